@@ -0,0 +1,7 @@
+"""Performance benchmarks (plain Python, headless).
+
+Run ``python -m benchmarks run`` to time the parse / layout / decode / export
+/ display-node pipeline across scaling inputs and write a JSON result with
+machine info; ``python -m benchmarks compare baseline.json current.json``
+flags regressions. See ``benchmarks/README.md``.
+"""
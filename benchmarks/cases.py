@@ -0,0 +1,126 @@
+"""Benchmark cases.
+
+Each case is ``setup(size) -> callable``: setup builds the inputs (untimed)
+and returns the zero-argument function the runner times. Only model and
+export modules are imported, so the suite runs without Tk.
+"""
+
+import importlib.util
+import io
+import os
+import tempfile
+
+from benchmarks import inputs
+
+SIZES = (100, 1000, 5000)
+QUICK_SIZES = (50, 200)
+
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _loaded_model(size):
+    from src.model.struct_model import StructModel
+    fd, path = tempfile.mkstemp(suffix=".h")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(inputs.struct_header(size))
+        model = StructModel()
+        model.load_struct_from_file(path, target_name="Bench")
+    finally:
+        os.unlink(path)
+    return model
+
+
+@case("parse_struct_definition_ast")
+def bench_parse_ast(size):
+    from src.model.struct_parser import parse_struct_definition_ast
+    header = inputs.struct_header(size)
+    return lambda: parse_struct_definition_ast(header, target_name="Bench")
+
+
+@case("V7StructParser")
+def bench_v7_parser(size):
+    from src.model.parser import V7StructParser
+    body = "struct Bench {\n" + "\n".join(inputs.member_lines(size)) + "\n};\n"
+    return lambda: V7StructParser().parse_aggregate_definition(body)
+
+
+@case("calculate_layout")
+def bench_calculate_layout(size):
+    from src.model.struct_model import calculate_layout
+    from src.model.struct_parser import parse_struct_definition_ast
+    members = parse_struct_definition_ast(inputs.struct_header(size), target_name="Bench").members
+    return lambda: calculate_layout(members)
+
+
+@case("parse_hex_data")
+def bench_parse_hex_data(size):
+    model = _loaded_model(size)
+    hex_data = inputs.pattern_bytes(model.total_size).hex()
+    return lambda: model.parse_hex_data(hex_data, "little")
+
+
+@case("parse_flexible_input")
+def bench_parse_flexible_input(size):
+    from src.model.flexible_bytes_parser import parse_flexible_input
+    total = size * 8
+    text = inputs.flexible_input(total)
+    return lambda: parse_flexible_input(text, total)
+
+
+@case("export_to_csv")
+def bench_export_to_csv(size):
+    from src.export.csv_export import CsvExportOptions, DefaultCsvExportService, build_parsed_model_from_struct
+    model = _loaded_model(size)
+    hex_input = inputs.pattern_bytes(model.total_size).hex()
+    service = DefaultCsvExportService()
+
+    def run():
+        # export_to_csv 會就地補值，每次使用新的 parsed model
+        parsed = build_parsed_model_from_struct(model)
+        options = CsvExportOptions(include_values=True, hex_input=hex_input)
+        service.export_to_csv(parsed, {"type": "stream", "stream": io.StringIO()}, options)
+    return run
+
+
+@case("get_display_nodes")
+def bench_get_display_nodes(size):
+    model = _loaded_model(size)
+    model.parse_hex_data(inputs.pattern_bytes(model.total_size).hex(), "little")
+
+    def run():
+        model._display_cache.clear()  # 量測實際建構，而非快取命中
+        return model.get_display_nodes("tree")
+    return run
+
+
+def _synthetic_generator():
+    path = os.path.join(os.path.dirname(__file__), "..", "tools", "gen_synthetic_header.py")
+    spec = importlib.util.spec_from_file_location("gen_synthetic_header", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@case("load_synthetic_header")
+def bench_load_synthetic_header(size):
+    from src.model.struct_model import StructModel
+    gen = _synthetic_generator()
+    # size 為成員總數：每個 struct 10 個成員，巢狀、bitfield、pack 區段與 alias 皆由 seed 決定
+    config = gen.GeneratorConfig(seed=size, structs=max(1, size // 10), unions=max(1, size // 100))
+    header, names = gen.HeaderGenerator(config, gen.load_aliases()).generate()
+    fd, path = tempfile.mkstemp(suffix=".h")
+    with os.fdopen(fd, "w") as f:
+        f.write(header)
+
+    def run():
+        StructModel().load_struct_from_file(path, target_name=names[-1])
+    run.cleanup = lambda: os.unlink(path)
+    return run
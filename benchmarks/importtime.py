@@ -0,0 +1,108 @@
+"""Startup import-time budget.
+
+Runs ``python -X importtime`` in a fresh interpreter that imports what
+``src/main.py`` imports before the window appears (model, view, presenter,
+config + UI strings), builds a presenter and pushes its first context (the
+first ``push_context`` validates the context), and sums the cumulative time of the top-level imports.
+The first run is a warm-up (``.pyc`` files and the config cache), the
+reported total is the median of the remaining runs.
+
+Besides the time budget, the modules in ``LAZY_MODULES`` must not be
+imported at startup at all; they are loaded on first use.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_BUDGET_MS = 200.0
+LAZY_MODULES = (
+    "jsonschema",
+    "yaml",
+    "numpy",
+    "asyncio",
+    "xml.etree.ElementTree",
+    "src.export.csv_export",
+    "src.model.flattening_strategy",
+)
+STARTUP_CODE = (
+    "import sys\n"
+    "sys.path[:0] = [{src!r}, {root!r}]\n"
+    "from src.model import StructModel\n"
+    "from src.view import StructView\n"
+    "from src.presenter import StructPresenter\n"
+    "from src.config import load_ui_strings\n"
+    "load_ui_strings({strings!r})\n"
+    "StructPresenter(StructModel(), None).push_context()\n"
+)
+
+
+def parse_importtime(stderr):
+    """解析 ``-X importtime`` 輸出，回傳 ``[(module, self_us, cumulative_us, depth)]``。"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表頭
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def startup_code():
+    return STARTUP_CODE.format(
+        src=os.path.join(ROOT, "src"), root=ROOT,
+        strings=os.path.join(ROOT, "src", "config", "ui_strings.xml"),
+    )
+
+
+def import_once(code=None):
+    # 打包後的程式一定有 bytecode；允許寫入 .pyc，避免量到 compile 時間
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code or startup_code()],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup import failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def measure(runs=5, code=None, top=10):
+    """回傳 ``{total_ms, samples_ms, top_self, lazy_violations}``（total 為 warm-up 後的 median）。"""
+    import_once(code)  # warm-up
+    samples, rows = [], []
+    for _ in range(max(1, runs)):
+        rows = import_once(code)
+        samples.append(sum(cum for _, _, cum, depth in rows if depth == 0) / 1000.0)
+    imported = {name for name, _, _, _ in rows}
+    return {
+        "total_ms": statistics.median(samples),
+        "samples_ms": samples,
+        "top_self": [{"module": name, "self_ms": self_us / 1000.0}
+                     for name, self_us, _, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:top]],
+        "lazy_violations": sorted(m for m in LAZY_MODULES if m in imported),
+    }
+
+
+def check(result, budget_ms=DEFAULT_BUDGET_MS):
+    """回傳違規訊息 list；空 list 代表符合預算。"""
+    problems = []
+    if result["total_ms"] > budget_ms:
+        problems.append(f"startup imports took {result['total_ms']:.1f} ms (budget {budget_ms:.1f} ms)")
+    for name in result["lazy_violations"]:
+        problems.append(f"{name} is imported at startup (should load on first use)")
+    return problems
+
+
+def format_result(result):
+    lines = [f"startup imports: {result['total_ms']:.1f} ms (median of {len(result['samples_ms'])})",
+             "slowest modules (self):"]
+    lines.extend(f"  {row['self_ms']:8.2f} ms  {row['module']}" for row in result["top_self"])
+    return "\n".join(lines)
@@ -0,0 +1,57 @@
+"""Deterministic scaling inputs for the benchmarks.
+
+Headers are built from a fixed member cycle (scalars, bitfields, arrays and a
+nested struct), so the same ``size`` always produces the same text and the
+results are comparable across machines.
+"""
+
+_MEMBER_CYCLE = (
+    "char c{i};",
+    "int i{i};",
+    "unsigned int f{i}a : 3;",
+    "unsigned int f{i}b : 5;",
+    "short s{i};",
+    "long long q{i};",
+    "unsigned char buf{i}[8];",
+    "bool b{i};",
+    "double d{i};",
+    "struct Inner in{i};",
+)
+
+INNER = "struct Inner {\n    int x;\n    char y;\n    short z[2];\n};\n"
+
+
+def member_lines(count):
+    return [_MEMBER_CYCLE[i % len(_MEMBER_CYCLE)].format(i=i) for i in range(count)]
+
+
+def struct_header(count, name="Bench"):
+    """``count`` 個成員的 header（含 nested ``struct Inner``）。"""
+    body = "\n".join(f"    {line}" for line in member_lines(count))
+    return f"{INNER}\nstruct {name} {{\n{body}\n}};\n"
+
+
+def manual_members(count):
+    """set_manual_struct / calculate_layout 用的 dict 成員（純量與 bitfield）。"""
+    types = ("char", "int", "short", "long long", "unsigned int", "unsigned int", "double")
+    members = []
+    for i in range(count):
+        type_name = types[i % len(types)]
+        bit_size = 3 if type_name == "unsigned int" else 0
+        members.append({"name": f"m{i}", "type": type_name, "bit_size": bit_size})
+    return members
+
+
+def pattern_bytes(size):
+    """可重現的非零資料（避免全 0 讓 decode 走捷徑）。"""
+    return bytes((i * 131 + 7) & 0xFF for i in range(size))
+
+
+def flexible_input(size):
+    """``parse_flexible_input`` 用的混合格式字串（0x 單位 + 逗號/空白分隔）。"""
+    data = pattern_bytes(size)
+    tokens = []
+    for i in range(0, len(data), 4):
+        chunk = data[i:i + 4]
+        tokens.append("0x" + chunk.hex())
+    return ", ".join(tokens)
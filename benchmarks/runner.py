@@ -0,0 +1,217 @@
+"""Benchmark runner and baseline comparison.
+
+``run``: for every case and size, one warm-up call, then ``repeat`` rounds.
+Each round loops the call until it takes at least ``min_time`` seconds and
+records the per-call time. The JSON result holds min/median/mean/stdev per
+(case, size) plus machine info, so files from different machines can be
+told apart.
+
+``compare``: matches (case, size) entries of two result files. An entry is a
+regression when its median is more than ``threshold`` times the baseline
+median and slower by more than ``min_delta`` seconds (noise floor). The exit
+status is 1 when any regression is found.
+
+``imports``: startup import-time budget, see ``benchmarks/importtime.py``.
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import importtime  # noqa: E402
+from benchmarks.cases import CASES, QUICK_SIZES, SIZES  # noqa: E402
+
+DEFAULT_THRESHOLD = 1.25
+DEFAULT_MIN_DELTA = 50e-6
+SCHEMA_VERSION = 1
+
+
+def machine_info():
+    info = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        info["git_commit"] = None
+    return info
+
+
+def time_call(func, repeat=5, min_time=0.05):
+    """回傳各 round 的每次呼叫秒數。"""
+    func()  # warm-up（import、快取、regex 編譯）
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            loops, elapsed = 0, 0.0
+            start = time.perf_counter()
+            while elapsed < min_time or loops == 0:
+                func()
+                loops += 1
+                elapsed = time.perf_counter() - start
+            samples.append(elapsed / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def run(case_patterns=None, sizes=SIZES, repeat=5, min_time=0.05, log=None):
+    results = []
+    for name, setup in CASES.items():
+        if case_patterns and not any(fnmatch.fnmatch(name, p) for p in case_patterns):
+            continue
+        for size in sizes:
+            func = setup(size)
+            try:
+                samples = time_call(func, repeat=repeat, min_time=min_time)
+            finally:
+                cleanup = getattr(func, "cleanup", None)  # 例如刪除暫存 header
+                if cleanup is not None:
+                    cleanup()
+            entry = {
+                "case": name,
+                "size": size,
+                "min": min(samples),
+                "median": statistics.median(samples),
+                "mean": statistics.fmean(samples),
+                "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                "rounds": len(samples),
+            }
+            results.append(entry)
+            if log is not None:
+                log(f"{name:<30} {size:>6}  median {entry['median'] * 1000:10.3f} ms")
+    return {
+        "schema": SCHEMA_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA):
+    """回傳比較列 ``[{case, size, baseline, current, ratio, status}]``；status 為 ok / regression / improved / new。"""
+    base = {(r["case"], r["size"]): r for r in baseline.get("results", [])}
+    rows = []
+    for r in current.get("results", []):
+        old = base.get((r["case"], r["size"]))
+        if old is None:
+            rows.append({"case": r["case"], "size": r["size"], "baseline": None,
+                         "current": r["median"], "ratio": None, "status": "new"})
+            continue
+        ratio = r["median"] / old["median"] if old["median"] else float("inf")
+        delta = r["median"] - old["median"]
+        if ratio > threshold and delta > min_delta:
+            status = "regression"
+        elif ratio < 1 / threshold and -delta > min_delta:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"case": r["case"], "size": r["size"], "baseline": old["median"],
+                     "current": r["median"], "ratio": ratio, "status": status})
+    return rows
+
+
+def format_comparison(rows):
+    lines = [f"{'case':<30} {'size':>6} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}  status"]
+    for row in rows:
+        base = "-" if row["baseline"] is None else f"{row['baseline'] * 1000:.3f}"
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+        lines.append(f"{row['case']:<30} {row['size']:>6} {base:>12} {row['current'] * 1000:>12.3f} {ratio:>7}  {row['status']}")
+    return "\n".join(lines)
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description="Struct parser benchmarks")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run benchmarks and write JSON results")
+    run_p.add_argument("--output", "-o", default="benchmark_results.json")
+    run_p.add_argument("--case", action="append", help="Case name or glob (repeatable)")
+    run_p.add_argument("--sizes", help="Comma-separated sizes (default: %s)" % ",".join(map(str, SIZES)))
+    run_p.add_argument("--quick", action="store_true", help="Small sizes and fewer rounds (smoke run)")
+    run_p.add_argument("--repeat", type=int, default=5)
+    run_p.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per round")
+    run_p.add_argument("--baseline", help="Compare against this baseline after running")
+    run_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    cmp_p = sub.add_parser("compare", help="Compare two result files and flag regressions")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="Median ratio above which a case is a regression (default %(default)s)")
+    cmp_p.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                       help="Ignore slowdowns smaller than this many seconds (default %(default)s)")
+
+    imp_p = sub.add_parser("imports", help="Measure startup import time (python -X importtime) against a budget")
+    imp_p.add_argument("--budget-ms", type=float, default=importtime.DEFAULT_BUDGET_MS,
+                       help="Maximum median startup import time (default %(default)s)")
+    imp_p.add_argument("--runs", type=int, default=5)
+    imp_p.add_argument("--output", "-o", help="Also write the result as JSON")
+
+    sub.add_parser("list", help="List benchmark cases")
+
+    args = ap.parse_args(argv)
+    if args.command == "list":
+        print("\n".join(CASES))
+        return 0
+
+    if args.command == "imports":
+        result = importtime.measure(runs=args.runs)
+        print(importtime.format_result(result))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(dict(result, budget_ms=args.budget_ms, machine=machine_info()), f, indent=2)
+        problems = importtime.check(result, args.budget_ms)
+        for problem in problems:
+            print(problem)
+        return 1 if problems else 0
+
+    if args.command == "run":
+        if args.sizes:
+            sizes = tuple(int(s) for s in args.sizes.split(","))
+        else:
+            sizes = QUICK_SIZES if args.quick else SIZES
+        repeat = min(args.repeat, 3) if args.quick else args.repeat
+        min_time = min(args.min_time, 0.01) if args.quick else args.min_time
+        result = run(args.case, sizes=sizes, repeat=repeat, min_time=min_time, log=print)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {len(result['results'])} results to {args.output}")
+        if not args.baseline:
+            return 0
+        rows = compare(_load(args.baseline), result, threshold=args.threshold)
+    else:
+        rows = compare(_load(args.baseline), _load(args.current),
+                       threshold=args.threshold, min_delta=args.min_delta)
+    print(format_comparison(rows))
+    regressions = [r for r in rows if r["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.2f}x")
+        return 1
+    return 0
@@ -11,7 +11,23 @@ except Exception:
     StructPresenter = None
 
 from .model import StructModel  # convenience re-export
-from .export.csv_export import DefaultCsvExportService, CsvExportOptions, CsvExportError
+
+_LAZY_EXPORTS = {
+    "DefaultCsvExportService": "src.export.csv_export",
+    "CsvExportOptions": "src.export.csv_export",
+    "CsvExportError": "src.export.csv_export",
+}
+
+
+def __getattr__(name):
+    # export 模組於第一次存取時才載入，縮短 GUI 啟動時間
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "StructPresenter",
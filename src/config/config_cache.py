@@ -0,0 +1,90 @@
+"""JSON cache for parsed config files.
+
+Parsing ``ui_strings.xml`` and the type YAML files at startup needs
+ElementTree / PyYAML and shows up in cold start time. ``load_cached(path,
+parse)`` stores ``parse(path)`` as JSON keyed by the file's absolute path,
+``st_mtime_ns`` and size; later starts read the JSON instead and never import
+the parser. Only plain data (dict/list/str/int/...) that survives a JSON
+round trip is cached, and a ``None`` result (e.g. PyYAML not installed) is
+never cached, so installing the parser later takes effect on the next start.
+Any cache problem (read-only directory, corrupt or foreign file) falls back
+to ``parse(path)``.
+
+Cache directory: ``STRUCT_CONFIG_CACHE_DIR``, or a per-user directory
+(``%LOCALAPPDATA%\\struct_converter\\cache`` on Windows,
+``$XDG_CACHE_HOME/struct_converter`` or ``~/.cache/struct_converter``
+elsewhere) created with mode 0o700; ``STRUCT_CONFIG_CACHE=0`` disables it.
+"""
+
+import json
+import os
+import zlib
+
+CACHE_VERSION = 2
+
+
+def cache_dir():
+    configured = os.environ.get("STRUCT_CONFIG_CACHE_DIR")
+    if configured:
+        return configured
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "struct_converter", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "struct_converter")
+
+
+def cache_enabled():
+    return os.environ.get("STRUCT_CONFIG_CACHE", "1").strip() != "0"
+
+
+def _cache_path(path, kind):
+    digest = f"{zlib.crc32(path.encode('utf-8')):08x}"
+    return os.path.join(cache_dir(), f"{kind}-{digest}.json")
+
+
+def _read(cache_path, key):
+    with open(cache_path, "r", encoding="utf-8") as f:
+        entry = json.load(f)
+    if isinstance(entry, dict) and entry.get("key") == key:
+        return True, entry.get("value")
+    return False, None
+
+
+def _write(cache_path, key, value):
+    text = json.dumps({"key": key, "value": value}, ensure_ascii=False)
+    if json.loads(text)["value"] != value:
+        return  # 非純 JSON 資料（如 int key 的 dict）不快取，避免讀回不同的值
+    os.makedirs(os.path.dirname(cache_path), mode=0o700, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, cache_path)  # 原子替換，並行啟動不會讀到半份檔案
+
+
+def load_cached(path, parse, kind="config"):
+    """回傳 ``parse(path)`` 的結果；檔案 mtime / 大小未變時直接讀 JSON 快取。
+
+    ``kind`` 區分同一檔案的不同解析方式；``parse`` 的結果須為 JSON 資料才會快取，
+    回傳 ``None`` 表示解析失敗，不寫入快取。
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = [CACHE_VERSION, path, stat.st_mtime_ns, stat.st_size]
+    if not cache_enabled():
+        return parse(path)
+    cache_path = _cache_path(path, kind)
+    try:
+        hit, value = _read(cache_path, key)
+        if hit:
+            return value
+    except Exception:
+        pass
+    value = parse(path)
+    if value is None:
+        return value
+    try:
+        _write(cache_path, key, value)
+    except Exception:
+        pass
+    return value
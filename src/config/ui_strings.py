@@ -1,22 +1,28 @@
-import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from src.config.config_cache import load_cached
+
 _strings = {}
 
 
+def _parse_ui_strings(path: str) -> dict:
+    import xml.etree.ElementTree as ET  # 延遲載入：快取命中時不需要
+    root = ET.parse(path).getroot()
+    loaded = {}
+    for elem in root.findall("string"):
+        name = elem.attrib.get("name")
+        if name:
+            loaded[name] = elem.text or ""
+    return loaded
+
+
 def load_ui_strings(path: str) -> dict:
     """Load UI strings from an XML file."""
     global _strings
     file_path = Path(path)
     if not file_path.exists():
         raise FileNotFoundError(f"UI string file not found: {path}")
-    tree = ET.parse(file_path)
-    root = tree.getroot()
-    loaded = {}
-    for elem in root.findall("string"):
-        name = elem.attrib.get("name")
-        if name:
-            loaded[name] = elem.text or ""
+    loaded = load_cached(str(file_path), _parse_ui_strings, kind="ui_strings")
     _strings = loaded
     return loaded
 
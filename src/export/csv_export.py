@@ -20,6 +20,8 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
 
 from src.config.columns import UNIFIED_LAYOUT_VALUE_COLUMNS  # added import
+from src.model.metrics import METRICS, CSV_WRITE
+from src.model.profiling import PROFILER
 
 
 # --------------------------- Exceptions & Types ------------------------------
@@ -166,6 +168,7 @@ DEFAULT_COLUMNS = [
 
 
 class DefaultCsvExportService:
+    @PROFILER.profiled("export")
     def export_to_csv(
         self,
         parsed_model: Dict[str, Any],
@@ -321,6 +324,7 @@ class DefaultCsvExportService:
         # Prepare text stream with encoding and BOM handling
         text_stream: Optional[TextIO] = None
         stream_to_close: Optional[TextIO] = None
+        write_start = time.perf_counter()
         try:
             if target_type == "file":
                 file_path = output_target.get("path")
@@ -362,6 +366,7 @@ class DefaultCsvExportService:
                     stream_to_close.detach()  # close underlying binary stream too
             except Exception:
                 pass
+            METRICS.record(CSV_WRITE, time.perf_counter() - write_start)
 
         duration_ms = int((time.time() - start) * 1000)
         return ExportReport(
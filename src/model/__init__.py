@@ -15,18 +15,34 @@ from src.model.struct_parser import (
 from src.model.layout import (
     LayoutCalculator,
     LayoutItem,
+    LayoutState,
     BaseLayoutCalculator,
     StructLayoutCalculator,
     UnionLayoutCalculator,
 )
-from src.model.flattening_strategy import (
-    ArrayFlatteningStrategy,
-    BitfieldFlatteningStrategy,
-    StructFlatteningStrategy,
-    UnionFlatteningStrategy,
-    FlatteningStrategy,
-    FlattenedNode,
-)
+
+# flattening_strategy（V7 展平）於第一次存取時才載入，縮短啟動時間
+_LAZY_EXPORTS = {
+    name: "src.model.flattening_strategy"
+    for name in (
+        "ArrayFlatteningStrategy",
+        "BitfieldFlatteningStrategy",
+        "StructFlatteningStrategy",
+        "UnionFlatteningStrategy",
+        "FlatteningStrategy",
+        "FlattenedNode",
+    )
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'StructModel',
@@ -43,6 +59,7 @@ __all__ = [
     'FlatteningStrategy',
     'FlattenedNode',
     'LayoutItem',
+    'LayoutState',
     'MemberDef',
     'StructDef',
     'UnionDef',
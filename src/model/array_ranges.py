@@ -0,0 +1,167 @@
+"""Range folding of large arrays for display nodes.
+
+``char buf[65536]`` used to mean one display row per element. Arrays with
+more than ``ARRAY_FOLD_SIZE`` elements are instead shown as range nodes
+(``buf[0..1023]``, ``buf[1024..2047]`` ...). Ranges are generated from an
+``ArrayDescriptor`` only when their parent's ``children`` are read, so the
+number of materialized nodes grows with log(array size); element values are
+decoded from the raw bytes when a range is opened. Each range shows a short
+hexdump preview of its bytes as its value.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+ARRAY_FOLD_SIZE = 1024
+PREVIEW_BYTES = 16
+
+
+@dataclass(frozen=True)
+class ArrayDescriptor:
+    """Array member as seen by the display layer (linear element index)."""
+
+    node_id: str
+    name: str
+    elem_type: str
+    dims: Tuple[int, ...]
+    elem_size: int = 0
+    offset: Optional[int] = None
+    nested: Any = None
+
+    @property
+    def count(self):
+        total = 1
+        for dim in self.dims:
+            total *= dim
+        return total
+
+    def element_suffix(self, index):
+        """``[i][j]`` suffix of linear element ``index``."""
+        parts = []
+        for dim in reversed(self.dims):
+            index, rem = divmod(index, dim)
+            parts.append(rem)
+        return "".join(f"[{i}]" for i in reversed(parts))
+
+    def element_offset(self, index):
+        if self.offset is None:
+            return None
+        return self.offset + index * self.elem_size
+
+
+def range_step(count, fold_size=ARRAY_FOLD_SIZE):
+    """Elements per child range so that a node has at most ``fold_size`` children."""
+    step = 1
+    while count > step * fold_size:
+        step *= fold_size
+    return step
+
+
+def hexdump_preview(data, offset, length, limit=PREVIEW_BYTES):
+    """``"00 01 02 …"`` preview of ``length`` bytes at ``offset`` (empty without data)."""
+    if data is None or offset is None or offset >= len(data):
+        return ""
+    chunk = data[offset:offset + min(length, limit)]
+    text = " ".join(f"{b:02x}" for b in chunk)
+    if length > limit:
+        text += " …"
+    return text
+
+
+class LazyChildren(Sequence):
+    """Read-only list of child nodes built by ``factory(i)`` on first access."""
+
+    __slots__ = ("_count", "_factory", "_items")
+
+    def __init__(self, count, factory):
+        self._count = count
+        self._factory = factory
+        self._items = {}
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        item = self._items.get(index)
+        if item is None:
+            item = self._items[index] = self._factory(index)
+        return item
+
+    @property
+    def materialized(self):
+        """Number of children built so far."""
+        return len(self._items)
+
+    def __repr__(self):
+        return f"<LazyChildren {self.materialized}/{self._count}>"
+
+
+class ArrayRangeBuilder:
+    """Build range / element display nodes for one ``ArrayDescriptor``.
+
+    ``decode(desc, index)`` returns the element value string;
+    ``element_children(desc, index, element_id)`` returns the children of a
+    struct element; ``data`` is the raw buffer used for previews.
+    """
+
+    def __init__(self, desc, decode, element_children=None, data=None,
+                 fold_size=ARRAY_FOLD_SIZE):
+        self.desc = desc
+        self.decode = decode
+        self.element_children = element_children
+        self.data = data
+        self.fold_size = fold_size
+
+    def children(self, lo=0, hi=None):
+        """Children covering elements ``[lo, hi)``: ranges, or elements when small."""
+        if hi is None:
+            hi = self.desc.count
+        step = range_step(hi - lo, self.fold_size)
+        if step == 1:
+            return LazyChildren(hi - lo, lambda i: self.element_node(lo + i))
+        count = -(-(hi - lo) // step)
+        return LazyChildren(count, lambda i: self.range_node(lo + i * step, min(hi, lo + (i + 1) * step)))
+
+    def range_node(self, lo, hi):
+        desc = self.desc
+        label = f"{desc.name}[{lo}..{hi - 1}]"
+        length = (hi - lo) * desc.elem_size
+        offset = desc.element_offset(lo)
+        return {
+            "id": f"{desc.node_id}[{lo}..{hi - 1}]",
+            "label": label,
+            "type": "array",
+            "value": hexdump_preview(self.data, offset, length),
+            "offset": "" if offset is None else str(offset),
+            "size": str(length) if desc.elem_size else "",
+            "children": self.children(lo, hi),
+            "icon": "array",
+            "extra": {"range": (lo, hi)},
+        }
+
+    def element_node(self, index):
+        desc = self.desc
+        suffix = desc.element_suffix(index)
+        node_id = f"{desc.node_id}{suffix}"
+        offset = desc.element_offset(index)
+        children = []
+        if desc.nested is not None and self.element_children is not None:
+            children = self.element_children(desc, index, node_id)
+        return {
+            "id": node_id,
+            "label": f"{desc.name}{suffix}",
+            "type": desc.elem_type,
+            "value": self.decode(desc, index) if not children else "",
+            "offset": "" if offset is None else str(offset),
+            "size": str(desc.elem_size) if desc.elem_size else "",
+            "children": children,
+            "icon": desc.elem_type,
+            "extra": {"index": index},
+        }
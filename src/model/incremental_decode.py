@@ -0,0 +1,172 @@
+"""Incremental decode of struct bytes for live (decode-as-you-type) mode.
+
+``StructModel.parse_hex_data`` decodes every layout item on each call. While
+the user types, only a few bytes change between two decodes, so
+``IncrementalDecoder`` keeps the previous bytes and results:
+
+- changed byte ranges are found by comparing the old and new bytes in blocks
+  (C-level slice compares), then narrowed to the first/last differing byte;
+- layout items are indexed by start offset plus a running maximum of their
+  end offsets, so the items overlapping a range are found by bisection;
+- only those items are decoded again. The value maps and the parsed list are
+  copied (C-level) and patched, so a result never shares mutable state with
+  the previous one and can be handed to another thread.
+
+A change of layout, byte order or data length falls back to a full decode.
+``decode_layout_item`` is shared with ``parse_hex_data`` so both paths give
+identical values.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+BLOCK_SIZE = 256
+STOP_CHECK_INTERVAL = 4096  # 全量 decode 時每隔幾個項目檢查一次是否已過時
+
+
+def decode_layout_item(item, data_bytes, byte_order):
+    """解碼單一 layout 項目，回傳 ``(parsed entry, numeric)``；padding 的 numeric 為 None。"""
+    offset, size = item['offset'], item['size']
+    member_bytes = data_bytes[offset:offset + size]
+    if item['type'] == "padding":
+        return {"name": item['name'], "value": "-", "hex_raw": member_bytes.hex()}, None
+    if item.get("is_bitfield", False):
+        storage_int = int.from_bytes(member_bytes, byte_order)
+        computed_val = (storage_int >> item["bit_offset"]) & ((1 << item["bit_size"]) - 1)
+        display_value = str(computed_val)
+    else:
+        computed_val = int.from_bytes(member_bytes, byte_order)
+        display_value = str(bool(computed_val)) if item['type'] == 'bool' else str(computed_val)
+    hex_value = int.from_bytes(member_bytes, 'big').to_bytes(size, 'big').hex()
+    return {"name": item['name'], "value": display_value, "hex_raw": hex_value}, computed_val
+
+
+def changed_ranges(old, new, block_size=BLOCK_SIZE):
+    """``old`` 與 ``new``（等長）不同的 byte 區間 ``[(start, end), ...]``（相鄰 block 合併）。"""
+    if old == new:
+        return []
+    old_view, new_view = memoryview(old), memoryview(new)
+    ranges = []
+    n = len(new)
+    for start in range(0, n, block_size):
+        end = min(n, start + block_size)
+        if old_view[start:end] == new_view[start:end]:
+            continue
+        first = start
+        while old[first] == new[first]:
+            first += 1
+        last = end - 1
+        while old[last] == new[last]:
+            last -= 1
+        if ranges and ranges[-1][1] >= first:
+            ranges[-1] = (ranges[-1][0], last + 1)
+        else:
+            ranges.append((first, last + 1))
+    return ranges
+
+
+class DecodeResult:
+    """One decode: parsed list, value maps, the bytes decoded and the changed item indices."""
+
+    __slots__ = ("layout", "byte_order", "data_bytes", "parsed_values",
+                 "values", "numeric_values", "hex_raws", "changed", "full")
+
+    def __init__(self, layout, byte_order, data_bytes, parsed_values, values, numeric_values, hex_raws, changed, full):
+        self.layout = layout
+        self.byte_order = byte_order
+        self.data_bytes = data_bytes
+        self.parsed_values = parsed_values
+        self.values = values
+        self.numeric_values = numeric_values
+        self.hex_raws = hex_raws
+        self.changed = changed  # 重新解碼的 layout index（full 時為全部）
+        self.full = full
+
+
+class IncrementalDecoder:
+    """Decode bytes against a layout, re-decoding only items whose bytes changed."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._last = None  # 上一次的 DecodeResult
+        self._index_layout = None
+        self._order = []  # 依 offset 排序的 layout index
+        self._starts = []
+        self._max_ends = []
+
+    def _build_index(self, layout):
+        order = sorted(range(len(layout)), key=lambda i: layout[i]['offset'])
+        self._order = order
+        self._starts = [layout[i]['offset'] for i in order]
+        self._max_ends = list(accumulate((layout[i]['offset'] + layout[i]['size'] for i in order), max))
+        self._index_layout = layout
+
+    def items_in(self, start, end):
+        """與 byte 區間 ``[start, end)`` 重疊的 layout index。"""
+        lo = bisect_right(self._max_ends, start)
+        hi = bisect_left(self._starts, end)
+        layout = self._index_layout
+        found = []
+        for k in range(lo, hi):
+            i = self._order[k]
+            item = layout[i]
+            if item['offset'] + item['size'] > start:
+                found.append(i)
+        return found
+
+    def decode(self, data_bytes, byte_order, layout, should_stop=None):
+        """回傳 ``DecodeResult``；``should_stop()`` 為真時中止並回傳 None（狀態不變）。"""
+        data_bytes = bytes(data_bytes)
+        with self._lock:
+            last = self._last
+            if (last is None or last.layout is not layout or last.byte_order != byte_order
+                    or len(last.data_bytes) != len(data_bytes)):
+                result = self._decode_full(data_bytes, byte_order, layout, should_stop)
+            else:
+                result = self._decode_changed(last, data_bytes, should_stop)
+            if result is not None:
+                self._last = result
+            return result
+
+    def _decode_full(self, data_bytes, byte_order, layout, should_stop):
+        parsed_values, values, numeric_values, hex_raws = [], {}, {}, {}
+        for i, item in enumerate(layout):
+            if should_stop is not None and i % STOP_CHECK_INTERVAL == 0 and should_stop():
+                return None
+            entry, numeric = decode_layout_item(item, data_bytes, byte_order)
+            parsed_values.append(entry)
+            if numeric is not None:
+                name = item['name']
+                values[name] = entry["value"]
+                numeric_values[name] = numeric
+                hex_raws[name] = entry["hex_raw"]
+        return DecodeResult(layout, byte_order, data_bytes, parsed_values, values, numeric_values,
+                            hex_raws, range(len(layout)), True)
+
+    def _decode_changed(self, last, data_bytes, should_stop):
+        layout, byte_order = last.layout, last.byte_order
+        if self._index_layout is not layout:
+            self._build_index(layout)
+        changed = set()
+        for start, end in changed_ranges(last.data_bytes, data_bytes):
+            changed.update(self.items_in(start, end))
+        if should_stop is not None and should_stop():
+            return None
+        changed = sorted(changed)
+        parsed_values = list(last.parsed_values)
+        values, numeric_values, hex_raws = dict(last.values), dict(last.numeric_values), dict(last.hex_raws)
+        for i in changed:
+            item = layout[i]
+            entry, numeric = decode_layout_item(item, data_bytes, byte_order)
+            parsed_values[i] = entry
+            if numeric is not None:
+                name = item['name']
+                values[name] = entry["value"]
+                numeric_values[name] = numeric
+                hex_raws[name] = entry["hex_raw"]
+        return DecodeResult(layout, byte_order, data_bytes, parsed_values, values, numeric_values,
+                            hex_raws, changed, False)
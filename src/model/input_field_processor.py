@@ -11,6 +11,26 @@ Example Usage:
     # bytes_data == b'\x12\x00\x00\x00'
 """
 
+import re
+from itertools import groupby
+
+_HEX_DIGITS_RE = re.compile(r"[0-9a-fA-F]*")
+
+
+class InputFieldBatchError(ValueError):
+    """Raised by ``process_input_fields`` for the first offending part.
+
+    ``kind`` is ``"non_hex"`` when the part contains non-hexadecimal
+    characters and ``"length"`` when it does not fit its byte size.
+    """
+
+    def __init__(self, kind, index, input_value, message):
+        super().__init__(message)
+        self.kind = kind
+        self.index = index
+        self.input_value = input_value
+
+
 class InputFieldProcessor:
     """Process user input field values for struct parsing.
 
@@ -19,6 +39,8 @@ class InputFieldProcessor:
     2. ``convert_to_raw_bytes`` - converts padded hex to bytes with
        the specified endianness.
     3. ``process_input_field`` - combines the above two steps.
+    4. ``process_input_fields`` - batch version of ``process_input_field``
+       for a whole hex grid.
 
     It supports the common byte sizes ``1``, ``4`` and ``8`` and the
     endianness values ``"little"`` and ``"big"``.
@@ -95,6 +117,95 @@ class InputFieldProcessor:
         padded = self.pad_hex_input(input_value, byte_size)
         return self.convert_to_raw_bytes(padded, byte_size, endianness)
     
+    def process_input_fields(self, parts, endianness):
+        """
+        批次版 process_input_field：一次處理整個 hex grid 的所有輸入格。
+        以單一 regex 驗證所有輸入，再以 bytes.fromhex 一次轉換，
+        little endian 時依 box 大小分段做 strided byte swap。
+        Args:
+            parts (Iterable[tuple[str, int]]): (hex 字串, byte_size) 序列
+            endianness (str): 'little' 或 'big'
+        Returns:
+            bytes: 所有輸入格依序串接後的原始 bytes
+        Raises:
+            InputFieldBatchError: 某一格含非 hex 字元或超過欄位長度
+            ValueError: byte_size 或 endianness 不合法
+        Example:
+            >>> processor = InputFieldProcessor()
+            >>> processor.process_input_fields([('12', 4), ('1', 1)], 'little')
+            b'\x12\x00\x00\x00\x01'
+        """
+        if endianness not in self.supported_endianness:
+            raise ValueError(
+                f"Unsupported endianness: {endianness}. Supported values: {self.supported_endianness}"
+            )
+        parts = list(parts)
+        values = [value or "" for value, _ in parts]
+        sizes = [size for _, size in parts]
+        if any(size <= 0 for size in sizes):
+            bad = next(size for size in sizes if size <= 0)
+            raise ValueError(f"Byte size must be positive, got: {bad}")
+
+        if not _HEX_DIGITS_RE.fullmatch("".join(values)):
+            for index, value in enumerate(values):
+                if not _HEX_DIGITS_RE.fullmatch(value):
+                    raise InputFieldBatchError(
+                        "non_hex", index, value,
+                        f"Input '{value}' contains non-hexadecimal characters."
+                    )
+
+        total_size = sum(sizes)
+        padded = "".join([value.zfill(size * 2) for value, size in zip(values, sizes)])
+        if len(padded) != total_size * 2:
+            for index, (value, size) in enumerate(zip(values, sizes)):
+                if len(value) > size * 2:
+                    raise InputFieldBatchError(
+                        "length", index, value,
+                        f"Hex string length mismatch: expected {size * 2} characters, got {len(value)}"
+                    )
+        data = bytes.fromhex(padded)
+        if endianness == "big":
+            return data
+        return self._swap_runs(data, [(size, len(list(run))) for size, run in groupby(sizes)])
+
+    def process_box_bytes(self, data, unit_size, endianness):
+        """
+        hex buffer 版 process_input_fields：輸入已是 bytes（每個 box 依顯示順序），
+        不需經過 hex 字串。box 大小為 unit_size，最後一格可較短。
+        Args:
+            data (bytes | bytearray): hex editor buffer 的內容
+            unit_size (int): box 大小（bytes）
+            endianness (str): 'little' 或 'big'
+        Returns:
+            bytes: 與 process_input_fields(buffer.parts(), endianness) 相同的結果
+        """
+        if endianness not in self.supported_endianness:
+            raise ValueError(
+                f"Unsupported endianness: {endianness}. Supported values: {self.supported_endianness}"
+            )
+        data = bytes(data)
+        if endianness == "big" or unit_size <= 1:
+            return data
+        full = len(data) - len(data) % unit_size
+        runs = [(unit_size, full // unit_size)]
+        if full < len(data):
+            runs.append((len(data) - full, 1))
+        return self._swap_runs(data, runs)
+
+    @staticmethod
+    def _swap_runs(data, runs):
+        """依 (box 大小, 連續個數) 分段做 strided byte swap。"""
+        swapped = bytearray(data)
+        offset = 0
+        for size, count in runs:
+            end = offset + size * count
+            if size > 1:
+                segment = data[offset:end]
+                for k in range(size):
+                    swapped[offset + k:end:size] = segment[size - 1 - k::size]
+            offset = end
+        return bytes(swapped)
+
     def is_supported_field_size(self, byte_size):
         """
         檢查 byte_size 是否為支援的欄位大小（1, 4, 8）。
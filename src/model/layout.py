@@ -1,14 +1,23 @@
 """Data structures and helpers for struct layout calculations."""
 
 from dataclasses import dataclass
-from typing import List, Tuple, Union, Optional
+from typing import List, NamedTuple, Tuple, Union, Optional
 from abc import ABC, abstractmethod
 
 
-from .types import get_type_info, merged_type_info
+from .types import REGISTRY, TargetABI, default_abi, merged_type_info
 TYPE_INFO = merged_type_info()
 
 
+def _refresh_type_info(registry):
+    # 就地更新，``from .layout import TYPE_INFO`` 的既有參照也看得到新型別
+    TYPE_INFO.clear()
+    TYPE_INFO.update(merged_type_info())
+
+
+REGISTRY.subscribe(_refresh_type_info)
+
+
 @dataclass
 class LayoutItem:
     """Represents a single entry in a struct layout.
@@ -35,16 +44,63 @@ class LayoutItem:
         return hasattr(self, key)
 
 
+class LayoutState(NamedTuple):
+    """Snapshot of a calculator's running state between two members.
+
+    ``BaseLayoutCalculator.snapshot_state``/``restore_state`` own the field
+    list, so callers that checkpoint a layout (e.g. the incremental manual
+    layout) never touch calculator attributes directly.
+    """
+
+    current_offset: int
+    max_alignment: int
+    bitfield_unit_type: Optional[str]
+    bitfield_unit_size: int
+    bitfield_unit_align: int
+    bitfield_bit_offset: int
+    bitfield_unit_offset: int
+
+    def shifted(self, delta: int) -> "LayoutState":
+        """Return the same state moved ``delta`` bytes further into the struct."""
+        return self._replace(
+            current_offset=self.current_offset + delta,
+            bitfield_unit_offset=self.bitfield_unit_offset + delta,
+        )
+
+    def offset_delta(self, other: "LayoutState", alignment: int) -> Optional[int]:
+        """Return ``d`` if laying out from ``other`` shifted by ``d`` equals ``self``.
+
+        Only offsets may differ, and ``d`` must be a multiple of ``alignment``
+        (the largest alignment of the members that follow). An open bitfield
+        unit must be shifted by the same amount. Returns ``None`` otherwise.
+        """
+        if self[1:6] != other[1:6]:
+            return None
+        delta = self.current_offset - other.current_offset
+        if delta % alignment:
+            return None
+        if delta and self.bitfield_unit_type is not None and (
+            self.bitfield_unit_offset - other.bitfield_unit_offset != delta
+        ):
+            return None
+        return delta
+
+
 class BaseLayoutCalculator(ABC):
     """Abstract base class for layout calculators."""
 
-    def __init__(self, pack_alignment: Optional[int] = None):
+    def __init__(self, pack_alignment: Optional[int] = None, abi: Optional[TargetABI] = None):
         """Initialize the layout calculator.
 
-        ``pack_alignment`` allows future support for ``#pragma pack`` style
-        alignment control. The parameter is accepted but currently ignored so
-        that existing behaviour remains unchanged.
+        ``pack_alignment`` mimics ``#pragma pack``; when omitted the ABI's
+        ``default_pack`` applies. ``abi`` (``TargetABI``) resolves type sizes
+        for this calculator and its nested calculators; ``None`` takes a
+        snapshot of the global default, so a running calculation is not
+        affected by a later pointer mode switch.
         """
+        self.abi = abi if abi is not None else default_abi()
+        if pack_alignment is None:
+            pack_alignment = self.abi.default_pack
         self.pack_alignment = pack_alignment
         self.layout: List[LayoutItem] = []
         self.current_offset = 0
@@ -64,6 +120,15 @@ class BaseLayoutCalculator(ABC):
             return min(alignment, self.pack_alignment)
         return alignment
 
+    def snapshot_state(self) -> LayoutState:
+        """Return the running state (offsets, alignment, open bitfield unit)."""
+        return LayoutState(*(getattr(self, field) for field in LayoutState._fields))
+
+    def restore_state(self, state: LayoutState):
+        """Restore a state returned by ``snapshot_state``; ``layout`` is untouched."""
+        for field, value in zip(LayoutState._fields, state):
+            setattr(self, field, value)
+
     def _get_attr(
         self, member: Union[Tuple[str, str], dict, object], attr: str, default=None
     ):
@@ -90,14 +155,14 @@ class BaseLayoutCalculator(ABC):
 class StructLayoutCalculator(BaseLayoutCalculator):
     """Helper class for calculating struct memory layout."""
 
-    def __init__(self, pack_alignment: Optional[int] = None):
-        super().__init__(pack_alignment=pack_alignment)
+    def __init__(self, pack_alignment: Optional[int] = None, abi: Optional[TargetABI] = None):
+        super().__init__(pack_alignment=pack_alignment, abi=abi)
 
     def _get_type_size_and_align(self, mtype: str, nested=None) -> Tuple[int, int]:
         """Return (size, alignment) for a given C type or struct/union (AST)。"""
-        # Always resolve via central registry to reflect runtime overrides
+        # 經由本次計算的 ABI 解析（overrides / pointer / long，其餘查 registry）
         try:
-            info = get_type_info(mtype)
+            info = self.abi.type_info(mtype)
             return info["size"], info["align"]
         except Exception:
             pass
@@ -109,7 +174,7 @@ class StructLayoutCalculator(BaseLayoutCalculator):
             elif isinstance(nested, dict):
                 nested_members = nested.get("members", [])
             if nested_members is not None:
-                _, size, align = StructLayoutCalculator(pack_alignment=self.pack_alignment).calculate(nested_members)
+                _, size, align = StructLayoutCalculator(pack_alignment=self.pack_alignment, abi=self.abi).calculate(nested_members)
                 return size, align
         raise KeyError(f"Unknown type: {mtype}")
 
@@ -133,7 +198,7 @@ class StructLayoutCalculator(BaseLayoutCalculator):
             elif isinstance(nested, dict):
                 nested_members = nested.get("members", [])
         if nested_members is not None:
-            struct_layout, struct_size, struct_align = StructLayoutCalculator(pack_alignment=self.pack_alignment).calculate(nested_members)
+            struct_layout, struct_size, struct_align = StructLayoutCalculator(pack_alignment=self.pack_alignment, abi=self.abi).calculate(nested_members)
             if struct_align > self.max_alignment:
                 self.max_alignment = struct_align
             self._add_padding_if_needed(struct_align)
@@ -169,16 +234,23 @@ class StructLayoutCalculator(BaseLayoutCalculator):
     def calculate(self, members: List[Union[Tuple[str, str], dict]]):
         """Calculate the complete memory layout for the struct."""
         for member in members:
-            if hasattr(member, "is_bitfield") and hasattr(member, "type"):
-                if member.is_bitfield:
-                    self._process_bitfield_member(member)
-                else:
-                    self._process_regular_member(member)
-            elif isinstance(member, dict) and member.get("is_bitfield", False):
+            self.add_member(member)
+        return self.finalize()
+
+    def add_member(self, member):
+        """Lay out one member after the ones already added (appends to ``layout``)."""
+        if hasattr(member, "is_bitfield") and hasattr(member, "type"):
+            if member.is_bitfield:
                 self._process_bitfield_member(member)
             else:
                 self._process_regular_member(member)
+        elif isinstance(member, dict) and member.get("is_bitfield", False):
+            self._process_bitfield_member(member)
+        else:
+            self._process_regular_member(member)
 
+    def finalize(self):
+        """Add final padding and return ``(layout, total_size, struct_alignment)``."""
         self._add_final_padding()
         return (
             self.layout,
@@ -191,7 +263,7 @@ class StructLayoutCalculator(BaseLayoutCalculator):
         mtype = self._get_attr(member, "type")
         mname = self._get_attr(member, "name")
         mbit_size = self._get_attr(member, "bit_size")
-        info = get_type_info(mtype)
+        info = self.abi.type_info(mtype)
         size, alignment = info["size"], info["align"]
 
         if self._needs_new_bitfield_unit(mtype, mbit_size):
@@ -233,7 +305,7 @@ class StructLayoutCalculator(BaseLayoutCalculator):
             elif isinstance(nested, dict):
                 nested_members = nested.get("members", [])
         if nested_members is not None:
-            struct_layout, struct_size, struct_align = StructLayoutCalculator(pack_alignment=self.pack_alignment).calculate(nested_members)
+            struct_layout, struct_size, struct_align = StructLayoutCalculator(pack_alignment=self.pack_alignment, abi=self.abi).calculate(nested_members)
             if struct_align > self.max_alignment:
                 self.max_alignment = struct_align
             self._add_padding_if_needed(struct_align)
@@ -334,12 +406,11 @@ class StructLayoutCalculator(BaseLayoutCalculator):
 class UnionLayoutCalculator(BaseLayoutCalculator):
     """Calculate memory layout for a C union."""
 
-    def __init__(self, pack_alignment: Optional[int] = None):
-        super().__init__(pack_alignment=pack_alignment)
+    def __init__(self, pack_alignment: Optional[int] = None, abi: Optional[TargetABI] = None):
+        super().__init__(pack_alignment=pack_alignment, abi=abi)
 
     def _get_type_size_and_align(self, mtype: str) -> Tuple[int, int]:
-        # Resolve via central registry to reflect runtime pointer mode overrides
-        info = get_type_info(mtype)
+        info = self.abi.type_info(mtype)
         return info["size"], info["align"]
 
     def calculate(self, members: List[Union[Tuple[str, str], dict]]):
@@ -0,0 +1,186 @@
+"""Content-addressed, byte-bounded cache of struct layouts.
+
+``StructPresenter._make_cache_key`` used to sort the members by name, so two
+structs with the same members in a different order shared one entry (and the
+wrong layout), and the LRU only counted entries no matter how large each
+layout was. ``LayoutCache`` instead:
+
+- keys entries by ``layout_key``: a BLAKE2 digest of the members *in order*
+  plus pack alignment, the type registry generation and any extra parameter
+  (e.g. the manual ``total_size``), so the key is O(n) to build and small to keep;
+- clears itself when the type registry changes (pointer mode, custom types,
+  aliases), since every cached size may be stale;
+- bounds both the entry count and the estimated byte size of the cached
+  layouts, evicting least recently used entries first;
+- counts hits, misses, evictions and bytes for the Debug tab.
+
+The model keeps one instance (``StructModel.layout_cache``) for the import
+path, and the presenter uses the same instance for manual layouts. The import
+path may run on the background loader thread, so lookups and stores take a lock.
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+from .types import REGISTRY
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _member_text(member):
+    if isinstance(member, dict):
+        # 成員順序保留；單一成員內的欄位排序以免 dict 插入順序影響 key
+        return repr(sorted(member.items(), key=lambda kv: kv[0]))
+    return repr(member)  # tuple / AST dataclass：repr 含所有欄位（含巢狀成員）
+
+
+def layout_key(members, pack_alignment=None, extra=None):
+    """``(digest, pack, registry generation, extra)``；成員順序不同即為不同 key。"""
+    digest = hashlib.blake2b(digest_size=16)
+    for member in members or ():
+        digest.update(_member_text(member).encode("utf-8", "surrogatepass"))
+        digest.update(b"\x00")
+    return (digest.hexdigest(), pack_alignment, REGISTRY.generation, extra)
+
+
+def estimate_layout_bytes(value):
+    """估算快取值（layout list，或 ``(layout, total, align)``）佔用的 bytes。"""
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(estimate_layout_bytes(v) for v in value)
+    if not isinstance(value, list):
+        return sys.getsizeof(value)
+    total = sys.getsizeof(value)
+    for item in value:
+        fields = item if isinstance(item, dict) else getattr(item, "__dict__", None)
+        total += sys.getsizeof(item)
+        if fields is None:
+            continue
+        if fields is not item:
+            total += sys.getsizeof(fields)
+        for v in fields.values():
+            if isinstance(v, str):
+                total += sys.getsizeof(v)  # 小整數/bool 為共享物件，不計
+    return total
+
+
+class LayoutCache(OrderedDict):
+    """LRU ``key -> layout`` mapping bounded by entry count and estimated bytes."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, registry=REGISTRY):
+        super().__init__()
+        self._lock = threading.RLock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizes = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_hit = None
+        self.last_evict = None
+        self.invalidations = 0
+        if registry is not None:
+            registry.subscribe(self._on_types_changed)
+
+    def _on_types_changed(self, registry):
+        with self._lock:
+            if len(self):
+                self.invalidations += 1
+            self.clear()
+
+    # OrderedDict 介面：直接指派/刪除也同步 bytes 統計
+    def __setitem__(self, key, value):
+        if key in self._sizes:
+            self.bytes -= self._sizes[key]
+        size = estimate_layout_bytes(value)
+        self._sizes[key] = size
+        self.bytes += size
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.bytes -= self._sizes.pop(key, 0)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self, last=True):
+        key = next(reversed(self)) if last else next(iter(self))
+        return key, self.pop(key)
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def lookup(self, key):
+        """命中時回傳快取值並移到最新；未命中回傳 None（不計 miss，由 ``store`` 計）。"""
+        with self._lock:
+            if self.max_entries <= 0 or key not in self:
+                return None
+            self.hits += 1
+            self.move_to_end(key)
+            self.last_hit = key
+            return OrderedDict.__getitem__(self, key)
+
+    def store(self, key, value):
+        """記錄一次 miss 並存入 ``value``（超過上限時淘汰最舊項目）。"""
+        with self._lock:
+            self.misses += 1
+            if self.max_entries <= 0:
+                self.clear()
+                return value
+            self[key] = value
+            self.move_to_end(key)
+            self.evict()
+            return value
+
+    def get_or_compute(self, key, compute):
+        value = self.lookup(key)
+        if value is None:
+            value = self.store(key, compute())
+        return value
+
+    def evict(self):
+        """淘汰最舊項目直到符合 entry 與 byte 上限（最新一筆即使超過 bytes 也保留）。"""
+        with self._lock:
+            while len(self) > max(self.max_entries, 0) or (len(self) > 1 and self.bytes > self.max_bytes):
+                key, _ = self.popitem(last=False)
+                self.evictions += 1
+                self.last_evict = key
+            if self.max_entries <= 0:
+                self.clear()
+
+    def resize(self, max_entries=None, max_bytes=None):
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self.evict()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
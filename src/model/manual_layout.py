@@ -0,0 +1,163 @@
+"""Incremental layout for manual struct members.
+
+The manual tab edits a flat list of ``{name, type, bit_size}`` rows and used to
+re-run ``calculate_layout`` over every row on each keystroke.
+``IncrementalManualLayout`` keeps the ``StructLayoutCalculator`` state *before*
+each row (``LayoutState`` from ``snapshot_state``, plus the number of layout
+items the row produced).
+When rows change, it restores the checkpoint of the first changed row and
+lays out only that row and the rows after it; the layout prefix (and its
+dicts) is reused as is. Once the old suffix is reached, an equal state (or one
+whose offset differs by a multiple of the struct alignment) lets the old suffix
+be spliced back, shifted if needed. Final padding is computed on a copy of the state so
+that appending a row does not have to undo it.
+"""
+
+from .layout import StructLayoutCalculator, TYPE_INFO
+from .types import REGISTRY
+
+
+def _item_dict(item):
+    # 等同 dataclasses.asdict(LayoutItem)，但不做遞迴 deepcopy（欄位皆為純量）
+    return {
+        "name": item.name, "type": item.type, "size": item.size, "offset": item.offset,
+        "is_bitfield": item.is_bitfield, "bit_offset": item.bit_offset, "bit_size": item.bit_size,
+    }
+
+
+def member_signature(member):
+    """``(name, type, bit_size)`` of a manual member (dict or ``(type, name)`` tuple)."""
+    if isinstance(member, tuple) and len(member) == 2:
+        return (member[1], member[0], 0)
+    return (member.get("name", ""), member.get("type", ""), member.get("bit_size", 0))
+
+
+def convert_manual_member(signature):
+    """與 ``StructModel._convert_to_cpp_members`` 相同的轉換；不支援的型別回傳 None。"""
+    name, type_name, bit_size = signature
+    if not type_name or type_name not in TYPE_INFO:
+        return None
+    if bit_size > 0:
+        return {"type": type_name, "name": name, "is_bitfield": True, "bit_size": bit_size}
+    return {"type": type_name, "name": name, "is_bitfield": False}
+
+
+class IncrementalManualLayout:
+    """Layout of manual members, recomputed from the first changed row."""
+
+    def __init__(self, pack_alignment=None, abi=None):
+        self.pack_alignment = pack_alignment
+        self.abi = abi
+        self.reset()
+
+    def reset(self):
+        self._calc = StructLayoutCalculator(pack_alignment=self.pack_alignment, abi=self.abi)
+        self._signatures = []
+        self._checkpoints = []  # 第 i 列之前的 calculator 狀態
+        self._counts = []  # 第 i 列產生的 layout 項目數（含其前的 padding）
+        self._dicts = []  # 與 self._calc.layout 對齊的 dict 版本
+        self._end_state = self._calc.snapshot_state()
+        self.layout = []
+        self.total_size = 0
+        self.struct_align = 1
+        self.first_changed = 0
+        self.recomputed = 0  # 最近一次 update 重新計算的列數
+        self._generation = REGISTRY.generation
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def update(self, members):
+        """回傳 ``members`` 的 layout（list of dict），只重算第一個變動列之後的部分。"""
+        return self.update_signatures([member_signature(m) for m in members])
+
+    def update_signatures(self, signatures, start=None, suffix=None):
+        """以 ``member_signature`` 清單更新。
+
+        ``start``/``suffix`` 為呼叫端已知的共同前綴/後綴長度（省去比對）。
+        重算到共同後綴時，若 calculator 狀態與舊的 checkpoint 相同，後綴的
+        layout 直接沿用（例如改名、不影響對齊的改型別）；若只差一個最大對齊
+        的整數倍 offset（例如刪除/插入一個成員），後綴只平移 offset、不重算。
+        """
+        if REGISTRY.generation != self._generation:
+            self.reset()  # 型別大小改變（pointer mode、custom type），前綴不可重用
+            start = suffix = None
+        old = self._signatures
+        n_old, n_new = len(old), len(signatures)
+        common = min(n_old, n_new)
+        k = start if start is not None else 0
+        if start is None:
+            while k < common and old[k] == signatures[k]:
+                k += 1
+        k = min(k, common)
+        self.first_changed = k
+        if k == n_old == n_new:
+            self.recomputed = 0
+            return self.layout
+        tail_len = suffix
+        if tail_len is None:
+            tail_len = 0
+            while tail_len < common - k and old[n_old - 1 - tail_len] == signatures[n_new - 1 - tail_len]:
+                tail_len += 1
+        tail_len = min(tail_len, common - k)
+        calc = self._calc
+        old_checkpoints, old_counts, old_end, old_dicts = self._checkpoints, self._counts, self._end_state, self._dicts
+        try:
+            calc.restore_state(old_checkpoints[k] if k < n_old else old_end)
+            self._dicts = old_dicts[:sum(old_counts[:k])]
+            self._signatures = old[:k]
+            self._checkpoints = old_checkpoints[:k]
+            self._counts = old_counts[:k]
+            stop = n_new - tail_len  # 新清單中共同後綴的起點
+            shift = n_old - n_new
+            j = k
+            while j < n_new:
+                if j >= stop and self._splice_suffix(signatures, j, j + shift, old_checkpoints, old_counts, old_end, old_dicts):
+                    break
+                self._checkpoints.append(calc.snapshot_state())
+                self._signatures.append(signatures[j])
+                member = convert_manual_member(signatures[j])
+                if member is not None:
+                    calc.add_member(member)
+                # calculator 只負責追加項目，轉成 dict 後即可清空
+                self._counts.append(len(calc.layout))
+                self._dicts.extend(_item_dict(item) for item in calc.layout)
+                calc.layout.clear()
+                j += 1
+            self.recomputed = j - k
+            self._end_state = calc.snapshot_state()
+            # final padding 只在暫時狀態上計算，不寫入 checkpoint
+            padding, self.total_size, self.struct_align = calc.finalize()
+            tail = [_item_dict(item) for item in padding]
+            calc.layout.clear()
+            calc.restore_state(self._end_state)
+        except Exception:
+            self.reset()
+            raise
+        self.layout = self._dicts + tail
+        return self.layout
+
+    def _splice_suffix(self, signatures, j, old_j, old_checkpoints, old_counts, old_end, old_dicts):
+        """新第 ``j`` 列（= 舊第 ``old_j`` 列）之前的狀態若與舊狀態相容，接回舊後綴並回傳 True。"""
+        delta = self._calc.snapshot_state().offset_delta(old_checkpoints[old_j], old_end.max_alignment)
+        if delta is None:
+            return False
+        begin = sum(old_counts[:old_j])
+        checkpoints = old_checkpoints[old_j:]
+        end = old_end
+        dicts = old_dicts[begin:]
+        if delta:
+            dicts = [{**d, "offset": d["offset"] + delta} for d in dicts]
+            checkpoints = [c.shifted(delta) for c in checkpoints]
+            end = end.shifted(delta)
+        self._dicts.extend(dicts)
+        self._signatures.extend(signatures[j:])
+        self._checkpoints.extend(checkpoints)
+        self._counts.extend(old_counts[old_j:])
+        self._calc.restore_state(end)
+        return True
+
+    def member_items(self, index):
+        """第 ``index`` 列產生的 layout 項目（含其前的 padding）。"""
+        start = sum(self._counts[:index])
+        return self._dicts[start:start + self._counts[index]]
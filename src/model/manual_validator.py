@@ -0,0 +1,184 @@
+"""Incremental validation for manual struct definitions.
+
+``StructModel.validate_manual_struct`` used to re-check every member type,
+find duplicate names with ``names.count(x)`` inside a loop and run a full
+``calculate_layout`` on each change. ``ManualStructValidator`` keeps:
+
+- the per-member type/bit_size error messages (and how many members have any);
+- a name -> count multiset plus the set of duplicated names;
+- an ``IncrementalManualLayout`` (prefix layout), updated from the first
+  changed member with the common prefix/suffix already known.
+
+Changes arrive as ``add`` / ``remove`` / ``rename`` / ``retype`` events;
+``diff(members)`` derives them from a new member list by trimming the common
+prefix and suffix, so one edit costs O(changed members) plus the comparison.
+"""
+
+from collections import Counter
+
+from .layout import TYPE_INFO
+from .manual_layout import IncrementalManualLayout, member_signature
+
+BITFIELD_TYPES = ("int", "unsigned int", "char", "unsigned char")
+
+
+def member_type_errors(signature):
+    """單一成員的型別 / bit_size 錯誤訊息（與 ``_validate_member_types`` 相同）。"""
+    name, type_name, bit_size = signature
+    errors = []
+    if not type_name:
+        errors.append(f"member '{name}' 必須指定型別")
+    elif type_name not in TYPE_INFO:
+        errors.append(f"member '{name}' 不支援的型別: {type_name}")
+    valid_bits = isinstance(bit_size, int)
+    if not valid_bits or bit_size < 0:
+        errors.append(f"member '{name}' bit_size 需為 0 或正整數")
+    if valid_bits and bit_size > 0 and type_name not in BITFIELD_TYPES:
+        errors.append(f"member '{name}' bitfield 只支援 int/unsigned int/char/unsigned char")
+    return errors
+
+
+class ManualStructValidator:
+    """Validation state of a manual struct, updated by member events."""
+
+    def __init__(self, abi=None):
+        self.abi = abi  # TargetABI；None 時依全域預設
+        self.reset()
+
+    def reset(self):
+        self.signatures = []
+        self._type_errors = []  # 與 signatures 對齊；無錯誤時為 None
+        self._invalid = 0
+        self._names = Counter()
+        self._duplicates = set()
+        self.layout_engine = IncrementalManualLayout(abi=self.abi)
+        self._dirty_start = 0  # 相對 layout_engine 上次計算的共同前綴長度
+        self._dirty_suffix = 0  # 相對 layout_engine 上次計算的共同後綴長度
+
+    def __len__(self):
+        return len(self.signatures)
+
+    # ------------------------------------------------------------------ events
+    def _add_name(self, name):
+        if name:
+            self._names[name] += 1
+            if self._names[name] == 2:
+                self._duplicates.add(name)
+
+    def _remove_name(self, name):
+        if name:
+            count = self._names[name] - 1
+            if count <= 0:
+                del self._names[name]
+            else:
+                self._names[name] = count
+            if count == 1:
+                self._duplicates.discard(name)
+
+    def _set_type_errors(self, index, signature):
+        errors = member_type_errors(signature) or None
+        old = self._type_errors[index]
+        self._invalid += (errors is not None) - (old is not None)
+        self._type_errors[index] = errors
+
+    def _touch(self, index, after):
+        """記錄 ``index`` 已變動；``after`` 為其後未變動的成員數。"""
+        self._dirty_start = min(self._dirty_start, index)
+        self._dirty_suffix = min(self._dirty_suffix, after)
+
+    def add(self, index, signature):
+        self.signatures.insert(index, signature)
+        self._type_errors.insert(index, None)
+        self._set_type_errors(index, signature)
+        self._add_name(signature[0])
+        self._touch(index, len(self.signatures) - index - 1)
+
+    def remove(self, index):
+        signature = self.signatures.pop(index)
+        if self._type_errors.pop(index) is not None:
+            self._invalid -= 1
+        self._remove_name(signature[0])
+        self._touch(index, len(self.signatures) - index)
+
+    def rename(self, index, name):
+        old = self.signatures[index]
+        if old[0] == name:
+            return
+        self._remove_name(old[0])
+        self._add_name(name)
+        signature = (name, old[1], old[2])
+        self.signatures[index] = signature
+        self._set_type_errors(index, signature)  # 錯誤訊息內含名稱
+        self._touch(index, len(self.signatures) - index - 1)
+
+    def retype(self, index, type_name, bit_size=None):
+        old = self.signatures[index]
+        signature = (old[0], type_name, old[2] if bit_size is None else bit_size)
+        if signature == old:
+            return
+        self.signatures[index] = signature
+        self._set_type_errors(index, signature)
+        self._touch(index, len(self.signatures) - index - 1)
+
+    def apply(self, events):
+        handlers = {"add": self.add, "remove": self.remove, "rename": self.rename, "retype": self.retype}
+        for kind, *args in events:
+            handlers[kind](*args)
+
+    def diff(self, members):
+        """由新的成員清單推得事件：``("add", i, sig)``、``("remove", i)``、``("rename", i, name)``、``("retype", i, type, bits)``。"""
+        new = [member_signature(m) for m in members]
+        old = self.signatures
+        n_old, n_new = len(old), len(new)
+        common = min(n_old, n_new)
+        start = 0
+        while start < common and old[start] == new[start]:
+            start += 1
+        tail = 0
+        while tail < common - start and old[n_old - 1 - tail] == new[n_new - 1 - tail]:
+            tail += 1
+        old_mid, new_mid = old[start:n_old - tail], new[start:n_new - tail]
+        events = []
+        if len(old_mid) == len(new_mid):
+            for offset, (before, after) in enumerate(zip(old_mid, new_mid)):
+                index = start + offset
+                if before[0] != after[0]:
+                    events.append(("rename", index, after[0]))
+                if before[1:] != after[1:]:
+                    events.append(("retype", index, after[1], after[2]))
+            return events
+        events.extend(("remove", start) for _ in old_mid)
+        events.extend(("add", start + offset, sig) for offset, sig in enumerate(new_mid))
+        return events
+
+    def sync(self, members):
+        """套用 ``diff(members)``，回傳事件清單。"""
+        events = self.diff(members)
+        self.apply(events)
+        return events
+
+    # ------------------------------------------------------------------ results
+    def layout(self):
+        """目前成員的 layout（list of dict），只重算變動的部分。"""
+        layout = self.layout_engine.update_signatures(
+            self.signatures, start=self._dirty_start, suffix=self._dirty_suffix)
+        self._dirty_start = self._dirty_suffix = len(self.signatures)
+        return layout
+
+    def errors(self, total_size):
+        errors = []
+        if self._invalid:
+            errors.extend(e for errs in self._type_errors if errs for e in errs)
+        errors.extend(f"成員名稱 '{n}' 重複" for n in sorted(self._duplicates))
+        if not isinstance(total_size, int) or total_size <= 0:
+            errors.append("結構體大小需為正整數")
+        if not errors:
+            self.layout()
+            layout_size = self.layout_engine.total_size
+            if layout_size > total_size:
+                errors.append(f"Layout 總長度 ({layout_size} bytes) 超過指定 struct 大小 ({total_size} bytes)")
+        return errors
+
+    def validate(self, members, total_size):
+        self.sync(members)
+        return self.errors(total_size)
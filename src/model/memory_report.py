@@ -0,0 +1,226 @@
+"""Memory footprint report for a loaded struct.
+
+Two complementary views of where memory goes when a large header is loaded:
+
+- ``StageMemoryTracker`` observes the stage spans of ``metrics.METRICS``
+  (header read, tokenize, symbol collection, layout, decode, display nodes,
+  context validation, tree render, CSV write). While tracking it takes a
+  ``tracemalloc`` snapshot before and after each outermost stage and keeps
+  the net allocated bytes, the peak and the top allocation sites per stage.
+  Snapshots are process-wide, so allocations of other threads running at
+  the same time are attributed to the current stage.
+- ``deep_sizeof`` estimates the retained size of an object graph
+  (``sys.getsizeof`` over reachable containers, dataclasses and
+  ``__slots__`` objects, each object counted once per root);
+  ``object_sizes`` applies it to ``StructModel.ast``, ``layout``, the
+  ``member_*`` maps, display nodes and the presenter ``context``.
+
+``measure_header(path)`` runs load -> decode -> display nodes (-> context
+push with a presenter class) under the tracker on a fresh model and is run by
+``tools/memory_report.py``; the Debug tab only reports ``object_sizes`` of the
+live objects (replaying the load on the Tk thread would freeze the UI). Both
+format the result with ``format_memory_report``.
+"""
+
+import sys
+import threading
+import tracemalloc
+import types
+
+from . import metrics as _metrics_module
+from .metrics import METRICS
+
+TOP_SITES = 10
+
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None), range, memoryview)
+_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+         types.MethodType, types.CodeType, types.FrameType, threading.Thread)
+
+
+def _skip(obj):
+    if isinstance(obj, _SKIP):
+        return True
+    module = getattr(type(obj), "__module__", "") or ""
+    return module.startswith("tkinter") or module.startswith("_thread")
+
+
+def deep_sizeof(obj, seen=None):
+    """估算 ``obj`` 可達物件的總 bytes（同一物件只計一次；跳過 module、型別、函式與 Tk 物件）。"""
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or _skip(current):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, _ATOMIC):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for cls in type(current).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if isinstance(slot, str) and hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+def object_sizes(model, presenter=None, view=None):
+    """``{名稱: 估算 bytes}``：model 的 AST、layout、member_* maps 等與 presenter context。"""
+    sizes = {
+        "ast": deep_sizeof(getattr(model, "ast", None)),
+        "layout": deep_sizeof(getattr(model, "layout", None)),
+        "member_values": deep_sizeof(getattr(model, "member_values", None)),
+        "member_numeric_values": deep_sizeof(getattr(model, "member_numeric_values", None)),
+        "member_hex_raws": deep_sizeof(getattr(model, "member_hex_raws", None)),
+        "display_nodes": deep_sizeof(getattr(model, "_display_cache", None)),
+        "layout_cache": deep_sizeof(getattr(model, "layout_cache", None)),
+    }
+    if presenter is not None:
+        context = getattr(presenter, "context", None) or {}
+        history = (context.get("debug_info") or {}).get("context_history")
+        sizes["context"] = deep_sizeof(context)
+        sizes["context_history"] = deep_sizeof(history)
+    tree = getattr(view, "member_tree", None) if view is not None else None
+    if tree is not None:
+        try:
+            sizes["treeview_rows"] = len(tree.get_children())  # Tk 端記憶體無法估算，僅列出列數
+        except Exception:
+            pass
+    return sizes
+
+
+class StageMemoryTracker:
+    """Metrics observer that records tracemalloc deltas per outermost stage span."""
+
+    def __init__(self, registry=METRICS, top=TOP_SITES, frames=1):
+        self.registry = registry
+        self.top = top
+        self.frames = frames
+        self.stages = {}
+        self._depth = 0
+        self._before = None
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self.registry.add_observer(self)
+        return self
+
+    def stop(self):
+        self.registry.remove_observer(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    @staticmethod
+    def _filters():
+        # 排除 tracemalloc 本身與 metrics 記錄樣本的配置
+        return (tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, _metrics_module.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<unknown>"))
+
+    def stage_started(self, name):
+        with self._lock:
+            self._depth += 1
+            if self._depth > 1 or not tracemalloc.is_tracing():
+                return  # 巢狀 stage 歸入最外層
+            tracemalloc.reset_peak()
+            self._before = (tracemalloc.take_snapshot().filter_traces(self._filters()),
+                            tracemalloc.get_traced_memory()[0])
+
+    def stage_finished(self, name, seconds):
+        with self._lock:
+            self._depth -= 1
+            if self._depth > 0 or self._before is None:
+                return
+            before_snapshot, before_current = self._before
+            self._before = None
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(self._filters())
+            sites = [
+                {"site": str(stat.traceback[0]) if stat.traceback else "?",
+                 "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in after.compare_to(before_snapshot, "lineno")[:self.top]
+                if stat.size_diff
+            ]
+            entry = self.stages.setdefault(name, {"count": 0, "net_bytes": 0, "last_net_bytes": 0,
+                                                  "peak_bytes": 0, "top_sites": []})
+            entry["count"] += 1
+            entry["net_bytes"] += current - before_current
+            entry["last_net_bytes"] = current - before_current
+            entry["peak_bytes"] = max(entry["peak_bytes"], peak - before_current)
+            entry["top_sites"] = sites
+
+    def report(self):
+        return {name: dict(entry) for name, entry in self.stages.items()}
+
+
+def measure_header(file_path, target_name=None, hex_data=None, byte_order="little",
+                   presenter_cls=None, top=TOP_SITES):
+    """以新的 model 執行 load、decode、display nodes（有 ``presenter_cls`` 時再 push context），回傳報告 dict。"""
+    from .struct_model import StructModel
+
+    presenter = None
+    with StageMemoryTracker(top=top) as tracker:
+        model = StructModel()
+        model.load_struct_from_file(file_path, target_name=target_name)
+        model.parse_hex_data(hex_data or "", byte_order)
+        model.get_display_nodes("tree")
+        if presenter_cls is not None:
+            presenter = presenter_cls(model)
+            presenter.push_context(immediate=True)
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+    return {
+        "file_path": file_path,
+        "struct_name": model.struct_name,
+        "total_size": model.total_size,
+        "layout_items": len(model.layout or []),
+        "traced_current": traced_current,
+        "traced_peak": traced_peak,
+        "stages": tracker.report(),
+        "objects": object_sizes(model, presenter),
+    }
+
+
+def _kib(n):
+    return f"{n / 1024:,.1f} KiB"
+
+
+def format_memory_report(report):
+    lines = []
+    if report.get("file_path"):
+        lines.append(f"Memory report: {report['file_path']} ({report.get('struct_name')}, "
+                     f"{report.get('layout_items', 0)} layout items)")
+    if "traced_peak" in report:
+        lines.append(f"tracemalloc current/peak: {_kib(report['traced_current'])} / {_kib(report['traced_peak'])}")
+    stages = report.get("stages") or {}
+    if stages:
+        lines.append("Stages: net / peak")
+        for name, entry in stages.items():
+            lines.append(f"  {name}: {_kib(entry['net_bytes'])} / {_kib(entry['peak_bytes'])}")
+            for site in entry["top_sites"][:3]:
+                lines.append(f"      {site['size_diff']:+,} B  {site['site']}")
+    objects = report.get("objects") or {}
+    if objects:
+        lines.append("Objects (deep size estimate):")
+        for name, size in objects.items():
+            lines.append(f"  {name}: {size if name == 'treeview_rows' else _kib(size)}")
+    return "\n".join(lines)
@@ -0,0 +1,227 @@
+"""Stage-level timing metrics.
+
+The only timing we used to keep was ``StructPresenter._last_layout_time`` for
+the manual layout path. ``MetricsRegistry`` records named spans instead:
+
+- ``with METRICS.span("layout"): ...`` (or the ``timed`` decorator) measures a
+  stage with ``time.perf_counter``; one lock-protected update per span, so the
+  overhead is a few hundred nanoseconds;
+- ``METRICS.start(name)`` opens a span that is recorded when ``finish()`` is
+  called, for work split across ``after()`` callbacks (tree rendering);
+  dropping it without ``finish()`` records nothing;
+- per stage it keeps count, total, max and last duration plus the most recent
+  ``sample_size`` samples, from which p50/p95 are computed on ``snapshot()``;
+- ``to_json()`` / ``dump_json(path)`` export the snapshot for dashboards;
+- observers (``add_observer``) get ``stage_started(name)`` /
+  ``stage_finished(name, seconds)`` around every span, e.g. the tracemalloc
+  tracker in ``memory_report``. Without observers spans skip the callbacks;
+  open spans from ``start`` never notify observers (other stages run while
+  they are open).
+
+``METRICS`` is the process-wide registry used by the model, presenter, CSV
+export and view; ``STRUCT_METRICS=0`` disables recording.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# 內建 stage 名稱（依處理流程排序，Debug tab 依此順序顯示）
+HEADER_READ = "header_read"
+TOKENIZE = "tokenize"
+SYMBOL_COLLECTION = "symbol_collection"
+LAYOUT = "layout"
+DECODE = "decode"
+DISPLAY_NODES = "display_nodes"
+CONTEXT_VALIDATION = "context_validation"
+TREE_RENDER = "tree_render"
+CSV_WRITE = "csv_write"
+STAGES = (HEADER_READ, TOKENIZE, SYMBOL_COLLECTION, LAYOUT, DECODE,
+          DISPLAY_NODES, CONTEXT_VALIDATION, TREE_RENDER, CSV_WRITE)
+
+DEFAULT_SAMPLE_SIZE = 1024
+
+
+def _percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+class StageStats:
+    """Running totals for one stage plus a bounded window of recent samples."""
+
+    __slots__ = ("count", "total", "max", "last", "samples")
+
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.samples = deque(maxlen=sample_size)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.samples.append(seconds)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total": self.total,
+            "p50": _percentile(ordered, 0.50),
+            "p95": _percentile(ordered, 0.95),
+            "max": self.max,
+            "last": self.last,
+        }
+
+
+class _Span:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _ObservedSpan(_Span):
+    __slots__ = ("observers",)
+
+    def __init__(self, registry, name, observers):
+        super().__init__(registry, name)
+        self.observers = observers
+
+    def __enter__(self):
+        for observer in self.observers:
+            observer.stage_started(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.registry.record(self.name, seconds)
+        for observer in reversed(self.observers):
+            observer.stage_finished(self.name, seconds)
+        return False
+
+
+class _OpenSpan:
+    __slots__ = ("registry", "name", "start", "finished")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+        self.start = time.perf_counter()
+        self.finished = False
+
+    def finish(self):
+        """記錄從 ``start`` 到現在的耗時；只記錄一次，回傳秒數（重複呼叫回傳 None）。"""
+        if self.finished:
+            return None
+        self.finished = True
+        seconds = time.perf_counter() - self.start
+        self.registry.record(self.name, seconds)
+        return seconds
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class MetricsRegistry:
+    """Thread-safe ``name -> StageStats`` registry (durations in seconds)."""
+
+    def __init__(self, sample_size=DEFAULT_SAMPLE_SIZE, enabled=True):
+        self.sample_size = sample_size
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._observers = ()
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats(self.sample_size)
+            stats.add(seconds)
+
+    def span(self, name):
+        """``with registry.span(name):`` 量測區塊耗時。"""
+        if self._observers:
+            return _ObservedSpan(self, name, self._observers)
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def start(self, name):
+        """開始跨 callback 的 span，``finish()`` 時才記錄（未 finish 則不記錄）。"""
+        return _OpenSpan(self, name)
+
+    def add_observer(self, observer):
+        with self._lock:
+            if observer not in self._observers:
+                self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        with self._lock:
+            self._observers = tuple(o for o in self._observers if o is not observer)
+
+    def timed(self, name):
+        """Decorator 版 ``span``。"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """``{stage: {count, total, p50, p95, max, last}}``；內建 stage 依流程順序在前。"""
+        with self._lock:
+            items = {name: stats.summary() for name, stats in self._stages.items()}
+        ordered = {name: items.pop(name) for name in STAGES if name in items}
+        ordered.update(sorted(items.items()))
+        return ordered
+
+    def to_json(self, indent=None):
+        return json.dumps({"unit": "seconds", "timestamp": time.time(), "stages": self.snapshot()}, indent=indent)
+
+    def dump_json(self, path, indent=2):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json(indent=indent))
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+
+METRICS = MetricsRegistry(enabled=os.environ.get("STRUCT_METRICS", "1") != "0")
@@ -0,0 +1,172 @@
+"""On-demand cProfile capture of a single load, decode or export.
+
+When a user reports "loading this header is slow" we need a profile from the
+packaged app. ``ProfileCapture`` is armed once (Debug tab toggle, or the
+``STRUCT_PROFILE=path`` environment variable at startup) and then wraps the
+*next* profiled operation in ``cProfile``:
+
+- ``StructModel.read_struct_file`` ("load"), ``parse_hex_data`` /
+  ``decode_bytes`` ("decode") and ``DefaultCsvExportService.export_to_csv``
+  ("export") are decorated with ``PROFILER.profiled(label)``; while disarmed
+  the decorator costs one attribute check;
+- the capture is written to a ``.pstats`` file (``python -m pstats`` or
+  snakeviz can open it) and summarized as a ``ProfileReport`` with the top
+  entries by cumulative time for the Debug tab and the CLI;
+- only one capture runs at a time; nested profiled calls (or calls on other
+  threads during a capture) run unprofiled;
+- a failure while writing or summarizing the capture (e.g. an unwritable
+  ``STRUCT_PROFILE`` path) is logged and kept in ``last_error``; it never
+  replaces the result or exception of the profiled operation.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+TOP_ENTRIES = 30
+
+
+def _resolve_path(path, label):
+    """``path`` 為 None 或目錄時，於該目錄（預設 temp）產生 ``struct_<label>_<時間>.pstats``。
+
+    ``path`` 為檔案時會先建立其上層目錄。
+    """
+    if path and not os.path.isdir(path) and not path.endswith(os.sep):
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        return path
+    if not path:
+        import tempfile
+        path = tempfile.gettempdir()
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, f"struct_{label}_{time.strftime('%Y%m%d_%H%M%S')}.pstats")
+
+
+class ProfileReport:
+    """Summary of one capture: label, pstats path, wall time and top cumulative entries."""
+
+    def __init__(self, label, path, elapsed, entries):
+        self.label = label
+        self.path = path
+        self.elapsed = elapsed
+        self.entries = entries  # [{"function", "ncalls", "tottime", "cumtime"}, ...]
+
+    @classmethod
+    def from_profile(cls, label, path, elapsed, profile, top=TOP_ENTRIES):
+        import pstats
+        stats = pstats.Stats(profile)
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _callers) in stats.stats.items():
+            location = func if filename == "~" else f"{os.path.basename(filename)}:{line}({func})"
+            ncalls = str(nc) if cc == nc else f"{nc}/{cc}"
+            rows.append({"function": location, "ncalls": ncalls, "tottime": tt, "cumtime": ct})
+        rows.sort(key=lambda r: r["cumtime"], reverse=True)
+        return cls(label, path, elapsed, rows[:top])
+
+    def format(self):
+        lines = [f"Profile [{self.label}] {self.elapsed * 1000:.1f} ms -> {self.path}",
+                 f"{'ncalls':>12} {'tottime':>9} {'cumtime':>9}  function"]
+        for r in self.entries:
+            lines.append(f"{r['ncalls']:>12} {r['tottime']:9.4f} {r['cumtime']:9.4f}  {r['function']}")
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {"label": self.label, "path": self.path, "elapsed": self.elapsed, "entries": list(self.entries)}
+
+
+class ProfileCapture:
+    """One-shot cProfile capture armed from the Debug tab, env var or CLI."""
+
+    def __init__(self, top=TOP_ENTRIES):
+        self.top = top
+        self._lock = threading.Lock()
+        self._armed = False
+        self._path = None
+        self._active = False
+        self.last_report = None
+        self.last_error = None
+
+    @property
+    def armed(self):
+        return self._armed
+
+    def arm(self, path=None):
+        """下一個 load / decode / export 以 cProfile 執行；``path`` 為 .pstats 檔或目錄。"""
+        with self._lock:
+            self._armed = True
+            self._path = path
+
+    def disarm(self):
+        with self._lock:
+            self._armed = False
+            self._path = None
+
+    def _claim(self, force):
+        """取得 capture 權；回傳 (是否取得, arm 時指定的路徑)。"""
+        with self._lock:
+            if self._active or not (force or self._armed):
+                return False, None
+            path = self._path if self._armed else None
+            if not force:
+                self._armed = False
+                self._path = None
+            self._active = True
+            return True, path
+
+    def _release(self):
+        with self._lock:
+            self._active = False
+
+    @contextmanager
+    def capture(self, label, path=None, force=False):
+        """Profile 區塊；``force`` 時不需 arm（CLI 用）。未 arm 或已有 capture 進行中則直接執行。"""
+        claimed, armed_path = self._claim(force)
+        if not claimed:
+            yield None
+            return
+        import cProfile  # 僅實際 capture 時載入，不影響啟動時間
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+        except ValueError:  # 其他 profiler（如 debugger）已啟用
+            self._release()
+            yield None
+            return
+        try:
+            yield profile
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            try:
+                out = _resolve_path(path or armed_path, label)
+                profile.dump_stats(out)
+                self.last_report = ProfileReport.from_profile(label, out, elapsed, profile, self.top)
+                self.last_error = None
+            except Exception as e:  # 診斷用途，不可讓被 profile 的操作失敗
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning("Failed to save %s profile: %s", label, self.last_error)
+            finally:
+                self._release()
+
+    def profiled(self, label):
+        """Decorator：arm 之後的下一次呼叫以 cProfile 執行。"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self._armed:
+                    return func(*args, **kwargs)
+                with self.capture(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+PROFILER = ProfileCapture()
+if os.environ.get("STRUCT_PROFILE"):
+    PROFILER.arm(os.environ["STRUCT_PROFILE"])
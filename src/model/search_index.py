@@ -0,0 +1,494 @@
+"""N-gram index over display nodes for search / filter.
+
+``on_search`` / ``on_filter`` used to walk the whole node tree and lower-case
+every label on each keystroke. ``NodeSearchIndex`` flattens the nodes once per
+structure (DFS order) into a ``_WordIndex`` of distinct lower-cased words:
+
+- names: the ``label`` / ``name`` / ``type`` words of every node;
+- paths: the id segment each node adds to its parent's id, split into its
+  leading separator (``.`` / ``[``) and body (``length``, ``3]``). A path
+  query (one containing ``.`` or ``[``) matches a node whose segment contains
+  the query, or whose segment starts the query's tail while its parent's id
+  ends with the head; every descendant of a match matches too, since its id
+  extends the matched id.
+
+``_WordIndex`` keeps trigram posting lists of word ids (``array('I')``) plus
+a list per word-final bigram, so a 1-3 character query is answered from
+posting lists alone and a longer one verifies the words of its rarest trigram
+(or of the previous match while the user keeps typing). Word -> node ordinal
+lists are stored once per table. Labels and id segments mostly share words,
+so each distinct word is gram-indexed once.
+
+Values use a separate prefix index (values sorted with their ordinals) for
+``=value`` queries; ``build_value_index`` rebuilds it from freshly decoded
+nodes and ``set_values`` swaps it in.
+
+Measured on 500k display nodes (benchmark header, one CPU core), the
+structure index takes about 3 s and the value index about 0.3 s to build,
+so the presenter builds both on a background worker when the display nodes
+change rather than on the first keystroke. Selective queries (``in99``,
+``c123``, ``in9.x``, ``=12``) then take 0.1-4 ms; broad queries are bound by
+the size of the result (45-90 ms for 150k-230k matches, 250 ms for ``.``,
+which matches every node). Array range
+children (``LazyChildren``) are not expanded: only range nodes that are
+already materialized are indexed.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import accumulate, chain, repeat
+from operator import add, floordiv, mod, mul
+
+from src.model.array_ranges import LazyChildren
+
+GRAM = 3
+VALUE_PREFIX = "="
+SEPARATOR = "\x00"
+PATH_SEPARATORS = ".["
+_NO_SEPARATOR = 0
+_EMPTY = array("I")
+
+
+class IndexBuildCancelled(Exception):
+    """背景建立索引時 ``is_stale()`` 為真（已有較新的 display nodes）。"""
+
+
+def _check(is_stale):
+    if is_stale is not None and is_stale():
+        raise IndexBuildCancelled()
+
+
+def _add_posting(postings, key, word):
+    lst = postings.get(key)
+    if lst is None:
+        postings[key] = array("I", (word,))
+    elif lst[-1] != word:
+        lst.append(word)
+
+
+class _WordIndex:
+    """Distinct words with trigram and word-final bigram posting lists of word ids."""
+
+    __slots__ = ("words", "grams", "tails", "heads", "_gram_keys", "_tail_keys", "_head_keys")
+
+    def __init__(self, words, is_stale=None):
+        self.words = words
+        blob = SEPARATOR.join(words)
+        # blob 每個位置所屬的 word id（分隔字元算前一個字，跨字的 gram 最後刪除）
+        owner = array("I", chain.from_iterable(map(repeat, range(len(words)), map(add, map(len, words), repeat(1)))))
+        grams = {}
+        get = grams.get
+        for gram, word in zip(map("".join, zip(blob, blob[1:], blob[2:])), owner):
+            lst = get(gram)
+            if lst is None:
+                grams[gram] = array("I", (word,))
+            elif lst[-1] != word:
+                lst.append(word)
+        for gram in [g for g in grams if SEPARATOR in g]:
+            del grams[gram]
+        _check(is_stale)
+        # 字尾兩個字元（不足兩個字元的字即整個字）補上 trigram 涵蓋不到的位置；字首兩個字元供前綴查詢
+        tails, heads = {}, {}
+        for word, text in enumerate(words):
+            if text:
+                _add_posting(tails, text[-2:], word)
+                _add_posting(heads, text[:2], word)
+        self.grams = grams
+        self.tails = tails
+        self.heads = heads
+        self._gram_keys = None  # 前綴 -> trigram，第一次短查詢時建立
+        self._tail_keys = None  # 字元 -> 字尾
+        self._head_keys = None  # 字元 -> 字首
+
+    def _short_keys(self):
+        if self._gram_keys is None:
+            gram_keys, tail_keys = {}, {}
+            for gram in self.grams:
+                gram_keys.setdefault(gram[0], []).append(gram)
+                gram_keys.setdefault(gram[:2], []).append(gram)
+            for tail in self.tails:
+                for ch in set(tail):
+                    tail_keys.setdefault(ch, []).append(tail)
+                if len(tail) == 2:
+                    tail_keys.setdefault(tail, []).append(tail)
+            head_keys = {}
+            for head in self.heads:
+                head_keys.setdefault(head[0], []).append(head)
+            self._gram_keys, self._tail_keys, self._head_keys = gram_keys, tail_keys, head_keys
+        return self._gram_keys, self._tail_keys
+
+    def match(self, query, candidates=None):
+        """包含 ``query`` 的 word id（遞增）；``candidates`` 為已知的超集合（如上一次的結果）。"""
+        n = len(query)
+        if n == GRAM:
+            return self.grams.get(query, _EMPTY)
+        if n < GRAM:
+            # 出現位置若不在字尾兩個字元內，必為某個以 query 開頭的 trigram
+            gram_keys, tail_keys = self._short_keys()
+            grams, tails = self.grams, self.tails
+            found = set()
+            for gram in gram_keys.get(query, ()):
+                found.update(grams[gram])
+            for tail in tail_keys.get(query, ()):
+                found.update(tails[tail])
+            return sorted(found)
+        best = min((self.grams.get(query[i:i + GRAM], _EMPTY) for i in range(n - GRAM + 1)), key=len)
+        if candidates is not None and len(candidates) < len(best):
+            best = candidates
+        words = self.words
+        return [w for w in best if query in words[w]]
+
+    def match_prefix(self, prefix):
+        """以 ``prefix`` 開頭的 word id（遞增）。"""
+        if len(prefix) == 1:
+            self._short_keys()
+            heads = self.heads
+            found = set()
+            for head in self._head_keys.get(prefix, ()):
+                found.update(heads[head])
+            return sorted(found)
+        candidates = self.heads.get(prefix[:2], _EMPTY)
+        if len(prefix) > 2:
+            grams = self.grams.get(prefix[:GRAM], _EMPTY)
+            if len(grams) < len(candidates):
+                candidates = grams
+        words = self.words
+        return [w for w in candidates if words[w].startswith(prefix)]
+
+    def match_suffix(self, suffix):
+        """以 ``suffix`` 結尾的 word id（遞增）。"""
+        words = self.words
+        if len(suffix) <= 2:
+            candidates = self.tails.get(suffix, _EMPTY) if len(suffix) == 2 else self.match(suffix)
+        else:
+            candidates = self.grams.get(suffix[-GRAM:], _EMPTY)
+        return [w for w in candidates if words[w].endswith(suffix)]
+
+
+class _Postings:
+    """word id -> node ordinals (CSR); each word's ordinals are ascending and unique."""
+
+    __slots__ = ("_offsets", "_ordinals")
+
+    def __init__(self, word_ids, owners, word_count, ordinal_count):
+        # (word, ordinal) 編成單一整數排序去重（同一節點的 label 與 type 可能是同一個字）
+        keys = sorted(set(map(add, map(mul, word_ids, repeat(ordinal_count)), owners)))
+        counts = Counter(map(floordiv, keys, repeat(ordinal_count)))
+        self._offsets = array("I", accumulate(map(counts.__getitem__, range(word_count)), initial=0))
+        self._ordinals = array("I", map(mod, keys, repeat(ordinal_count)))
+
+    def count(self, word_ids):
+        """``word_ids`` 對應的節點數（未去重）。"""
+        offsets = self._offsets
+        return sum(offsets[w + 1] - offsets[w] for w in word_ids)
+
+    def ordinals(self, word_ids):
+        """``word_ids`` 對應的節點 ordinal（遞增，不重複）。"""
+        offsets, ordinals = self._offsets, self._ordinals
+        if len(word_ids) == 1:
+            w = word_ids[0]
+            return ordinals[offsets[w]:offsets[w + 1]].tolist()
+        found = set()
+        for w in word_ids:
+            found.update(ordinals[offsets[w]:offsets[w + 1]])
+        return sorted(found)
+
+
+def _materialized(children):
+    return [children[i] for i in sorted(children._items)]
+
+
+def iter_nodes(nodes):
+    """DFS (pre-order) over ``nodes``，yield ``(node, parent ordinal)``；不展開 LazyChildren。"""
+    stack = [(node, -1) for node in reversed(nodes or [])]
+    ordinal = 0
+    while stack:
+        node, parent = stack.pop()
+        yield node, parent
+        children = node.get("children") or []
+        if isinstance(children, LazyChildren):
+            # 只走訪已建立的 range/元素節點，避免為了索引把整個陣列展開
+            children = _materialized(children)
+        stack.extend((child, ordinal) for child in reversed(children))
+        ordinal += 1
+
+
+def _iter_dfs(nodes):
+    """與 ``iter_nodes`` 相同的 DFS 順序，只 yield node（不建立 tuple，減少大樹的 GC 負擔）。"""
+    stack = list(reversed(nodes or []))
+    while stack:
+        node = stack.pop()
+        yield node
+        children = node.get("children")
+        if children:
+            if isinstance(children, LazyChildren):
+                children = _materialized(children)
+            stack.extend(reversed(children))
+
+
+def build_value_index(nodes, ids, positions=None, is_stale=None):
+    """``=value`` 前綴索引：(依 value 排序的 lower-cased value, 對應 ordinal)。
+
+    ``nodes`` 與建立索引時結構相同（decode 後）時，DFS 順序即 ordinal；
+    id 不符的節點才以 ``positions()``（id -> ordinal）查詢。
+    """
+    values, ordinals = [], array("I")
+    lookup = None
+    count = len(ids)
+    for ordinal, node in enumerate(_iter_dfs(nodes)):
+        value = node.get("value")
+        if value in (None, ""):
+            continue
+        if ordinal >= count or ids[ordinal] != node["id"]:
+            if lookup is None:
+                lookup = positions() if positions is not None else {node_id: i for i, node_id in enumerate(ids)}
+            ordinal = lookup.get(node["id"])
+            if ordinal is None:
+                continue
+        values.append(str(value))
+        ordinals.append(ordinal)
+    _check(is_stale)
+    values = SEPARATOR.join(values).lower().split(SEPARATOR) if values else []
+    order = sorted(range(len(values)), key=values.__getitem__)
+    return [values[i] for i in order], array("I", map(ordinals.__getitem__, order))
+
+
+class NodeSearchIndex:
+    """Substring search over display nodes; results are node ids in DFS order.
+
+    ``is_stale`` (optional) is polled between build phases; when it returns
+    true the build stops with ``IndexBuildCancelled``.
+    """
+
+    def __init__(self, nodes, is_stale=None):
+        ids = []
+        parents = array("i")
+        labels, types = [], []
+        names, name_owners = [], array("I")  # 與 label 不同的 name（少見）
+        bodies = []
+        seps = bytearray()
+        path_roots = array("I")  # id 不延伸父節點 id 的節點（如 range 底下的元素）
+        stack = list(reversed(nodes or []))
+        parent_stack = [-1] * len(stack)
+        while stack:
+            node = stack.pop()
+            parent = parent_stack.pop()
+            ordinal = len(ids)
+            node_id = node["id"]
+            ids.append(node_id)
+            parents.append(parent)
+            label, name = node.get("label", ""), node.get("name")
+            labels.append(label)
+            types.append(node.get("type", ""))
+            if name and name != label:
+                names.append(name)
+                name_owners.append(ordinal)
+            sep = _NO_SEPARATOR
+            if parent >= 0:
+                parent_id = ids[parent]
+                size = len(parent_id)
+                if not node_id.startswith(parent_id):
+                    path_roots.append(ordinal)
+                elif node_id[size:size + 1] in (".", "["):
+                    sep = ord(node_id[size])
+                    node_id = node_id[size + 1:]
+            seps.append(sep)
+            bodies.append(node_id)
+            children = node.get("children")
+            if children:
+                if isinstance(children, LazyChildren):
+                    children = _materialized(children)
+                stack.extend(reversed(children))
+                parent_stack.extend(repeat(ordinal, len(children)))
+        _check(is_stale)
+        # 子樹範圍：DFS 順序下 ordinal 的子孫為 [ordinal, ends[ordinal])
+        ends = array("I", range(1, len(ids) + 1))
+        child_counts = array("I", bytes(4 * len(ids)))
+        for ordinal in range(len(ids) - 1, 0, -1):
+            parent = parents[ordinal]
+            if parent >= 0:
+                child_counts[parent] += 1
+                if ends[ordinal] > ends[parent]:
+                    ends[parent] = ends[ordinal]
+        # 名稱與 path 片段共用一份 distinct words；一次 lower 整段再切回，比逐一 lower 快
+        count = len(ids)
+        texts = labels + types + names + bodies
+        lowered = SEPARATOR.join(texts).lower().split(SEPARATOR) if texts else []
+        words = list(dict.fromkeys(lowered))
+        word_id = {word: i for i, word in enumerate(words)}
+        word_ids = array("I", map(word_id.__getitem__, lowered))
+        del texts, lowered, word_id, labels, types, names
+        name_count = 2 * count + len(name_owners)
+        ordinals = array("I", range(count))
+        self._names = _Postings(word_ids[:name_count], ordinals + ordinals + name_owners, len(words), count)
+        self._seg_words = word_ids[name_count:]  # ordinal -> 自己 path 片段的 word id
+        self._segments = _Postings(self._seg_words, ordinals, len(words), count)
+        _check(is_stale)
+        self._words = _WordIndex(words, is_stale)
+        self.ids = ids
+        self.parents = parents
+        self._ends = ends
+        self._child_counts = child_counts
+        self._seps = bytes(seps)
+        self._path_roots = path_roots
+        self._positions = None  # id -> ordinal，value 索引遇到結構不符的節點時才建立
+        self._values = (nodes, None)  # (nodes, (sorted values, ordinals))
+        self._last = (None, None, None)  # (query, kind, (word ids, ordinals))
+
+    def __len__(self):
+        return len(self.ids)
+
+    # ------------------------------------------------------------------ values
+    def positions(self):
+        """id -> ordinal（第一次呼叫時建立）。"""
+        if self._positions is None:
+            self._positions = {node_id: i for i, node_id in enumerate(self.ids)}
+        return self._positions
+
+    def has_values(self, nodes):
+        return self._values[0] is nodes and self._values[1] is not None
+
+    def set_values(self, nodes, value_index):
+        """換上 ``build_value_index(nodes, ...)`` 的結果（decode 後呼叫）。"""
+        self._values = (nodes, value_index)
+        if self._last[1] == "value":
+            self._last = (None, None, None)
+
+    def refresh_values(self, nodes):
+        """記錄最新 decode 的 nodes；尚未建立其 value 索引時，下一次 ``=`` 查詢才同步建立。"""
+        if self._values[0] is not nodes:
+            self.set_values(nodes, None)
+
+    def _search_values(self, prefix):
+        nodes, value_index = self._values
+        if value_index is None:
+            value_index = build_value_index(nodes, self.ids, self.positions)
+            self._values = (nodes, value_index)
+        values, ordinals = value_index
+        i = bisect_left(values, prefix)
+        j = bisect_left(values, prefix + "\U0010ffff", i)
+        return sorted(ordinals[i:j])
+
+    # ------------------------------------------------------------------ paths
+    def _path_hits(self, query):
+        """id 含 ``query`` 且出現位置結束於節點自己片段內的節點（不含子孫）。"""
+        hits = self._segments.ordinals(self._words.match(query))
+        for j, ch in enumerate(query):
+            if ch in PATH_SEPARATORS:
+                hits.extend(self._segment_starts(query[:j], ord(ch), query[j + 1:]))
+        return hits
+
+    def _segment_starts(self, head, sep, body):
+        """片段為 ``sep`` + 以 ``body`` 開頭、且父節點 id 以 ``head`` 結尾的節點。"""
+        words, segments, seps = self._words, self._segments, self._seps
+        if not body and not head:
+            found, i = [], seps.find(sep)
+            while i >= 0:
+                found.append(i)
+                i = seps.find(sep, i + 1)
+            return found
+        tail_words = words.match_prefix(body) if body else None
+        if not head:
+            return [o for o in segments.ordinals(tail_words) if seps[o] == sep]
+        parents = self._ids_ending_with(head)
+        child_counts = self._child_counts
+        # 由父節點往下或由片段往上，取候選較少的一邊
+        if tail_words is None or sum(child_counts[p] for p in parents) <= segments.count(tail_words):
+            found = []
+            ends, seg_words, text = self._ends, self._seg_words, words.words
+            for parent in parents:
+                child = parent + 1
+                while child < ends[parent]:
+                    if seps[child] == sep and (not body or text[seg_words[child]].startswith(body)):
+                        found.append(child)
+                    child = ends[child]
+            return found
+        parent_set = set(parents)
+        node_parents = self.parents
+        return [o for o in segments.ordinals(tail_words) if seps[o] == sep and node_parents[o] in parent_set]
+
+    def _ids_ending_with(self, head):
+        """id 以 ``head`` 結尾的節點。"""
+        if not any(sep in head for sep in PATH_SEPARATORS):
+            # 不含分隔字元時只可能落在自己的片段內
+            return self._segments.ordinals(self._words.match_suffix(head))
+        ids = self.ids
+        return [o for o in self._path_hits(head) if ids[o].lower().endswith(head)]
+
+    def _with_descendants(self, hits):
+        """``hits`` 與其 id 延伸自它們的子孫（跳過 path root 的子樹）。"""
+        ends, roots = self._ends, self._path_roots
+        spans = []
+        for ordinal in hits:
+            start, end = ordinal, ends[ordinal]
+            i = bisect_right(roots, ordinal)
+            while i < len(roots) and roots[i] < end:
+                spans.append((start, roots[i]))
+                start = ends[roots[i]]
+                i = bisect_left(roots, start, i)
+            spans.append((start, end))
+        spans.sort()
+        result = []
+        covered = 0
+        for start, end in spans:
+            if end > covered:
+                result.extend(range(max(start, covered), end))
+                covered = end
+        return result
+
+    # ------------------------------------------------------------------ search
+    def search_ordinals(self, query):
+        query = (query or "").lower()
+        if not query:
+            return []
+        if query.startswith(VALUE_PREFIX):
+            kind = "value"
+        elif any(sep in query for sep in PATH_SEPARATORS):
+            kind = "path"
+        else:
+            kind = "name"
+        last_query, last_kind, last_match = self._last
+        if query == last_query:
+            return last_match[1]
+        if kind == "value":
+            words, result = None, self._search_values(query[len(VALUE_PREFIX):])
+        elif kind == "path":
+            words, result = None, self._with_descendants(self._path_hits(query))
+        else:
+            # 新查詢包含上一次查詢時，只需驗證上一次符合的字
+            candidates = last_match[0] if last_kind == kind and last_query in query else None
+            words = self._words.match(query, candidates)
+            result = self._names.ordinals(words)
+        self._last = (query, kind, (words, result))
+        return result
+
+    def search(self, query):
+        """符合 ``query`` 的 node id（DFS 順序）。"""
+        ids = self.ids
+        return [ids[i] for i in self.search_ordinals(query)]
+
+    def keep_set(self, query):
+        """符合的節點與其所有祖先 id（filter 保留集合）。"""
+        keep = set()
+        parents = self.parents
+        for i in self.search_ordinals(query):
+            while i >= 0 and i not in keep:
+                keep.add(i)
+                i = parents[i]
+        ids = self.ids
+        return {ids[i] for i in keep}
+
+    def filter_nodes(self, nodes, query):
+        """回傳只保留符合節點及其祖先的 node tree 副本。"""
+        keep = self.keep_set(query)
+
+        def prune(node):
+            children = node.get("children") or []
+            if isinstance(children, LazyChildren):
+                children = _materialized(children)
+            kept = [prune(child) for child in children if child["id"] in keep]
+            copy = dict(node)
+            copy["children"] = kept
+            return copy
+        return [prune(node) for node in nodes or [] if node["id"] in keep]
@@ -7,6 +7,16 @@
 from src.model.input_field_processor import InputFieldProcessor
 from .layout import LayoutCalculator, LayoutItem, TYPE_INFO
 from .struct_parser import parse_struct_definition, parse_member_line
+from .array_ranges import ARRAY_FOLD_SIZE, ArrayDescriptor, ArrayRangeBuilder
+from .manual_validator import ManualStructValidator
+from .layout_cache import LayoutCache, layout_key
+from .types import REGISTRY
+from .incremental_decode import IncrementalDecoder, decode_layout_item
+from .metrics import (
+    METRICS, HEADER_READ, TOKENIZE, SYMBOL_COLLECTION, LAYOUT, DECODE, DISPLAY_NODES,
+)
+from .profiling import PROFILER
+from collections import Counter
 from dataclasses import asdict
 import re
 import logging
@@ -41,8 +51,22 @@ def _flatten_legacy_members(members, prefix=""):
             flat.append(m2)
     return flat
 
-def calculate_layout(members, calculator_cls=None, pack_alignment=None):
-    """Calculate the memory layout using the specified calculator class. 支援 legacy union 展平。"""
+class LoadCancelled(Exception):
+    """背景載入被取消（使用者取消或被較新的載入取代）。"""
+
+
+def _make_calculator(calculator_cls, pack_alignment, abi):
+    # 未指定 abi 時沿用舊的建構參數，自訂 calculator 不必接受 abi
+    if abi is None:
+        return calculator_cls(pack_alignment=pack_alignment)
+    return calculator_cls(pack_alignment=pack_alignment, abi=abi)
+
+
+def calculate_layout(members, calculator_cls=None, pack_alignment=None, abi=None):
+    """Calculate the memory layout using the specified calculator class. 支援 legacy union 展平。
+
+    ``abi`` (``TargetABI``) 指定本次計算的目標平台；None 時使用全域預設（pointer mode）。
+    """
     if not members:
         return [], 0, 1
 
@@ -53,21 +77,36 @@ def calculate_layout(members, calculator_cls=None, pack_alignment=None):
     if all(is_ast_member(m) for m in members):
         # 直接傳給 layout calculator，保留 array_dims/nested 等資訊
         calculator_cls = calculator_cls or LayoutCalculator
-        layout_calculator = calculator_cls(pack_alignment=pack_alignment)
+        layout_calculator = _make_calculator(calculator_cls, pack_alignment, abi)
         return layout_calculator.calculate(members)
     else:
         # legacy dict/tuple 格式才展平
         flat_members = _flatten_legacy_members(members)
         calculator_cls = calculator_cls or LayoutCalculator
-        layout_calculator = calculator_cls(pack_alignment=pack_alignment)
+        layout_calculator = _make_calculator(calculator_cls, pack_alignment, abi)
         return layout_calculator.calculate(flat_members)
 
 
 
-import uuid
+def _child_segments(members):
+    """回傳各子節點在 path id 中的片段；匿名成員以 #index 表示，重名時附加 #index。"""
+    segments = []
+    seen = set()
+    for index, child in enumerate(members):
+        segment = getattr(child, "name", None) or f"#{index}"
+        if segment in seen:
+            segment = f"{segment}#{index}"
+        seen.add(segment)
+        segments.append(segment)
+    return segments
+
 
-def ast_to_dict(node, parent_id=None, prefix=""):
-    """遞迴將 AST 物件轉為 V2P API 規範的 dict 結構，id 保證全域唯一"""
+def ast_to_dict(node, parent_id=None, prefix="", segment=None):
+    """遞迴將 AST 物件轉為 V2P API 規範的 dict 結構。
+
+    id 由成員路徑決定（例如 ``Outer.inner.x``），同一 AST 每次轉換結果相同，
+    可用於快取、diff 與 expanded/selected 狀態保存。
+    """
     node_type = getattr(node, "type", None)
     if node_type is None:
         cls_name = node.__class__.__name__
@@ -76,11 +115,13 @@ def ast_to_dict(node, parent_id=None, prefix=""):
         elif cls_name == "UnionDef":
             node_type = "union"
     name = getattr(node, "name", None)
-    # id: parent_id.name.uuid4（保證唯一）
-    base_id = f"{parent_id}.{name}" if parent_id and name else (name or str(uuid.uuid4()))
-    unique_id = f"{base_id}.{uuid.uuid4().hex[:8]}"
+    # id: parent_id.segment（根節點為 struct 名稱）
+    if parent_id:
+        node_id = f"{parent_id}.{segment or name or '#0'}"
+    else:
+        node_id = segment or name or "root"
     base = {
-        "id": unique_id,
+        "id": node_id,
         "name": name,
         "type": node_type,
         "is_struct": node_type == "struct",
@@ -91,15 +132,33 @@ def ast_to_dict(node, parent_id=None, prefix=""):
         "value": getattr(node, "value", None),
         "offset": getattr(node, "offset", None),
         "size": getattr(node, "size", None),
+        "array_dims": list(getattr(node, "array_dims", None) or []),
         "children": [],
     }
     # 巢狀 struct/union
     if hasattr(node, "nested") and node.nested:
-        base["children"] = [ast_to_dict(child, unique_id, prefix=unique_id+".") for child in getattr(node.nested, "members", [])]
+        members = getattr(node.nested, "members", [])
     elif hasattr(node, "members"):
-        base["children"] = [ast_to_dict(child, unique_id, prefix=unique_id+".") for child in node.members]
+        members = node.members
+    else:
+        members = []
+    base["children"] = [
+        ast_to_dict(child, node_id, segment=seg)
+        for child, seg in zip(members, _child_segments(members))
+    ]
     return base
 
+
+def build_node_id_map(nodes):
+    """以 DFS 順序將 display node 的 path id 對應為連續整數（供 View 做緊湊索引）。"""
+    id_map = {}
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        id_map[node["id"]] = len(id_map)
+        stack.extend(reversed(node.get("children", [])))
+    return id_map
+
 # 展平 AST node 為 flat list（for flat mode）
 def flatten_ast_nodes(ast_node):
     result = []
@@ -124,6 +183,29 @@ class StructModel:
         self.member_values = {}  # 新增：存放解析後的 value（字串/顯示用）
         self.member_numeric_values = {}  # 新增：存放解析後的數值（int，用於 hex_value 計算）
         self.member_hex_raws = {}  # 新增：存放解析後的 hex_raw 字串
+        # 顯示節點快取：version 於載入、decode、pointer mode 變更時遞增
+        self.version = 0
+        self.structure_version = 0  # 只在 struct 結構變更時遞增（decode 不變），供搜尋索引重用
+        self._display_cache = {}  # (version, mode) -> (ast, member_values, nodes)
+        self._ast_dict_cache = None  # (version, ast, ast_dict)
+        self._node_id_map_cache = {}  # mode -> (nodes, {path id: int})
+        # 大型陣列以 range 節點折疊顯示；None/0 表示不折疊
+        self.array_fold_size = ARRAY_FOLD_SIZE
+        self._data_bytes = None  # 最近一次 decode 的原始資料（range 預覽與展開時解碼）
+        self._data_byte_order = "little"
+        self._data_layout = None
+        # 目標平台（TargetABI）；None 表示依全域 pointer mode（見 set_target_abi）
+        self.abi = None
+        # 手動 struct：增量驗證（名稱 multiset、逐成員型別檢查）與前綴 layout，編輯時只重算變動部分
+        self.manual_validator = ManualStructValidator()
+        # 以成員內容（依序）+ pack + pointer mode 為 key 的 layout 快取，匯入與手動路徑共用
+        self.layout_cache = LayoutCache()
+        # live decode：保留上一次 bytes 與結果，只重新解碼變動的項目
+        self.live_decoder = IncrementalDecoder()
+        # stage timing（header read / tokenize / layout / decode ...），Debug tab 與 JSON dump 使用
+        self.metrics = METRICS
+        # 型別表（pointer mode、custom type、alias）變更時清除顯示/AST 快取與手動驗證狀態
+        REGISTRY.subscribe(self._on_types_changed)
 
     # 移除 _merge_byte_and_bit_size
     # 完全移除 _convert_legacy_member 及舊格式相容邏輯
@@ -139,77 +221,138 @@ class StructModel:
             if hasattr(obs, "update"):
                 obs.update(event_type, self, **kwargs)
 
+    def set_target_abi(self, abi=None):
+        """之後的 layout（匯入與手動）以 ``abi`` 計算；None 回到全域預設。不影響其他 model。"""
+        self.abi = abi
+        self.manual_validator = ManualStructValidator(abi=abi)
+        self.bump_version()
+
+    def _on_types_changed(self, registry):
+        self.manual_validator.reset()
+        self.bump_version()
+
+    def bump_version(self, structure=True):
+        """遞增 model 版本並清除顯示節點快取（載入、decode、pointer mode 變更時呼叫）。
+
+        decode 只改變值，以 ``structure=False`` 呼叫，``structure_version`` 維持不變。
+        """
+        self.version += 1
+        if structure:
+            self.structure_version += 1
+        self._display_cache.clear()
+        self._ast_dict_cache = None
+        self._node_id_map_cache.clear()
+        return self.version
+
     def set_manual_struct(self, members, total_size):
         # 統一格式：轉換為 C++ 標準型別格式
         self.struct_name = "MyStruct"
         self.members = self._convert_to_cpp_members(members)
-        layout, self.total_size, self.struct_align = calculate_layout(self.members)
+        layout, self.total_size, self.struct_align = calculate_layout(self.members, abi=self.abi)
         # 將 layout 統一轉為 list of dict
         self.layout = [asdict(item) if hasattr(item, '__dataclass_fields__') else dict(item) for item in layout]
         self.manual_struct = {"members": self.members, "total_size": total_size}
+        self.bump_version()
         self._notify_observers("manual_struct_changed")
 
     def load_struct_from_file(self, file_path, target_name=None):
-        with open(file_path, 'r') as f:
+        return self.apply_struct_file(self.read_struct_file(file_path, target_name))
+
+    @PROFILER.profiled("load")
+    def read_struct_file(self, file_path, target_name=None, progress=None):
+        """讀檔、解析並計算 layout，不修改 model 狀態（可在背景執行緒呼叫）。
+
+        ``progress(done, total)`` 於每個頂層定義之後呼叫；callback 拋出
+        ``LoadCancelled`` 即中止載入。回傳值交給 ``apply_struct_file`` 套用。
+        """
+        abi = self.abi  # 背景執行緒：整次載入使用同一個 ABI
+        with self.metrics.span(HEADER_READ), open(file_path, 'r') as f:
             content = f.read()
-        # 保存最後載入的檔案路徑供導出報告/追蹤
-        try:
-            self.last_loaded_file_path = file_path
-        except Exception:
-            pass
-        self.struct_content = content  # 同步保存原始內容供 AST/顯示使用
-        # v17: 收集頂層可用型別名稱供 Presenter/View 下拉
+        loaded = {"file_path": file_path, "content": content, "ast": None}
+        # v17: 收集頂層可用型別名稱供 Presenter/View 下拉；型別表同時供 AST 解析重用
+        known = None
         try:
             from src.model.struct_parser import _collect_known_types
-            known = _collect_known_types(content)
-            self.available_top_level_types = sorted(list(known.keys()))
+            with self.metrics.span(SYMBOL_COLLECTION):
+                known = _collect_known_types(content, progress=progress)
+            loaded["available_top_level_types"] = sorted(list(known.keys()))
+        except LoadCancelled:
+            raise
         except Exception:
-            self.available_top_level_types = []
+            loaded["available_top_level_types"] = []
 
         # 優先使用 AST 解析以支援巢狀 struct/union 與陣列
         try:
             from src.model.struct_parser import parse_c_definition_ast, parse_struct_definition_ast
-            if target_name:
-                definition = parse_struct_definition_ast(content, target_name=target_name)
-            else:
-                definition = parse_c_definition_ast(content)
+            with self.metrics.span(TOKENIZE):
+                if target_name:
+                    definition = parse_struct_definition_ast(content, target_name=target_name, known_types=known)
+                else:
+                    definition = parse_c_definition_ast(content, known_types=known)
         except Exception:
             definition = None
+        if progress is not None:
+            progress(len(content), len(content))
 
         if definition and hasattr(definition, 'name') and hasattr(definition, 'members'):
             # AST 路徑：完整支援巢狀/union/array/bitfield
-            self.struct_name = definition.name
-            self.ast = definition
-            self.members = list(definition.members)
-            pack_alignment = self._extract_top_level_pack_alignment(content, target_name or self.struct_name)
-            self.layout, self.total_size, self.struct_align = calculate_layout(self.members, pack_alignment=pack_alignment)
+            members = list(definition.members)
+            pack_alignment = self._extract_top_level_pack_alignment(content, target_name or definition.name)
+            loaded.update(struct_name=definition.name, ast=definition, members=members)
+            loaded["layout"], loaded["total_size"], loaded["struct_align"] = self._cached_layout(members, pack_alignment, abi)
         else:
             # 回退到 legacy 路徑（僅平面成員，巢狀僅佔位）
             struct_name, members = parse_struct_definition(content)
             if not struct_name or not members:
                 raise ValueError("Could not find a valid struct definition in the file.")
-            self.struct_name = struct_name
-            self.members = self._convert_to_cpp_members(members)
-            self.layout, self.total_size, self.struct_align = calculate_layout(self.members)
-
-        self._notify_observers("file_struct_loaded", file_path=file_path)
+            members = self._convert_to_cpp_members(members)
+            loaded.update(struct_name=struct_name, members=members)
+            with self.metrics.span(LAYOUT):
+                loaded["layout"], loaded["total_size"], loaded["struct_align"] = calculate_layout(members, abi=abi)
+        return loaded
+
+    def apply_struct_file(self, loaded):
+        """套用 ``read_struct_file`` 的結果（主執行緒），遞增版本並通知 observers。"""
+        # 保存最後載入的檔案路徑供導出報告/追蹤
+        self.last_loaded_file_path = loaded["file_path"]
+        self.struct_content = loaded["content"]  # 同步保存原始內容供 AST/顯示使用
+        self.available_top_level_types = loaded["available_top_level_types"]
+        if loaded["ast"] is not None:
+            self.ast = loaded["ast"]
+        self.struct_name = loaded["struct_name"]
+        self.members = loaded["members"]
+        self.layout, self.total_size, self.struct_align = loaded["layout"], loaded["total_size"], loaded["struct_align"]
+        self.bump_version()
+        self._notify_observers("file_struct_loaded", file_path=loaded["file_path"])
         return self.struct_name, self.layout, self.total_size, self.struct_align
 
+    def _cached_layout(self, members, pack_alignment=None, abi=None):
+        """``calculate_layout`` 結果經 ``layout_cache``（重新載入同檔或切換回已看過的 target 時命中）。"""
+        key = layout_key(members, pack_alignment, extra="import" if abi is None else ("import", abi))
+
+        def compute():
+            with self.metrics.span(LAYOUT):
+                return calculate_layout(members, pack_alignment=pack_alignment, abi=abi)
+        return self.layout_cache.get_or_compute(key, compute)
+
     def set_import_target_struct(self, name: str):
         """v17: 切換匯入的根 struct/union 名稱並更新佈局/AST。"""
         if not getattr(self, 'struct_content', None):
             raise ValueError("No struct content loaded to switch target.")
         from src.model.struct_parser import parse_struct_definition_ast
-        definition = parse_struct_definition_ast(self.struct_content, target_name=name)
+        with self.metrics.span(TOKENIZE):
+            definition = parse_struct_definition_ast(self.struct_content, target_name=name)
         if not definition:
             raise ValueError(f"Target struct '{name}' not found.")
         self.struct_name = definition.name
         self.ast = definition
         self.members = list(definition.members)
         pack_alignment = self._extract_top_level_pack_alignment(self.struct_content, name)
-        self.layout, self.total_size, self.struct_align = calculate_layout(self.members, pack_alignment=pack_alignment)
+        self.layout, self.total_size, self.struct_align = self._cached_layout(self.members, pack_alignment, self.abi)
+        self.bump_version()
         self._notify_observers("file_struct_loaded", file_path=None)
 
+    @PROFILER.profiled("decode")
     def parse_hex_data(self, hex_data, byte_order, layout=None, total_size=None):
         orig_layout = self.layout
         orig_total_size = self.total_size
@@ -232,49 +375,24 @@ class StructModel:
             member_value_map = {}
             member_numeric_map = {}
             member_hex_raw_map = {}
-            for item in self.layout:
-                if item['type'] == "padding":
-                    padding_bytes = data_bytes[item['offset'] : item['offset'] + item['size']]
-                    hex_value = padding_bytes.hex()
-                    parsed_values.append({
-                        "name": item['name'],
-                        "value": "-",
-                        "hex_raw": hex_value
-                    })
-                    continue
-                offset, size, name = item['offset'], item['size'], item['name']
-                member_bytes = data_bytes[offset : offset + size]
-                if item.get("is_bitfield", False):
-                    storage_int = int.from_bytes(member_bytes, byte_order)
-                    bit_offset = item["bit_offset"]
-                    bit_size = item["bit_size"]
-                    mask = (1 << bit_size) - 1
-                    computed_val = (storage_int >> bit_offset) & mask
-                    display_value = str(computed_val)
-                else:
-                    computed_val = int.from_bytes(member_bytes, byte_order)
-                    display_value = str(bool(computed_val)) if item['type'] == 'bool' else str(computed_val)
-                hex_value = int.from_bytes(member_bytes, 'big').to_bytes(size, 'big').hex()
-                parsed_values.append({
-                    "name": name,
-                    "value": display_value,
-                    "hex_raw": hex_value
-                })
-                member_value_map[name] = display_value
-                try:
-                    member_numeric_map[name] = int(computed_val)
-                except Exception:
-                    # 布林或非數值時，轉為 0/1 或略過
-                    try:
-                        if isinstance(computed_val, bool):
-                            member_numeric_map[name] = 1 if computed_val else 0
-                    except Exception:
-                        pass
-                member_hex_raw_map[name] = hex_value
+            with self.metrics.span(DECODE):
+                for item in self.layout:
+                    entry, numeric = decode_layout_item(item, data_bytes, byte_order)
+                    parsed_values.append(entry)
+                    if numeric is None:
+                        continue  # padding 不進入 value maps
+                    name = item['name']
+                    member_value_map[name] = entry["value"]
+                    member_numeric_map[name] = numeric
+                    member_hex_raw_map[name] = entry["hex_raw"]
             # 更新快取映射供後續 unified rows 使用
             self.member_values = member_value_map
             self.member_numeric_values = member_numeric_map
             self.member_hex_raws = member_hex_raw_map
+            self._data_bytes = data_bytes
+            self._data_byte_order = byte_order
+            self._data_layout = self.layout
+            self.bump_version(structure=False)
             return parsed_values
         except Exception as e:
             raise
@@ -282,6 +400,36 @@ class StructModel:
             self.layout = orig_layout
             self.total_size = orig_total_size
 
+    @PROFILER.profiled("decode")
+    def decode_bytes(self, data_bytes, byte_order, layout=None, total_size=None, should_stop=None):
+        """Live 模式的增量 decode（可在背景執行緒呼叫，不修改 model 狀態）。
+
+        只重新解碼 bytes 有變動的 layout 項目；回傳 ``DecodeResult``，交由
+        ``apply_decoded`` 於主執行緒套用。``should_stop()`` 為真時回傳 None。
+        """
+        layout = self.layout if layout is None else layout
+        total_size = self.total_size if total_size is None else total_size
+        if not layout:
+            raise ValueError("No struct layout loaded. Please load a struct definition first.")
+        data_bytes = bytes(data_bytes)
+        if len(data_bytes) < total_size:
+            data_bytes += bytes(total_size - len(data_bytes))  # 與 parse_hex_data 相同：尾端補 0
+        with self.metrics.span(DECODE):
+            return self.live_decoder.decode(data_bytes, byte_order, layout, should_stop=should_stop)
+
+    def apply_decoded(self, result):
+        """套用 ``decode_bytes`` 的結果並回傳 parsed values；layout 已變更時回傳 None。"""
+        if result is None or result.layout is not self.layout:
+            return None
+        self.member_values = result.values
+        self.member_numeric_values = result.numeric_values
+        self.member_hex_raws = result.hex_raws
+        self._data_bytes = result.data_bytes
+        self._data_byte_order = result.byte_order
+        self._data_layout = result.layout
+        self.bump_version(structure=False)
+        return result.parsed_values
+
     # V25: 提供統一 rows 生成，鍵名遵循 V22/V24
     def build_unified_rows(self):
         rows = []
@@ -402,12 +550,8 @@ class StructModel:
         return errors
 
     def _validate_member_names(self, members):
-        errors = []
-        names = [m["name"] for m in members if m.get("name")]
-        if len(set(names)) != len(names):
-            for n in set([x for x in names if names.count(x) > 1]):
-                errors.append(f"成員名稱 '{n}' 重複")
-        return errors
+        counts = Counter(m["name"] for m in members if m.get("name"))
+        return [f"成員名稱 '{n}' 重複" for n in sorted(n for n, c in counts.items() if c > 1)]
 
     def _validate_total_size(self, total_size):
         errors = []
@@ -417,29 +561,23 @@ class StructModel:
 
     def _validate_layout_size(self, members, total_size):
         errors = []
-        expanded_members = self._convert_to_cpp_members(members)
-        _, layout_size, _ = calculate_layout(expanded_members)
+        self.manual_validator.sync(members)
+        self.manual_validator.layout()
+        layout_size = self.manual_validator.layout_engine.total_size
         if layout_size > total_size:
             errors.append(f"Layout 總長度 ({layout_size} bytes) 超過指定 struct 大小 ({total_size} bytes)")
         return errors
 
     def validate_manual_struct(self, members, total_size):
-        errors = []
-        errors += self._validate_member_types(members)
-        errors += self._validate_member_names(members)
-        errors += self._validate_total_size(total_size)
-        if not errors:
-            errors += self._validate_layout_size(members, total_size)
-        return errors
+        # 與 _validate_member_types/_validate_member_names/_validate_total_size/_validate_layout_size
+        # 結果相同，但只重新檢查有變動的成員
+        return self.manual_validator.validate(members, total_size)
 
     def calculate_manual_layout(self, members, total_size):
-        # 使用 _convert_to_cpp_members 轉換為 C++ 標準型別
-        expanded_members = self._convert_to_cpp_members(members)
-        # 呼叫 calculate_layout 產生 C++ 標準 struct align/padding
-        layout, total, align = calculate_layout(expanded_members)
-        # 將 layout 統一轉為 list of dict
-        layout_dicts = [asdict(item) if hasattr(item, '__dataclass_fields__') else dict(item) for item in layout]
-        return layout_dicts
+        # 與 _convert_to_cpp_members + calculate_layout 結果相同，但重用未變動成員的 layout 前綴
+        with self.metrics.span(LAYOUT):
+            self.manual_validator.sync(members)
+            return list(self.manual_validator.layout())
 
     def export_manual_struct_to_h(self, struct_name=None):
         """匯出手動 struct 為 C header 檔案（V4 版本）"""
@@ -468,14 +606,20 @@ class StructModel:
     def get_struct_ast(self):
         """回傳符合 V2P API 的 AST dict 結構"""
         # 假設 self.ast 為 StructDef/UnionDef 物件
-        if hasattr(self, 'ast') and self.ast:
-            return ast_to_dict(self.ast)
-        # 若無，則可用 parse_struct_definition_ast 重新解析
-        if hasattr(self, 'struct_content') and self.struct_content:
-            from src.model.struct_parser import parse_struct_definition_ast
-            self.ast = parse_struct_definition_ast(self.struct_content)
-            return ast_to_dict(self.ast)
-        return None  # 修正：沒有 AST 時回傳 None
+        if not (hasattr(self, 'ast') and self.ast):
+            # 若無，則可用 parse_struct_definition_ast 重新解析
+            if hasattr(self, 'struct_content') and self.struct_content:
+                from src.model.struct_parser import parse_struct_definition_ast
+                self.ast = parse_struct_definition_ast(self.struct_content)
+            if not (hasattr(self, 'ast') and self.ast):
+                return None  # 修正：沒有 AST 時回傳 None
+        # 同一版本、同一 AST 物件沿用上次轉換結果
+        cached = self._ast_dict_cache
+        if cached and cached[0] == self.version and cached[1] is self.ast:
+            return cached[2]
+        ast_dict = ast_to_dict(self.ast)
+        self._ast_dict_cache = (self.version, self.ast, ast_dict)
+        return ast_dict
 
     # --- v18: Import .H 頂層 pragma pack 支援 ---------------------------------
     def _extract_top_level_pack_alignment(self, content: str, target_name=None):
@@ -584,12 +728,28 @@ class StructModel:
         return depth == 0
 
     def get_display_nodes(self, mode='tree'):
-        """回傳符合 V2P API 文件的 Treeview node 結構。"""
+        """回傳符合 V2P API 文件的 Treeview node 結構。
+
+        結果依 (version, mode) 快取；選取/展開等事件不會重建整棵樹。
+        """
+        value_map = getattr(self, "member_values", {})  # 新增
+        cache_key = (self.version, mode)
+        cached = self._display_cache.get(cache_key)
+        if cached and cached[0] is getattr(self, "ast", None) and cached[1] is value_map:
+            return cached[2]
+        with self.metrics.span(DISPLAY_NODES):
+            nodes = self._build_display_nodes(mode, value_map)
+        if nodes is None:
+            return []  # 修正：沒有 AST 時回傳空 list
+        self._display_cache[cache_key] = (self.ast, value_map, nodes)
+        return nodes
+
+    def _build_display_nodes(self, mode, value_map):
         ast_dict = self.get_struct_ast()
         if not ast_dict:
-            return []  # 修正：沒有 AST 時回傳空 list
-        value_map = getattr(self, "member_values", {})  # 新增
-        def to_treeview_node(node, strip_children=False):
+            return None
+        fold_size = self.array_fold_size
+        def to_treeview_node(node, strip_children=False, rebase=None):
             label = node["name"]
             if node.get("is_struct"):
                 label = f"{label} [struct]"
@@ -602,23 +762,106 @@ class StructModel:
             siz = node.get("size", None)
             offset_str = "" if off is None or off == "" else str(off)
             size_str = "" if siz is None or siz == "" else str(siz)
-            # print(f"[DEBUG] to_treeview_node: name={node['name']} id={node['id']} value={value}")  # debug print
+            node_id = node["id"]
+            if rebase is not None:
+                # struct 陣列元素：以元素 id 取代陣列 id 前綴，值以 layout 名稱（如 pts[3].x）查詢
+                node_id = rebase[1] + node_id[len(rebase[0]):]
+                layout_name = node_id.split(".", 1)[1] if "." in node_id else node_id
+                value_raw = value_map.get(layout_name, "")
+                value = str(value_raw) if value_raw is not None else ""
+            builder = None
+            if not strip_children:
+                builder = self._array_range_builder(node, fold_size, to_treeview_node)
+            if strip_children:
+                children = []
+            elif builder is not None:
+                children = builder.children()
+            else:
+                children = [to_treeview_node(child, rebase=rebase) for child in node.get("children", [])]
             result = {
-                "id": node["id"],
+                "id": node_id,
                 "label": label,
                 "type": node["type"],
                 "value": value,  # 新增
                 "offset": offset_str,
                 "size": size_str,
-                "children": [] if strip_children else [to_treeview_node(child, strip_children=strip_children) for child in node.get("children", [])],
+                "children": children,
                 "icon": node.get("type"),
                 "extra": {},
             }
             return result
         if mode == "tree":
-            return [to_treeview_node(ast_dict, strip_children=False)]
+            nodes = [to_treeview_node(ast_dict, strip_children=False)]
         elif mode == "flat":
-            flat_nodes = flatten_ast_nodes(ast_dict)
-            return [to_treeview_node(n, strip_children=True) for n in flat_nodes]
+            nodes = []
+            for n in flatten_ast_nodes(ast_dict):
+                nodes.append(to_treeview_node(n, strip_children=True))
+                # 平面模式：大型陣列只列出第一層 range（附 hexdump 預覽）
+                builder = self._array_range_builder(n, fold_size, to_treeview_node)
+                if builder is not None:
+                    nodes.extend(dict(r, children=[]) for r in builder.children())
         else:
-            raise ValueError(f"Unknown display mode: {mode}")
\ No newline at end of file
+            raise ValueError(f"Unknown display mode: {mode}")
+        return nodes
+
+    def _array_range_builder(self, node, fold_size, to_treeview_node):
+        """大型陣列節點回傳 ArrayRangeBuilder，否則回傳 None。"""
+        dims = node.get("array_dims") or []
+        if not dims or not fold_size:
+            return None
+        count = 1
+        for dim in dims:
+            count *= dim
+        if count <= fold_size:
+            return None
+        layout = self._data_layout or self.layout or []
+        # layout 名稱不含根節點名稱（例如 "inner.buf[0]"）
+        prefix = node["id"].split(".", 1)[1] if "." in node["id"] else node["name"]
+        first = prefix + "[0]" * len(dims)
+        second = prefix + ArrayDescriptor("", "", "", tuple(dims)).element_suffix(1)
+        starts = {}
+        for item in layout:
+            name = item.get("name") or ""
+            for key in (first, second):
+                if name == key or name.startswith(key + "."):
+                    off = item.get("offset")
+                    if key not in starts or off < starts[key]:
+                        starts[key] = off
+        offset = starts.get(first)
+        elem_size = starts[second] - offset if offset is not None and second in starts else 0
+        nested_children = node.get("children") or []
+        desc = ArrayDescriptor(
+            node_id=node["id"],
+            name=node["name"],
+            elem_type=node["type"],
+            dims=tuple(dims),
+            elem_size=elem_size,
+            offset=offset,
+            nested=nested_children or None,
+        )
+        data = self._data_bytes
+        byte_order = self._data_byte_order
+        value_map = getattr(self, "member_values", {}) or {}
+
+        def decode(desc, index):
+            # 展開 range 時才解碼元素；無原始資料時沿用已解碼的 member_values
+            off = desc.element_offset(index)
+            if data is not None and off is not None and desc.elem_size and off + desc.elem_size <= len(data):
+                raw = int.from_bytes(data[off:off + desc.elem_size], byte_order)
+                return str(bool(raw)) if desc.elem_type == "bool" else str(raw)
+            return str(value_map.get(f"{prefix}{desc.element_suffix(index)}", ""))
+
+        def element_children(desc, index, element_id):
+            return [to_treeview_node(child, rebase=(desc.node_id, element_id)) for child in desc.nested]
+
+        return ArrayRangeBuilder(desc, decode, element_children, data=data, fold_size=fold_size)
+
+    def get_node_id_map(self, mode='tree'):
+        """回傳 {path id: int} 緊湊索引，與 get_display_nodes 同版本快取。"""
+        nodes = self.get_display_nodes(mode)
+        cached = self._node_id_map_cache.get(mode)
+        if cached and cached[0] is nodes:
+            return cached[1]
+        id_map = build_node_id_map(nodes)
+        self._node_id_map_cache[mode] = (nodes, id_map)
+        return id_map
\ No newline at end of file
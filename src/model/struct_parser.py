@@ -300,17 +300,25 @@ def _extract_struct_body_by_name(file_content: str, struct_name: str, keyword: s
     return None, None
 
 
-def _collect_known_types(file_content: str) -> dict:
+_TOP_LEVEL_DEF_RE = re.compile(r"\s*(struct|union)\s+(\w+)\s*\{")
+
+
+def _collect_known_types(file_content: str, progress=None) -> dict:
     """v16: 掃描整個檔案，收集頂層具名 struct/union 定義做為型別表。
 
     僅處理形如 `struct Name { ... };` / `union Name { ... };` 的完整定義，
     不處理 typedef 與跨檔 include。
+
+    ``progress(done, total)`` 於每個頂層定義之後呼叫（單位為字元）；
+    callback 拋出的例外（例如取消載入）會直接往外傳遞。
     """
     text = re.sub(r"//.*", "", file_content)
     known: dict[str, Union["StructDef", "UnionDef"]] = {}
     i = 0
     n = len(text)
     while i < n:
+        if progress is not None:
+            progress(i, n)
         # 僅在頂層搜尋（brace depth == 0）
         depth = 0
         j = i
@@ -322,10 +330,11 @@ def _collect_known_types(file_content: str) -> dict:
                 depth = max(0, depth - 1)
             # 嘗試在頂層比對 struct/union 名稱模式
             if depth == 0:
-                m = re.match(r"\s*(struct|union)\s+(\w+)\s*\{", text[j:])
+                # 以 pos 參數比對，不再每個字元切一次 text[j:]（大型 header 為 O(n^2)）
+                m = _TOP_LEVEL_DEF_RE.match(text, j)
                 if m:
                     kind, type_name = m.groups()
-                    brace_start = j + m.end(0) - 1
+                    brace_start = m.end(0) - 1
                     k = brace_start + 1
                     brace = 1
                     while k < n and brace > 0:
@@ -462,15 +471,19 @@ def parse_struct_definition_v2(file_content: str) -> Tuple[Optional[str], Option
     return struct_name, members
 
 
-def parse_struct_definition_ast(file_content: str, _collect: bool = True, target_name: Optional[str] = None) -> Optional[StructDef]:
+def parse_struct_definition_ast(file_content: str, _collect: bool = True, target_name: Optional[str] = None,
+                                known_types: Optional[dict] = None) -> Optional[StructDef]:
     """Parse a struct definition and return a :class:`StructDef` object (遞迴支援巢狀 struct/union).
 
     v16: 加入同檔引用型 struct/union 解析支援：
     - 建立 known_types registry 收錄具名 inline 定義
     - 結束後進行一次解參考 pass，補齊 forward reference 的 members
+
+    ``known_types`` 可傳入已由 ``_collect_known_types`` 收集的型別表（會被補入 inline 定義）。
     """
     # v16: 先收集整個檔案的具名型別（可關閉以避免遞迴收集）
-    known_types: dict[str, Union["StructDef", "UnionDef"]] = _collect_known_types(file_content) if _collect else {}
+    if known_types is None:
+        known_types = _collect_known_types(file_content) if _collect else {}
 
     if target_name:
         struct_name, struct_body = _extract_struct_body_by_name(file_content, target_name)
@@ -757,9 +770,9 @@ def parse_union_definition_ast(file_content: str) -> Optional[UnionDef]:
     return UnionDef(name=union_name, members=members)
 
 
-def parse_c_definition_ast(file_content: str) -> Optional[Union[StructDef, UnionDef]]:
+def parse_c_definition_ast(file_content: str, known_types: Optional[dict] = None) -> Optional[Union[StructDef, UnionDef]]:
     """Parse a C struct or union and return a definition object."""
     header = file_content.strip().split('{', 1)[0]
     if header.strip().startswith('union'):
         return parse_union_definition_ast(file_content)
-    return parse_struct_definition_ast(file_content)
+    return parse_struct_definition_ast(file_content, known_types=known_types)
@@ -8,12 +8,29 @@ parser and layout calculators. It separates:
 - ALIAS_MAP: type aliases mapped to canonical types (e.g., U32 -> unsigned int)
 
 Downstream code should use ``normalize_type`` and ``get_type_info``.
+
+``REGISTRY`` (a ``TypeRegistry``) owns these tables: lookups are memoized,
+and every change made through it (``set_type``, ``set_alias``,
+``set_pointer_mode`` ...) increments ``REGISTRY.generation``, drops the memo
+and calls the subscribers, so layout caches, parsed/display caches and the
+presenter LRU are invalidated exactly when a type size or alias changes.
+Code that edits ``CUSTOM_TYPE_INFO`` / ``ALIAS_MAP`` directly must call
+``REGISTRY.invalidate()`` afterwards.
+
+``TargetABI`` is an immutable per-call target description (pointer size,
+``long`` size, default pack, per-type overrides). Layout calculators resolve
+sizes through the ABI they were given, so layouts for different targets can
+run at the same time in threads. Without an explicit ABI they use
+``default_abi()``, derived from the global pointer mode above.
 """
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Mapping, Optional, Tuple
 import os
+import threading
+import weakref
 
 
 # --- Built-in base types (previously TYPE_INFO) ------------------------------
@@ -50,19 +67,228 @@ CUSTOM_TYPE_INFO: Dict[str, Dict[str, int]] = {}
 ALIAS_MAP: Dict[str, str] = dict(DEFAULT_ALIAS_MAP)
 
 
+_MISSING = object()
+
+
+class TypeRegistry:
+    """Versioned view of the base/custom/alias tables with memoized lookups.
+
+    ``generation`` increments on every change. Subscribers are called as
+    ``callback(registry)`` after the memo is dropped; bound methods are held
+    weakly so models and caches can subscribe without being kept alive.
+    """
+
+    def __init__(self, base=None, custom=None, aliases=None):
+        self.base = BASE_TYPE_INFO if base is None else base
+        self.custom = CUSTOM_TYPE_INFO if custom is None else custom
+        self.aliases = ALIAS_MAP if aliases is None else aliases
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._normalized: Dict[str, str] = {}
+        self._info: Dict[str, object] = {}
+        self._default_abi = None
+        self._subscribers = []
+
+    # -- lookups ---------------------------------------------------------------
+    def normalize(self, type_name: str) -> str:
+        memo = self._normalized  # 變更時整個換新；舊 thread 只會寫回舊的 dict
+        result = memo.get(type_name)
+        if result is None:
+            t = " ".join((type_name or "").split())
+            result = memo[type_name] = self.aliases.get(t, t)
+        return result
+
+    def get_info(self, type_name: str) -> Dict[str, int]:
+        memo = self._info
+        info = memo.get(type_name)
+        if info is None:
+            canonical = self.normalize(type_name)
+            info = self.custom.get(canonical) or self.base.get(canonical) or _MISSING
+            memo[type_name] = info
+        if info is _MISSING:
+            raise KeyError(f"Unknown type: {type_name}")
+        return info
+
+    def default_abi(self) -> "TargetABI":
+        """目前全域設定（pointer mode 等）對應的 ``TargetABI``；型別表變更前重複使用同一個物件。"""
+        abi = self._default_abi
+        if abi is None:
+            abi = self._default_abi = TargetABI.from_registry(self)
+        return abi
+
+    def merged(self) -> Dict[str, Dict[str, int]]:
+        merged = dict(self.base)
+        merged.update(self.custom)
+        return merged
+
+    # -- changes ---------------------------------------------------------------
+    def set_type(self, type_name: str, size: int, align: int) -> bool:
+        """設定 custom 型別；有效大小/對齊改變時才遞增 generation（回傳是否改變）。"""
+        name = " ".join(type_name.split())
+        info = {"size": int(size), "align": int(align)}
+        with self._lock:
+            previous = self.custom.get(name) or self.base.get(name)
+            self.custom[name] = info
+            if previous == info:
+                return False
+            self.invalidate()
+            return True
+
+    def remove_type(self, type_name: str) -> bool:
+        with self._lock:
+            if self.custom.pop(" ".join(type_name.split()), None) is None:
+                return False
+            self.invalidate()
+            return True
+
+    def set_alias(self, alias: str, target: str) -> bool:
+        alias, target = alias.strip(), " ".join(target.split())
+        with self._lock:
+            if self.aliases.get(alias) == target:
+                return False
+            self.aliases[alias] = target
+            self.invalidate()
+            return True
+
+    def invalidate(self) -> int:
+        """清除 memo、遞增 generation 並通知 subscribers；回傳新的 generation。"""
+        with self._lock:
+            self._normalized = {}
+            self._info = {}
+            self._default_abi = None
+            self.generation += 1
+            subscribers = list(self._subscribers)
+        for ref in subscribers:
+            callback = ref()
+            if callback is None:
+                self._discard(ref)
+                continue
+            callback(self)
+        return self.generation
+
+    # -- subscribers -----------------------------------------------------------
+    def subscribe(self, callback: Callable[["TypeRegistry"], None]):
+        """登記 ``callback(registry)``；bound method 以 weak reference 保存。回傳 callback。"""
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            ref = weakref.WeakMethod(callback, self._discard)
+        else:
+            ref = lambda cb=callback: cb  # noqa: E731  一般函式強參照
+        with self._lock:
+            self._subscribers.append(ref)
+        return callback
+
+    def unsubscribe(self, callback) -> None:
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers if ref() not in (None, callback)]
+
+    def _discard(self, ref) -> None:
+        with self._lock:
+            self._subscribers = [r for r in self._subscribers if r is not ref]
+
+    def subscriber_count(self) -> int:
+        return sum(1 for ref in self._subscribers if ref() is not None)
+
+
+REGISTRY = TypeRegistry()
+
+
+_LONG_TYPES = ("long", "unsigned long")
+
+
+def _type_key(type_name: str) -> str:
+    return " ".join((type_name or "").split())
+
+
+@dataclass(frozen=True)
+class TargetABI:
+    """Immutable target description used by one layout computation.
+
+    ``overrides`` maps type names to ``(size, align)`` (or ``{"size", "align"}``)
+    and wins over everything else; ``pointer_size`` / ``long_size`` apply to
+    ``pointer`` and ``long`` / ``unsigned long``; other types resolve through
+    the type registry (aliases, custom and base types). ``default_pack`` is
+    used when the caller does not pass a pack alignment.
+    """
+
+    pointer_size: int = 8
+    long_size: int = 8
+    default_pack: Optional[int] = None
+    overrides: Tuple[Tuple[str, int, int], ...] = ()
+    name: str = field(default="", compare=False)
+    _table: Dict[str, Dict[str, int]] = field(default=None, init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self):
+        items = self.overrides.items() if isinstance(self.overrides, Mapping) else self.overrides
+        normalized = []
+        for item in items:
+            if len(item) == 2:
+                type_name, info = item
+                size, align = (info["size"], info["align"]) if isinstance(info, Mapping) else info
+            else:
+                type_name, size, align = item
+            normalized.append((_type_key(type_name), int(size), int(align)))
+        normalized = tuple(sorted(normalized))
+        table = {name: {"size": size, "align": align} for name, size, align in normalized}
+        pointer = {"size": self.pointer_size, "align": self.pointer_size}
+        long_info = {"size": self.long_size, "align": self.long_size}
+        for type_name, info in (("pointer", pointer),) + tuple((t, long_info) for t in _LONG_TYPES):
+            table.setdefault(type_name, info)
+        object.__setattr__(self, "overrides", normalized)
+        object.__setattr__(self, "_table", table)
+
+    @classmethod
+    def from_registry(cls, registry: Optional["TypeRegistry"] = None, **changes) -> "TargetABI":
+        """以 registry 目前的 pointer / long 設定建立 ABI（``changes`` 覆寫個別欄位）。"""
+        registry = registry or REGISTRY
+        values = {
+            "pointer_size": registry.get_info("pointer")["size"],
+            "long_size": registry.get_info("long")["size"],
+            "name": f"x{86 if registry.get_info('pointer')['size'] == 4 else 64}",
+        }
+        values.update(changes)
+        return cls(**values)
+
+    def replace(self, **changes) -> "TargetABI":
+        values = {"pointer_size": self.pointer_size, "long_size": self.long_size,
+                  "default_pack": self.default_pack, "overrides": self.overrides, "name": self.name}
+        values.update(changes)
+        return TargetABI(**values)
+
+    def type_info(self, type_name: str, registry: Optional["TypeRegistry"] = None) -> Dict[str, int]:
+        """``{size, align}``：overrides → pointer/long → registry；找不到時 raise KeyError。"""
+        registry = registry or REGISTRY
+        canonical = registry.normalize(type_name)
+        info = self._table.get(canonical)
+        if info is not None:
+            return info
+        return registry.get_info(canonical)
+
+
+# 與 GUI 的 x64 / x86 切換（``set_pointer_mode(64/32)``）相同：x86 只把 pointer 改為 4 bytes，
+# long 維持 BASE_TYPE_INFO 的 8 bytes，因此 ``default_abi()`` 在兩種模式下分別等於這兩個常數
+ABI_X64 = TargetABI(pointer_size=8, long_size=BASE_TYPE_INFO["long"]["size"], name="x64")
+ABI_X86 = TargetABI(pointer_size=4, long_size=BASE_TYPE_INFO["long"]["size"], name="x86")
+
+
+def default_abi() -> TargetABI:
+    """The ABI used when none is passed explicitly (follows ``set_pointer_mode``)."""
+    return REGISTRY.default_abi()
+
+
 # --- Pointer mode runtime switch (v14) ---------------------------------------
 POINTER_BITS: int = 64  # default runtime mode
 
 def set_pointer_mode(bits: int) -> None:
     """Set pointer mode to 32 or 64 bits at runtime.
 
-    This updates CUSTOM_TYPE_INFO['pointer'] so downstream size/align queries
-    reflect the new pointer size. Align equals size for now.
+    This updates CUSTOM_TYPE_INFO['pointer'] through ``REGISTRY`` so
+    downstream size/align queries reflect the new pointer size and
+    subscribed caches are invalidated. Align equals size for now.
     """
     global POINTER_BITS
     size = 4 if bits == 32 else 8
     POINTER_BITS = 32 if bits == 32 else 64
-    CUSTOM_TYPE_INFO["pointer"] = {"size": size, "align": size}
+    REGISTRY.set_type("pointer", size, size)
 
 
 def get_pointer_mode() -> int:
@@ -75,11 +301,9 @@ def reset_pointer_mode() -> None:
     set_pointer_mode(64)
 
 
-def _load_yaml_if_available(path: str) -> Optional[dict]:
-    if not os.path.exists(path):
-        return None
+def _parse_yaml(path: str) -> Optional[dict]:
     try:
-        import yaml  # type: ignore
+        import yaml  # type: ignore  # 延遲載入：快取命中時不需要
     except Exception:
         return None
     try:
@@ -89,6 +313,20 @@ def _load_yaml_if_available(path: str) -> Optional[dict]:
         return None
 
 
+def _load_yaml_if_available(path: str) -> Optional[dict]:
+    """Parse ``path`` via the mtime-keyed JSON cache (``src.config.config_cache``)."""
+    if not os.path.exists(path):
+        return None
+    try:
+        from src.config.config_cache import load_cached
+    except Exception:
+        return _parse_yaml(path)
+    try:
+        return load_cached(path, _parse_yaml, kind="yaml")
+    except Exception:
+        return _parse_yaml(path)
+
+
 def _bootstrap_from_config() -> None:
     # Allow overriding config locations via env vars if desired
     base_dir = os.path.join(os.getcwd(), "config")
@@ -129,9 +367,8 @@ except Exception:
 
 
 def normalize_type(type_name: str) -> str:
-    """Normalize a type using alias map (idempotent)."""
-    t = " ".join((type_name or "").split())
-    return ALIAS_MAP.get(t, t)
+    """Normalize a type using alias map (idempotent, memoized by ``REGISTRY``)."""
+    return REGISTRY.normalize(type_name)
 
 
 def get_type_info(type_name: str) -> Dict[str, int]:
@@ -140,18 +377,12 @@ def get_type_info(type_name: str) -> Dict[str, int]:
     Resolution order: alias normalization -> CUSTOM_TYPE_INFO -> BASE_TYPE_INFO.
     Raises KeyError if not found.
     """
-    canonical = normalize_type(type_name)
-    if canonical in CUSTOM_TYPE_INFO:
-        return CUSTOM_TYPE_INFO[canonical]
-    if canonical in BASE_TYPE_INFO:
-        return BASE_TYPE_INFO[canonical]
-    raise KeyError(f"Unknown type: {type_name}")
+    return REGISTRY.get_info(type_name)
 
 
 # Backward compatibility: a merged TYPE_INFO view where custom overrides base.
 def merged_type_info() -> Dict[str, Dict[str, int]]:
-    merged = dict(BASE_TYPE_INFO)
-    merged.update(CUSTOM_TYPE_INFO)
+    merged = REGISTRY.merged()
     # Normalize: ensure align equals size in the merged snapshot for layout/static lookups
     normalized: Dict[str, Dict[str, int]] = {}
     for tname, meta in merged.items():
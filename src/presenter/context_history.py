@@ -0,0 +1,388 @@
+"""Structural-sharing snapshot history for the presenter context.
+
+``StructPresenter.push_context`` used to ``copy.deepcopy`` the whole context
+(including the loaded AST) on every UI event.  ``ContextHistory`` instead
+stores immutable snapshots:
+
+- every snapshot is frozen into ``FrozenDict``/tuple trees, so unchanged
+  top-level values are shared with the previous snapshot instead of copied;
+- the ``ast`` entry is never copied, only referenced by a version id kept in
+  a small side table that is released once no snapshot uses it;
+- retention is bounded by an estimated byte budget (plus an optional legacy
+  entry cap) rather than by a fixed entry count;
+- when the caller reports which top-level keys may have changed (the
+  presenter keeps its context in a ``TrackedContext``), every other key whose
+  value is still the same object reuses the previous frozen value without
+  being frozen or compared again.
+"""
+
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+
+# 不進入快照的 debug_info 欄位（避免 history 自我參照）
+_EXCLUDED_DEBUG_KEYS = ("context_history", "api_trace")
+_AST_KEY = "ast"
+_SCALAR_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+class TrackedContext(dict):
+    """Context dict that records which top-level keys may have changed.
+
+    Assigning, deleting or popping a key marks it dirty. A mutable value
+    (list, dict, ...) read through ``ctx[key]``, ``get`` or ``setdefault`` is
+    also marked, since the caller may modify it in place
+    (``ctx["expanded_nodes"].append(...)``). ``items()``, ``values()``,
+    iteration and ``copy()`` do not mark anything, so in-place changes must go
+    through one of the reads above. A new ``TrackedContext`` starts with every
+    key dirty; ``clear_dirty()`` resets the set after a snapshot.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dirty = set(dict.keys(self))
+
+    @property
+    def dirty_keys(self):
+        return frozenset(self._dirty)
+
+    def clear_dirty(self):
+        self._dirty.clear()
+
+    def _mark_read(self, key, value):
+        if not isinstance(value, _SCALAR_TYPES):
+            self._dirty.add(key)
+        return value
+
+    def __getitem__(self, key):
+        return self._mark_read(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __setitem__(self, key, value):
+        self._dirty.add(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._dirty.add(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        self._dirty.add(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._dirty.add(key)
+        return key, value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._dirty.update(dict.keys(self))
+        dict.clear(self)
+
+
+class FrozenDict(Mapping):
+    """Read-only dict used inside snapshots; hashable-free, shareable."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenDict):
+            return self._data == other._data
+        if isinstance(other, dict):
+            return self._data == other
+        return NotImplemented
+
+    __hash__ = None
+
+
+def freeze(value, _memo=None):
+    """Return an immutable copy of ``value`` (dict -> FrozenDict, list -> tuple).
+
+    Scalars and unknown objects are kept by reference. Objects shared inside
+    ``value`` are frozen once (``_memo`` keyed by ``id``); a container that
+    refers back to itself (e.g. ``context["history"]`` holding shallow copies
+    of the context) is cut with ``Ellipsis`` like ``repr`` does.
+    """
+    if _memo is None:
+        _memo = {}
+    if isinstance(value, (str, bytes, int, float, bool, type(None), FrozenDict, frozenset)):
+        return value
+    key = id(value)
+    if key in _memo:
+        return _memo[key]
+    if not isinstance(value, (dict, list, tuple, set)):
+        return value
+    _memo[key] = ...
+    if isinstance(value, dict):
+        result = FrozenDict({k: freeze(v, _memo) for k, v in value.items()})
+    elif isinstance(value, set):
+        result = frozenset(freeze(v, _memo) for v in value)
+    else:
+        result = tuple(freeze(v, _memo) for v in value)
+    _memo[key] = result
+    return result
+
+
+def estimate_size(value, seen=None):
+    """Rough deep ``sys.getsizeof`` of ``value``; objects in ``seen`` are free."""
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, FrozenDict):
+            obj = obj._data
+            total += sys.getsizeof(obj)
+        if isinstance(obj, Mapping):
+            for k, v in obj.items():
+                stack.append(k)
+                stack.append(v)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class ContextSnapshot(Mapping):
+    """One immutable history entry; reads like the context dict it came from."""
+
+    __slots__ = ("_values", "ast_version", "_store")
+
+    def __init__(self, values, ast_version, store):
+        self._values = values
+        self.ast_version = ast_version
+        self._store = store
+
+    def __getitem__(self, key):
+        if key == _AST_KEY and self.ast_version is not None:
+            return self._store.get(self.ast_version)
+        return self._values[key]
+
+    def __iter__(self):
+        yield from self._values
+        if self.ast_version is not None:
+            yield _AST_KEY
+
+    def __len__(self):
+        return len(self._values) + (1 if self.ast_version is not None else 0)
+
+    def __repr__(self):
+        shown = dict(self._values)
+        if self.ast_version is not None:
+            shown[_AST_KEY] = f"<ast v{self.ast_version}>"
+        return repr(shown)
+
+
+class _AstStore:
+    """Version id -> AST object, ref-counted by the snapshots that use it."""
+
+    def __init__(self):
+        self._entries = {}  # version -> [ast, refcount, size]
+        self.bytes = 0
+        self._last_ast = None
+        self._last_version = None
+        self._next_version = 1
+
+    def version_of(self, ast):
+        # AST 以物件身分區分版本；同一物件視為同一版本（載入後不再原地修改）
+        if self._last_version is not None and ast is self._last_ast:
+            return self._last_version
+        version = self._next_version
+        self._next_version += 1
+        self._last_ast = ast
+        self._last_version = version
+        return version
+
+    def acquire(self, version, ast):
+        entry = self._entries.get(version)
+        if entry is not None:
+            entry[1] += 1
+            return
+        size = estimate_size(ast)
+        self._entries[version] = [ast, 1, size]
+        self.bytes += size
+
+    def release(self, version):
+        entry = self._entries.get(version)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._entries[version]
+            self.bytes -= entry[2]
+
+    def get(self, version):
+        entry = self._entries.get(version)
+        return entry[0] if entry is not None else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+
+class ContextHistory(Sequence):
+    """Byte-budgeted list of ``ContextSnapshot`` sharing unchanged subtrees."""
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = []  # list of (snapshot, retained_bytes)
+        self._value_bytes = 0
+        self._ast_store = _AstStore()
+        self._last_values = {}
+        self._last_raw = {}  # key -> 上一次 append 時 context 中的原始物件（供 identity 比對）
+        # 最近一次 append 相對前一筆快照有變動的 key（None 表示無可比較的前一筆）
+        self.last_changed_keys = None
+
+    # Sequence API ---------------------------------------------------------
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [entry[0] for entry in self._entries[index]]
+        return self._entries[index][0]
+
+    def __repr__(self):
+        return f"<ContextHistory entries={len(self)} bytes={self.bytes_used}>"
+
+    @property
+    def bytes_used(self):
+        """Estimated bytes retained by all snapshots (AST versions counted once)."""
+        return self._value_bytes + self._ast_store.bytes
+
+    @property
+    def ast_versions(self):
+        """Number of distinct AST versions still referenced by the history."""
+        return len(self._ast_store)
+
+    # Mutation -------------------------------------------------------------
+    def append(self, context, dirty_keys=None):
+        """Snapshot ``context`` (a dict or Mapping) and enforce the budget.
+
+        ``dirty_keys`` lists the top-level keys that may have changed since the
+        previous ``append`` (e.g. ``TrackedContext.dirty_keys``); any other key
+        whose value is the same object as last time keeps the previous frozen
+        value as is. ``None`` freezes and compares every key.
+        """
+        memo = {}
+        seen = set()
+        values = {}
+        raw = {}
+        changed = set()
+        retained = 0
+        ast_version = None
+        for key, value in context.items():
+            if key == _AST_KEY and value is not None:
+                ast_version = self._ast_store.version_of(value)
+                continue
+            raw[key] = value
+            if (dirty_keys is not None and key not in dirty_keys and key in self._last_values
+                    and self._last_raw.get(key) is value):
+                values[key] = self._last_values[key]
+                continue
+            if key == "debug_info" and isinstance(value, Mapping):
+                value = {k: v for k, v in value.items() if k not in _EXCLUDED_DEBUG_KEYS}
+                value.update({k: () for k in _EXCLUDED_DEBUG_KEYS})
+            frozen = freeze(value, memo)
+            previous = self._last_values.get(key)
+            if previous is not None and previous == frozen:
+                # 結構共享：與上一個快照相同的子樹直接沿用
+                frozen = previous
+            else:
+                retained += estimate_size(frozen, seen)
+                changed.add(key)
+            values[key] = frozen
+        if ast_version is not None:
+            self._ast_store.acquire(ast_version, context[_AST_KEY])
+        snapshot = ContextSnapshot(OrderedDict(values), ast_version, self._ast_store)
+        self._entries.append((snapshot, retained))
+        self._value_bytes += retained
+        if self._last_values:
+            changed.update(self._last_values.keys() - values.keys())
+            self.last_changed_keys = frozenset(changed)
+        else:
+            self.last_changed_keys = None
+        self._last_values = values
+        self._last_raw = raw
+        self._trim()
+        return snapshot
+
+    def extend(self, contexts):
+        for ctx in contexts:
+            self.append(ctx)
+
+    def set_limits(self, max_bytes=None, max_entries=None):
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._trim()
+
+    def clear(self):
+        self._entries.clear()
+        self._ast_store.clear()
+        self._value_bytes = 0
+        self._last_values = {}
+        self._last_raw = {}
+        self.last_changed_keys = None
+
+    def _trim(self):
+        # 至少保留最新一筆，其餘依 byte budget / entry 上限由舊到新淘汰
+        while len(self._entries) > 1 and (
+            (self.max_bytes is not None and self.bytes_used > self.max_bytes)
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        snapshot, retained = self._entries.pop(0)
+        if snapshot.ast_version is not None:
+            self._ast_store.release(snapshot.ast_version)
+        self._value_bytes -= retained
+        if not self._entries:
+            return
+        # 仍被下一筆共享的子樹改由下一筆承擔大小
+        nxt, nxt_retained = self._entries[0]
+        seen = set()
+        carried = sum(
+            estimate_size(value, seen) for key, value in nxt._values.items()
+            if snapshot._values.get(key) is value
+        )
+        carried = min(carried, retained)
+        self._entries[0] = (nxt, nxt_retained + carried)
+        self._value_bytes += carried
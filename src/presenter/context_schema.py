@@ -1,4 +1,4 @@
-import jsonschema
+import random
 
 # V2P Presenter context JSON Schema
 PRESENTER_CONTEXT_SCHEMA = {
@@ -25,6 +25,229 @@ PRESENTER_CONTEXT_SCHEMA = {
     "additionalProperties": True
 }
 
+class _SchemaError(Exception):
+    """編譯後的檢查內部使用；只有 ``ContextValidator.validate`` 失敗時才轉成 jsonschema 例外。"""
+
+
+def _jsonschema():
+    """延遲載入 jsonschema；未安裝時退回內附的 ``src.jsonschema``（啟動時不需要）。"""
+    try:
+        import jsonschema
+    except ImportError:
+        from src import jsonschema
+    return jsonschema
+
+
+def _validation_error_cls():
+    """``jsonschema.ValidationError``；jsonschema 只在驗證失敗時才載入。"""
+    return _jsonschema().ValidationError
+
+
+def _error(message):
+    return _SchemaError(message)
+
+
+def _type_error(expected):
+    return _error(f"Expected {expected}")
+
+
+# 內建編譯器實作的關鍵字；其餘關鍵字交給 jsonschema 的 validator，不會被靜默忽略
+_COMPILED_KEYWORDS = frozenset({"type", "enum", "anyOf", "items", "properties", "required", "additionalProperties"})
+# 不影響驗證結果的註解關鍵字
+_ANNOTATION_KEYWORDS = frozenset({"$schema", "$id", "$comment", "title", "description", "default", "examples"})
+_OBJECT_KEYWORDS = ("properties", "required", "additionalProperties")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPE_TESTS = {
+    "string": lambda value: isinstance(value, str),
+    "number": _is_number,
+    "integer": lambda value: _is_number(value) and float(value).is_integer(),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+}
+
+
+def _unsupported_keywords(schema):
+    unsupported = set(schema) - _COMPILED_KEYWORDS - _ANNOTATION_KEYWORDS
+    if not isinstance(schema.get("type", "object"), str):
+        unsupported.add("type")  # type 為 list 等形式
+    if not isinstance(schema.get("additionalProperties", True), bool):
+        unsupported.add("additionalProperties")  # additionalProperties 為 schema
+    if not isinstance(schema.get("items", {}), dict):
+        unsupported.add("items")  # tuple 形式的 items
+    return unsupported
+
+
+def _compile_with_jsonschema(schema, keywords):
+    """以 ``jsonschema.validators.validator_for(schema)(schema)`` 編譯內建編譯器不支援的 schema 片段。
+
+    只有自訂 schema 用到這些關鍵字時才會載入 jsonschema；內附的簡化版 jsonschema
+    沒有 ``validators``，此時於編譯時拋出 ``ValueError``，而不是略過檢查。
+    """
+    validators = getattr(_jsonschema(), "validators", None)
+    if validators is None or not hasattr(validators, "validator_for"):
+        raise ValueError(f"unsupported schema keywords {sorted(keywords)}: install the jsonschema package")
+    cls = validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+
+    def check_jsonschema(value):
+        for error in validator.iter_errors(value):
+            raise _error(error.message)
+    return check_jsonschema
+
+
+def _compile_schema(schema):
+    """把 schema 片段編譯成 check(value) 函式；失敗時拋出 ``_SchemaError``。
+
+    內建編譯器只實作本 schema 用到的關鍵字（見 ``_COMPILED_KEYWORDS``），含其他
+    關鍵字的片段整段交給 jsonschema 編譯；未知的 type 於編譯時拋出 ``ValueError``。
+    """
+    unsupported = _unsupported_keywords(schema)
+    if unsupported:
+        return _compile_with_jsonschema(schema, unsupported)
+    checks = []
+    t = schema.get("type")
+    if t is not None:
+        if t not in _TYPE_TESTS:
+            raise ValueError(f"unsupported schema type: {t!r}")
+        test = _TYPE_TESTS[t]
+
+        def check_type(value):
+            if not test(value):
+                raise _type_error(t)
+        checks.append(check_type)
+    if "enum" in schema:
+        enum = tuple(schema["enum"])
+
+        def check_enum(value):
+            if value not in enum:
+                raise _error(f"{value!r} is not one of {list(enum)}")
+        checks.append(check_enum)
+    if "anyOf" in schema:
+        options = [_compile_schema(sub) for sub in schema["anyOf"]]
+
+        def check_any(value):
+            for option in options:
+                try:
+                    option(value)
+                    return
+                except _SchemaError:
+                    continue
+            raise _error("anyOf conditions not met")
+        checks.append(check_any)
+    if "items" in schema:
+        item_check = _compile_schema(schema["items"])
+
+        def check_items(value):
+            if isinstance(value, list):
+                for item in value:
+                    item_check(item)
+        checks.append(check_items)
+    if any(key in schema for key in _OBJECT_KEYWORDS):
+        props, required, additional = _compile_object(schema)
+
+        def check_object(value):
+            if isinstance(value, dict):
+                _check_properties(value, value.keys(), props, required, additional)
+        checks.append(check_object)
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value):
+        for check in checks:
+            check(value)
+    return check_all
+
+
+def _compile_object(schema):
+    props = {key: _compile_schema(sub) for key, sub in schema.get("properties", {}).items()}
+    return props, tuple(schema.get("required", ())), schema.get("additionalProperties", True)
+
+
+def _check_properties(value, keys, props, required, additional):
+    """檢查必要欄位與 ``keys``；失敗時拋出 ``_SchemaError``。"""
+    for key in required:
+        if key not in value:
+            raise _error(f"Missing required property: {key}")
+    for key in keys:
+        check = props.get(key)
+        if check is not None:
+            try:
+                check(value[key])
+            except _SchemaError as e:
+                raise _error(f"{key}: {e}") from None
+        elif not additional:
+            raise _error(f"Additional property {key} not allowed")
+
+
+class ContextValidator:
+    """Compiled, change-aware validator for the presenter context.
+
+    The schema is compiled once into per-property checks (``_compile_schema``
+    raises ``ValueError`` for keywords it cannot check). ``validate`` can be
+    limited to ``changed_keys``; keys skipped by sampling are remembered and
+    checked on the next sampled run, so nothing changed goes unvalidated.
+    """
+
+    def __init__(self, schema=None, sample_rate=1.0, debug=False, rng=random.random):
+        schema = PRESENTER_CONTEXT_SCHEMA if schema is None else schema
+        # changed-key 檢查只能套用在頂層 properties；頂層的其他關鍵字一律拒絕
+        unsupported = _unsupported_keywords(schema) | (set(schema) & {"enum", "anyOf", "items"})
+        if schema.get("type", "object") != "object":
+            unsupported.add("type")
+        if unsupported:
+            raise ValueError(f"unsupported top-level context schema keywords: {sorted(unsupported)}")
+        self._checks, self._required, self._additional = _compile_object(schema)
+        self.sample_rate = sample_rate
+        self.debug = debug
+        self._rng = rng
+        self._pending = set()
+        self._pending_all = True
+        self.validated_count = 0
+        self.skipped_count = 0
+
+    def validate(self, context, changed_keys=None):
+        """驗證 context；changed_keys 為 None 代表全部檢查。"""
+        if changed_keys is None:
+            self._pending_all = True
+        else:
+            self._pending.update(changed_keys)
+        if not self.debug and self.sample_rate < 1.0 and self._rng() >= self.sample_rate:
+            self.skipped_count += 1
+            return
+        try:
+            if not isinstance(context, dict):
+                raise _error("Expected object")
+            keys = context.keys() if self._pending_all else [k for k in self._pending if k in context]
+            self._check(context, keys)
+        except _SchemaError as e:
+            raise _validation_error_cls()(str(e)) from None
+        self._pending.clear()
+        self._pending_all = False
+        self.validated_count += 1
+
+    def _check(self, context, keys):
+        _check_properties(context, keys, self._checks, self._required, self._additional)
+
+    def reset(self):
+        """下一次 validate 會做完整檢查（例如 context 被整個替換時）。"""
+        self._pending.clear()
+        self._pending_all = True
+
+
+_DEFAULT_VALIDATOR = None
+
+
 def validate_presenter_context(context: dict):
     """驗證 Presenter context 是否符合 schema，若不符會拋出 jsonschema.ValidationError"""
-    jsonschema.validate(instance=context, schema=PRESENTER_CONTEXT_SCHEMA) 
\ No newline at end of file
+    global _DEFAULT_VALIDATOR
+    if _DEFAULT_VALIDATOR is None:
+        _DEFAULT_VALIDATOR = ContextValidator()
+    _DEFAULT_VALIDATOR.validate(context)
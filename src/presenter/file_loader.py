@@ -0,0 +1,102 @@
+"""Background file loading for the presenter.
+
+``browse_file`` used to read, parse and lay out the header on the Tk thread,
+freezing the UI on large files. ``BackgroundFileLoader`` runs such a job on a
+worker thread:
+
+- the job receives a ``progress(done, total)`` callback; the model calls it
+  between top-level definitions, and it raises ``LoadCancelled`` once the job
+  is cancelled, so cancellation is cooperative;
+- progress, result and error callbacks are handed to ``schedule`` (the
+  presenter passes ``MainThreadQueue.post``), so they run on the main thread;
+- every ``start`` bumps a generation number: callbacks of superseded or
+  cancelled jobs are dropped on the main thread even if the worker already
+  finished.
+"""
+
+import threading
+import time
+
+from src.model.struct_model import LoadCancelled
+
+PROGRESS_INTERVAL = 0.05  # 秒；進度回報節流，避免 after() 佇列塞滿
+
+
+class BackgroundFileLoader:
+    """Run one load job at a time on a worker thread; newer jobs supersede older ones."""
+
+    def __init__(self, schedule=None, progress_interval=PROGRESS_INTERVAL, clock=time.monotonic):
+        self._schedule = schedule or (lambda fn: fn())
+        self.progress_interval = progress_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._cancel_event = None
+        self._thread = None
+
+    def start(self, job, on_done, on_error=None, on_progress=None):
+        """在背景執行 ``job(progress)``；回傳此工作的 generation。"""
+        with self._lock:
+            if self._cancel_event is not None:
+                self._cancel_event.set()  # 舊工作在下一個頂層定義時中止
+            self.generation += 1
+            generation = self.generation
+            cancel_event = self._cancel_event = threading.Event()
+        last_report = [None]
+
+        def progress(done, total):
+            if cancel_event.is_set():
+                raise LoadCancelled()
+            if on_progress is None:
+                return
+            now = self._clock()
+            if last_report[0] is None or done >= total or now - last_report[0] >= self.progress_interval:
+                last_report[0] = now
+                self._deliver(generation, on_progress, done, total)
+
+        def run():
+            try:
+                result = job(progress)
+            except LoadCancelled:
+                return
+            except Exception as e:
+                if on_error is not None:
+                    self._deliver(generation, on_error, e, finished=True)
+                return
+            self._deliver(generation, on_done, result, finished=True)
+
+        thread = threading.Thread(target=run, name=f"struct-file-loader-{generation}", daemon=True)
+        self._thread = thread
+        thread.start()
+        return generation
+
+    def _deliver(self, generation, callback, *args, finished=False):
+        def run():
+            # 主執行緒上再檢查一次：worker 完成後才被取代的結果也要丟棄
+            if generation != self.generation:
+                return
+            if finished:
+                self._cancel_event = None
+            callback(*args)
+        self._schedule(run)
+
+    def cancel(self):
+        """取消目前工作；回傳是否有工作被取消。"""
+        with self._lock:
+            event = self._cancel_event
+            self._cancel_event = None
+            self.generation += 1
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def busy(self):
+        return self._cancel_event is not None
+
+    def wait(self, timeout=None):
+        """等待目前的 worker 結束（測試與 CLI 用）。"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return thread is None or not thread.is_alive()
@@ -0,0 +1,92 @@
+"""Coalescing background worker for live decode.
+
+Live mode re-decodes the hex input after edits. Keystrokes arrive faster than
+a large struct decodes, so ``LatestOnlyWorker``:
+
+- runs jobs on one long-lived daemon thread, one at a time (the model's
+  ``IncrementalDecoder`` keeps state between decodes);
+- keeps a single pending slot: ``submit`` replaces a job that has not started
+  yet, so a burst of edits results in at most one queued decode;
+- tags every job with a generation number. The running job gets a
+  ``is_stale()`` callable to stop early, and results of stale generations are
+  dropped on the main thread (``schedule`` is the presenter's
+  ``MainThreadQueue.post`` in the app).
+"""
+
+import threading
+
+
+class LatestOnlyWorker:
+    """Run the latest submitted job on a worker thread; older pending jobs are dropped."""
+
+    def __init__(self, schedule=None, name="struct-live-decode"):
+        self._schedule = schedule or (lambda fn: fn())
+        self._name = name
+        self._cond = threading.Condition()
+        self._pending = None
+        self._running = False
+        self._thread = None
+        self.generation = 0
+
+    def submit(self, job, on_done, on_error=None):
+        """排入 ``job(is_stale)``（取代尚未開始的舊工作）；回傳 generation。"""
+        with self._cond:
+            self.generation += 1
+            generation = self.generation
+            self._pending = (generation, job, on_done, on_error)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return generation
+
+    def cancel(self):
+        """丟棄排隊中的工作，執行中的工作結果也不再送出。"""
+        with self._cond:
+            self.generation += 1
+            self._pending = None
+            self._cond.notify_all()
+
+    def is_stale(self, generation):
+        return generation != self.generation
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                generation, job, on_done, on_error = self._pending
+                self._pending = None
+                self._running = True
+            try:
+                if not self.is_stale(generation):
+                    self._run(generation, job, on_done, on_error)
+            finally:
+                with self._cond:
+                    self._running = False
+                    self._cond.notify_all()
+
+    def _run(self, generation, job, on_done, on_error):
+        try:
+            result = job(lambda: self.is_stale(generation))
+        except Exception as e:
+            if on_error is not None:
+                self._deliver(generation, on_error, e)
+            return
+        self._deliver(generation, on_done, result)
+
+    def _deliver(self, generation, callback, *args):
+        def run():
+            if not self.is_stale(generation):
+                callback(*args)
+        self._schedule(run)
+
+    def busy(self):
+        """是否有排隊或執行中的工作。"""
+        with self._cond:
+            return self._pending is not None or self._running
+
+    def wait_idle(self, timeout=None):
+        """等待沒有排隊或執行中的工作（測試用）；回傳是否已閒置。"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._running, timeout)
@@ -0,0 +1,77 @@
+"""Hand callbacks from worker threads to the Tk main thread.
+
+Tk may only be called from the thread running ``mainloop``, and ``view.after``
+is itself a Tk call, so a worker thread cannot use it to schedule its
+callbacks (and falling back to calling them on the worker runs
+``apply_struct_file``, ``push_context`` and view updates off the Tk thread).
+``MainThreadQueue`` splits the two sides:
+
+- ``post(fn)`` is the only method workers call; it puts ``fn`` on a
+  ``queue.Queue`` and never touches Tk;
+- ``start()`` is called on the main thread whenever a background job starts;
+  it schedules a ``view.after`` poll that drains the queue and re-arms itself
+  while ``is_busy()`` reports running jobs or callbacks are still queued;
+- without a Tk view (tests, CLI) there is no main loop to protect and
+  ``post`` runs ``fn`` right away.
+"""
+
+import logging
+import queue
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_MS = 15
+
+
+class MainThreadQueue:
+    """Callbacks posted by worker threads, drained on the Tk thread by an ``after`` poll."""
+
+    def __init__(self, get_after, is_busy=lambda: False, interval_ms=POLL_INTERVAL_MS):
+        self._get_after = get_after  # 回傳 view.after；無 Tk view 時回傳 None
+        self._is_busy = is_busy
+        self.interval_ms = interval_ms
+        self._queue = queue.Queue()
+        self._polling = False
+
+    def post(self, fn):
+        """由任意執行緒呼叫；有 Tk view 時只排入佇列，等主執行緒 poll 執行。"""
+        if self._get_after() is None:
+            fn()
+            return
+        self._queue.put(fn)
+
+    def start(self):
+        """於主執行緒呼叫：確保 poll 正在執行。"""
+        if self._polling:
+            return
+        after = self._get_after()
+        if after is None:
+            self.drain()
+            return
+        try:
+            after(self.interval_ms, self._poll)
+        except Exception:  # 視窗已關閉：沒有主執行緒可交付，佇列中的 callback 一併丟棄
+            logger.debug("main thread poll not scheduled", exc_info=True)
+            return
+        self._polling = True
+
+    def drain(self):
+        """執行目前佇列中的 callback（主執行緒）；回傳執行數量。"""
+        count = 0
+        while True:
+            try:
+                fn = self._queue.get_nowait()
+            except queue.Empty:
+                return count
+            count += 1
+            try:
+                fn()
+            except Exception:
+                logger.exception("main thread callback failed")
+
+    def _poll(self):
+        self._polling = False
+        self.drain()
+        # 先查 busy 再查佇列：worker 先 post 才結束，兩者不會同時看起來閒置
+        if self._is_busy() or not self._queue.empty():
+            self.start()
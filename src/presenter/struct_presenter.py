@@ -1,4 +1,3 @@
-import re
 try:
     import tkinter as tk
     from tkinter import filedialog
@@ -10,14 +9,24 @@ except Exception:
             return None
     filedialog = _DummyFileDialog()
 from src.config import get_string
-from src.model.input_field_processor import InputFieldProcessor
+from src.model.input_field_processor import InputFieldProcessor, InputFieldBatchError
 import time
-from collections import OrderedDict
 import os
 import threading
-from src.presenter.context_schema import validate_presenter_context
+from src.presenter.context_schema import ContextValidator
+from src.presenter.context_history import ContextHistory, TrackedContext
+from src.model.search_index import NodeSearchIndex, build_value_index
+from src.model.manual_validator import ManualStructValidator
+from src.model.layout_cache import LayoutCache, layout_key
+from src.model.metrics import METRICS, MetricsRegistry, CONTEXT_VALIDATION
+from src.model.profiling import PROFILER
+from src.presenter.file_loader import BackgroundFileLoader
+from src.presenter.main_thread import MainThreadQueue
+from src.presenter.live_decode import LatestOnlyWorker
 import copy
 import functools
+from collections.abc import Sequence
+from itertools import accumulate
 
 
 class HexProcessingError(Exception):
@@ -27,23 +36,53 @@ class HexProcessingError(Exception):
         super().__init__(message)
         self.kind = kind
 
+class BoxDebugLines(Sequence):
+    """Lazily formatted ``Box N (k bytes): ..`` lines for the debug pane.
+
+    Holds the converted bytes and per-box sizes; a line is only built when
+    it is indexed or iterated, so large grids cost nothing until shown.
+    """
+
+    def __init__(self, data: bytes, sizes):
+        self._data = data
+        self._sizes = list(sizes)
+        self._offsets = list(accumulate(self._sizes, initial=0))
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("debug line index out of range")
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return f"Box {index+1} ({end - start} bytes): {self._data[start:end].hex(' ')}"
+
+
 class StructPresenter:
     def __init__(self, model, view=None, lru_cache_size=None):
         self.model = model
         self.view = view # This will be set by main.py after view is instantiated
         self.input_processor = InputFieldProcessor()
-        # 支援從參數、環境變數初始化 cache size
+        # layout cache：model 有 LayoutCache 時與匯入路徑共用同一份（content-addressed key）
+        shared = getattr(model, "layout_cache", None)
+        self._layout_cache = shared if isinstance(shared, LayoutCache) else LayoutCache()
+        # stage timing registry：與 model 共用（預設為全域 METRICS）
+        metrics = getattr(model, "metrics", None)
+        self.metrics = metrics if isinstance(metrics, MetricsRegistry) else METRICS
+        # 支援從參數、環境變數初始化 cache size 與 byte 上限
         if lru_cache_size is not None:
             self._lru_cache_size = lru_cache_size
         else:
             env_size = os.environ.get("STRUCT_LRU_CACHE_SIZE")
             self._lru_cache_size = int(env_size) if env_size is not None else 32
-        self._layout_cache = OrderedDict()  # (members_key, total_size) -> layout
-        self._cache_hits = 0
-        self._cache_misses = 0
+        env_bytes = os.environ.get("STRUCT_LAYOUT_CACHE_BYTES")
+        if env_bytes is not None:
+            self._layout_cache.resize(max_bytes=int(env_bytes))
         self._last_layout_time = None
-        self._last_hit_key = None  # 新增：記錄最近命中 key
-        self._last_evict_key = None  # 新增：記錄最近淘汰 key
         self._auto_cache_clear_timer = None
         self._auto_cache_clear_enabled = False
         self._auto_cache_clear_interval = None
@@ -52,14 +91,41 @@ class StructPresenter:
         # Observer pattern: 註冊自己為 model observer
         if hasattr(self.model, "add_observer"):
             self.model.add_observer(self)
-        # context 初始化
-        self.context = self.get_default_context()
+        # context 初始化（TrackedContext 記錄變動的 key，push_context 只快照這些 key）
+        self.context = TrackedContext(self.get_default_context())
         self._debounce_timer = None
         self._debounce_lock = threading.Lock()
         self._debounce_interval = 0.1  # 100ms
+        self._view_update_id = None
+        # search/filter：n-gram 索引依 (mode, structure_version) 重用，filter 結果依 nodes 快取
+        self._search_index = None  # (key, NodeSearchIndex)
+        self._filter_cache = None
         self._pending_context = None
         self._after_id = None  # Tk after id for main-thread scheduling
+        # 背景工作的 callback 經佇列交給主執行緒（worker 不呼叫任何 Tk API）
+        self._main_queue = MainThreadQueue(self._view_after, is_busy=self._background_busy)
+        # 背景載入 .h：worker thread 解析，結果經 _main_queue 回到主執行緒
+        self._file_loader = BackgroundFileLoader(schedule=self._main_queue.post)
+        # live decode：hex 編輯後 debounce，再由單一 worker 增量 decode（只保留最新一筆）
+        self._live_decode = False
+        env_delay = os.environ.get("STRUCT_LIVE_DECODE_DELAY_MS")
+        self._live_decode_delay_ms = int(env_delay) if env_delay is not None else 150
+        self._live_after_id = None
+        self._live_worker = LatestOnlyWorker(schedule=self._main_queue.post)
+        # 搜尋索引：display nodes 變更時由 push_context 排入背景建立，不等到第一次按鍵
+        self._index_worker = LatestOnlyWorker(schedule=self._main_queue.post, name="struct-search-index")
+        self._index_pending = None  # 最近排入的 (key, nodes)
+        self._index_result = None  # worker 完成的 (key, index, nodes, value pairs)，於主執行緒套用
         self._history_maxlen = 200
+        # context_history 以估算 bytes 為上限（structural sharing，不再 deepcopy）
+        env_budget = os.environ.get("STRUCT_HISTORY_BUDGET_BYTES")
+        self._history_budget_bytes = int(env_budget) if env_budget is not None else 8 * 1024 * 1024
+        # context 驗證：schema 預先編譯，只檢查變動欄位；production 可設抽樣率，STRUCT_DEBUG=1 時一律驗證
+        env_rate = os.environ.get("STRUCT_CONTEXT_VALIDATION_RATE")
+        self._context_validator = ContextValidator(
+            sample_rate=float(env_rate) if env_rate is not None else 1.0,
+            debug=os.environ.get("STRUCT_DEBUG") == "1",
+        )
 
     def add_observer(self, observer):
         self._observers.add(observer)
@@ -88,63 +154,67 @@ class StructPresenter:
             except Exception:
                 pass
             self._schedule_view_update(nodes, getattr(self, "context", {}))
-        # 其他事件只做 cache 失效與 observer 通知
-        if event_type in ("manual_struct_changed", "file_struct_loaded"):
-            self.invalidate_cache()
+        # layout cache 以內容為 key，struct 變更不需清空（切換回舊 struct 仍可命中）
         self.notify_observers(event_type, **kwargs)
         # 可根據 event_type 擴充自動行為
 
     def invalidate_cache(self):
         self._layout_cache.clear()
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self._layout_cache.reset_stats()
 
-    def _make_cache_key(self, members, total_size):
-        key = tuple(sorted((
-            m.get('name', '<invalid>'),
-            m.get('type', '<invalid>'),
-            m.get('bit_size', 0)
-        ) for m in members))
-        return (key, total_size)
+    # 舊屬性名稱保留為 LayoutCache 的別名（Debug tab 與測試仍直接讀寫）
+    @property
+    def _lru_cache_size(self):
+        return self._layout_cache.max_entries
 
-    def _process_hex_parts(self, hex_parts, byte_order):
-        """Convert list of hex input parts to a hex string and debug lines."""
-        final_hex_parts = []
-        debug_bytes = []
+    @_lru_cache_size.setter
+    def _lru_cache_size(self, size):
+        self._layout_cache.resize(max_entries=size)
 
-        for raw_part, expected_chars in hex_parts:
-            if not re.match(r"^[0-9a-fA-F]*$", raw_part):
-                raise HexProcessingError(
-                    "invalid_input",
-                    f"Input '{raw_part}' contains non-hexadecimal characters."
-                )
+    @property
+    def _cache_hits(self):
+        return self._layout_cache.hits
 
-            chunk_byte_size = expected_chars // 2
+    @_cache_hits.setter
+    def _cache_hits(self, value):
+        self._layout_cache.hits = value
 
-            try:
-                # 新版：直接用 process_input_field 產生 bytes
-                bytes_for_chunk = self.input_processor.process_input_field(raw_part, chunk_byte_size, byte_order)
-                int_value = int.from_bytes(bytes_for_chunk, byte_order)
-            except ValueError:
+    @property
+    def _cache_misses(self):
+        return self._layout_cache.misses
+
+    @_cache_misses.setter
+    def _cache_misses(self, value):
+        self._layout_cache.misses = value
+
+    def _make_cache_key(self, members, total_size):
+        """依序的成員內容 hash（不排序：成員順序不同即為不同 layout）。"""
+        abi = getattr(self.model, "abi", None)
+        return layout_key(members, extra=("manual", total_size) if abi is None else ("manual", total_size, abi))
+
+    def _process_hex_parts(self, hex_parts, byte_order):
+        """Convert list of hex input parts to a hex string and debug lines.
+
+        All parts are converted in one batch by ``InputFieldProcessor``;
+        debug lines are formatted lazily when the view actually reads them.
+        """
+        parts = [(raw_part, expected_chars // 2) for raw_part, expected_chars in hex_parts]
+        try:
+            data = self.input_processor.process_input_fields(parts, byte_order)
+        except InputFieldBatchError as e:
+            if e.kind == "non_hex":
                 raise HexProcessingError(
                     "invalid_input",
-                    f"Could not convert '{raw_part}' to a number."
-                )
-            except OverflowError:
-                raise HexProcessingError(
-                    "value_too_large",
-                    f"Value 0x{raw_part} is too large for a {chunk_byte_size}-byte field."
+                    f"Input '{e.input_value}' contains non-hexadecimal characters."
                 )
+            raise HexProcessingError(
+                "invalid_input",
+                f"Could not convert '{e.input_value}' to a number."
+            )
+        except ValueError as e:
+            raise HexProcessingError("conversion_error", str(e))
 
-            final_hex_parts.append(bytes_for_chunk.hex())
-            debug_bytes.append(bytes_for_chunk)
-
-        debug_lines = []
-        for i, chunk in enumerate(debug_bytes):
-            hex_chars = [f"{b:02x}" for b in chunk]
-            debug_lines.append(f"Box {i+1} ({len(chunk)} bytes): {' '.join(hex_chars)}")
-
-        return "".join(final_hex_parts), debug_lines
+        return data.hex(), BoxDebugLines(data, [size for _, size in parts])
 
     def browse_file(self):
         file_path = filedialog.askopenfilename(
@@ -170,6 +240,98 @@ class StructPresenter:
         except Exception as e:
             return {'type': 'error', 'message': get_string('msg_file_load_error').format(error=str(e))}
 
+    def browse_file_async(self, on_result):
+        """選擇檔案後於背景載入；``on_result`` 於主執行緒收到與 ``browse_file`` 相同格式的結果。"""
+        file_path = filedialog.askopenfilename(
+            title=get_string("dialog_select_file"),
+            filetypes=(("Header files", "*.h"), ("All files", "*.*" ))
+        )
+        if not file_path:
+            on_result({'type': 'error', 'message': get_string('msg_no_file_selected')})
+            return None
+        return self.load_file_async(file_path, on_result)
+
+    def load_file_async(self, file_path, on_result=None, target_name=None):
+        """在背景執行緒讀檔、解析與計算 layout，完成後於主執行緒套用到 model。
+
+        進度以 ``context["pending_action"]`` 呈現；新的載入會取消並取代尚未
+        完成的舊載入（舊結果直接丟棄）。回傳此次載入的 generation。
+        """
+        self.context["loading"] = True
+        self.context["pending_action"] = get_string("pending_loading_file").format(percent=0)
+        self.context["debug_info"]["last_event"] = "load_file_async"
+        self.context["debug_info"]["last_event_args"] = {"file_path": file_path}
+        self.push_context()
+
+        def on_progress(done, total):
+            percent = int(done * 100 / total) if total else 100
+            self.context["pending_action"] = get_string("pending_loading_file").format(percent=percent)
+            self.push_context()
+
+        def on_done(loaded):
+            self._finish_file_load()
+            try:
+                struct_name, layout, total_size, struct_align = self.model.apply_struct_file(loaded)
+            except Exception as e:
+                on_error(e)
+                return
+            result = {
+                'type': 'ok',
+                'file_path': file_path,
+                'struct_name': struct_name,
+                'layout': layout,
+                'total_size': total_size,
+                'struct_align': struct_align,
+                'struct_content': loaded["content"],
+            }
+            if on_result is not None:
+                on_result(result)
+
+        def on_error(e):
+            self._finish_file_load(error=str(e))
+            if on_result is not None:
+                on_result({'type': 'error', 'message': get_string('msg_file_load_error').format(error=str(e))})
+
+        generation = self._file_loader.start(
+            lambda progress: self.model.read_struct_file(file_path, target_name, progress=progress),
+            on_done, on_error=on_error, on_progress=on_progress)
+        self._main_queue.start()
+        return generation
+
+    def cancel_file_load(self):
+        """取消進行中的背景載入；回傳是否有載入被取消。"""
+        if not self._file_loader.cancel():
+            return False
+        self._finish_file_load()
+        self.context["debug_info"]["last_event"] = "cancel_file_load"
+        self.context["debug_info"]["last_error"] = get_string("msg_file_load_cancelled")
+        self.push_context()
+        return True
+
+    def _finish_file_load(self, error=None):
+        self.context["loading"] = False
+        self.context["pending_action"] = None
+        if error is not None:
+            # 錯誤對話框由 on_result 的呼叫端顯示，這裡只記錄於 debug_info
+            self.context["debug_info"]["last_error"] = error
+
+    def _view_after(self):
+        """Tk view 的 ``after``；無 view（測試、CLI）時為 None。"""
+        if self.view and hasattr(self.view, "after"):
+            return self.view.after
+        return None
+
+    def _background_busy(self):
+        return self._file_loader.busy() or self._live_worker.busy() or self._index_worker.busy()
+
+    async def parse_file(self, file_path):
+        """於 executor 執行緒讀檔與解析（不阻塞 event loop），套用到 model 後回傳 AST dict。"""
+        import asyncio  # 僅 async API 使用，啟動時不載入
+        loop = asyncio.get_running_loop()
+        loaded = await loop.run_in_executor(None, self.model.read_struct_file, file_path)
+        self.model.apply_struct_file(loaded)
+        return self.model.get_struct_ast()
+
     async def on_load_file(self, file_path):
         self.context["loading"] = True
         self.context["debug_info"]["last_event"] = "on_load_file"
@@ -235,6 +397,78 @@ class StructPresenter:
         except Exception as e:
             return {'type': 'error', 'message': get_string('msg_hex_parse_error').format(error=str(e))}
 
+    # live decode（decode-as-you-type）
+    def set_live_decode(self, enabled):
+        self._live_decode = bool(enabled)
+        self.context.setdefault("extra", {})["live_decode"] = self._live_decode
+        if not self._live_decode:
+            self._cancel_live_decode()
+        self.context["debug_info"]["last_event"] = "set_live_decode"
+        self.context["debug_info"]["last_event_args"] = {"enabled": self._live_decode}
+        self.push_context()
+        return {"live_decode": self._live_decode}
+
+    def on_hex_input_changed(self):
+        """hex 輸入變更：live 模式下 debounce 後於背景 decode。"""
+        if not self._live_decode or not self.model.layout or not self.view:
+            return
+        self._cancel_live_timer()
+        if hasattr(self.view, "after"):
+            try:
+                self._live_after_id = self.view.after(self._live_decode_delay_ms, self._submit_live_decode)
+                return
+            except Exception:
+                pass
+        self._submit_live_decode()
+
+    def _cancel_live_timer(self):
+        if self._live_after_id is not None and self.view and hasattr(self.view, "after_cancel"):
+            try:
+                self.view.after_cancel(self._live_after_id)
+            except Exception:
+                pass
+        self._live_after_id = None
+
+    def _cancel_live_decode(self):
+        self._cancel_live_timer()
+        self._live_worker.cancel()
+
+    def _submit_live_decode(self):
+        """在主執行緒取 bytes 快照，交給 worker；新的編輯會讓舊工作過時並中止。"""
+        self._live_after_id = None
+        if not self.model.layout or not hasattr(self.view, "get_hex_input_snapshot"):
+            return None
+        data, unit_size = self.view.get_hex_input_snapshot()
+        byte_order = 'little' if self.view.get_selected_endianness() == "Little Endian" else 'big'
+        layout, total_size = self.model.layout, self.model.total_size
+
+        def job(is_stale):
+            raw = self.input_processor.process_box_bytes(data, unit_size, byte_order)
+            return self.model.decode_bytes(raw, byte_order, layout=layout, total_size=total_size,
+                                           should_stop=is_stale)
+
+        def on_error(e):
+            self.context["debug_info"]["last_error"] = get_string('msg_hex_parse_error').format(error=str(e))
+            self.push_context()
+
+        generation = self._live_worker.submit(job, self._apply_live_decode, on_error=on_error)
+        self._main_queue.start()
+        return generation
+
+    def _apply_live_decode(self, result):
+        parsed_values = self.model.apply_decoded(result)
+        if parsed_values is None or not self.view:
+            return
+        try:
+            if hasattr(self.view, "show_parsed_values_incremental"):
+                self.view.show_parsed_values_incremental(parsed_values, result.changed)
+            elif hasattr(self.view, "show_parsed_values"):
+                self.view.show_parsed_values(parsed_values)
+            if hasattr(self.view, "on_values_refreshed"):
+                self.view.on_values_refreshed()
+        except Exception:
+            pass
+
     # v26: input mode and flexible input parsing
     def set_input_mode(self, mode: str):
         if mode not in ("grid", "flex_string"):
@@ -287,7 +521,13 @@ class StructPresenter:
         return self.model.validate_manual_struct(struct_data["members"], struct_data["total_size"])
 
     def on_manual_struct_change(self, struct_data):
-        errors = self.model.validate_manual_struct(struct_data["members"], struct_data["total_size"])
+        validator = getattr(self.model, "manual_validator", None)
+        if isinstance(validator, ManualStructValidator):
+            # 由成員差異推得 add/remove/rename/retype 事件，只重新驗證變動的成員
+            validator.apply(validator.diff(struct_data["members"]))
+            errors = validator.errors(struct_data["total_size"])
+        else:
+            errors = self.model.validate_manual_struct(struct_data["members"], struct_data["total_size"])
         return {"errors": errors}
 
     def on_export_manual_struct(self):
@@ -322,31 +562,14 @@ class StructPresenter:
     def compute_member_layout(self, members, total_size):
         """計算 struct member 的 layout，回傳 layout list，含 LRU cache 機制。"""
         cache_key = self._make_cache_key(members, total_size)
-        if self._lru_cache_size > 0 and cache_key in self._layout_cache:
-            self._cache_hits += 1
-            # LRU: move to end
-            self._layout_cache.move_to_end(cache_key)
-            self._last_hit_key = cache_key  # 新增
-            return self._layout_cache[cache_key]
-        try:
-            start = time.perf_counter()
-            layout = self.model.calculate_manual_layout(members, total_size)
-            elapsed = time.perf_counter() - start
-            self._last_layout_time = elapsed
-        except Exception:
-            # 不記錄 miss，不快取
-            raise
-        if self._lru_cache_size > 0:
-            self._layout_cache[cache_key] = layout
-            self._layout_cache.move_to_end(cache_key)
-            while len(self._layout_cache) > self._lru_cache_size:
-                evicted = self._layout_cache.popitem(last=False)
-                self._last_evict_key = evicted[0]  # 新增
-        else:
-            # cache size 0，不儲存任何項目
-            self._layout_cache.clear()
-        self._cache_misses += 1
-        return layout
+        cached = self._layout_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+        # 例外時不記錄 miss，也不快取
+        start = time.perf_counter()
+        layout = self.model.calculate_manual_layout(members, total_size)
+        self._last_layout_time = time.perf_counter() - start
+        return self._layout_cache.store(cache_key, layout)
 
     def get_last_layout_time(self):
         """回傳最近一次 layout 計算（非 cache）所花秒數（float）。"""
@@ -356,9 +579,57 @@ class StructPresenter:
         """回傳 (hit, miss) 統計。"""
         return self._cache_hits, self._cache_misses
 
+    def get_layout_cache_stats(self):
+        """回傳 layout cache 的 hit ratio、bytes、evictions 等統計 dict（Debug tab 用）。"""
+        return self._layout_cache.stats()
+
+    def get_stage_metrics(self):
+        """回傳各 stage 的 count/total/p50/p95/max/last（秒），Debug tab 用。"""
+        return self.metrics.snapshot()
+
+    def dump_metrics_json(self, path=None):
+        """stage metrics 的 JSON 字串；指定 ``path`` 時寫入檔案並回傳路徑。"""
+        if path is None:
+            return self.metrics.to_json()
+        return self.metrics.dump_json(path)
+
+    def arm_profile(self, path=None):
+        """下一次 load / decode / export 以 cProfile 執行並寫出 .pstats（``path`` 可為檔案或目錄）。"""
+        PROFILER.arm(path)
+        self.context["debug_info"]["last_event"] = "arm_profile"
+        self.context["debug_info"]["last_event_args"] = {"path": path}
+        self.push_context()
+
+    def disarm_profile(self):
+        PROFILER.disarm()
+
+    def is_profile_armed(self):
+        return PROFILER.armed
+
+    def get_last_profile(self):
+        """最近一次 capture 的 ``ProfileReport``（含 cumulative 前 30 名）；尚未 capture 時為 None。"""
+        return PROFILER.last_report
+
+    def get_memory_report(self, measure_pipeline=False):
+        """記憶體報告：目前 model/context 的 deep size 估算；``measure_pipeline`` 時另以新的
+        model 重新載入最後的 .h，記錄各 stage 的 tracemalloc 差異。
+
+        重新載入在呼叫端執行緒同步進行且比一般載入慢數倍，Debug tab 只取 deep size；
+        完整 stage 報告請用 ``tools/memory_report.py``。"""
+        from src.model.memory_report import measure_header, object_sizes
+        report = {}
+        path = getattr(self.model, "last_loaded_file_path", None)
+        if measure_pipeline and path:
+            try:
+                report = measure_header(path, target_name=getattr(self.model, "struct_name", None),
+                                        presenter_cls=type(self))
+            except Exception as e:
+                report = {"error": str(e)}
+        report["objects"] = object_sizes(self.model, self, self.view)
+        return report
+
     def reset_cache_stats(self):
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self._layout_cache.reset_stats()
 
     def calculate_remaining_space(self, members, total_size):
         """計算剩餘可用空間（bits, bytes）。"""
@@ -377,22 +648,16 @@ class StructPresenter:
         return {
             "capacity": self._lru_cache_size,
             "current_size": len(self._layout_cache),
-            "last_hit": self._last_hit_key,
-            "last_evict": self._last_evict_key
+            "last_hit": self._layout_cache.last_hit,
+            "last_evict": self._layout_cache.last_evict
         }
 
     def set_lru_cache_size(self, size):
         """動態調整 LRU cache 容量，並自動淘汰多餘項目。"""
         if not isinstance(size, int) or size < 0:
             raise ValueError("Cache size must be a non-negative integer")
+        # 淘汰多餘項目；設為 0 時直接清空 cache
         self._lru_cache_size = size
-        # 淘汰多餘項目
-        while len(self._layout_cache) > self._lru_cache_size:
-            evicted = self._layout_cache.popitem(last=False)
-            self._last_evict_key = evicted[0]
-        # 若設為 0，直接清空 cache
-        if self._lru_cache_size == 0:
-            self._layout_cache.clear()
 
     def get_lru_cache_size(self):
         """回傳目前 LRU cache 容量。"""
@@ -465,7 +730,7 @@ class StructPresenter:
         }
 
     def reset_context(self):
-        self.context = self.get_default_context()
+        self.context = TrackedContext(self.get_default_context())
         self.push_context()
 
     def push_context(self, immediate=False):
@@ -474,18 +739,24 @@ class StructPresenter:
         if self.context["debug_info"].get("last_event") not in ("on_undo", "on_redo"):
             self.context["redo_history"] = []
         self.context["last_update_time"] = time.time()
+        changed_keys = None
+        # 外部直接指派的一般 dict 無法得知變動的 key，history 退回逐一比較
+        tracked = isinstance(self.context, TrackedContext)
+        snapshotted = False
         # 更新 context_history, api_trace
         if "debug_info" in self.context:
-            import copy
-            history = self.context["debug_info"].setdefault("context_history", [])
-            # --- 避免 reference loop ---
-            ctx_copy = copy.deepcopy(self.context)
-            if "debug_info" in ctx_copy:
-                ctx_copy["debug_info"]["context_history"] = []
-                ctx_copy["debug_info"]["api_trace"] = []
-            history.append(ctx_copy)
-            if len(history) > self._history_maxlen:
-                del history[0:len(history)-self._history_maxlen]
+            history = self.context["debug_info"].get("context_history")
+            if not isinstance(history, ContextHistory):
+                # 舊格式（list）轉為 ContextHistory，保留既有快照
+                legacy = history or []
+                history = ContextHistory(max_bytes=self._history_budget_bytes)
+                history.extend(legacy)
+                self.context["debug_info"]["context_history"] = history
+            history.set_limits(self._history_budget_bytes, self._history_maxlen)
+            # 快照共享未變更子樹，AST 僅以版本 id 參照
+            history.append(self.context, self.context.dirty_keys if tracked else None)
+            snapshotted = True
+            changed_keys = history.last_changed_keys
             api_trace = self.context["debug_info"].setdefault("api_trace", [])
             api_trace.append({
                 "api": self.context["debug_info"].get("last_event"),
@@ -494,10 +765,15 @@ class StructPresenter:
             })
             if len(api_trace) > self._history_maxlen:
                 del api_trace[0:len(api_trace)-self._history_maxlen]
-        from src.presenter.context_schema import validate_presenter_context
-        validate_presenter_context(self.context)
+        with self.metrics.span(CONTEXT_VALIDATION):
+            self._context_validator.validate(self.context, changed_keys)
+        if tracked and snapshotted:
+            # 驗證讀取 context 之後才清除，避免驗證本身把 key 標成 dirty
+            self.context.clear_dirty()
         # Debounce/throttle 推送（改為 Tk after）
         nodes = self.model.get_display_nodes(self.context["display_mode"]) if self.model and hasattr(self.model, "get_display_nodes") else None
+        self._prepare_search_index(self.context["display_mode"], nodes)
+        nodes = self._apply_filter(nodes)
         ctx_copy = self.context.copy()
         if immediate or self._debounce_interval == 0:
             self._schedule_view_update(nodes, ctx_copy)
@@ -511,17 +787,20 @@ class StructPresenter:
             except Exception:
                 pass
             delay_ms = int(self._debounce_interval * 1000)
-            if self.view and hasattr(self.view, "after"):
+            use_after = bool(self.view and hasattr(self.view, "after"))
+            if use_after:
                 self._after_id = self.view.after(delay_ms, self._flush_pending_ui)
-            else:
-                # 無法使用 after（測試/Dummy），退回同步執行
-                self._flush_pending_ui()
+        if not use_after:
+            # 無法使用 after（測試/Dummy），退回同步執行；須在釋放 lock 後呼叫以免死結
+            self._flush_pending_ui()
 
     def on_pointer_mode_toggle(self, enable_32bit: bool):
         """Toggle pointer mode between 64-bit and 32-bit.
 
-        When toggled, update context arch_mode, set pointer size via model.types,
-        invalidate layout cache, and push updated context to view.
+        When toggled, update context arch_mode, set pointer size via model.types
+        and push updated context to view. The layout cache and the model's
+        display caches subscribe to the type registry and are invalidated by
+        ``set_pointer_mode`` itself (only when the pointer size really changes).
         """
         try:
             from src.model.types import set_pointer_mode
@@ -531,7 +810,6 @@ class StructPresenter:
         self.context["arch_mode"] = mode
         bits = 32 if enable_32bit else 64
         set_pointer_mode(bits)
-        self.invalidate_cache()
         self.context["debug_info"]["last_event"] = "on_pointer_mode_toggle"
         self.context["debug_info"]["last_event_args"] = {"enable_32bit": enable_32bit}
         self.push_context()
@@ -549,7 +827,16 @@ class StructPresenter:
         """主執行緒排程更新 View。"""
         if self.view and hasattr(self.view, "after"):
             try:
-                self.view.after(0, lambda: self.view.update_display(nodes, context))
+                # 尚未執行的舊更新直接取消，只保留最新一次（View 端再依 frame budget 分批）
+                if getattr(self, "_view_update_id", None) is not None and hasattr(self.view, "after_cancel"):
+                    try:
+                        self.view.after_cancel(self._view_update_id)
+                    except Exception:
+                        pass
+                def run():
+                    self._view_update_id = None
+                    self.view.update_display(nodes, context)
+                self._view_update_id = self.view.after(0, run)
                 return
             except Exception:
                 pass
@@ -605,6 +892,112 @@ class StructPresenter:
         if node_id in self.context["expanded_nodes"]:
             self.context["expanded_nodes"].remove(node_id)
 
+    @event_handler("on_expand_all")
+    def on_expand_all(self):
+        # 只記錄有子節點的 id；實際插入由 View 分批載入
+        mode = self.context.get("display_mode", "tree")
+        expanded = []
+        stack = list(reversed(self.get_display_nodes(mode) or []))
+        while stack:
+            node = stack.pop()
+            children = node.get("children") or []
+            if children:
+                expanded.append(node["id"])
+                stack.extend(reversed(children))
+        self.context["expanded_nodes"] = expanded
+
+    @event_handler("on_collapse_all")
+    def on_collapse_all(self):
+        # 只保留根節點展開
+        mode = self.context.get("display_mode", "tree")
+        self.context["expanded_nodes"] = [n["id"] for n in self.get_display_nodes(mode) or []]
+
+    @event_handler("on_search")
+    def on_search(self, search_str):
+        # 以索引查詢；"=值" 以 decode 後的 value 前綴搜尋
+        self.context["search"] = search_str
+        self.context["highlighted_nodes"] = self.get_search_index().search(search_str) if search_str else []
+
+    @event_handler("on_filter")
+    def on_filter(self, filter_str):
+        # 實際修剪於 push_context（_apply_filter）進行
+        self.context["filter"] = filter_str
+
+    def _search_index_key(self, mode, nodes):
+        structure = getattr(self.model, "structure_version", None)
+        if structure is None:
+            return (mode, id(nodes))
+        return (mode, structure, getattr(self.model, "array_fold_size", None))
+
+    def _prepare_search_index(self, mode, nodes):
+        """display nodes 變更時於背景建立索引：結構變更重建整個索引，decode 後只重建 value 索引。"""
+        if not isinstance(nodes, list) or not nodes:
+            return
+        key = self._search_index_key(mode, nodes)
+        pending = self._index_pending
+        if pending is not None and pending[0] == key and pending[1] is nodes:
+            return
+        current = self._search_index
+        if current is not None and current[0] == key:
+            index = current[1]
+            if index.has_values(nodes):
+                return
+
+            def job(is_stale):
+                pairs = build_value_index(nodes, index.ids, index.positions, is_stale)
+                if not is_stale():
+                    self._index_result = (key, index, nodes, pairs)
+        else:
+            def job(is_stale):
+                index = NodeSearchIndex(nodes, is_stale)
+                pairs = build_value_index(nodes, index.ids, index.positions, is_stale)
+                if not is_stale():  # 結果直接放入 slot，get_search_index 等待時不必經過主執行緒佇列
+                    self._index_result = (key, index, nodes, pairs)
+        self._index_pending = (key, nodes)
+        self._index_worker.submit(job, lambda _: self._apply_index_result())
+        self._main_queue.start()
+
+    def _apply_index_result(self):
+        result, self._index_result = self._index_result, None
+        if result is None:
+            return
+        key, index, nodes, pairs = result
+        current = self._search_index
+        if current is None or current[0] != key:
+            current = self._search_index = (key, index)
+        if current[1] is index:
+            index.set_values(nodes, pairs)
+
+    def get_search_index(self, mode=None):
+        """回傳目前 display nodes 的 NodeSearchIndex（結構未變時重用，只刷新 value 索引）。
+
+        索引通常已由 push_context 在背景建好；仍在建立中時等待它完成，
+        沒有排入背景（例如未經 push_context）時才在呼叫端同步建立。
+        """
+        mode = mode or self.context.get("display_mode", "tree")
+        nodes = self.get_display_nodes(mode) or []
+        key = self._search_index_key(mode, nodes)
+        pending = self._index_pending
+        if pending is not None and pending[0] == key:
+            self._index_worker.wait_idle()
+            self._apply_index_result()
+        current = self._search_index
+        if current is None or current[0] != key:
+            current = self._search_index = (key, NodeSearchIndex(nodes))
+        current[1].refresh_values(nodes)
+        return current[1]
+
+    def _apply_filter(self, nodes):
+        query = self.context.get("filter")
+        if not query or not nodes:
+            return nodes
+        cached = self._filter_cache
+        if cached and cached[0] is nodes and cached[1] == query:
+            return cached[2]
+        filtered = self.get_search_index().filter_nodes(nodes, query)
+        self._filter_cache = (nodes, query, filtered)
+        return filtered
+
     @event_handler("on_refresh")
     def on_refresh(self):
         # 清空 highlighted_nodes，確保 refresh 後 UI 狀態回到預設
@@ -638,7 +1031,7 @@ class StructPresenter:
             if "redo_history" not in self.context:
                 self.context["redo_history"] = []
             self.context["redo_history"].append(self.context.copy())
-            self.context = self.context["history"].pop()
+            self.context = TrackedContext(self.context["history"].pop())
         # 補寫 last_event/last_event_args，確保 contract 一致
         self.context["debug_info"]["last_event"] = "on_undo"
         self.context["debug_info"]["last_event_args"] = {}
@@ -650,7 +1043,7 @@ class StructPresenter:
             if "history" not in self.context:
                 self.context["history"] = []
             self.context["history"].append(self.context.copy())
-            self.context = self.context["redo_history"].pop()
+            self.context = TrackedContext(self.context["redo_history"].pop())
         # 補寫 last_event/last_event_args，確保 contract 一致
         self.context["debug_info"]["last_event"] = "on_redo"
         self.context["debug_info"]["last_event_args"] = {}
@@ -708,6 +1101,13 @@ class StructPresenter:
             return self.model.get_display_nodes(mode)
         return []
 
+    def get_node_id_map(self, mode):
+        """對外 API：回傳 {node id: int} 緊湊索引（DFS 順序），供 View 使用。"""
+        if hasattr(self.model, "get_node_id_map"):
+            return self.model.get_node_id_map(mode)
+        from src.model.struct_model import build_node_id_map
+        return build_node_id_map(self.get_display_nodes(mode))
+
     def set_import_target_struct(self, name: str):
         """v17: 指定要顯示的根 struct/union 名稱，切換並推送 UI。"""
         if not hasattr(self.model, "set_import_target_struct"):
@@ -0,0 +1,471 @@
+"""Canvas-based hex editor for the hex input grid.
+
+The old grid created one ``tk.Entry`` (plus two key bindings) per unit-size
+box, i.e. 65,536 widgets for a 64 KB struct in 1-byte mode. ``HexEditor``
+draws only the visible rows on a single ``tk.Canvas`` and keeps the bytes in
+a ``HexBuffer`` (``bytearray``):
+
+- cursor editing per nibble, arrow/Home/End navigation and clipboard paste;
+- ``unit_size`` only groups bytes into boxes when rendering;
+- field boundaries from the struct layout are shaded alternately;
+- ``HexBuffer.parts()`` is a lazy view producing the ``(hex, expected_chars)``
+  pairs the presenter expects, without copying the buffer.
+
+``BoxEntries`` keeps the former ``hex_entries`` list API
+(``(entry, expected_chars)`` pairs with ``get``/``delete``/``insert``) on top of
+the buffer for callers that still edit boxes one by one.
+"""
+
+import string
+from bisect import bisect_right
+from collections.abc import Sequence
+
+_HEX = set(string.hexdigits)
+
+
+class HexBuffer:
+    """Bytes being edited, grouped into ``unit_size`` boxes.
+
+    Box text is the box's bytes in display order (``"01020304"``); the
+    presenter applies endianness per box as before.
+    """
+
+    def __init__(self, total_size=0, unit_size=1):
+        self.data = bytearray(total_size)
+        self.unit_size = max(1, unit_size)
+        self.field_starts = []  # 每個欄位起始 offset（遞增）
+
+    @property
+    def total_size(self):
+        return len(self.data)
+
+    def resize(self, total_size, unit_size):
+        """Change size/grouping; existing bytes are kept (truncated or zero-padded)."""
+        self.unit_size = max(1, unit_size)
+        if total_size < len(self.data):
+            del self.data[total_size:]
+        elif total_size > len(self.data):
+            self.data.extend(bytes(total_size - len(self.data)))
+
+    def clear(self):
+        self.data[:] = bytes(len(self.data))
+
+    # boxes ------------------------------------------------------------------
+    @property
+    def box_count(self):
+        return -(-len(self.data) // self.unit_size)
+
+    def box_span(self, index):
+        start = index * self.unit_size
+        return start, min(len(self.data), start + self.unit_size)
+
+    def box_chars(self, index):
+        start, end = self.box_span(index)
+        return (end - start) * 2
+
+    def box_text(self, index):
+        start, end = self.box_span(index)
+        return self.data[start:end].hex()
+
+    def set_box_text(self, index, text):
+        """Set a box from typed text; shorter text is zero-filled on the left."""
+        text = (text or "").strip()
+        chars = self.box_chars(index)
+        if len(text) > chars or not set(text) <= _HEX:
+            raise ValueError(f"Invalid hex for box {index}: {text!r}")
+        start, end = self.box_span(index)
+        self.data[start:end] = bytes.fromhex(text.zfill(chars))
+
+    def parts(self):
+        return HexPartsView(self)
+
+    # nibble editing ------------------------------------------------------------
+    @property
+    def nibble_count(self):
+        return len(self.data) * 2
+
+    def get_nibble(self, pos):
+        byte = self.data[pos // 2]
+        return byte >> 4 if pos % 2 == 0 else byte & 0x0F
+
+    def set_nibble(self, pos, digit):
+        value = int(digit, 16) if isinstance(digit, str) else digit
+        index = pos // 2
+        byte = self.data[index]
+        if pos % 2 == 0:
+            self.data[index] = (value << 4) | (byte & 0x0F)
+        else:
+            self.data[index] = (byte & 0xF0) | value
+
+    def paste(self, pos, text):
+        """Overwrite nibbles from ``pos`` with the hex digits in ``text``.
+
+        Whitespace and ``0x`` prefixes are ignored; returns the new cursor.
+        """
+        digits = "".join((text or "").replace("0x", " ").replace("0X", " ").split())
+        if not set(digits) <= _HEX:
+            raise ValueError(f"Invalid hex: {text!r}")
+        digits = digits[: max(0, self.nibble_count - pos)]
+        if pos % 2 == 0 and len(digits) % 2 == 0:
+            self.data[pos // 2:(pos + len(digits)) // 2] = bytes.fromhex(digits)
+        else:
+            for i, d in enumerate(digits):
+                self.set_nibble(pos + i, d)
+        return pos + len(digits)
+
+    # layout ----------------------------------------------------------------
+    def set_layout(self, layout):
+        """Take field start offsets from layout items (``offset``/``size``)."""
+        starts = set()
+        for item in layout or []:
+            try:
+                starts.add(int(item.get("offset")))
+            except (TypeError, ValueError):
+                continue
+        self.field_starts = sorted(starts)
+
+    def field_index(self, offset):
+        """Index of the field containing ``offset`` (-1 before the first field)."""
+        return bisect_right(self.field_starts, offset) - 1
+
+
+class HexPartsView(Sequence):
+    """``[(box_hex, expected_chars), ...]`` computed per access from the buffer."""
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+
+    def __len__(self):
+        return self._buffer.box_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._buffer.box_text(index), self._buffer.box_chars(index)
+
+
+class BoxEntry:
+    """Entry-like proxy for one box (``get``/``delete``/``insert``)."""
+
+    __slots__ = ("_buffer", "index")
+
+    def __init__(self, buffer, index):
+        self._buffer = buffer
+        self.index = index
+
+    def get(self):
+        return self._buffer.box_text(self.index)
+
+    def delete(self, first, last=None):
+        text = self.get()
+        end = len(text) if last in (None, "end") else int(last)
+        if last is None:
+            end = int(first) + 1
+        self._buffer.set_box_text(self.index, text[:int(first)] + text[end:])
+
+    def insert(self, index, text):
+        current = self.get()
+        # 舊 Entry 行為：delete(0, end) 後 insert；全為 0 的 box 視為空白
+        if not current.strip("0"):
+            current = ""
+        pos = len(current) if index == "end" else int(index)
+        self._buffer.set_box_text(self.index, current[:pos] + text + current[pos:])
+
+
+class BoxEntries(Sequence):
+    """``hex_entries`` compatible view: ``(BoxEntry, expected_chars)`` per box."""
+
+    def __init__(self, buffer=None):
+        self._buffer = buffer
+
+    def attach(self, buffer):
+        self._buffer = buffer
+
+    @property
+    def buffer(self):
+        return self._buffer
+
+    def parts(self):
+        return self._buffer.parts() if self._buffer is not None else []
+
+    def __len__(self):
+        return self._buffer.box_count if self._buffer is not None else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return BoxEntry(self._buffer, index), self._buffer.box_chars(index)
+
+
+class HexEditor:
+    """Draw and edit a ``HexBuffer`` on a canvas, one screen of rows at a time."""
+
+    FIELD_COLORS = ("#ffffff", "#eef3ff")
+    CURSOR_COLOR = "#ffd54f"
+    BYTES_PER_ROW = 16
+
+    def __init__(self, canvas, buffer=None, scrollbar=None, font=("Courier", 10),
+                 on_change=None):
+        self.canvas = canvas
+        self.buffer = buffer if buffer is not None else HexBuffer()
+        self.scrollbar = scrollbar
+        self.font = font
+        self.on_change = on_change
+        self.first_row = 0
+        self.cursor = 0  # nibble index
+        self.char_width, self.row_height = self._measure_font(font)
+        self.margin = self.char_width * 7  # offset 欄
+        self.box_gap = self.char_width
+        if scrollbar is not None:
+            try:
+                scrollbar.configure(command=self.yview)
+            except Exception:
+                pass
+        for seq, handler in (
+            ("<Configure>", lambda e: self.render()),
+            ("<MouseWheel>", self._on_wheel),
+            ("<Button-4>", self._on_wheel),
+            ("<Button-5>", self._on_wheel),
+            ("<Button-1>", self._on_click),
+            ("<Key>", self._on_key),
+            ("<<Paste>>", self._on_paste),
+            ("<Control-v>", self._on_paste),
+        ):
+            try:
+                canvas.bind(seq, handler)
+            except Exception:
+                pass
+
+    @staticmethod
+    def _measure_font(font):
+        try:
+            from tkinter import font as tkfont
+            f = tkfont.Font(font=font)
+            return f.measure("0"), f.metrics("linespace") + 4
+        except Exception:
+            return 8, 18
+
+    # geometry ------------------------------------------------------------------
+    @property
+    def boxes_per_row(self):
+        return max(1, self.BYTES_PER_ROW // self.buffer.unit_size)
+
+    @property
+    def bytes_per_row(self):
+        return self.boxes_per_row * self.buffer.unit_size
+
+    @property
+    def row_count(self):
+        return -(-self.buffer.total_size // self.bytes_per_row)
+
+    @property
+    def visible_rows(self):
+        try:
+            height = int(self.canvas.winfo_height())
+        except Exception:
+            height = 0
+        return max(1, height // self.row_height)
+
+    def _byte_x(self, byte_in_row):
+        unit = self.buffer.unit_size
+        box, within = divmod(byte_in_row, unit)
+        return self.margin + box * (unit * 2 * self.char_width + self.box_gap) + within * 2 * self.char_width
+
+    def hit_test(self, x, y):
+        """Nibble index under canvas point ``(x, y)`` or None."""
+        row = self.first_row + int(y // self.row_height)
+        if row >= self.row_count or x < self.margin:
+            return None
+        unit = self.buffer.unit_size
+        box_width = unit * 2 * self.char_width
+        box, rest = divmod(int(x - self.margin), box_width + self.box_gap)
+        if box >= self.boxes_per_row or rest >= box_width:
+            return None
+        nibble = row * self.bytes_per_row * 2 + box * unit * 2 + rest // self.char_width
+        return nibble if nibble < self.buffer.nibble_count else None
+
+    # buffer --------------------------------------------------------------------
+    def configure_buffer(self, total_size, unit_size):
+        self.buffer.resize(total_size, unit_size)
+        self.cursor = min(self.cursor, max(0, self.buffer.nibble_count - 1))
+        self._clamp()
+        self.render()
+
+    def set_layout(self, layout):
+        self.buffer.set_layout(layout)
+        self.render()
+
+    def clear(self):
+        self.buffer.clear()
+        self.render()
+
+    # scrolling -----------------------------------------------------------------
+    def _clamp(self):
+        self.first_row = max(0, min(self.first_row, self.row_count - self.visible_rows))
+
+    def scroll_rows(self, rows):
+        old = self.first_row
+        self.first_row += rows
+        self._clamp()
+        if self.first_row != old:
+            self.render()
+
+    def yview(self, *args):
+        if not args:
+            total = max(1, self.row_count)
+            return self.first_row / total, min(1.0, (self.first_row + self.visible_rows) / total)
+        if args[0] == "moveto":
+            self.first_row = int(float(args[1]) * self.row_count)
+            self._clamp()
+            self.render()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and str(args[2]).startswith("page"):
+                amount *= self.visible_rows
+            self.scroll_rows(amount)
+        return None
+
+    def ensure_cursor_visible(self):
+        row = self.cursor // (self.bytes_per_row * 2)
+        if row < self.first_row:
+            self.first_row = row
+        elif row >= self.first_row + self.visible_rows:
+            self.first_row = row - self.visible_rows + 1
+        self._clamp()
+
+    # events --------------------------------------------------------------------
+    def _on_wheel(self, event):
+        delta = getattr(event, "delta", 0) or 0
+        up = delta > 0 or getattr(event, "num", 0) == 4
+        self.scroll_rows(-3 if up else 3)
+        return "break"
+
+    def _on_click(self, event):
+        try:
+            self.canvas.focus_set()
+        except Exception:
+            pass
+        pos = self.hit_test(event.x, event.y)
+        if pos is not None:
+            self.cursor = pos
+            self.render()
+
+    def move_cursor(self, delta):
+        self.cursor = max(0, min(self.buffer.nibble_count - 1, self.cursor + delta))
+        self.ensure_cursor_visible()
+        self.render()
+
+    def type_digit(self, digit):
+        if self.buffer.nibble_count == 0:
+            return
+        self.buffer.set_nibble(self.cursor, digit)
+        self._changed()
+        self.move_cursor(1)
+
+    def paste(self, text):
+        self.cursor = min(self.buffer.paste(self.cursor, text), max(0, self.buffer.nibble_count - 1))
+        self._changed()
+        self.ensure_cursor_visible()
+        self.render()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def _on_key(self, event):
+        keysym = getattr(event, "keysym", "")
+        char = getattr(event, "char", "")
+        row_nibbles = self.bytes_per_row * 2
+        moves = {
+            "Left": -1, "Right": 1, "Up": -row_nibbles, "Down": row_nibbles,
+            "Prior": -row_nibbles * self.visible_rows, "Next": row_nibbles * self.visible_rows,
+        }
+        if keysym in moves:
+            self.move_cursor(moves[keysym])
+        elif keysym == "Home":
+            self.move_cursor(-(self.cursor % row_nibbles))
+        elif keysym == "End":
+            self.move_cursor(row_nibbles - 1 - self.cursor % row_nibbles)
+        elif keysym == "BackSpace":
+            if self.cursor > 0:
+                self.cursor -= 1
+                self.buffer.set_nibble(self.cursor, 0)
+                self._changed()
+            self.move_cursor(0)
+        elif keysym == "Delete":
+            self.buffer.set_nibble(self.cursor, 0)
+            self._changed()
+            self.render()
+        elif char and char in _HEX and not (getattr(event, "state", 0) & 0x4):
+            self.type_digit(char)
+        else:
+            return None
+        return "break"
+
+    def _on_paste(self, event=None):
+        try:
+            text = self.canvas.clipboard_get()
+        except Exception:
+            return "break"
+        try:
+            self.paste(text)
+        except ValueError:
+            pass
+        return "break"
+
+    # rendering -----------------------------------------------------------------
+    def render(self):
+        canvas = self.canvas
+        try:
+            canvas.delete("all")
+        except Exception:
+            return
+        buffer = self.buffer
+        data = buffer.data
+        per_row = self.bytes_per_row
+        unit = buffer.unit_size
+        cw, rh = self.char_width, self.row_height
+        last = min(self.row_count, self.first_row + self.visible_rows + 1)
+        for row in range(self.first_row, last):
+            y = (row - self.first_row) * rh
+            base = row * per_row
+            end = min(len(data), base + per_row)
+            canvas.create_text(2, y + rh // 2, anchor="w", text=f"{base:06x}",
+                               font=self.font, fill="gray")
+            # 欄位邊界：同一欄位的連續 byte 以交替底色標示
+            if buffer.field_starts:
+                run_start = base
+                run_field = buffer.field_index(base)
+                for offset in range(base + 1, end + 1):
+                    field = buffer.field_index(offset) if offset < end else None
+                    if field != run_field:
+                        x0 = self._byte_x(run_start - base)
+                        x1 = self._byte_x(offset - 1 - base) + 2 * cw
+                        canvas.create_rectangle(x0, y + 1, x1, y + rh - 1, width=0,
+                                                fill=self.FIELD_COLORS[run_field % 2])
+                        run_start, run_field = offset, field
+            for box_start in range(base, end, unit):
+                text = data[box_start:min(end, box_start + unit)].hex()
+                canvas.create_text(self._byte_x(box_start - base), y + rh // 2, anchor="w",
+                                   text=text, font=self.font)
+        cursor_byte = self.cursor // 2
+        cursor_row = cursor_byte // per_row if per_row else 0
+        if buffer.nibble_count and self.first_row <= cursor_row < last:
+            x = self._byte_x(cursor_byte - cursor_row * per_row) + (self.cursor % 2) * cw
+            y = (cursor_row - self.first_row) * rh
+            canvas.create_rectangle(x, y + 1, x + cw, y + rh - 1, outline=self.CURSOR_COLOR, width=2)
+        if self.scrollbar is not None:
+            try:
+                self.scrollbar.set(*self.yview())
+            except Exception:
+                pass
@@ -44,6 +44,7 @@ class StructLayout:
         self.parent = parent
         self.tree = tree or self._create_tree(parent)
         self.display_mode = "tree"  # placeholder for future behavior
+        self.scheduler = None  # 可選 ChunkedUpdateScheduler
 
     def _create_tree(self, parent):
         col_names = tuple(UNIFIED_LAYOUT_VALUE_COLUMNS)
@@ -102,8 +103,9 @@ class StructLayout:
     def set_rows(self, rows: List[Dict]):
         # Full rebuild
         try:
-            for iid in self.tree.get_children():
-                self.tree.delete(iid)
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
         except Exception:
             pass
         self._insert_rows(rows)
@@ -113,37 +115,38 @@ class StructLayout:
         self.set_rows(rows)
 
     def _insert_rows(self, rows: List[Dict]):
+        # 大量 rows 交給 scheduler 依 frame budget 分批插入（新資料到達時取消舊批次）
+        if self.scheduler is not None:
+            self.scheduler.run(str(self.tree), rows or [], self._insert_row)
+            return
         for row in rows or []:
-            try:
-                name_str = str(row.get("name", ""))
-                type_str = str(row.get("type", ""))
-                offset_str = str(row.get("offset", ""))
-                size_str = str(row.get("size", ""))
-                bit_offset = row.get("bit_offset")
-                bit_size = row.get("bit_size")
-                bit_offset_str = str(bit_offset) if bit_offset is not None else "-"
-                bit_size_str = str(bit_size) if bit_size is not None else "-"
-                is_bf_str = str(row.get("is_bitfield", False))
-                value = row.get("value", "")
-                hex_value = row.get("hex_value", "")
-                hex_raw = row.get("hex_raw", "")
-                if hex_raw and isinstance(hex_raw, str) and len(hex_raw) > 2:
-                    try:
-                        hex_raw = "｜".join(hex_raw[j:j+2] for j in range(0, len(hex_raw), 2))
-                    except Exception:
-                        pass
-                self.tree.insert("", "end", values=(
-                    name_str,
-                    type_str,
-                    offset_str,
-                    size_str,
-                    bit_offset_str,
-                    bit_size_str,
-                    is_bf_str,
-                    str(value) if value is not None else "",
-                    str(hex_value) if hex_value is not None else "",
-                    str(hex_raw) if hex_raw is not None else "",
-                ))
-            except Exception:
-                continue
+            self._insert_row(row)
+
+    def _insert_row(self, row: Dict):
+        try:
+            self.tree.insert("", "end", values=format_layout_row(row))
+        except Exception:
+            pass
+
 
+def format_layout_row(row: Dict) -> tuple:
+    """Return Treeview ``values`` for a unified layout/value row (all strings)."""
+    bit_offset = row.get("bit_offset")
+    bit_size = row.get("bit_size")
+    value = row.get("value", "")
+    hex_value = row.get("hex_value", "")
+    hex_raw = row.get("hex_raw", "")
+    if hex_raw and isinstance(hex_raw, str) and len(hex_raw) > 2:
+        hex_raw = "｜".join(hex_raw[j:j+2] for j in range(0, len(hex_raw), 2))
+    return (
+        str(row.get("name", "")),
+        str(row.get("type", "")),
+        str(row.get("offset", "")),
+        str(row.get("size", "")),
+        str(bit_offset) if bit_offset is not None else "-",
+        str(bit_size) if bit_size is not None else "-",
+        str(row.get("is_bitfield", False)),
+        str(value) if value is not None else "",
+        str(hex_value) if hex_value is not None else "",
+        str(hex_raw) if hex_raw is not None else "",
+    )
@@ -39,19 +39,25 @@ except Exception:
     filedialog = _DummyFileDialog()
 
 from .virtual_tree import VirtualTreeview
+from .tree_patch import (
+    TreeIndex, KeepSubtrees, LazyTreeLoader, build_tree_index, diff_tree_index,
+    apply_tree_ops, is_placeholder, subtree_within,
+)
 from src.config import get_string
-from src.export.csv_export import DefaultCsvExportService, CsvExportOptions, build_parsed_model_from_struct
 from src.model.struct_model import StructModel
+from src.model.metrics import METRICS, TREE_RENDER
 import time
 
 # v24: ensure GUI columns align with shared unified columns
 from src.config.columns import UNIFIED_LAYOUT_VALUE_COLUMNS  # noqa: F401
-from src.view.components.struct_layout import StructLayout
+from src.view.components.struct_layout import StructLayout, format_layout_row
+from .ui_scheduler import ChunkedUpdateScheduler
+from src.view.components.hex_editor import BoxEntries, HexEditor
 
 class _DummyVirtual:
     def __init__(self, tree):
         self.tree = tree
-    def set_nodes(self, nodes):
+    def set_nodes(self, nodes, expanded=None, keep_position=False):
         pass
     def _on_scroll(self, event):
         return "break"
@@ -59,6 +65,10 @@ class _DummyVirtual:
         return -1
     def reorder_nodes(self, parent_id, from_idx, to_idx):
         pass
+    def selection(self):
+        return self.tree.selection()
+    def selection_set(self, ids):
+        self.tree.selection_set(ids)
 
 # --- Treeview 巢狀遞迴插入與互動 helper ---
 MEMBER_TREEVIEW_COLUMNS = [
@@ -118,14 +128,22 @@ def create_layout_treeview(parent, yscrollcommand=None):
     tree.pack(side="left", fill="both", expand=True)
     return tree
 
+def _context_selection(context):
+    """context 中的選取 id（selected_nodes 優先，其次 selected_node）。"""
+    selected = context.get("selected_node")
+    selected_nodes = context.get("selected_nodes")
+    if isinstance(selected_nodes, (list, tuple)) and selected_nodes:
+        return list(selected_nodes)
+    if isinstance(selected, str) and selected:
+        return [selected]
+    return []
+
 def update_treeview_by_context(tree, context):
     # 展開/收合
     expanded = set(context.get("expanded_nodes", []))
     for item in tree.get_children(""):
         _update_treeview_expand_recursive(tree, item, expanded)
     # 高亮選取
-    selected = context.get("selected_node")
-    selected_nodes = context.get("selected_nodes")
     # 取得所有現有 id
     def collect_all_ids(tree, parent=""):
         ids = list(tree.get_children(parent))
@@ -133,15 +151,10 @@ def update_treeview_by_context(tree, context):
             ids.extend(collect_all_ids(tree, i))
         return ids
     all_ids = set(collect_all_ids(tree, ""))
-    # 僅在型別正確時才呼叫 selection_set，且只選取存在的 id
-    if isinstance(selected_nodes, (list, tuple)) and selected_nodes:
-        filtered = [i for i in selected_nodes if i in all_ids]
-        if filtered:
-            tree.selection_set(filtered)
-        else:
-            tree.selection_remove(tree.selection())
-    elif isinstance(selected, str) and selected and selected in all_ids:
-        tree.selection_set(selected)
+    # 只選取存在的 id
+    filtered = [i for i in _context_selection(context) if i in all_ids]
+    if filtered:
+        tree.selection_set(filtered)
     else:
         tree.selection_remove(tree.selection())
 
@@ -171,8 +184,21 @@ class StructView(tk.Tk):
     def __init__(self, presenter=None, enable_virtual=False, virtual_page_size=100):
         super().__init__()
         self._member_table_refresh_count = 0
+        # 手動 member 表格：row widget 重用，只更新值有變動的欄位
+        self._member_row_widgets = {}
+        self._member_row_vars = {}  # idx -> (name_var, type_var, bit_var)
+        self._member_row_sizes = {}  # idx -> 目前顯示的 size 文字
+        self._member_traces_suspended = False
+        self._manual_layout_rows = []  # manual_layout_tree 目前各列的 (iid, values)
+        self._manual_layout_model = None
         self._hex_grid_refresh_count = 0
         self._treeview_refresh_count = 0
+        self._tree_index = None  # 上次繪製 member_tree 的索引（diff/patch 用）
+        self._tree_expanded = set()
+        self._tree_loader = None  # member_tree 的分批子節點載入器
+        self._modern_tree_loader = None
+        self._ui_scheduler = None  # 大量 row 分批插入（frame budget）
+        self._tree_render_spans = {}  # tree key -> METRICS.start(TREE_RENDER)，分批繪製完成時 finish
         self.presenter = presenter
         self.enable_virtual = enable_virtual
         self._virtual_page_size = virtual_page_size
@@ -353,6 +379,8 @@ class StructView(tk.Tk):
         self.expand_all_btn.pack(side=tk.LEFT, padx=1)
         self.collapse_all_btn = tk.Button(advanced_row, text=get_string("btn_collapse_all"), command=self._on_collapse_all)
         self.collapse_all_btn.pack(side=tk.LEFT, padx=1)
+        self.tree_progress_label = tk.Label(advanced_row, text="", fg="gray")
+        self.tree_progress_label.pack(side=tk.LEFT, padx=2)
         # 批次操作按鈕（進階列）
         self.batch_expand_btn = tk.Button(advanced_row, text=get_string("btn_expand_selected"), command=self._on_batch_expand)
         self.batch_expand_btn.pack(side=tk.LEFT, padx=1)
@@ -400,7 +428,7 @@ class StructView(tk.Tk):
             self.input_footer_frame = _DummyFrame(main_frame)
 
         # hex grid 輸入區（移入 footer）
-        self.hex_entries = []
+        self.hex_entries = BoxEntries()
         try:
             self.hex_grid_frame = tk.Frame(self.input_footer_frame)
             # 預設由輸入模式控制是否顯示，此處不主動 pack
@@ -454,6 +482,10 @@ class StructView(tk.Tk):
         # 解析按鈕
         self.parse_button = tk.Button(main_frame, text=get_string("parse_button"), command=self._on_parse_file, state="disabled")
         self.parse_button.pack(anchor="w", pady=5)
+        # live decode：編輯 hex 後自動重新解析（只更新變動的欄位）
+        self.live_decode_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(main_frame, text=get_string("label_live_decode"), variable=self.live_decode_var,
+                       command=self._on_live_decode_toggle).pack(anchor="w")
 
         # 匯出 CSV 按鈕（v19 GUI 整合）
         self.export_csv_button = tk.Button(main_frame, text=get_string("export_csv_button"), command=self._on_export_csv, state="disabled")
@@ -482,6 +514,7 @@ class StructView(tk.Tk):
         layout_frame.pack(fill="both", expand=True, padx=2, pady=2)
         # 新版：使用 StructLayout 元件（內含 Treeview）
         self.struct_layout_component = StructLayout(layout_frame)
+        self.struct_layout_component.scheduler = self._get_ui_scheduler()
         self.layout_tree = self.struct_layout_component.tree
         # 仍加入 scroll bar（若 Treeview 支援 yscrollcommand）
         try:
@@ -545,7 +578,7 @@ class StructView(tk.Tk):
         tk.Checkbutton(manual_control_frame, text="32-bit 模式", variable=self.manual_pointer32_var, command=lambda: self._on_pointer_mode_toggle(self.manual_pointer32_var.get())).pack(side=tk.LEFT, padx=6)
 
         # hex grid 輸入區（與 file tab 一致，移到 member_frame 之後）
-        self.manual_hex_entries = []
+        self.manual_hex_entries = BoxEntries()
         self.manual_hex_grid_frame = tk.Frame(scrollable_frame)
         self.manual_hex_grid_frame.pack(fill="x", pady=2)
 
@@ -657,9 +690,6 @@ class StructView(tk.Tk):
     def _render_member_table(self):
         self._member_table_refresh_count += 1
         members = self.members
-        # 初始化 row widget cache
-        if not hasattr(self, "_member_row_widgets") or self._member_row_widgets is None:
-            self._member_row_widgets = {}
         row_widgets = self._member_row_widgets
         # 若 members 為空，清空所有 row widget
         if not members:
@@ -667,8 +697,11 @@ class StructView(tk.Tk):
                 for w in widgets:
                     w.destroy()
             row_widgets.clear()
+            self._member_row_vars.clear()
+            self._member_row_sizes.clear()
             for widget in self.member_frame.winfo_children():
                 widget.destroy()
+            self._member_header_widgets = None
             tk.Label(self.member_frame, text="無成員資料", fg="gray").grid(row=0, column=0, columnspan=6, pady=10)
             self.member_entries = []
             self._update_manual_layout_tree()
@@ -694,18 +727,14 @@ class StructView(tk.Tk):
                 for w in row_widgets[idx]:
                     w.destroy()
                 del row_widgets[idx]
+                self._member_row_vars.pop(idx, None)
+                self._member_row_sizes.pop(idx, None)
         # 更新/新增 row widget
         self.member_entries = []
         for idx, m in enumerate(members):
             if idx in row_widgets:
-                widgets = row_widgets[idx]
-                # 更新值
-                widgets[0].config(text=str(idx + 1))  # row number
-                widgets[1].delete(0, "end"); widgets[1].insert(0, m.get("name", ""))
-                widgets[2].setvar(widgets[2].cget("textvariable"), m.get("type", ""))
-                widgets[3].delete(0, "end"); widgets[3].insert(0, m.get("bit_size", 0))
-                widgets[4].config(text=name2size.get(m.get("name", ""), "-"))
-                # 操作按鈕無需更新
+                # 重用既有 row：只寫入與畫面不同的欄位（row number/按鈕依 idx 固定，無需更新）
+                self._refresh_member_row(idx, m, name2size.get(m.get("name", ""), "-"))
             else:
                 # 新增 row widget
                 name_var = tk.StringVar(value=m.get("name", ""))
@@ -764,43 +793,72 @@ class StructView(tk.Tk):
                             return "break"
                     fw.bind("<Tab>", on_tab)
                 row_widgets[idx] = widgets
+                self._member_row_vars[idx] = (name_var, type_var, bit_var)
+                self._member_row_sizes[idx] = size_val
             self.member_entries.append(tuple(row_widgets[idx][1:6]))
         self._update_manual_layout_tree()
 
-    def _update_manual_layout_tree(self):
-        # 計算 layout
-        model = StructModel()
+    def _refresh_member_row(self, idx, member, size_text):
+        name_var, type_var, bit_var = self._member_row_vars[idx]
+        name, type_name, bit_size = member.get("name", ""), member.get("type", ""), member.get("bit_size", 0)
+        # 程式寫入 var 時暫停 trace，避免每列都觸發 _on_manual_struct_change
+        self._member_traces_suspended = True
+        try:
+            if name_var.get() != name:
+                name_var.set(name)
+            if type_var.get() != type_name:
+                type_var.set(type_name)
+            try:
+                current_bit = bit_var.get()
+            except tk.TclError:
+                current_bit = None
+            if current_bit != bit_size:
+                bit_var.set(bit_size)
+        finally:
+            self._member_traces_suspended = False
+        if self._member_row_sizes.get(idx) != size_text:
+            self._member_row_widgets[idx][4].config(text=size_text)
+            self._member_row_sizes[idx] = size_text
+
+    def _compute_manual_layout(self):
+        """手動 struct 的 layout（list of dict）；model 端由第一個變動成員起增量計算。"""
+        member_data = [
+            {"name": m.get("name", ""), "type": m.get("type", ""), "bit_size": m.get("bit_size", 0)}
+            for m in self.members
+        ]
+        # 優先與 presenter 共用 model（驗證也用同一份增量 layout），否則使用 view 自己的 model
+        model = getattr(self.presenter, "model", None)
+        if not hasattr(model, "calculate_manual_layout"):
+            if self._manual_layout_model is None:
+                self._manual_layout_model = StructModel()
+            model = self._manual_layout_model
         try:
-            member_data = [
-                {"name": m.get("name", ""), "type": m.get("type", ""), "bit_size": m.get("bit_size", 0)}
-                for m in self.members
-            ]
             layout = model.calculate_manual_layout(member_data, self.size_var.get())
         except Exception:
-            layout = []
-        # 清空 treeview
-        for i in self.manual_layout_tree.get_children():
-            self.manual_layout_tree.delete(i)
-        # 插入新資料
-        for item in layout:
-            bit_offset = item.get("bit_offset")
-            bit_size = item.get("bit_size")
-            bit_offset_str = str(bit_offset) if bit_offset is not None else "-"
-            bit_size_str = str(bit_size) if bit_size is not None else "-"
-            # Manual tab keeps layout-only semantics; append empty strings for unified value columns.
-            self.manual_layout_tree.insert("", "end", values=(
-                item.get("name", ""),
-                item.get("type", ""),
-                item.get("offset", ""),
-                item.get("size", ""),
-                bit_offset_str,
-                bit_size_str,
-                str(item.get("is_bitfield", False)),
-                "",
-                "",
-                "",
-            ))
-    
+            return []
+        return layout if isinstance(layout, list) else []
+
+    def _update_manual_layout_tree(self):
+        layout = self._compute_manual_layout()
+        editor = getattr(getattr(self, "manual_hex_grid_frame", None), "_hex_editor", None)
+        if editor is not None:
+            editor.set_layout(layout)
+        tree = self.manual_layout_tree
+        rows = self._manual_layout_rows
+        # 只改寫內容不同的列（變動成員與其後 offset 位移的列），多出/不足的列再刪除/補上
+        for pos, item in enumerate(layout):
+            values = format_layout_row(item)
+            if pos < len(rows):
+                iid, current = rows[pos]
+                if current != values:
+                    tree.item(iid, values=values)
+                    rows[pos] = (iid, values)
+            else:
+                rows.append((tree.insert("", "end", values=values), values))
+        if len(rows) > len(layout):
+            tree.delete(*[iid for iid, _ in rows[len(layout):]])
+            del rows[len(layout):]
+
     def _on_manual_struct_change(self):
         struct_data = self.get_manual_struct_definition()
         if self.presenter:
@@ -826,18 +884,24 @@ class StructView(tk.Tk):
         self._on_manual_struct_change()
 
     def _update_member_name(self, idx, var):
+        if self._member_traces_suspended:
+            return
         self.members[idx]["name"] = var.get()
         if self.presenter:
             self.presenter.invalidate_cache()
         self._on_manual_struct_change()
 
     def _update_member_type(self, idx, var):
+        if self._member_traces_suspended:
+            return
         self.members[idx]["type"] = var.get()
         if self.presenter:
             self.presenter.invalidate_cache()
         self._on_manual_struct_change()
 
     def _update_member_bit(self, idx, var):
+        if self._member_traces_suspended:
+            return
         try:
             value = var.get()
             self.members[idx]["bit_size"] = int(value) if str(value).strip() else 0
@@ -966,31 +1030,40 @@ class StructView(tk.Tk):
         txt.config(state="disabled")
 
     def _on_browse_file(self):
-        if self.presenter:
-            result = self.presenter.browse_file()
-            if result['type'] == 'ok':
-                self.show_file_path(result['file_path'])
-                self.show_struct_layout(result['struct_name'], result['layout'], result['total_size'], result['struct_align'])
-                self.show_struct_debug(result['struct_content'])
-                self.enable_parse_button()
-                self.clear_results()
-                # 記錄 total_size 供後續切換單位時使用
-                self.current_file_total_size = result['total_size']
-                self.rebuild_hex_grid(result['total_size'], 1)
-            else:
-                from src.config import get_string
-                self.show_error(get_string('dialog_file_error'), result['message'])
-                self.disable_parse_button()
-                self.clear_results()
-                # 清除記錄的 total_size
-                self.current_file_total_size = 0
-                self.rebuild_hex_grid(0, 1)
-                # 停用 CSV 匯出按鈕
-                try:
-                    if hasattr(self, "export_csv_button"):
-                        self.export_csv_button.config(state="disabled")
-                except Exception:
-                    pass
+        if not self.presenter:
+            return
+        if hasattr(self.presenter, "browse_file_async"):
+            # 背景執行緒解析，結果由 presenter 經 after() 回到主執行緒
+            self.presenter.browse_file_async(self._apply_browse_result)
+        else:
+            self._apply_browse_result(self.presenter.browse_file())
+
+    def _apply_browse_result(self, result):
+        if not result:
+            return
+        if result['type'] == 'ok':
+            self.show_file_path(result['file_path'])
+            self.show_struct_layout(result['struct_name'], result['layout'], result['total_size'], result['struct_align'])
+            self.show_struct_debug(result['struct_content'])
+            self.enable_parse_button()
+            self.clear_results()
+            # 記錄 total_size 供後續切換單位時使用
+            self.current_file_total_size = result['total_size']
+            self.rebuild_hex_grid(result['total_size'], 1)
+        else:
+            from src.config import get_string
+            self.show_error(get_string('dialog_file_error'), result['message'])
+            self.disable_parse_button()
+            self.clear_results()
+            # 清除記錄的 total_size
+            self.current_file_total_size = 0
+            self.rebuild_hex_grid(0, 1)
+            # 停用 CSV 匯出按鈕
+            try:
+                if hasattr(self, "export_csv_button"):
+                    self.export_csv_button.config(state="disabled")
+            except Exception:
+                pass
 
     def _on_parse_file(self):
         if not self.presenter:
@@ -1068,26 +1141,70 @@ class StructView(tk.Tk):
 
     def _populate_tree(self, tree, parsed_values):
         """Helper to display parsed values in a Treeview."""
-        for item_id in tree.get_children():
-            tree.delete(item_id)
-
-        for item in parsed_values:
-            value = item.get("value", "")
-            try:
-                hex_value = hex(int(value)) if value != "-" else "-"
-            except Exception:
-                hex_value = "-"
-
-            hex_raw = item.get("hex_raw", "")
-            if hex_raw and len(hex_raw) > 2:
-                hex_raw = "｜".join(hex_raw[i:i+2] for i in range(0, len(hex_raw), 2))
-
-            # 確保皆為字串
-            name_str = str(item.get("name", ""))
-            value_str = str(value) if value is not None else ""
-            hex_value_str = str(hex_value) if hex_value is not None else ""
-            hex_raw_str = str(hex_raw) if hex_raw is not None else ""
-            tree.insert("", "end", values=(name_str, value_str, hex_value_str, hex_raw_str))
+        if tree is getattr(self, "member_tree", None):
+            self._reset_tree_loader()
+        key = str(tree)
+        self._begin_tree_render(key)
+        self._schedule_tree_rows(tree, parsed_values, self._parsed_row_values,
+                                 on_done=lambda: self._end_tree_render(key))
+
+    def _begin_tree_render(self, key):
+        """tree_render 從排程開始量到分批插入完成；同一 tree 重新繪製時捨棄舊的 span。"""
+        self._tree_render_spans[key] = METRICS.start(TREE_RENDER)
+
+    def _end_tree_render(self, key):
+        span = self._tree_render_spans.pop(key, None)
+        if span is not None:
+            span.finish()
+
+    @staticmethod
+    def _parsed_row_values(item):
+        """parsed value dict -> member tree 的 (name, value, hex value, hex raw)。"""
+        value = item.get("value", "")
+        try:
+            hex_value = hex(int(value)) if value != "-" else "-"
+        except Exception:
+            hex_value = "-"
+
+        hex_raw = item.get("hex_raw", "")
+        if hex_raw and len(hex_raw) > 2:
+            hex_raw = "｜".join(hex_raw[i:i+2] for i in range(0, len(hex_raw), 2))
+
+        # 確保皆為字串
+        name_str = str(item.get("name", ""))
+        value_str = str(value) if value is not None else ""
+        hex_value_str = str(hex_value) if hex_value is not None else ""
+        hex_raw_str = str(hex_raw) if hex_raw is not None else ""
+        return (name_str, value_str, hex_value_str, hex_raw_str)
+
+    def _get_ui_scheduler(self):
+        if self._ui_scheduler is None:
+            self._ui_scheduler = ChunkedUpdateScheduler(
+                after=self.after, after_cancel=self.after_cancel,
+                on_progress=self._on_rows_progress,
+            )
+        return self._ui_scheduler
+
+    def _schedule_tree_rows(self, tree, rows, to_values, on_done=None):
+        """清空 tree 後依 frame budget 分批插入 rows；同一 tree 的舊批次會被取消。"""
+        scheduler = self._get_ui_scheduler()
+        scheduler.cancel(str(tree))
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+        scheduler.run(str(tree), rows or [], lambda row: tree.insert("", "end", values=to_values(row)),
+                      on_done=on_done)
+
+    def _on_rows_progress(self, key, done, total):
+        label = getattr(self, "tree_progress_label", None)
+        if label is None:
+            return
+        from src.config import get_string
+        text = get_string("label_rows_loading").format(done=done, total=total) if done < total else ""
+        try:
+            label.config(text=text)
+        except Exception:
+            pass
 
     def _show_debug_text(self, text_widget, debug_lines):
         """Helper to display debug lines in a Text widget."""
@@ -1111,39 +1228,8 @@ class StructView(tk.Tk):
                 if hasattr(self, "struct_layout_component") and self.struct_layout_component:
                     self.struct_layout_component.refresh_values(rows)
                 else:
-                    # 後備：直接清空再插入
-                    for iid in self.layout_tree.get_children():
-                        self.layout_tree.delete(iid)
-                    for row in rows:
-                        bit_offset = row.get("bit_offset")
-                        bit_size = row.get("bit_size")
-                        bit_offset_str = str(bit_offset) if bit_offset is not None else "-"
-                        bit_size_str = str(bit_size) if bit_size is not None else "-"
-                        name_str = str(row.get("name", ""))
-                        type_str = str(row.get("type", ""))
-                        offset_str = str(row.get("offset", ""))
-                        size_str = str(row.get("size", ""))
-                        is_bf_str = str(row.get("is_bitfield", False))
-                        value = row.get("value", "")
-                        hex_value = row.get("hex_value", "")
-                        hex_raw = row.get("hex_raw", "")
-                        if hex_raw and len(hex_raw) > 2:
-                            try:
-                                hex_raw = "｜".join(hex_raw[j:j+2] for j in range(0, len(hex_raw), 2))
-                            except Exception:
-                                pass
-                        self.layout_tree.insert("", "end", values=(
-                            name_str,
-                            type_str,
-                            offset_str,
-                            size_str,
-                            bit_offset_str,
-                            bit_size_str,
-                            is_bf_str,
-                            str(value) if value is not None else "",
-                            str(hex_value) if hex_value is not None else "",
-                            str(hex_raw) if hex_raw is not None else "",
-                        ))
+                    # 後備：分批重建 layout_tree
+                    self._schedule_tree_rows(self.layout_tree, rows, format_layout_row)
                 return
             except Exception:
                 # fallback to legacy path if anything goes wrong
@@ -1151,13 +1237,51 @@ class StructView(tk.Tk):
         # legacy mode fallback
         self._populate_tree(self.member_tree, parsed_values)
 
+    def show_parsed_values_incremental(self, parsed_values, changed):
+        """Live decode：只更新 ``changed`` 索引的 member tree 列；列數不符時整表重建。"""
+        tree = getattr(self, "member_tree", None)
+        unified = getattr(self, "enable_unified_layout_values", False) and getattr(self, "_last_layout", None)
+        if tree is None or unified:
+            return self.show_parsed_values(parsed_values)
+        children = tree.get_children()
+        scheduler = self._ui_scheduler
+        if len(children) != len(parsed_values) or (scheduler is not None and scheduler.busy(str(tree))):
+            return self.show_parsed_values(parsed_values)
+        self._last_parsed_values = parsed_values
+        for i in changed:
+            tree.item(children[i], values=self._parsed_row_values(parsed_values[i]))
+
     def show_manual_parsed_values(self, parsed_values, byte_order_str=None):
         """顯示 MyStruct tab 的解析結果，與 file tab 的 show_parsed_values 一致"""
         self._populate_tree(self.manual_member_tree, parsed_values)
 
     def show_debug_bytes(self, debug_lines):
+        # 大型 struct 的 debug lines 為 lazy 序列，僅在 Debug Bytes 區塊可見時才格式化
+        if not self._is_widget_visible(self.debug_text):
+            self._pending_debug_lines = debug_lines
+            try:
+                self.debug_text.bind("<Map>", lambda e: self._flush_pending_debug_bytes())
+            except Exception:
+                pass
+            return
+        self._pending_debug_lines = None
         self._show_debug_text(self.debug_text, debug_lines)
 
+    def _flush_pending_debug_bytes(self):
+        pending = getattr(self, "_pending_debug_lines", None)
+        if pending is None:
+            return
+        self._pending_debug_lines = None
+        self._show_debug_text(self.debug_text, pending)
+
+    @staticmethod
+    def _is_widget_visible(widget):
+        """回傳 widget 是否已映射於畫面上；無法判斷時視為可見。"""
+        try:
+            return bool(widget.winfo_ismapped())
+        except Exception:
+            return True
+
 
     def show_struct_member_debug(self, parsed_values, layout):
         # 顯示 struct layout 與欄位對應
@@ -1173,6 +1297,10 @@ class StructView(tk.Tk):
             self._last_layout = layout
         except Exception:
             pass
+        # hex editor 依 layout 標示欄位邊界
+        editor = getattr(getattr(self, "hex_grid_frame", None), "_hex_editor", None)
+        if editor is not None:
+            editor.set_layout(layout)
         # 清空舊資料並插入新資料（值留空）
         rows = []
         for item in layout:
@@ -1193,26 +1321,8 @@ class StructView(tk.Tk):
         if getattr(self, "enable_unified_layout_values", False) and hasattr(self, "struct_layout_component") and self.struct_layout_component:
             self.struct_layout_component.set_rows(rows)
         else:
-            # 後備：直接清空再插入
-            for i in self.layout_tree.get_children():
-                self.layout_tree.delete(i)
-            for r in rows:
-                bit_offset = r.get("bit_offset")
-                bit_size = r.get("bit_size")
-                bit_offset_str = str(bit_offset) if bit_offset is not None else "-"
-                bit_size_str = str(bit_size) if bit_size is not None else "-"
-                self.layout_tree.insert("", "end", values=(
-                    str(r.get("name", "")),
-                    str(r.get("type", "")),
-                    str(r.get("offset", "")),
-                    str(r.get("size", "")),
-                    bit_offset_str,
-                    bit_size_str,
-                    str(r.get("is_bitfield", False)),
-                    "",
-                    "",
-                    "",
-                ))
+            # 後備：分批重建 layout_tree
+            self._schedule_tree_rows(self.layout_tree, rows, format_layout_row)
         # 啟用 CSV 匯出（當 layout 存在時）
         # 啟用 CSV 匯出（當 layout 存在時）
         try:
@@ -1229,34 +1339,21 @@ class StructView(tk.Tk):
                 if hasattr(self, "struct_layout_component") and self.struct_layout_component:
                     self.struct_layout_component.refresh_values(rows)
                 else:
-                    # 後備：重建顯示
-                    for iid in self.layout_tree.get_children():
-                        self.layout_tree.delete(iid)
-                    for r in rows:
-                        bit_offset = r.get("bit_offset")
-                        bit_size = r.get("bit_size")
-                        bit_offset_str = str(bit_offset) if bit_offset is not None else "-"
-                        bit_size_str = str(bit_size) if bit_size is not None else "-"
-                        self.layout_tree.insert("", "end", values=(
-                            str(r.get("name", "")),
-                            str(r.get("type", "")),
-                            str(r.get("offset", "")),
-                            str(r.get("size", "")),
-                            bit_offset_str,
-                            bit_size_str,
-                            str(r.get("is_bitfield", False)),
-                            str(r.get("value", "")),
-                            str(r.get("hex_value", "")),
-                            str(r.get("hex_raw", "")),
-                        ))
+                    # 後備：分批重建顯示
+                    self._schedule_tree_rows(self.layout_tree, rows, format_layout_row)
         except Exception:
             pass
 
     def clear_results(self):
-        for entry, _ in self.hex_entries:
-            entry.delete(0, tk.END)
+        editor = getattr(self.hex_grid_frame, "_hex_editor", None)
+        if editor is not None:
+            editor.clear()
+        if self._ui_scheduler is not None:
+            self._ui_scheduler.cancel(str(self.member_tree))
         for i in self.member_tree.get_children():
             self.member_tree.delete(i)
+        self._reset_tree_loader()
+        self._pending_debug_lines = None
         self.debug_text.config(state="normal")
         self.debug_text.delete("1.0", tk.END)
         self.debug_text.config(state="disabled")
@@ -1290,6 +1387,9 @@ class StructView(tk.Tk):
             if not file_path:
                 return
 
+            # export 模組於第一次匯出時才載入（縮短啟動時間）
+            from src.export.csv_export import DefaultCsvExportService, CsvExportOptions, build_parsed_model_from_struct
+
             # 建構 parsed model
             parsed_model = build_parsed_model_from_struct(self.presenter.model)
 
@@ -1403,53 +1503,50 @@ class StructView(tk.Tk):
 
     def _build_hex_grid(self, frame, entry_list, total_size, unit_size):
         self._hex_grid_refresh_count += 1
-        # 增量更新 Entry widget
-        if not hasattr(frame, "_hex_entry_widgets") or frame._hex_entry_widgets is None:
-            frame._hex_entry_widgets = []
-        widgets = frame._hex_entry_widgets
-        # 計算應有的 box 數
-        if total_size == 0:
-            for w, _ in widgets:
-                w.destroy()
-            widgets.clear()
-            entry_list.clear()
-            return
-        chars_per_box = unit_size * 2
-        num_boxes = (total_size + unit_size - 1) // unit_size
-        cols = max(1, 16 // unit_size)
-        # 刪除多餘 Entry
-        while len(widgets) > num_boxes:
-            w, _ = widgets.pop()
-            w.destroy()
-        # 新增缺少的 Entry
-        while len(widgets) < num_boxes:
-            entry = tk.Entry(frame, font=("Courier", 10))
-            widgets.append((entry, chars_per_box))
-        # 更新/配置 Entry
-        for i in range(num_boxes):
-            if i == num_boxes - 1:
-                remain_bytes = total_size - (unit_size * (num_boxes - 1))
-                box_chars = remain_bytes * 2 if remain_bytes > 0 else chars_per_box
-            else:
-                box_chars = chars_per_box
-            entry, _ = widgets[i]
-            entry.config(width=box_chars + 2)
-            entry.grid(row=i // cols, column=i % cols, padx=2, pady=2)
-            # 綁定事件
-            entry.bind("<KeyPress>", lambda e, length=box_chars: self._validate_input(e, length))
-            entry.bind("<Key>", lambda e, length=box_chars: self._limit_input_length(e, length))
-            widgets[i] = (entry, box_chars)
-        # 更新 entry_list
-        entry_list.clear()
-        entry_list.extend(widgets[:num_boxes])
-        frame._hex_entry_widgets = widgets[:num_boxes]
+        # 單一 Canvas 只繪製可見列，資料存於 bytearray（不再每個 box 一個 Entry）
+        editor = getattr(frame, "_hex_editor", None)
+        if editor is None:
+            canvas = tk.Canvas(frame, height=120, bg="white", highlightthickness=1, takefocus=1)
+            scrollbar = tk.Scrollbar(frame, orient="vertical")
+            scrollbar.pack(side="right", fill="y")
+            canvas.pack(side="left", fill="x", expand=True)
+            on_change = self._on_hex_edited if frame is getattr(self, "hex_grid_frame", None) else None
+            editor = HexEditor(canvas, scrollbar=scrollbar, on_change=on_change)
+            frame._hex_editor = editor
+        editor.configure_buffer(total_size, unit_size)
+        if frame is getattr(self, "hex_grid_frame", None) and getattr(self, "_last_layout", None):
+            editor.set_layout(self._last_layout)
+        if isinstance(entry_list, BoxEntries):
+            entry_list.attach(editor.buffer)
+        else:
+            entry_list[:] = BoxEntries(editor.buffer)
 
     def rebuild_hex_grid(self, total_size, unit_size):
         self._build_hex_grid(self.hex_grid_frame, self.hex_entries, total_size, unit_size)
 
     def get_hex_input_parts(self):
+        """回傳 (box hex, 預期字元數) 序列；為 hex buffer 的即時 view，不複製資料。"""
+        editor = getattr(self.hex_grid_frame, "_hex_editor", None)
+        if editor is not None:
+            return editor.buffer.parts()
         return [(entry.get().strip(), expected_len) for entry, expected_len in self.hex_entries]
 
+    def get_hex_input_snapshot(self):
+        """回傳 (hex buffer bytes 複本, unit size)，供背景 live decode 使用。"""
+        editor = getattr(self.hex_grid_frame, "_hex_editor", None)
+        if editor is not None:
+            return bytes(editor.buffer.data), editor.buffer.unit_size
+        data = bytes.fromhex("".join(entry.get().strip().zfill(n) for entry, n in self.hex_entries))
+        return data, self.get_selected_unit_size()
+
+    def _on_hex_edited(self):
+        if self.presenter and hasattr(self.presenter, "on_hex_input_changed"):
+            self.presenter.on_hex_input_changed()
+
+    def _on_live_decode_toggle(self):
+        if self.presenter and hasattr(self.presenter, "set_live_decode"):
+            self.presenter.set_live_decode(self.live_decode_var.get())
+
     # v26 flexible input minimal API
     def get_input_mode(self) -> str:
         # Prefer local UI state; fallback to presenter context
@@ -1610,7 +1707,11 @@ class StructView(tk.Tk):
         pass  # 可根據需要擴充
 
     def _on_parse_manual_hex(self):
-        hex_parts = [(entry.get().strip(), expected_len) for entry, expected_len in self.manual_hex_entries]
+        editor = getattr(self.manual_hex_grid_frame, "_hex_editor", None)
+        if editor is not None:
+            hex_parts = editor.buffer.parts()
+        else:
+            hex_parts = [(entry.get().strip(), expected_len) for entry, expected_len in self.manual_hex_entries]
         if self.presenter and hasattr(self.presenter, 'parse_manual_hex_data'):
             struct_def = self.get_manual_struct_definition()
             struct_def['unit_size'] = self.get_selected_manual_unit_size()
@@ -1692,6 +1793,17 @@ class StructView(tk.Tk):
         refresh_btn = tk.Button(control_frame, text=get_string("btn_refresh"), command=self.refresh_debug_info)
         refresh_btn.grid(row=0, column=8, padx=5)
 
+        # cProfile：勾選後下一次 load / decode / export 寫出 .pstats，下方顯示 cumulative 前 30 名；
+        # 記憶體報告（tracemalloc 各 stage + deep size）也顯示於同一區
+        self.profile_next_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(control_frame, text=get_string("label_profile_next"), variable=self.profile_next_var,
+                       command=self._on_toggle_profile).grid(row=0, column=12, padx=5)
+        tk.Button(control_frame, text=get_string("btn_memory_report"),
+                  command=self._on_memory_report).grid(row=0, column=13, padx=5)
+        self.profile_text = tk.Text(self.debug_tab, height=16, font=("Courier", 10), state="disabled", wrap="none")
+        self.profile_text.pack(fill="both", expand=True, padx=10, pady=5)
+        self._shown_profile = None
+
         self.refresh_debug_info()
         self._start_debug_auto_refresh()
 
@@ -1726,6 +1838,41 @@ class StructView(tk.Tk):
         self._stop_debug_auto_refresh()
         super().destroy()
 
+    def _on_toggle_profile(self):
+        if not self.presenter or not hasattr(self.presenter, "arm_profile"):
+            return
+        if self.profile_next_var.get():
+            self.presenter.arm_profile()
+        else:
+            self.presenter.disarm_profile()
+
+    def _on_memory_report(self):
+        if not self.presenter or not hasattr(self.presenter, "get_memory_report"):
+            return
+        from src.model.memory_report import format_memory_report
+        # 只估算現有物件大小；重新載入量測 stage 會阻塞 UI，交給 CLI
+        report = format_memory_report(self.presenter.get_memory_report(measure_pipeline=False))
+        self._set_report_text(f"{report}\n\n{get_string('msg_memory_report_cli_hint')}")
+
+    def _set_report_text(self, text):
+        self.profile_text.config(state="normal")
+        self.profile_text.delete("1.0", tk.END)
+        self.profile_text.insert("1.0", text)
+        self.profile_text.config(state="disabled")
+
+    def _refresh_profile_view(self):
+        """capture 完成後取消勾選並顯示新的 profile 報告。"""
+        if not self.presenter or not hasattr(self.presenter, "get_last_profile") or not hasattr(self, "profile_text"):
+            return
+        armed = self.presenter.is_profile_armed()
+        if isinstance(armed, bool) and self.profile_next_var.get() != armed:
+            self.profile_next_var.set(armed)
+        report = self.presenter.get_last_profile()
+        if report is None or report is self._shown_profile or not hasattr(report, "format"):
+            return
+        self._shown_profile = report
+        self._set_report_text(report.format())
+
     def _on_invalidate_cache(self):
         if self.presenter and hasattr(self.presenter, "invalidate_cache"):
             self.presenter.invalidate_cache()
@@ -1767,6 +1914,19 @@ class StructView(tk.Tk):
                 lines.append(f"Current Size: {lru.get('current_size')}")
                 lines.append(f"Last Hit: {lru.get('last_hit')}")
                 lines.append(f"Last Evict: {lru.get('last_evict')}")
+            if hasattr(self.presenter, "get_layout_cache_stats"):
+                stats = self.presenter.get_layout_cache_stats()
+                lines.append(f"Hit Ratio: {stats['hit_ratio']:.1%}")
+                lines.append(f"Cache Bytes: {stats['bytes']} / {stats['max_bytes']}")
+                lines.append(f"Evictions: {stats['evictions']}")
+            stage_metrics = self.presenter.get_stage_metrics() if hasattr(self.presenter, "get_stage_metrics") else None
+            if isinstance(stage_metrics, dict):
+                lines.append("Stage Timing (ms): count / p50 / p95 / max / last")
+                for name, m in stage_metrics.items():
+                    lines.append(
+                        f"  {name}: {m['count']} / {m['p50'] * 1000:.2f} / {m['p95'] * 1000:.2f}"
+                        f" / {m['max'] * 1000:.2f} / {m['last'] * 1000:.2f}"
+                    )
             # 顯示自動清空狀態
             if hasattr(self.presenter, "is_auto_cache_clear_enabled"):
                 enabled = self.presenter.is_auto_cache_clear_enabled()
@@ -1785,6 +1945,7 @@ class StructView(tk.Tk):
                 else:
                     lines.append(f"{k}: {v}")
         self.debug_info_label.config(text="\n".join(lines))
+        self._refresh_profile_view()
 
         # Undo/Redo 按鈕狀態
         context = self.presenter.context if self.presenter and hasattr(self.presenter, "context") else {}
@@ -1917,6 +2078,9 @@ class StructView(tk.Tk):
 
     def _on_member_tree_open(self, event):
         item_id = event.widget.focus()
+        # 收合狀態下只有 placeholder，展開時才分批插入真正的子節點
+        if self._tree_loader is not None:
+            self._tree_loader.open(item_id)
         if self.presenter and hasattr(self.presenter, "on_expand"):
             self.presenter.on_expand(item_id)
 
@@ -1925,8 +2089,14 @@ class StructView(tk.Tk):
         if self.presenter and hasattr(self.presenter, "on_collapse"):
             self.presenter.on_collapse(item_id)
 
+    def _selected_member_ids(self):
+        """member_tree 的選取；虛擬化時包含捲出視窗的節點。"""
+        if self.enable_virtual and hasattr(self, "virtual"):
+            return self.virtual.selection()
+        return self.member_tree.selection()
+
     def _on_member_tree_select(self, event):
-        selected = event.widget.selection()
+        selected = self._selected_member_ids() if event.widget is self.member_tree else event.widget.selection()
         if not selected or not self.presenter:
             return
         if len(selected) == 1 and hasattr(self.presenter, "on_node_click"):
@@ -1962,7 +2132,68 @@ class StructView(tk.Tk):
             return ids
         tree.selection_set(collect())
 
+    # 超過此數量子孫的收合節點改以 placeholder 延遲載入
+    TREE_EAGER_LIMIT = 200
+    TREE_LOAD_CHUNK = 200
+
+    def _tree_is_loaded_predicate(self, old_index, expanded, partial=()):
+        limit = self.TREE_EAGER_LIMIT
+        def is_loaded(node):
+            iid = node["id"]
+            if (old_index is not None and iid in old_index.children
+                    and iid not in old_index.lazy and iid not in partial):
+                return True  # 先前已插入完畢的子樹維持插入狀態
+            if iid in expanded:
+                return subtree_within(node, self.TREE_LOAD_CHUNK)
+            return subtree_within(node, limit)
+        return is_loaded
+
+    def _ensure_tree_loader(self, tree, index, item_options, auto_open):
+        loader = self._tree_loader
+        if loader is None:
+            loader = LazyTreeLoader(
+                tree, index, item_options,
+                after=self.after, after_cancel=self.after_cancel,
+                chunk_size=self.TREE_LOAD_CHUNK,
+                on_progress=self._on_tree_load_progress,
+            )
+            self._tree_loader = loader
+        loader.index = index
+        loader.item_options = item_options
+        loader.auto_open = set(auto_open)
+        return loader
+
+    def _reset_tree_loader(self):
+        self._tree_index = None
+        if self._tree_loader is not None:
+            self._tree_loader.cancel()
+            self._tree_loader = None
+        self._on_tree_load_progress(0, 0)
+
+    def _on_tree_load_progress(self, done, total):
+        if total and done >= total:
+            self._end_tree_render(str(getattr(self, "member_tree", "member_tree")))
+        label = getattr(self, "tree_progress_label", None)
+        if label is None:
+            return
+        from src.config import get_string
+        busy = total and done < total
+        text = get_string("label_tree_loading").format(done=done, total=total) if busy else ""
+        try:
+            label.config(text=text)
+        except Exception:
+            pass
+
     def show_treeview_nodes(self, nodes, context, icon_map=None):
+        # tree_render 含 LazyTreeLoader 之後以 after() 分批插入的展開子樹
+        key = str(getattr(self, "member_tree", "member_tree"))
+        self._begin_tree_render(key)
+        self._show_treeview_nodes(nodes, context, icon_map)
+        loader = self._tree_loader
+        if loader is None or not loader.busy:
+            self._end_tree_render(key)
+
+    def _show_treeview_nodes(self, nodes, context, icon_map=None):
         self._treeview_refresh_count += 1
         # V23: 依 display_mode 調整顯示：tree 顯示樹欄，flat 顯示表頭
         try:
@@ -1980,8 +2211,10 @@ class StructView(tk.Tk):
                 self._enable_virtualization()
             if hasattr(self, "virtual"):
                 flat = self._flatten_nodes(nodes, context=context)
-                self.virtual.set_nodes(flat)
-                update_treeview_by_context(self.member_tree, context)
+                self._reset_tree_loader()
+                self.virtual.set_nodes(flat, keep_position=True)
+                # 選取交給 VirtualTreeview：視窗外的節點捲入時才選取
+                self.virtual.selection_set(_context_selection(context))
                 return
         # 依據 user_settings 設定 displaycolumns
         all_columns = tuple(c["name"] for c in MEMBER_TREEVIEW_COLUMNS)
@@ -1992,9 +2225,6 @@ class StructView(tk.Tk):
             columns = tuple(c["name"] for c in visible_cols)
         tree = self.member_tree
         tree["displaycolumns"] = columns
-        # 先清空所有節點，避免 id 重複
-        for item in tree.get_children(""):
-            tree.delete(item)
         # 每次都設置 tag_configure
         tree.tag_configure("highlighted", background="yellow")
         tree.tag_configure("struct", foreground="blue", font="Arial 10 bold")
@@ -2002,20 +2232,8 @@ class StructView(tk.Tk):
         tree.tag_configure("bitfield", foreground="#008000")
         tree.tag_configure("array", foreground="#B8860B")
         # --- diff/patch 機制 ---
-        if not hasattr(self, "_last_tree_nodes"):
-            self._last_tree_nodes = None
-        def node_dict_by_id(nodes):
-            d = {}
-            def rec(nlist):
-                for n in nlist:
-                    d[n["id"]] = n
-                    rec(n.get("children", []))
-            rec(nodes)
-            return d
-        # fallback: 全量重繪
-        def insert_with_highlight(tree, parent_id, node):
-            if parent_id in (None, "", 0):
-                parent_id = ""
+        highlighted = set(context.get("highlighted_nodes", []))
+        def item_options(node):
             node_type = node.get("type", "")
             label = node.get("label", node.get("name", ""))
             tags = []
@@ -2029,32 +2247,70 @@ class StructView(tk.Tk):
                 tags.append("bitfield")
             elif node_type == "array":
                 tags.append("array")
-            if node["id"] in set(context.get("highlighted_nodes", [])):
+            if node["id"] in highlighted:
                 tags.append("highlighted")
             values = tuple(label if col == "label" else node.get(col, "") for col in columns)
             icon = icon_map.get(node["icon"]) if icon_map and node.get("icon") else ""
-            item_id = tree.insert(parent_id, 'end', iid=node['id'], text=label, values=values, image=icon, tags=tuple(tags))
-            for child in node.get('children', []):
-                insert_with_highlight(tree, item_id, child)
-            return item_id
-        for node in nodes:
-            insert_with_highlight(tree, None, node)
-        self._last_tree_nodes = [n.copy() for n in nodes]  # 淺複製即可
-        update_treeview_by_context(tree, context)
-        # 多選高亮
+            return {"text": label, "values": values, "image": icon, "tags": tuple(tags)}
+        old_index = getattr(self, "_tree_index", None)
+        expanded = set(context.get("expanded_nodes", []))
+        loader = self._tree_loader
+        keep = None
+        partial = set()
+        if loader is not None:
+            if loader.busy and old_index is not None and nodes is getattr(self, "_last_tree_nodes", None):
+                # 同一份 display nodes：分批載入中的子樹維持原狀，繼續載入
+                keep = KeepSubtrees(old_index, loader.loading)
+            else:
+                partial = set(loader.loading)
+                loader.cancel()
+        new_index = build_tree_index(
+            nodes, item_options,
+            is_loaded=self._tree_is_loaded_predicate(old_index, expanded, partial),
+            keep=keep,
+        )
+        try:
+            if old_index is None:
+                raise LookupError("no previous render")
+            # 依 id 比對新舊節點，只對變動處 insert/delete/move/item
+            inserted = apply_tree_ops(tree, diff_tree_index(old_index, new_index))
+            prev_expanded = self._tree_expanded
+            to_update = (expanded ^ prev_expanded) | (expanded & set(inserted))
+        except Exception:
+            # 首次繪製或 widget 狀態與索引不一致：全量重繪（先清空所有節點，避免 id 重複）
+            for item in tree.get_children(""):
+                tree.delete(item)
+            if loader is not None:
+                loader.cancel()
+            apply_tree_ops(tree, diff_tree_index(TreeIndex(), new_index))
+            to_update = set(new_index.items)
+        self._tree_index = new_index
+        self._tree_expanded = expanded
+        self._last_tree_nodes = nodes
+        loader = self._ensure_tree_loader(tree, new_index, item_options, expanded)
+        # 已展開但子節點尚未插入者：交給 loader 分批載入
+        pending = [i for i in new_index.lazy if i in expanded]
+        for iid in pending:
+            tree.item(iid, open=True)
+        loader.open_many(pending)
+        # 展開狀態只更新有變動的 item；未變動 item 保留 widget 既有狀態
+        for iid in to_update:
+            if iid in new_index.items and not is_placeholder(iid):
+                tree.item(iid, open=(iid in expanded))
+        # 選取 / 多選高亮（以索引判斷存在與否，不需走訪 widget）
+        selected = context.get("selected_node")
         selected_nodes = context.get("selected_nodes")
-        if selected_nodes:
-            def collect_all_ids(tree, parent=""):
-                ids = list(tree.get_children(parent))
-                for i in list(ids):
-                    ids.extend(collect_all_ids(tree, i))
-                return ids
-            all_ids = set(collect_all_ids(tree, ""))
-            filtered = [i for i in selected_nodes if i in all_ids]
+        if isinstance(selected_nodes, (list, tuple)) and selected_nodes:
+            filtered = [i for i in selected_nodes if i in new_index.items]
             if filtered:
                 tree.selection_set(filtered)
             else:
                 tree.selection_remove(tree.selection())
+        elif isinstance(selected, str) and selected and selected in new_index.items:
+            if tuple(tree.selection()) != (selected,):
+                tree.selection_set(selected)
+        else:
+            tree.selection_remove(tree.selection())
 
     def _flatten_nodes(self, nodes, depth=0, context=None):
         result = []
@@ -2062,6 +2318,7 @@ class StructView(tk.Tk):
         for n in nodes:
             n2 = n.copy()
             n2["label"] = ("  " * depth) + n2.get("label", n2.get("name", ""))
+            n2["depth"] = depth
             tags = []
             t = n2.get("type")
             if t == "struct":
@@ -2118,6 +2375,12 @@ class StructView(tk.Tk):
                 self.pending_label = tk.Label(self, text="", fg="blue", font=("Arial", 14, "bold"))
                 self.pending_label.pack(side="top", fill="x", pady=4)
             self.pending_label.config(text=f"{get_string('label_pending_prefix')}{pending}... {get_string('label_please_wait')}")
+            # 背景載入檔案時可取消（按鈕或 Esc）
+            if context.get("loading") and self.presenter and hasattr(self.presenter, "cancel_file_load"):
+                if not hasattr(self, "pending_cancel_button"):
+                    self.pending_cancel_button = tk.Button(self, text=get_string("button_cancel_load"), command=self._on_cancel_pending)
+                if not self.pending_cancel_button.winfo_ismapped():
+                    self.pending_cancel_button.pack(side="top", after=self.pending_label, pady=2)
             # 禁用主要互動元件
             if hasattr(self, "parse_button"): self.parse_button.config(state="disabled")
             if hasattr(self, "expand_all_btn"): self.expand_all_btn.config(state="disabled")
@@ -2127,6 +2390,8 @@ class StructView(tk.Tk):
             # 移除進度提示
             if hasattr(self, "pending_label") and self.pending_label.winfo_exists():
                 self.pending_label.config(text="")
+            if hasattr(self, "pending_cancel_button") and self.pending_cancel_button.winfo_exists():
+                self.pending_cancel_button.pack_forget()
             # 恢復互動
             if hasattr(self, "parse_button"): self.parse_button.config(state="normal")
             if hasattr(self, "expand_all_btn"): self.expand_all_btn.config(state="normal")
@@ -2223,6 +2488,15 @@ class StructView(tk.Tk):
         self.bind_all("<Control-l>", lambda e: self.filter_entry.focus_set())
         self.bind_all("<Delete>", lambda e: self._on_batch_delete())
         self.bind_all("<Control-a>", lambda e: self._select_all_nodes())
+        self.bind_all("<Escape>", lambda e: self._on_cancel_pending())
+
+    def _on_cancel_pending(self):
+        """取消進行中的背景載入（僅 pending_action 存在時）。"""
+        if not self.presenter or not hasattr(self.presenter, "cancel_file_load"):
+            return
+        context = getattr(self.presenter, "context", None) or {}
+        if context.get("pending_action"):
+            self.presenter.cancel_file_load()
 
     def _on_expand_all(self):
         if self.presenter and hasattr(self.presenter, "on_expand_all"):
@@ -2261,7 +2535,7 @@ class StructView(tk.Tk):
 
     def _on_batch_delete(self):
         if self.presenter and hasattr(self.presenter, "on_batch_delete"):
-            selected = self.member_tree.selection()
+            selected = self._selected_member_ids()
             self.presenter.on_batch_delete(list(selected))
 
     # V23: 移除 GUI 版本切換與 legacy/v7 切換方法
@@ -2320,6 +2594,8 @@ class StructView(tk.Tk):
     def _populate_modern_tree(self, nodes):
         """將節點資料填入新版樹狀顯示"""
         # 清空現有資料
+        if self._modern_tree_loader is not None:
+            self._modern_tree_loader.cancel()
         for item in self.modern_tree.get_children():
             self.modern_tree.delete(item)
         # 設置 tag_configure（每次都設置，確保樣式）
@@ -2328,8 +2604,7 @@ class StructView(tk.Tk):
         self.modern_tree.tag_configure("union", foreground="purple", font="Arial 10 bold")
         self.modern_tree.tag_configure("bitfield", foreground="#008000")
         self.modern_tree.tag_configure("array", foreground="#B8860B")
-        # 遞迴插入節點
-        def insert_node(parent, node):
+        def item_options(node):
             node_type = node.get("type", "")
             label = node.get("label", node.get("name", ""))
             tags = []
@@ -2343,41 +2618,40 @@ class StructView(tk.Tk):
                 tags.append("bitfield")
             elif node_type == "array":
                 tags.append("array")
-            node_id = self.modern_tree.insert(
-                parent, 
-                "end", 
-                iid=node.get("id", None),
-                text=label,
-                values=(
+            return {
+                "text": label,
+                "values": (
                     node.get("name", ""),
                     node.get("value", ""),
                     node.get("hex_value", ""),
-                    node.get("hex_raw", "")
+                    node.get("hex_raw", ""),
                 ),
-                tags=tuple(tags)
-            )
-            # 遞迴插入子節點
-            for child in node.get("children", []):
-                insert_node(node_id, child)
-        # 插入所有根節點
-        for node in nodes:
-            insert_node("", node)
-        # 插入完畢後根據 context 展開節點（先展開 parent 再展開 child）
+                "tags": tuple(tags),
+            }
+        expanded = set()
         if self.presenter and hasattr(self.presenter, "context"):
             expanded = set(self.presenter.context.get("expanded_nodes", []))
-            def expand_recursive(tree, item_id):
-                if item_id in expanded:
-                    tree.item(item_id, open=True)
-                    tree.update_idletasks()
-                for child in tree.get_children(item_id):
-                    expand_recursive(tree, child)
-            for item in self.modern_tree.get_children(""):
-                expand_recursive(self.modern_tree, item)
+        # 只插入可見層級；大型收合子樹先放 placeholder，展開時再分批插入
+        index = build_tree_index(nodes, item_options, is_loaded=self._tree_is_loaded_predicate(None, expanded))
+        apply_tree_ops(self.modern_tree, diff_tree_index(TreeIndex(), index))
+        loader = LazyTreeLoader(
+            self.modern_tree, index, item_options,
+            after=self.after, after_cancel=self.after_cancel,
+            chunk_size=self.TREE_LOAD_CHUNK, auto_open=expanded,
+            on_progress=self._on_tree_load_progress,
+        )
+        self._modern_tree_loader = loader
+        # 插入完畢後根據 context 展開節點
+        for iid in expanded:
+            if iid in index.items:
+                self.modern_tree.item(iid, open=True)
+        loader.open_many([i for i in index.lazy if i in expanded])
         self.modern_tree.update_idletasks()
 
     def _on_modern_tree_open(self, event):
-        """新版樹狀顯示展開事件"""
-        pass  # 暫時留空，未來可擴充
+        """新版樹狀顯示展開事件：載入 placeholder 下的子節點"""
+        if self._modern_tree_loader is not None:
+            self._modern_tree_loader.open(event.widget.focus())
 
     def _on_modern_tree_close(self, event):
         """新版樹狀顯示收合事件"""
@@ -2386,7 +2660,7 @@ class StructView(tk.Tk):
     def _on_batch_expand(self):
         if not self.presenter or not hasattr(self.presenter, "on_expand_nodes"):
             return
-        selected = self.member_tree.selection()
+        selected = self._selected_member_ids()
         if selected:
             self.presenter.on_expand_nodes(list(selected))
             # 重新取得 nodes/context 並刷新顯示
@@ -2397,7 +2671,7 @@ class StructView(tk.Tk):
     def _on_batch_collapse(self):
         if not self.presenter or not hasattr(self.presenter, "on_collapse_nodes"):
             return
-        selected = self.member_tree.selection()
+        selected = self._selected_member_ids()
         if selected:
             self.presenter.on_collapse_nodes(list(selected))
             # 重新取得 nodes/context 並刷新顯示
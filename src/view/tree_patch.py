@@ -0,0 +1,304 @@
+"""Diff/patch helpers for ``ttk.Treeview`` refreshes.
+
+``StructView.show_treeview_nodes`` used to delete every item and re-insert
+the whole tree on every context push. These helpers compare the previous
+render (kept as an index) with the new display nodes by id and return the
+minimal list of ``insert``/``delete``/``move``/``item`` operations.
+Untouched items keep their open and selection state in the widget.
+
+Children of collapsed nodes are not inserted up front: the index holds a
+single placeholder row per unloaded node and ``LazyTreeLoader`` inserts the
+real children in chunks (scheduled with ``after``) when the node is opened.
+"""
+
+PLACEHOLDER_SUFFIX = "::__placeholder__"
+PLACEHOLDER_OPTIONS = {"text": "…", "values": (), "tags": ()}
+
+
+def placeholder_id(iid):
+    return f"{iid}{PLACEHOLDER_SUFFIX}"
+
+
+def is_placeholder(iid):
+    return isinstance(iid, str) and iid.endswith(PLACEHOLDER_SUFFIX)
+
+
+def subtree_within(node, limit):
+    """True if ``node`` has at most ``limit`` descendants (stops counting early)."""
+    count = 0
+    stack = list(node.get("children") or ())
+    while stack:
+        count += 1
+        if count > limit:
+            return False
+        stack.extend(stack.pop().get("children") or ())
+    return True
+
+
+class TreeIndex:
+    """Snapshot of a rendered tree: id -> (parent, options), parent -> [ids].
+
+    ``lazy`` maps the ids whose children are still a placeholder to their
+    display node.
+    """
+
+    __slots__ = ("items", "children", "lazy")
+
+    def __init__(self, items=None, children=None, lazy=None):
+        self.items = items if items is not None else {}
+        self.children = children if children is not None else {}
+        self.lazy = lazy if lazy is not None else {}
+
+    def __contains__(self, iid):
+        return iid in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+
+def build_tree_index(nodes, item_options, is_loaded=None, keep=None):
+    """Index display ``nodes`` (nested ``children``) with ``item_options(node)``.
+
+    ``is_loaded(node)`` False replaces the node's children with a placeholder
+    row (``None`` loads everything). Ids in ``keep`` copy their current
+    subtree from the ``TreeIndex`` given as ``keep.index`` (children being
+    loaded in chunks are left untouched).
+    """
+    items = {}
+    children = {"": []}
+    lazy = {}
+    stack = [("", nodes)]
+    while stack:
+        parent, nlist = stack.pop()
+        kids = children.setdefault(parent, [])
+        for node in nlist:
+            iid = node["id"]
+            items[iid] = (parent, item_options(node))
+            kids.append(iid)
+            sub = node.get("children")
+            if not sub:
+                continue
+            if keep is not None and iid in keep.ids:
+                _copy_subtree(keep.index, iid, items, children)
+                if iid in keep.index.lazy:
+                    lazy[iid] = node
+            elif is_loaded is None or is_loaded(node):
+                stack.append((iid, sub))
+            else:
+                ph = placeholder_id(iid)
+                items[ph] = (iid, PLACEHOLDER_OPTIONS)
+                children[iid] = [ph]
+                lazy[iid] = node
+    return TreeIndex(items, children, lazy)
+
+
+class KeepSubtrees:
+    """``build_tree_index(keep=...)`` argument: ids whose subtree is copied from ``index``."""
+
+    __slots__ = ("index", "ids")
+
+    def __init__(self, index, ids):
+        self.index = index
+        self.ids = set(ids)
+
+
+def _copy_subtree(index, iid, items, children):
+    stack = [iid]
+    while stack:
+        parent = stack.pop()
+        kids = list(index.children.get(parent, ()))
+        children[parent] = kids
+        for kid in kids:
+            items[kid] = index.items[kid]
+            stack.append(kid)
+
+
+def diff_tree_index(old, new):
+    """Return the operations turning ``old`` into ``new``.
+
+    Operations are tuples applied in order:
+    ``("delete", iid)``, ``("insert", parent, index, iid, options)``,
+    ``("move", iid, parent, index)`` and ``("item", iid, changed_options)``.
+    """
+    ops = []
+    # 找出需刪除的 item；祖先被刪除的存活 item 之後改以 insert 重建
+    removed = set()
+    gone = set()
+    stack = [(iid, False) for iid in reversed(old.children.get("", []))]
+    while stack:
+        iid, ancestor_removed = stack.pop()
+        if ancestor_removed:
+            gone.add(iid)
+        elif iid not in new.items:
+            removed.add(iid)
+            ops.append(("delete", iid))
+            gone.add(iid)
+        is_gone = iid in gone
+        stack.extend((child, is_gone) for child in reversed(old.children.get(iid, [])))
+
+    order = [""]
+    for parent in order:
+        kids = new.children.get(parent, [])
+        if not kids:
+            continue
+        order.extend(kids)
+        # 同 parent 下既有 item 的相對順序是否改變
+        old_kids = [k for k in old.children.get(parent, ())
+                    if k not in gone and new.items.get(k, (None,))[0] == parent]
+        kept = [k for k in kids if k not in gone and k in old.items and old.items[k][0] == parent]
+        reorder = kept != old_kids
+        for index, iid in enumerate(kids):
+            options = new.items[iid][1]
+            if iid in gone or iid not in old.items:
+                ops.append(("insert", parent, index, iid, options))
+                continue
+            old_parent, old_options = old.items[iid]
+            if old_parent != parent or reorder:
+                ops.append(("move", iid, parent, index))
+            if old_options != options:
+                changed = {k: v for k, v in options.items() if old_options.get(k) != v}
+                ops.append(("item", iid, changed))
+    return ops
+
+
+def apply_tree_ops(tree, ops):
+    """Apply ``diff_tree_index`` operations to ``tree``; return inserted ids."""
+    inserted = []
+    for op in ops:
+        kind = op[0]
+        if kind == "delete":
+            tree.delete(op[1])
+        elif kind == "insert":
+            _, parent, index, iid, options = op
+            tree.insert(parent, index, iid=iid, **options)
+            inserted.append(iid)
+        elif kind == "move":
+            _, iid, parent, index = op
+            tree.move(iid, parent, index)
+        elif kind == "item":
+            tree.item(op[1], **op[2])
+    return inserted
+
+
+class LazyTreeLoader:
+    """Insert children of placeholder nodes in chunks.
+
+    ``open(iid)`` queues the children of a lazy node; each tick inserts at
+    most ``chunk_size`` rows and reschedules itself with ``after`` so the UI
+    stays responsive. Inserted children that have children get their own
+    placeholder; those listed in ``auto_open`` are opened and queued too
+    (used by Expand All). Without ``after`` everything loads synchronously.
+    ``index`` is kept in sync with the widget.
+    """
+
+    def __init__(self, tree, index, item_options, after=None, after_cancel=None,
+                 chunk_size=200, auto_open=None, on_progress=None):
+        self.tree = tree
+        self.index = index
+        self.item_options = item_options
+        self._after = after
+        self._after_cancel = after_cancel
+        self.chunk_size = chunk_size
+        self.auto_open = set(auto_open or ())
+        self.on_progress = on_progress
+        self._queue = []  # [parent_iid, children, next_pos]
+        self._after_id = None
+        self.loading = set()  # 已開始、尚未插入完畢的 parent id
+        self.total = 0
+        self.done = 0
+
+    @property
+    def busy(self):
+        return bool(self._queue)
+
+    def open(self, iid):
+        """Start loading the children of ``iid``; returns False if not lazy."""
+        return self.open_many((iid,)) > 0
+
+    def open_many(self, iids):
+        """Queue several lazy nodes and schedule once; returns how many were queued."""
+        queued = sum(1 for iid in iids if self._queue_open(iid))
+        if queued:
+            self._schedule()
+        return queued
+
+    def cancel(self):
+        if self._after_id is not None and self._after_cancel is not None:
+            try:
+                self._after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._after_id = None
+        self._queue.clear()
+        self.loading.clear()
+        self.total = self.done = 0
+
+    def _schedule(self):
+        if self._after is None:
+            while self._queue:
+                self._run_chunk()
+            return
+        if self._after_id is None:
+            # 第一批立即插入，讓展開馬上有內容；其餘交給 after()
+            self._run_chunk()
+            if self._queue:
+                self._after_id = self._after(1, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        self._run_chunk()
+        if self._queue:
+            self._after_id = self._after(1, self._tick)
+
+    def _run_chunk(self):
+        budget = self.chunk_size
+        index = self.index
+        while self._queue and budget > 0:
+            entry = self._queue[0]
+            parent, kids, pos = entry
+            end = min(len(kids), pos + budget)
+            siblings = index.children.setdefault(parent, [])
+            opened = []
+            for node in kids[pos:end]:
+                iid = node["id"]
+                options = self.item_options(node)
+                self.tree.insert(parent, "end", iid=iid, **options)
+                index.items[iid] = (parent, options)
+                siblings.append(iid)
+                if node.get("children"):
+                    ph = placeholder_id(iid)
+                    self.tree.insert(iid, "end", iid=ph, **PLACEHOLDER_OPTIONS)
+                    index.items[ph] = (iid, PLACEHOLDER_OPTIONS)
+                    index.children[iid] = [ph]
+                    index.lazy[iid] = node
+                    if iid in self.auto_open:
+                        opened.append(iid)
+            budget -= end - pos
+            self.done += end - pos
+            entry[2] = end
+            if end >= len(kids):
+                self._queue.pop(0)
+                self.loading.discard(parent)
+            for iid in opened:
+                self.tree.item(iid, open=True)
+                self._queue_open(iid)
+        if self.on_progress is not None:
+            self.on_progress(self.done, self.total)
+
+    def _queue_open(self, iid):
+        node = self.index.lazy.pop(iid, None)
+        if node is None:
+            return False
+        ph = placeholder_id(iid)
+        if ph in self.index.items:
+            del self.index.items[ph]
+            try:
+                self.tree.delete(ph)
+            except Exception:
+                pass
+        self.index.children[iid] = []
+        kids = node.get("children") or []
+        self._queue.append([iid, kids, 0])
+        self.loading.add(iid)
+        self.total += len(kids)
+        return True
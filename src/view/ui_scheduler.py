@@ -0,0 +1,101 @@
+"""Frame-budgeted batch scheduler for large Treeview updates.
+
+``show_parsed_values``, ``on_values_refreshed`` and ``show_struct_layout``
+used to insert every row inside one Tk callback. ``ChunkedUpdateScheduler``
+applies rows in slices that stay within a frame-time budget (default 8 ms)
+and hands the rest to ``after()``:
+
+- jobs are keyed (one per target widget); starting a job cancels the stale
+  batches of the previous job with the same key;
+- the first slice runs immediately, so small updates finish synchronously;
+- ``on_progress(key, done, total)`` reports progress after every slice.
+"""
+
+import time
+
+DEFAULT_BUDGET_MS = 8.0
+
+
+class _Job:
+    __slots__ = ("items", "apply", "on_done", "pos", "after_id")
+
+    def __init__(self, items, apply, on_done):
+        self.items = items
+        self.apply = apply
+        self.on_done = on_done
+        self.pos = 0
+        self.after_id = None
+
+
+class ChunkedUpdateScheduler:
+    """Run ``apply(item)`` over items in time-budgeted batches via ``after``."""
+
+    def __init__(self, after=None, after_cancel=None, budget_ms=DEFAULT_BUDGET_MS,
+                 clock=time.perf_counter, on_progress=None, min_batch=1):
+        self._after = after
+        self._after_cancel = after_cancel
+        self.budget = budget_ms / 1000.0
+        self._clock = clock
+        self.on_progress = on_progress
+        self.min_batch = min_batch
+        self._jobs = {}
+
+    def run(self, key, items, apply, on_done=None):
+        """Start (or restart) job ``key``; returns True when it already finished."""
+        self.cancel(key)
+        if not isinstance(items, (list, tuple)):
+            items = list(items)
+        job = _Job(items, apply, on_done)
+        self._jobs[key] = job
+        if self._after is None:
+            # 無 Tk（測試/headless）：同步跑完所有批次
+            while not self._step(key, job) and self._jobs.get(key) is job:
+                pass
+            return True
+        return self._step(key, job)
+
+    def cancel(self, key):
+        job = self._jobs.pop(key, None)
+        if job is not None and job.after_id is not None and self._after_cancel is not None:
+            try:
+                self._after_cancel(job.after_id)
+            except Exception:
+                pass
+
+    def cancel_all(self):
+        for key in list(self._jobs):
+            self.cancel(key)
+
+    def busy(self, key=None):
+        if key is None:
+            return bool(self._jobs)
+        return key in self._jobs
+
+    def _step(self, key, job):
+        if self._jobs.get(key) is not job:
+            return False  # 已被較新的資料取代
+        job.after_id = None
+        items, apply = job.items, job.apply
+        total = len(items)
+        deadline = self._clock() + self.budget
+        pos = job.pos
+        done_in_slice = 0
+        while pos < total:
+            apply(items[pos])
+            pos += 1
+            done_in_slice += 1
+            # 每 16 筆檢查一次時間，降低 clock 呼叫成本
+            if done_in_slice >= self.min_batch and done_in_slice % 16 == 0 and self._clock() >= deadline:
+                break
+        job.pos = pos
+        if self.on_progress is not None:
+            self.on_progress(key, pos, total)
+        if pos >= total:
+            del self._jobs[key]
+            if job.on_done is not None:
+                job.on_done()
+            return True
+        if self._after is None:
+            return False
+        job.after_id = self._after(1, lambda: self._step(key, job))
+        return False
@@ -1,82 +1,339 @@
+from bisect import bisect_left
+
+try:
+    from tkinter import ttk
+except Exception:  # pragma: no cover - headless 環境
+    ttk = None
+
+_EXTEND_STATE = 0x0001 | 0x0004  # Shift / Control：延伸選取
+_SELECT_KEYS = {"Up", "Down", "Prior", "Next", "Home", "End"}
+
+
 class VirtualTreeview:
-    """Simplified virtualized tree widget.
+    """Virtualized tree widget on top of a ``ttk.Treeview``.
 
-    This widget only renders a window of the provided node list. Nodes must
-    be provided as pre-order flattened dictionaries with an ``id`` and
-    ``label``. Children are not rendered recursively – the list should
-    already contain the items in the desired visual order with appropriate
-    indentation information if needed.
+    Nodes are provided as a pre-order flattened list of dictionaries with an
+    ``id`` and ``label``; an optional ``depth`` field (as produced by
+    ``StructView._flatten_nodes``) describes the hierarchy. Only a window of
+    ``page_size`` visible rows exists in the widget at any time:
+
+    - scrolling diffs the window against the rendered rows, so a one-row
+      scroll deletes one row and inserts one, and unchanged rows only get
+      their values rewritten when they differ;
+    - expand/collapse is computed on the flattened model (``expand``,
+      ``collapse``, ``toggle``) without touching hidden rows;
+    - ``get_global_index`` uses an id -> index dict;
+    - an optional vertical scrollbar tracks the window proportionally.
+
+    Rows keep the node id as their Treeview iid, so selection, context menus
+    and drag handlers keep working with node ids. Rows that leave the window
+    are deleted even when selected; the selection is tracked by node id
+    (``selection`` / ``selection_set``) and re-applied when the row scrolls
+    back in. A scroll step of ``k`` rows costs ``k`` inserts, one ``delete``
+    for the rows that left, and one ``get_children`` / ``selection`` /
+    ``selection_add`` call each (plus the scrollbar update): at most
+    ``page_size + 4`` calls on the tree.
     """
-    def __init__(self, tree, page_size=100):
+    def __init__(self, tree, page_size=100, scrollbar=True):
         self.tree = tree
         self.page_size = page_size
         self.nodes = []
         self.start = 0
+        self.expanded = None  # None: 全部展開
+        self._index = {}  # id -> index in self.nodes
+        self._subtree_end = []  # index -> 子樹結束位置（不含）
+        self._visible = []  # 可見節點在 self.nodes 的 index（遞增）
+        self._row_options = {}  # iid -> 最近一次寫入的 item options
+        self._rows = []  # widget 內目前的 row（依序）
+        self._selected = set()  # 選取中的 node id，含捲出視窗者
+        self.scrollbar = None
         self.tree.bind("<MouseWheel>", self._on_scroll)
         self.tree.bind("<Button-4>", self._on_scroll)
         self.tree.bind("<Button-5>", self._on_scroll)
+        try:
+            self.tree.bind("<Prior>", lambda e: self._scroll_by(-self.page_size))
+            self.tree.bind("<Next>", lambda e: self._scroll_by(self.page_size))
+            self.tree.bind("<Double-1>", self._on_double_click, add="+")
+            # 獨立 bindtag：widget 上的 <ButtonPress-1> 等綁定被覆寫時仍會觸發
+            tag = f"VirtualTreeview{id(self)}"
+            self.tree.bindtags((tag,) + tuple(self.tree.bindtags()))
+            self.tree.bind_class(tag, "<ButtonPress-1>", self._on_select_click)
+            self.tree.bind_class(tag, "<KeyPress>", self._on_select_key)
+        except Exception:
+            pass
+        if scrollbar:
+            self._create_scrollbar()
+
+    # --- model -----------------------------------------------------------
+    def set_nodes(self, nodes, expanded=None, keep_position=False):
+        """Replace the flattened model.
 
-    def set_nodes(self, nodes):
+        ``expanded`` None opens every node. With ``keep_position`` the scroll
+        offset and the current expand state are kept (context refreshes).
+        """
         self.nodes = list(nodes)
-        self.start = 0
+        if expanded is not None:
+            self.expanded = set(expanded)
+        elif not keep_position:
+            self.expanded = None
+        self._rebuild_structure()
+        if not keep_position:
+            self.start = 0
+        self._clamp_start()
         self._render()
 
-    def _on_scroll(self, event):
-        if event.delta > 0 or getattr(event, "num", 0) == 4:
-            self.start = max(0, self.start - 1)
-        else:
-            self.start = min(max(0, len(self.nodes) - self.page_size),
-                             self.start + 1)
+    def _rebuild_structure(self):
+        nodes = self.nodes
+        self._index = {n["id"]: i for i, n in enumerate(nodes)}
+        self._selected.intersection_update(self._index)
+        count = len(nodes)
+        ends = list(range(1, count + 1))
+        self._subtree_end = ends
+        if not any("depth" in n and n["depth"] for n in nodes):
+            # 平面列表：每個節點都可見
+            self._visible = list(range(count))
+            return
+        # 以 depth 推算每個節點的子樹範圍（pre-order）
+        stack = []
+        for i, n in enumerate(nodes):
+            depth = n.get("depth", 0)
+            while stack and nodes[stack[-1]].get("depth", 0) >= depth:
+                ends[stack.pop()] = i
+            stack.append(i)
+        for i in stack:
+            ends[i] = count
+        self._visible = self._collect_visible(0, count)
+
+    def _has_children(self, index):
+        return self._subtree_end[index] > index + 1
+
+    def _is_open(self, index):
+        return self.expanded is None or self.nodes[index]["id"] in self.expanded
+
+    def _collect_visible(self, lo, hi):
+        result = []
+        i = lo
+        while i < hi:
+            result.append(i)
+            if self._has_children(i) and not self._is_open(i):
+                i = self._subtree_end[i]
+            else:
+                i += 1
+        return result
+
+    def _visible_position(self, index):
+        pos = bisect_left(self._visible, index)
+        if pos < len(self._visible) and self._visible[pos] == index:
+            return pos
+        return -1
+
+    def expand(self, iid):
+        index = self._index.get(iid)
+        if index is None or self._is_open(index):
+            return
+        self.expanded.add(iid)
+        pos = self._visible_position(index)
+        if pos >= 0:
+            self._visible[pos + 1:pos + 1] = self._collect_visible(index + 1, self._subtree_end[index])
         self._render()
-        return "break"
 
-    def _render(self):
-        selected = set(self.tree.selection())
-        # 刪除非選取中的既有節點，保留選中的節點（即使不在當前頁面）
-        existing = set(self.tree.get_children())
-        for item in list(existing):
-            if item not in selected:
-                self.tree.delete(item)
-        # 插入當前頁面節點
-        end = self.start + self.page_size
-        window = self.nodes[self.start:end]
-        for n in window:
-            iid = n["id"]
-            if iid not in set(self.tree.get_children()):
-                values = (
-                    n.get("name", ""),
-                    n.get("value", ""),
-                    n.get("hex_value", ""),
-                    n.get("hex_raw", ""),
-                )
-                tags = tuple(n.get("tags", []))
-                self.tree.insert(
-                    "",
-                    "end",
-                    iid=iid,
-                    text=n.get("label", n.get("name", "")),
-                    values=values,
-                    tags=tags,
-                )
-        # 重新設置選取狀態（若選取節點仍存在）
-        if selected:
-            keep = [i for i in selected if i in self.tree.get_children("")]
-            if keep:
-                self.tree.selection_set(keep)
+    def collapse(self, iid):
+        index = self._index.get(iid)
+        if index is None or not self._has_children(index) or not self._is_open(index):
+            return
+        if self.expanded is None:
+            self.expanded = {n["id"] for i, n in enumerate(self.nodes) if self._has_children(i)}
+        self.expanded.discard(iid)
+        pos = self._visible_position(index)
+        if pos >= 0:
+            hi = bisect_left(self._visible, self._subtree_end[index], pos + 1)
+            del self._visible[pos + 1:hi]
+        self._clamp_start()
+        self._render()
+
+    def toggle(self, iid):
+        index = self._index.get(iid)
+        if index is None:
+            return
+        if self._is_open(index):
+            self.collapse(iid)
+        else:
+            self.expand(iid)
 
     def get_global_index(self, iid):
         """Return the index of ``iid`` within the full node list."""
-        for idx, n in enumerate(self.nodes):
-            if n.get("id") == iid:
-                return idx
-        return -1
+        return self._index.get(iid, -1)
 
     def reorder_nodes(self, parent_id, from_idx, to_idx):
-        """Move node from ``from_idx`` to ``to_idx`` and re-render."""
+        """Move node (with its subtree) from ``from_idx`` to ``to_idx`` and re-render."""
         if from_idx < 0 or from_idx >= len(self.nodes):
             return
         if to_idx < 0 or to_idx >= len(self.nodes):
             return
-        node = self.nodes.pop(from_idx)
-        self.nodes.insert(to_idx, node)
+        end = self._subtree_end[from_idx] if self._subtree_end else from_idx + 1
+        block = self.nodes[from_idx:end]
+        del self.nodes[from_idx:end]
+        if to_idx > from_idx:
+            to_idx = max(from_idx, to_idx - len(block) + 1)
+        self.nodes[to_idx:to_idx] = block
+        self._rebuild_structure()
+        self._clamp_start()
         self._render()
+
+    # --- selection -----------------------------------------------------
+    def selection(self):
+        """Selected node ids in model order, including rows outside the window."""
+        self._sync_selection()
+        return tuple(sorted(self._selected, key=self._index.__getitem__))
+
+    def selection_set(self, ids):
+        """Replace the selection; rows outside the window are selected when shown."""
+        if isinstance(ids, str):
+            ids = (ids,)
+        self._selected = {iid for iid in ids or () if iid in self._index}
+        self.tree.selection_set([iid for iid in self._rows if iid in self._selected])
+
+    def _sync_selection(self):
+        # widget 內的 row 以 widget 的選取為準；捲出視窗的 row 沿用記錄
+        self._selected.difference_update(self._rows)
+        self._selected.update(iid for iid in self.tree.selection() if iid in self._index)
+
+    def _forget_hidden_selection(self):
+        self._selected.intersection_update(self._rows)
+
+    def _on_select_click(self, event):
+        # 單擊（無 Shift/Control）會取代選取：捲出視窗的選取一併放棄
+        if not getattr(event, "state", 0) & _EXTEND_STATE:
+            self._forget_hidden_selection()
+
+    def _on_select_key(self, event):
+        if getattr(event, "keysym", "") in _SELECT_KEYS and not getattr(event, "state", 0) & _EXTEND_STATE:
+            self._forget_hidden_selection()
+
+    # --- scrolling -------------------------------------------------------
+    def _on_scroll(self, event):
+        delta = getattr(event, "delta", 0) or 0
+        if delta > 0 or getattr(event, "num", 0) == 4:
+            step = -max(1, abs(delta) // 120)
+        else:
+            step = max(1, abs(delta) // 120)
+        self._scroll_by(step)
+        return "break"
+
+    def _scroll_by(self, rows):
+        old = self.start
+        self.start += rows
+        self._clamp_start()
+        if self.start != old:
+            self._render()
+        return "break"
+
+    def _clamp_start(self):
+        self.start = min(max(0, len(self._visible) - self.page_size), max(0, self.start))
+
+    def yview(self, *args):
+        """Scrollbar command：支援 ``moveto`` 與 ``scroll n units|pages``。"""
+        if not args:
+            return self._scroll_fractions()
+        if args[0] == "moveto":
+            self.start = int(float(args[1]) * len(self._visible))
+            self._clamp_start()
+            self._render()
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and args[2].startswith("page"):
+                amount *= self.page_size
+            self._scroll_by(amount)
+        return None
+
+    def _scroll_fractions(self):
+        total = len(self._visible)
+        if total == 0:
+            return 0.0, 1.0
+        return self.start / total, min(1.0, (self.start + self.page_size) / total)
+
+    def _create_scrollbar(self):
+        if ttk is None:
+            return
+        try:
+            if self.tree.winfo_manager() != "pack":
+                return
+            self.scrollbar = ttk.Scrollbar(self.tree.master, orient="vertical", command=self.yview)
+            self.scrollbar.pack(side="right", fill="y", before=self.tree)
+        except Exception:
+            self.scrollbar = None
+
+    def attach_scrollbar(self, scrollbar):
+        """使用外部建立的 scrollbar（tree 非 pack 佈局時）。"""
+        self.scrollbar = scrollbar
+        scrollbar.configure(command=self.yview)
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self.scrollbar is not None:
+            try:
+                self.scrollbar.set(*self._scroll_fractions())
+            except Exception:
+                pass
+
+    def _on_double_click(self, event):
+        try:
+            iid = self.tree.identify_row(event.y)
+        except Exception:
+            return None
+        index = self._index.get(iid)
+        if index is not None and self._has_children(index):
+            self.toggle(iid)
+            return "break"
+        return None
+
+    # --- rendering -------------------------------------------------------
+    def _row_options_for(self, index):
+        n = self.nodes[index]
+        text = n.get("label", n.get("name", ""))
+        if self._has_children(index):
+            text = ("▾ " if self._is_open(index) else "▸ ") + text
+        return {
+            "text": text,
+            "values": (
+                n.get("name", ""),
+                n.get("value", ""),
+                n.get("hex_value", ""),
+                n.get("hex_raw", ""),
+            ),
+            "tags": tuple(n.get("tags", [])),
+        }
+
+    def _render(self):
+        tree = self.tree
+        window_ids = [self.nodes[i]["id"] for i in self._visible[self.start:self.start + self.page_size]]
+        wanted = set(window_ids)
+        self._sync_selection()
+        current = tree.get_children("")
+        # 離開視窗的 row 一次刪除（含選取中者，選取由 self._selected 記住）
+        gone = [iid for iid in current if iid not in wanted]
+        if gone:
+            tree.delete(*gone)
+            for iid in gone:
+                self._row_options.pop(iid, None)
+        rows = [iid for iid in current if iid in wanted]
+        existing = set(rows)
+        reselect = [iid for iid in window_ids if iid in self._selected and iid not in existing]
+        for pos, iid in enumerate(window_ids):
+            options = self._row_options_for(self._index[iid])
+            if iid not in existing:
+                tree.insert("", pos, iid=iid, **options)
+                rows.insert(pos, iid)
+                existing.add(iid)
+            else:
+                if rows[pos] != iid:
+                    tree.move(iid, "", pos)
+                    rows.remove(iid)
+                    rows.insert(pos, iid)
+                if self._row_options.get(iid) != options:
+                    tree.item(iid, **options)
+            self._row_options[iid] = options
+        self._rows = rows
+        if reselect:
+            tree.selection_add(reselect)
+        self._update_scrollbar()
@@ -0,0 +1,97 @@
+import os
+
+from src.config.config_cache import cache_dir, load_cached
+from src.config.ui_strings import load_ui_strings, get_string
+
+
+def _counting_parser(calls):
+    def parse(path):
+        calls.append(path)
+        with open(path, encoding="utf-8") as f:
+            return {"text": f.read()}
+    return parse
+
+
+def test_cache_hit_until_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("STRUCT_CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+    source = tmp_path / "a.yaml"
+    source.write_text("one", encoding="utf-8")
+    calls = []
+    parse = _counting_parser(calls)
+
+    assert load_cached(str(source), parse) == {"text": "one"}
+    assert load_cached(str(source), parse) == {"text": "one"}
+    assert len(calls) == 1
+
+    source.write_text("two!", encoding="utf-8")
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_cached(str(source), parse) == {"text": "two!"}
+    assert len(calls) == 2
+
+
+def test_corrupt_cache_and_disabled_cache_fall_back_to_parse(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("STRUCT_CONFIG_CACHE_DIR", str(cache_dir))
+    source = tmp_path / "a.yaml"
+    source.write_text("one", encoding="utf-8")
+    calls = []
+    parse = _counting_parser(calls)
+    load_cached(str(source), parse)
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b"not a pickle")
+    assert load_cached(str(source), parse) == {"text": "one"}
+    assert len(calls) == 2
+
+    monkeypatch.setenv("STRUCT_CONFIG_CACHE", "0")
+    load_cached(str(source), parse)
+    load_cached(str(source), parse)
+    assert len(calls) == 4
+
+
+def test_ui_strings_served_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("STRUCT_CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+    xml_path = tmp_path / "strings.xml"
+    xml_path.write_text('<resources><string name="k">v</string></resources>', encoding="utf-8")
+    try:
+        assert load_ui_strings(str(xml_path)) == {"k": "v"}
+        assert load_ui_strings(str(xml_path)) == {"k": "v"}
+        assert get_string("k") == "v"
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+    finally:
+        load_ui_strings(os.path.join(os.path.dirname(__file__), "..", "..", "src", "config", "ui_strings.xml"))
+
+
+def test_none_and_non_json_results_are_not_cached(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("STRUCT_CONFIG_CACHE_DIR", str(cache_dir))
+    source = tmp_path / "a.yaml"
+    source.write_text("one", encoding="utf-8")
+    calls = []
+
+    def parse_none(path):
+        calls.append(path)
+        return None
+
+    assert load_cached(str(source), parse_none) is None
+    assert load_cached(str(source), parse_none) is None
+    assert len(calls) == 2
+    assert not cache_dir.exists()
+
+    int_keys = {1: "a"}
+    assert load_cached(str(source), lambda path: int_keys, kind="ints") == int_keys
+    assert not cache_dir.exists()
+
+
+def test_default_cache_dir_is_per_user(tmp_path, monkeypatch):
+    monkeypatch.delenv("STRUCT_CONFIG_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path / "local"))
+    source = tmp_path / "a.yaml"
+    source.write_text("one", encoding="utf-8")
+    load_cached(str(source), _counting_parser([]))
+    directory = cache_dir()
+    assert directory.startswith(str(tmp_path))
+    assert [p.endswith(".json") for p in os.listdir(directory)] == [True]
+    if os.name != "nt":
+        assert os.stat(directory).st_mode & 0o777 == 0o700
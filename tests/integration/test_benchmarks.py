@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import importtime
+from benchmarks.cases import CASES
+from benchmarks.runner import compare, main, run
+
+
+def result(median, size=100, case="calculate_layout"):
+    return {"results": [{"case": case, "size": size, "median": median}]}
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_every_case_runs(self):
+        data = run(sizes=(5,), repeat=1, min_time=0)
+        self.assertEqual(sorted(r["case"] for r in data["results"]), sorted(CASES))
+        self.assertIn("python", data["machine"])
+        self.assertTrue(all(r["median"] > 0 for r in data["results"]))
+
+    def test_compare_flags_regressions(self):
+        self.assertEqual(compare(result(0.010), result(0.020))[0]["status"], "regression")
+        self.assertEqual(compare(result(0.010), result(0.011))[0]["status"], "ok")
+        self.assertEqual(compare(result(0.010), result(0.005))[0]["status"], "improved")
+        self.assertEqual(compare(result(1e-6), result(3e-6))[0]["status"], "ok")  # 低於 noise floor
+        self.assertEqual(compare(result(0.010), result(0.010, size=200))[0]["status"], "new")
+
+    def test_compare_command_exit_status(self):
+        with tempfile.TemporaryDirectory() as d:
+            base, slow = os.path.join(d, "base.json"), os.path.join(d, "slow.json")
+            for path, median in ((base, 0.010), (slow, 0.030)):
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump(result(median), f)
+            self.assertEqual(main(["compare", base, base]), 0)
+            self.assertEqual(main(["compare", base, slow]), 1)
+            self.assertEqual(main(["compare", base, slow, "--threshold", "5"]), 0)
+
+
+class TestImportBudget(unittest.TestCase):
+    def test_parse_importtime(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       100 |        100 |     _abc\n"
+                  "import time:       250 |        350 |   abc\n"
+                  "import time:        40 |        390 | pkg\n")
+        rows = importtime.parse_importtime(stderr)
+        self.assertEqual(rows[-1], ("pkg", 40, 390, 0))
+        self.assertEqual([r[3] for r in rows], [2, 1, 0])
+
+    def test_startup_does_not_import_lazy_modules(self):
+        result = importtime.measure(runs=1)
+        self.assertEqual(result["lazy_violations"], [])
+        self.assertGreater(result["total_ms"], 0)
+        self.assertEqual(importtime.check(dict(result, total_ms=1e9), budget_ms=1)[0][:16], "startup imports ")
+
+
+if __name__ == "__main__":
+    unittest.main()
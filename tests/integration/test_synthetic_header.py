@@ -0,0 +1,59 @@
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+
+from src.model.struct_model import StructModel
+
+TOOL = os.path.join(os.path.dirname(__file__), "..", "..", "tools", "gen_synthetic_header.py")
+_spec = importlib.util.spec_from_file_location("gen_synthetic_header", TOOL)
+gen = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gen)
+
+
+def config(**overrides):
+    values = dict(seed=7, structs=12, unions=3, members=8, depth=3, max_array=6,
+                  bitfield_ratio=0.2, forward_ratio=0.15, pack_regions=2, alias_ratio=0.5)
+    values.update(overrides)
+    return gen.GeneratorConfig(**values)
+
+
+class TestSyntheticHeader(unittest.TestCase):
+    def test_same_seed_same_output(self):
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+            gen.generate(a, config(), records=3)
+            gen.generate(b, config(), records=3)
+            for name in sorted(os.listdir(a)):
+                with open(os.path.join(a, name), "rb") as fa, open(os.path.join(b, name), "rb") as fb:
+                    self.assertEqual(fa.read(), fb.read(), name)
+        first, _ = gen.HeaderGenerator(config()).generate()
+        other, _ = gen.HeaderGenerator(config(seed=8)).generate()
+        self.assertNotEqual(first, other)
+
+    def test_header_features_and_records(self):
+        aliases = gen.load_aliases()
+        header, names = gen.HeaderGenerator(config(), aliases).generate()
+        self.assertEqual(len(names), 12)
+        self.assertIn("#pragma pack(push,", header)
+        self.assertEqual(header.count("#pragma pack(push,"), header.count("#pragma pack(pop)"))
+        self.assertRegex(header, r"\w+ m\d+ : \d;")
+        self.assertRegex(header, r"struct S\d+ \*m\d+;")
+        self.assertIn("union U", header)
+        self.assertTrue(any(alias in header for alias in aliases))
+
+        with tempfile.TemporaryDirectory() as d:
+            manifest = gen.generate(d, config(), records=2)
+            with open(os.path.join(d, "manifest.json"), encoding="utf-8") as f:
+                self.assertEqual(json.load(f), manifest)
+            for name in names:
+                model = StructModel()
+                model.load_struct_from_file(os.path.join(d, "synthetic.h"), target_name=name)
+                self.assertEqual(model.struct_name, name)
+                entry = manifest["records"][name]
+                self.assertEqual(entry["record_size"], model.total_size)
+                self.assertEqual(os.path.getsize(os.path.join(d, entry["file"])), 2 * model.total_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+from src.model.array_ranges import (
+    ArrayDescriptor, ArrayRangeBuilder, LazyChildren, hexdump_preview, range_step,
+)
+from src.model.struct_model import StructModel
+
+
+class TestArrayRangeHelpers(unittest.TestCase):
+    def test_range_step_is_logarithmic(self):
+        self.assertEqual(range_step(1000, 1024), 1)
+        self.assertEqual(range_step(65536, 1024), 1024)
+        self.assertEqual(range_step(1024 * 1024 + 1, 1024), 1024 * 1024)
+
+    def test_element_suffix_multi_dim(self):
+        desc = ArrayDescriptor("S.m", "m", "int", (3, 4), elem_size=4, offset=0)
+        self.assertEqual(desc.count, 12)
+        self.assertEqual(desc.element_suffix(0), "[0][0]")
+        self.assertEqual(desc.element_suffix(6), "[1][2]")
+        self.assertEqual(desc.element_offset(6), 24)
+
+    def test_hexdump_preview(self):
+        data = bytes(range(32))
+        self.assertEqual(hexdump_preview(data, 2, 3), "02 03 04")
+        self.assertTrue(hexdump_preview(data, 0, 32, limit=4).endswith("…"))
+        self.assertEqual(hexdump_preview(None, 0, 4), "")
+
+    def test_children_are_built_on_demand(self):
+        calls = []
+        def decode(desc, index):
+            calls.append(index)
+            return str(index)
+        desc = ArrayDescriptor("S.buf", "buf", "char", (65536,), elem_size=1, offset=0)
+        top = ArrayRangeBuilder(desc, decode, fold_size=1024).children()
+        self.assertIsInstance(top, LazyChildren)
+        self.assertEqual(len(top), 64)
+        self.assertEqual(top.materialized, 0)
+        rng = top[1]
+        self.assertEqual(rng["label"], "buf[1024..2047]")
+        self.assertEqual(top.materialized, 1)
+        self.assertEqual(calls, [])
+        self.assertEqual(rng["children"][5]["value"], "1029")
+        self.assertEqual(calls, [1029])
+
+
+class TestStructModelArrayFolding(unittest.TestCase):
+    def _load(self, content):
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.unlink, f.name)
+        model = StructModel()
+        model.load_struct_from_file(f.name)
+        return model
+
+    def test_large_array_folds_into_ranges(self):
+        model = self._load("struct S { int a; unsigned char buf[4096]; };")
+        model.parse_hex_data((bytes(4) + bytes(range(256)) * 16).hex(), "little")
+        root = model.get_display_nodes("tree")[0]
+        buf = root["children"][1]
+        self.assertEqual([r["label"] for r in buf["children"]],
+                         ["buf[0..1023]", "buf[1024..2047]", "buf[2048..3071]", "buf[3072..4095]"])
+        rng = buf["children"][1]
+        self.assertEqual(rng["offset"], "1028")
+        self.assertTrue(rng["value"].startswith("00 01 02"))
+        elem = rng["children"][3]
+        self.assertEqual(elem["id"], "S.buf[1027]")
+        self.assertEqual(elem["value"], "3")
+
+    def test_small_array_is_not_folded(self):
+        model = self._load("struct S { int a; char buf[8]; };")
+        root = model.get_display_nodes("tree")[0]
+        self.assertEqual(root["children"][1]["children"], [])
+
+    def test_flat_mode_lists_top_ranges_only(self):
+        model = self._load("struct S { int a; char buf[4096]; };")
+        labels = [n["label"] for n in model.get_display_nodes("flat")]
+        self.assertEqual(labels[2:], ["buf", "buf[0..1023]", "buf[1024..2047]",
+                                      "buf[2048..3071]", "buf[3072..4095]"])
+
+    def test_fold_can_be_disabled(self):
+        model = self._load("struct S { char buf[4096]; };")
+        model.array_fold_size = None
+        model.bump_version()
+        root = model.get_display_nodes("tree")[0]
+        self.assertEqual(root["children"][0]["children"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
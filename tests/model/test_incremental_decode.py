@@ -0,0 +1,96 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.model.incremental_decode import IncrementalDecoder, changed_ranges
+from src.model.input_field_processor import InputFieldProcessor
+from src.model.struct_model import StructModel
+
+HEADER = """
+struct S {
+    char c;
+    int i;
+    unsigned int a : 3;
+    unsigned int b : 5;
+    bool flag;
+    long long big;
+    short arr[6];
+};
+"""
+
+
+def load_model(content=HEADER):
+    with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+        f.write(content)
+    try:
+        model = StructModel()
+        model.load_struct_from_file(f.name)
+    finally:
+        os.unlink(f.name)
+    return model
+
+
+class TestIncrementalDecoder(unittest.TestCase):
+    def test_changed_ranges(self):
+        old = bytes(1000)
+        new = bytearray(old)
+        new[3] = 1
+        new[600] = 2
+        new[601] = 3
+        self.assertEqual(changed_ranges(old, bytes(new), block_size=256), [(3, 4), (600, 602)])
+        self.assertEqual(changed_ranges(old, old), [])
+
+    def test_random_edits_match_full_parse(self):
+        model = load_model()
+        reference = load_model()
+        rng = random.Random(42)
+        data = bytearray(model.total_size)
+        for _ in range(200):
+            for _ in range(rng.randint(1, 3)):
+                data[rng.randrange(len(data))] = rng.randrange(256)
+            order = rng.choice(["little", "big"])
+            result = model.decode_bytes(bytes(data), order)
+            parsed = model.apply_decoded(result)
+            self.assertEqual(parsed, reference.parse_hex_data(data.hex(), order))
+            self.assertEqual(model.member_values, reference.member_values)
+            self.assertEqual(model.member_numeric_values, reference.member_numeric_values)
+            self.assertEqual(model.member_hex_raws, reference.member_hex_raws)
+
+    def test_only_overlapping_items_are_redecoded(self):
+        model = load_model()
+        first = model.decode_bytes(bytes(model.total_size), "little")
+        self.assertTrue(first.full)
+        data = bytearray(model.total_size)
+        offset_i = next(item["offset"] for item in model.layout if item["name"] == "i")
+        data[offset_i] = 7
+        result = model.decode_bytes(bytes(data), "little")
+        self.assertFalse(result.full)
+        self.assertEqual([model.layout[i]["name"] for i in result.changed], ["i"])
+        self.assertIsNot(result.values, first.values)  # 不共用可變狀態
+        self.assertEqual(first.values["i"], "0")
+
+    def test_stale_decode_returns_none_and_keeps_state(self):
+        model = load_model()
+        decoder = IncrementalDecoder()
+        self.assertIsNone(decoder.decode(bytes(model.total_size), "little", model.layout, should_stop=lambda: True))
+        self.assertIsNone(decoder._last)
+
+    def test_apply_decoded_ignores_old_layout(self):
+        model = load_model()
+        result = model.decode_bytes(bytes(model.total_size), "little")
+        model.layout = list(model.layout)
+        self.assertIsNone(model.apply_decoded(result))
+
+    def test_process_box_bytes_matches_input_fields(self):
+        processor = InputFieldProcessor()
+        data = bytes(range(1, 15))
+        for unit in (1, 2, 4, 8):
+            parts = [(data[i:i + unit].hex(), len(data[i:i + unit])) for i in range(0, len(data), unit)]
+            for order in ("little", "big"):
+                self.assertEqual(processor.process_box_bytes(data, unit, order),
+                                 processor.process_input_fields(parts, order))
+
+
+if __name__ == "__main__":
+    unittest.main()
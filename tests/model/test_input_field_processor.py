@@ -82,6 +82,28 @@ class TestInputFieldProcessorXMLDriven(unittest.TestCase):
                     result = self.processor.convert_to_raw_bytes(subcase['padded_hex'], subcase['byte_size'], subcase['endianness'])
                     self.assertEqual(result.hex(), subcase['expected'].lower())
 
+    def test_process_input_fields_matches_single_field(self):
+        # 批次 API 需與逐格 process_input_field 串接結果一致
+        for endianness in ('little', 'big'):
+            parts = []
+            for case in self.test_data:
+                extra = case.get('extra_tests', {})
+                for subcase in extra.get('process_input_field', []):
+                    if subcase['endianness'] == endianness:
+                        parts.append((subcase['input'], subcase['byte_size']))
+            with self.subTest(endianness=endianness, count=len(parts)):
+                expected = b"".join(self.processor.process_input_field(v, n, endianness) for v, n in parts)
+                self.assertEqual(self.processor.process_input_fields(parts, endianness), expected)
+
+    def test_process_input_fields_reports_offending_part(self):
+        from src.model.input_field_processor import InputFieldBatchError
+        with self.assertRaises(InputFieldBatchError) as cm:
+            self.processor.process_input_fields([("12", 4), ("zz", 1)], 'little')
+        self.assertEqual((cm.exception.kind, cm.exception.index), ("non_hex", 1))
+        with self.assertRaises(InputFieldBatchError) as cm:
+            self.processor.process_input_fields([("123", 1)], 'big')
+        self.assertEqual(cm.exception.kind, "length")
+
 
 @unittest.skip("XML-driven tests placeholder")
 class TestInputFieldProcessorXML(unittest.TestCase):
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from src.model.layout_cache import LayoutCache, estimate_layout_bytes, layout_key
+from src.model.struct_model import StructModel
+from src.model.types import get_pointer_mode, set_pointer_mode
+
+
+def manual_layout(n, name="m"):
+    return [{"name": f"{name}{i}", "type": "int", "size": 4, "offset": 4 * i} for i in range(n)]
+
+
+class TestLayoutKey(unittest.TestCase):
+    def test_order_pack_and_pointer_mode_change_key(self):
+        a = {"name": "a", "type": "char", "bit_size": 0}
+        b = {"name": "b", "type": "int", "bit_size": 0}
+        self.assertEqual(layout_key([a, b]), layout_key([dict(reversed(list(a.items()))), b]))
+        self.assertNotEqual(layout_key([a, b]), layout_key([b, a]))
+        self.assertNotEqual(layout_key([a, b]), layout_key([a, b], pack_alignment=1))
+        mode = get_pointer_mode()
+        try:
+            key64 = layout_key([a])
+            set_pointer_mode(32 if mode == 64 else 64)
+            self.assertNotEqual(key64, layout_key([a]))
+        finally:
+            set_pointer_mode(mode)
+
+
+class TestLayoutCache(unittest.TestCase):
+    def test_evicts_by_bytes_and_counts(self):
+        smalls = [manual_layout(2, name=f"s{i}") for i in range(3)]
+        cache = LayoutCache(max_entries=10, max_bytes=sum(map(estimate_layout_bytes, smalls)))
+        for i, layout in enumerate(smalls):
+            cache.store(("k", i), layout)
+        self.assertEqual((len(cache), cache.evictions), (3, 0))
+        cache.store("big", manual_layout(50))
+        # 大 layout 擠掉所有舊項目，但最新一筆仍保留
+        self.assertEqual(list(cache), ["big"])
+        self.assertEqual(cache.evictions, 3)
+        self.assertEqual(cache.bytes, estimate_layout_bytes(cache["big"]))
+
+    def test_lookup_updates_lru_and_stats(self):
+        cache = LayoutCache(max_entries=2)
+        cache.store("a", manual_layout(1))
+        cache.store("b", manual_layout(1))
+        self.assertIsNotNone(cache.lookup("a"))
+        cache.store("c", manual_layout(1))
+        self.assertEqual(list(cache), ["a", "c"])
+        self.assertEqual(cache.last_evict, "b")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 3, 1))
+        del cache["a"]
+        cache.clear()
+        self.assertEqual(cache.bytes, 0)
+
+    def test_import_path_uses_cache(self):
+        content = "struct A { int x; char y; };\nstruct B { char c; };\n"
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write(content)
+        try:
+            model = StructModel()
+            model.load_struct_from_file(f.name, target_name="A")
+            first = model.layout
+            model.set_import_target_struct("B")
+            model.set_import_target_struct("A")
+            self.assertIs(model.layout, first)
+            self.assertEqual(model.total_size, 8)
+            self.assertEqual(model.layout_cache.hits, 1)
+        finally:
+            os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import random
+import unittest
+from dataclasses import asdict
+
+from src.model.manual_layout import IncrementalManualLayout
+from src.model.layout import LayoutState, StructLayoutCalculator
+from src.model.struct_model import StructModel, calculate_layout
+
+TYPES = ["char", "short", "int", "long long", "double", "unsigned char", "bool"]
+BIT_TYPES = ["int", "unsigned int", "char", "unsigned char"]
+
+
+def full_layout(members):
+    expanded = StructModel()._convert_to_cpp_members(members)
+    layout, total, align = calculate_layout(expanded)
+    return [asdict(item) for item in layout], total, align
+
+
+class TestIncrementalManualLayout(unittest.TestCase):
+    def test_matches_full_layout_under_random_edits(self):
+        rng = random.Random(7)
+        members = []
+        engine = IncrementalManualLayout()
+        for step in range(300):
+            op = rng.choice(["add", "add", "retype", "rename", "delete", "bit"])
+            if op == "add" or not members:
+                members.insert(rng.randint(0, len(members)), {"name": f"m{step}", "type": rng.choice(TYPES), "bit_size": 0})
+            elif op == "retype":
+                members[rng.randrange(len(members))]["type"] = rng.choice(TYPES + ["bogus"])
+            elif op == "rename":
+                members[rng.randrange(len(members))]["name"] = f"r{step}"
+            elif op == "delete":
+                del members[rng.randrange(len(members))]
+            else:
+                m = members[rng.randrange(len(members))]
+                m["type"], m["bit_size"] = rng.choice(BIT_TYPES), rng.randint(1, 7)
+            layout = engine.update(members)
+            expected, total, align = full_layout(members)
+            self.assertEqual(layout, expected, f"step {step}")
+            self.assertEqual((engine.total_size, engine.struct_align), (total, align))
+
+    def test_only_suffix_is_recomputed(self):
+        members = [{"name": f"m{i}", "type": "int", "bit_size": 0} for i in range(300)]
+        engine = IncrementalManualLayout()
+        engine.update(members)
+        prefix = engine.layout[:250]
+        members[250]["type"] = "long long"
+        layout = engine.update(members)
+        self.assertEqual(engine.first_changed, 250)
+        self.assertEqual(engine.recomputed, 50)
+        self.assertTrue(all(a is b for a, b in zip(prefix, layout[:250])))
+        self.assertEqual(engine.update(members), layout)
+        self.assertEqual(engine.recomputed, 0)
+
+    def test_unchanged_state_reuses_suffix(self):
+        members = [{"name": f"m{i}", "type": "int", "bit_size": 0} for i in range(300)]
+        engine = IncrementalManualLayout()
+        engine.update(members)
+        members[10]["name"] = "renamed"
+        layout = engine.update(members)
+        self.assertEqual(engine.recomputed, 1)
+        self.assertEqual(layout[10]["name"], "renamed")
+        # char 後接 int：padding 吸收差異，只重算兩列
+        members[20]["type"] = "char"
+        layout = engine.update(members)
+        self.assertEqual(engine.recomputed, 2)
+        self.assertEqual(layout, full_layout(members)[0])
+        del members[5]
+        self.assertEqual(engine.update(members), full_layout(members)[0])
+
+    def test_insert_and_delete_shift_suffix(self):
+        members = [{"name": f"m{i}", "type": "int", "bit_size": 0} for i in range(300)]
+        engine = IncrementalManualLayout()
+        engine.update(members)
+        members.insert(3, {"name": "x", "type": "int", "bit_size": 0})
+        self.assertEqual(engine.update(members), full_layout(members)[0])
+        self.assertEqual(engine.recomputed, 1)
+        del members[100]
+        self.assertEqual(engine.update(members), full_layout(members)[0])
+        self.assertEqual(engine.recomputed, 0)
+        # 插入 char：offset 差 1 不是最大對齊的倍數，後綴必須重算
+        members.insert(0, {"name": "c", "type": "char", "bit_size": 0})
+        self.assertEqual(engine.update(members), full_layout(members)[0])
+        self.assertEqual(engine.recomputed, 2)
+
+    def test_member_items_include_leading_padding(self):
+        engine = IncrementalManualLayout()
+        engine.update([{"name": "a", "type": "char", "bit_size": 0}, {"name": "b", "type": "int", "bit_size": 0}])
+        self.assertEqual([i["name"] for i in engine.member_items(1)], ["(padding)", "b"])
+
+    def test_model_calculate_manual_layout_is_incremental(self):
+        model = StructModel()
+        members = [{"name": "a", "type": "char", "bit_size": 0}]
+        first = model.calculate_manual_layout(members, 8)
+        members.append({"name": "b", "type": "int", "bit_size": 0})
+        second = model.calculate_manual_layout(members, 8)
+        self.assertIs(first[0], second[0])
+        self.assertEqual([i["offset"] for i in second], [0, 1, 4])
+        self.assertEqual(model.validate_manual_struct(members, 4), ["Layout 總長度 (8 bytes) 超過指定 struct 大小 (4 bytes)"])
+
+
+class TestCalculatorCheckpointHooks(unittest.TestCase):
+    def test_add_member_and_finalize_match_calculate(self):
+        members = [{"type": "char", "name": "a", "is_bitfield": False},
+                   {"type": "int", "name": "b", "is_bitfield": True, "bit_size": 3},
+                   {"type": "double", "name": "c", "is_bitfield": False}]
+        calc = StructLayoutCalculator()
+        for m in members:
+            calc.add_member(m)
+        self.assertEqual(calc.finalize(), StructLayoutCalculator().calculate(members))
+
+    def test_snapshot_restore_round_trip(self):
+        calc = StructLayoutCalculator()
+        calc.add_member({"type": "int", "name": "a", "is_bitfield": True, "bit_size": 3})
+        state = calc.snapshot_state()
+        self.assertIsInstance(state, LayoutState)
+        calc.add_member({"type": "double", "name": "b", "is_bitfield": False})
+        calc.restore_state(state)
+        self.assertEqual(calc.snapshot_state(), state)
+        self.assertEqual(state.shifted(8).offset_delta(state, 8), 8)
+        self.assertIsNone(state.shifted(2).offset_delta(state, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import random
+import time
+import unittest
+
+from src.model.manual_validator import ManualStructValidator
+from src.model.struct_model import StructModel
+
+TYPES = ["char", "short", "int", "long long", "double", "float", "bogus", ""]
+
+
+def reference_errors(members, total_size):
+    model = StructModel()
+    errors = model._validate_member_types(members)
+    errors += model._validate_member_names(members)
+    errors += model._validate_total_size(total_size)
+    if not errors:
+        errors += model._validate_layout_size(members, total_size)
+    return errors
+
+
+class TestManualStructValidator(unittest.TestCase):
+    def test_diff_yields_member_events(self):
+        validator = ManualStructValidator()
+        members = [{"name": "a", "type": "int", "bit_size": 0}, {"name": "b", "type": "char", "bit_size": 0}]
+        self.assertEqual(validator.sync(members), [("add", 0, ("a", "int", 0)), ("add", 1, ("b", "char", 0))])
+        members[1] = {"name": "c", "type": "short", "bit_size": 0}
+        self.assertEqual(validator.sync(members), [("rename", 1, "c"), ("retype", 1, "short", 0)])
+        self.assertEqual(validator.diff(members[1:]), [("remove", 0)])
+
+    def test_duplicate_multiset(self):
+        validator = ManualStructValidator()
+        members = [{"name": n, "type": "int", "bit_size": 0} for n in ("a", "b", "a", "a")]
+        self.assertEqual(validator.validate(members, 64), ["成員名稱 'a' 重複"])
+        members[0]["name"] = "x"
+        self.assertEqual(validator.validate(members, 64), ["成員名稱 'a' 重複"])
+        members[2]["name"] = "y"
+        self.assertEqual(validator.validate(members, 64), [])
+
+    def test_matches_full_validation_under_random_edits(self):
+        rng = random.Random(3)
+        validator = ManualStructValidator()
+        members = []
+        for step in range(300):
+            op = rng.choice(["add", "add", "rename", "retype", "delete", "bits"])
+            if op == "add" or not members:
+                members.insert(rng.randint(0, len(members)), {"name": f"m{rng.randrange(40)}", "type": rng.choice(TYPES), "bit_size": 0})
+            elif op == "rename":
+                members[rng.randrange(len(members))]["name"] = rng.choice(["", f"m{rng.randrange(40)}"])
+            elif op == "retype":
+                members[rng.randrange(len(members))]["type"] = rng.choice(TYPES)
+            elif op == "delete":
+                del members[rng.randrange(len(members))]
+            else:
+                members[rng.randrange(len(members))]["bit_size"] = rng.choice([0, 3, -1])
+            total_size = rng.choice([0, 64, 4096])
+            expected = reference_errors(members, total_size)
+            self.assertEqual(sorted(validator.validate(members, total_size)), sorted(expected), f"step {step}")
+
+    def test_single_edit_on_large_struct_is_fast(self):
+        validator = ManualStructValidator()
+        members = [{"name": f"m{i}", "type": "int", "bit_size": 0} for i in range(2000)]
+        validator.validate(members, 8000)
+        start = time.perf_counter()
+        for i in range(50):
+            members[1000]["name"] = f"renamed{i}"
+            validator.validate(members, 8000)
+        per_edit = (time.perf_counter() - start) / 50
+        # 寬鬆上限，避免 CI 機器抖動
+        self.assertLess(per_edit, 0.01)
+        self.assertEqual(validator.layout_engine.recomputed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
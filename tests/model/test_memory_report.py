@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+from src.model.memory_report import (
+    StageMemoryTracker, deep_sizeof, format_memory_report, measure_header, object_sizes,
+)
+from src.model.metrics import MetricsRegistry
+from src.model.struct_model import StructModel
+from src.presenter.struct_presenter import StructPresenter
+
+HEADER = "struct Inner { int x; char y; };\nstruct S { struct Inner a[4]; unsigned int f : 3; long long z; };\n"
+
+
+class TestDeepSizeof(unittest.TestCase):
+    def test_counts_nested_and_shared_once(self):
+        shared = ["x" * 1000]
+        nested = {"a": shared, "b": shared}
+        self.assertGreaterEqual(deep_sizeof(nested), sys.getsizeof("x" * 1000))
+        self.assertLess(deep_sizeof(nested), 2 * sys.getsizeof("x" * 1000))
+
+    def test_objects_and_slots(self):
+        class Slotted:
+            __slots__ = ("payload",)
+
+            def __init__(self):
+                self.payload = "y" * 500
+
+        class Plain:
+            def __init__(self):
+                self.payload = "z" * 500
+        self.assertGreater(deep_sizeof(Slotted()), 500)
+        self.assertGreater(deep_sizeof(Plain()), 500)
+
+
+class TestStageMemoryTracker(unittest.TestCase):
+    def test_records_outermost_stage_allocations(self):
+        registry = MetricsRegistry()
+        keep = []
+        with StageMemoryTracker(registry=registry) as tracker:
+            with registry.span("layout"):
+                with registry.span("decode"):  # 巢狀：歸入 layout
+                    keep.append(bytearray(256 * 1024))
+        stages = tracker.report()
+        self.assertEqual(list(stages), ["layout"])
+        self.assertGreaterEqual(stages["layout"]["net_bytes"], 256 * 1024)
+        self.assertTrue(stages["layout"]["top_sites"])
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(registry.snapshot()["decode"]["count"], 1)  # 時間仍照常記錄
+
+    def test_measure_header_and_format(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write(HEADER)
+        self.addCleanup(os.unlink, f.name)
+        report = measure_header(f.name, target_name="S", presenter_cls=StructPresenter)
+        self.assertEqual(report["struct_name"], "S")
+        for stage in ("header_read", "tokenize", "layout", "decode", "display_nodes", "context_validation"):
+            self.assertIn(stage, report["stages"])
+        for name in ("ast", "layout", "member_values", "member_numeric_values", "member_hex_raws", "context"):
+            self.assertGreater(report["objects"][name], 0, name)
+        text = format_memory_report(report)
+        self.assertIn("Objects (deep size estimate):", text)
+        self.assertIn("display_nodes", text)
+
+    def test_presenter_memory_report_uses_live_objects(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write(HEADER)
+        self.addCleanup(os.unlink, f.name)
+        model = StructModel()
+        model.load_struct_from_file(f.name, target_name="S")
+        presenter = StructPresenter(model)
+        report = presenter.get_memory_report()  # 預設不重新載入
+        self.assertNotIn("stages", report)
+        self.assertEqual(report["objects"], object_sizes(model, presenter))
+        self.assertIn("stages", presenter.get_memory_report(measure_pipeline=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from src.export.csv_export import DefaultCsvExportService, build_parsed_model_from_struct
+from src.model.metrics import MetricsRegistry, STAGES
+from src.model.struct_model import StructModel
+from src.presenter.struct_presenter import StructPresenter
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_summary_statistics(self):
+        registry = MetricsRegistry()
+        for ms in range(1, 101):
+            registry.record("layout", ms / 1000)
+        m = registry.snapshot()["layout"]
+        self.assertEqual(m["count"], 100)
+        self.assertAlmostEqual(m["total"], 5.05)
+        self.assertAlmostEqual(m["p50"], 0.050, places=3)
+        self.assertAlmostEqual(m["p95"], 0.095, places=3)
+        self.assertAlmostEqual(m["max"], 0.100)
+        self.assertAlmostEqual(m["last"], 0.100)
+
+    def test_sample_window_is_bounded(self):
+        registry = MetricsRegistry(sample_size=10)
+        for i in range(1000):
+            registry.record("decode", float(i))
+        m = registry.snapshot()["decode"]
+        self.assertEqual(m["count"], 1000)
+        self.assertGreaterEqual(m["p50"], 990.0)  # 百分位只看最近的樣本
+
+    def test_span_timed_and_disabled(self):
+        registry = MetricsRegistry()
+        with registry.span("tokenize"):
+            pass
+        with self.assertRaises(ValueError), registry.span("tokenize"):
+            raise ValueError()
+        wrapped = registry.timed("decode")(lambda x: x * 2)
+        self.assertEqual(wrapped(2), 4)
+        snap = registry.snapshot()
+        self.assertEqual(snap["tokenize"]["count"], 2)
+        self.assertEqual(snap["decode"]["count"], 1)
+        self.assertEqual(list(snap), ["tokenize", "decode"])  # 依 STAGES 流程順序
+
+        off = MetricsRegistry(enabled=False)
+        with off.span("layout"):
+            pass
+        self.assertEqual(off.snapshot(), {})
+
+    def test_open_span_records_on_finish_only(self):
+        registry = MetricsRegistry()
+        dropped = registry.start("tree_render")
+        span = registry.start("tree_render")
+        self.assertNotIn("tree_render", registry.snapshot())
+        self.assertGreaterEqual(span.finish(), 0)
+        self.assertIsNone(span.finish())
+        del dropped  # 未 finish（被新的繪製取代）不記錄
+        self.assertEqual(registry.snapshot()["tree_render"]["count"], 1)
+
+    def test_concurrent_record(self):
+        registry = MetricsRegistry()
+        threads = [threading.Thread(target=lambda: [registry.record("layout", 0.001) for _ in range(1000)])
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(registry.snapshot()["layout"]["count"], 4000)
+
+    def test_json_dump(self):
+        registry = MetricsRegistry()
+        registry.record("csv_write", 0.5)
+        data = json.loads(registry.to_json())
+        self.assertEqual(data["unit"], "seconds")
+        self.assertEqual(data["stages"]["csv_write"]["count"], 1)
+        with tempfile.TemporaryDirectory() as d:
+            path = registry.dump_json(os.path.join(d, "metrics.json"))
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["stages"], data["stages"])
+
+
+class TestStageWiring(unittest.TestCase):
+    def test_pipeline_stages_are_recorded(self):
+        model = StructModel()
+        model.metrics = MetricsRegistry()
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write("struct S { int a; char b; };\n")
+        self.addCleanup(os.unlink, f.name)
+        model.load_struct_from_file(f.name)
+        model.parse_hex_data("0100000002", "little")
+        model.get_display_nodes("tree")
+        presenter = StructPresenter(model)
+        presenter.push_context()
+        snap = presenter.get_stage_metrics()
+        for stage in ("header_read", "tokenize", "symbol_collection", "layout", "decode",
+                      "display_nodes", "context_validation"):
+            self.assertGreaterEqual(snap[stage]["count"], 1, stage)
+        self.assertTrue(set(snap) <= set(STAGES))
+        self.assertIn("decode", json.loads(presenter.dump_metrics_json())["stages"])
+
+    def test_csv_write_is_recorded(self):
+        from src.model import metrics
+        before = metrics.METRICS.snapshot().get("csv_write", {}).get("count", 0)
+        model = StructModel()
+        model.layout = [{"name": "a", "type": "int", "offset": 0, "size": 4}]
+        DefaultCsvExportService().export_to_csv(
+            build_parsed_model_from_struct(model), {"type": "stream", "stream": io.StringIO()})
+        self.assertEqual(metrics.METRICS.snapshot()["csv_write"]["count"], before + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
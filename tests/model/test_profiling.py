@@ -0,0 +1,92 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+from src.model.profiling import ProfileCapture, PROFILER
+from src.model.struct_model import StructModel
+from src.presenter.struct_presenter import StructPresenter
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfileCapture(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_disarmed_runs_without_profiling(self):
+        capture = ProfileCapture()
+        self.assertEqual(capture.profiled("decode")(busy)(10), busy(10))
+        self.assertIsNone(capture.last_report)
+
+    def test_armed_captures_only_next_call(self):
+        capture = ProfileCapture(top=5)
+        path = os.path.join(self.tmp.name, "out.pstats")
+        capture.arm(path)
+        wrapped = capture.profiled("decode")(busy)
+        self.assertEqual(wrapped(1000), busy(1000))
+        self.assertFalse(capture.armed)
+        report = capture.last_report
+        self.assertEqual((report.label, report.path), ("decode", path))
+        self.assertTrue(pstats.Stats(path).stats)
+        self.assertLessEqual(len(report.entries), 5)
+        cumtimes = [e["cumtime"] for e in report.entries]
+        self.assertEqual(cumtimes, sorted(cumtimes, reverse=True))
+        self.assertIn("busy", report.format())
+
+        wrapped(10)  # 已 disarm：不再 capture
+        self.assertIs(capture.last_report, report)
+
+    def test_nested_calls_profile_outermost_only(self):
+        capture = ProfileCapture()
+        capture.arm(self.tmp.name)  # 目錄：自動命名
+        inner = capture.profiled("decode")(busy)
+        outer = capture.profiled("load")(lambda: inner(100))
+        outer()
+        self.assertEqual(capture.last_report.label, "load")
+        self.assertEqual(os.path.dirname(capture.last_report.path), self.tmp.name)
+        self.assertTrue(capture.last_report.path.endswith(".pstats"))
+
+    def test_missing_parent_directory_is_created(self):
+        capture = ProfileCapture()
+        path = os.path.join(self.tmp.name, "new", "dir", "out.pstats")
+        capture.arm(path)
+        capture.profiled("load")(busy)(10)
+        self.assertEqual(capture.last_report.path, path)
+        self.assertTrue(os.path.exists(path))
+
+    def test_save_failure_does_not_break_operation(self):
+        capture = ProfileCapture()
+        blocker = os.path.join(self.tmp.name, "file")
+        open(blocker, "w").close()
+        capture.arm(os.path.join(blocker, "out.pstats"))  # 上層是檔案：無法建立目錄
+        with self.assertLogs("src.model.profiling", level="WARNING"):
+            self.assertEqual(capture.profiled("load")(busy)(10), busy(10))
+        self.assertIsNone(capture.last_report)
+        self.assertTrue(capture.last_error)
+        capture.arm(os.path.join(blocker, "out.pstats"))
+        with self.assertRaises(ZeroDivisionError):  # 原本的例外不會被取代
+            capture.profiled("load")(lambda: 1 / 0)()
+
+    def test_presenter_arms_next_load(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write("struct S { int a; char b; };\n")
+        self.addCleanup(os.unlink, f.name)
+        presenter = StructPresenter(StructModel())
+        presenter.arm_profile(os.path.join(self.tmp.name, "load.pstats"))
+        self.assertTrue(presenter.is_profile_armed())
+        try:
+            presenter.model.load_struct_from_file(f.name)
+        finally:
+            PROFILER.disarm()
+        report = presenter.get_last_profile()
+        self.assertEqual(report.label, "load")
+        self.assertTrue(os.path.exists(report.path))
+        self.assertFalse(presenter.is_profile_armed())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+from src.model.array_ranges import ArrayDescriptor, ArrayRangeBuilder
+from src.model.search_index import IndexBuildCancelled, NodeSearchIndex, build_value_index
+
+
+def node(node_id, label, type_="int", value="", children=None):
+    return {"id": node_id, "label": label, "type": type_, "value": value, "children": children or []}
+
+
+class TestNodeSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.nodes = [node("S", "S [struct]", "struct", children=[
+            node("S.header", "header [struct]", "struct", children=[
+                node("S.header.length", "length", "uint16_t", "12"),
+                node("S.header.flags", "flags", "uint8_t", "3"),
+            ]),
+            node("S.payload_len", "payload_len", "int", "120"),
+            node("S.crc", "crc", "uint32_t", "7"),
+        ])]
+        self.index = NodeSearchIndex(self.nodes)
+
+    def test_trigram_and_short_queries(self):
+        self.assertEqual(self.index.search("LEN"), ["S.header.length", "S.payload_len"])
+        self.assertEqual(self.index.search("uint"), ["S.header.length", "S.header.flags", "S.crc"])
+        self.assertEqual(self.index.search("cr"), ["S.crc"])
+        self.assertEqual(self.index.search("zzz"), [])
+        self.assertEqual(self.index.search(""), [])
+
+    def test_incremental_narrowing(self):
+        self.assertEqual(len(self.index.search("l")), 3)
+        self.assertEqual(self.index.search("le"), ["S.header.length", "S.payload_len"])
+        self.assertEqual(self.index.search("leng"), ["S.header.length"])
+        # 刪字後回到較寬的查詢
+        self.assertEqual(self.index.search("le"), ["S.header.length", "S.payload_len"])
+
+    def test_path_query(self):
+        self.assertEqual(self.index.search("header.f"), ["S.header.flags"])
+
+    def test_value_prefix_refreshes_after_decode(self):
+        self.index.refresh_values(self.nodes)
+        self.assertEqual(self.index.search("=12"), ["S.header.length", "S.payload_len"])
+        decoded = [node("S", "S [struct]", "struct", children=[
+            node("S.header", "header [struct]", "struct", children=[
+                node("S.header.length", "length", "uint16_t", "99"),
+                node("S.header.flags", "flags", "uint8_t", "12"),
+            ]),
+            node("S.payload_len", "payload_len", "int", "0"),
+            node("S.crc", "crc", "uint32_t", "7"),
+        ])]
+        self.index.refresh_values(decoded)
+        self.assertEqual(self.index.search("=12"), ["S.header.flags"])
+
+    def test_filter_keeps_ancestors(self):
+        filtered = self.index.filter_nodes(self.nodes, "flags")
+        self.assertEqual(len(filtered), 1)
+        header = filtered[0]["children"]
+        self.assertEqual([n["id"] for n in header], ["S.header"])
+        self.assertEqual([n["id"] for n in header[0]["children"]], ["S.header.flags"])
+        self.assertEqual(len(self.nodes[0]["children"]), 3)
+
+    def test_lazy_array_children_are_not_expanded(self):
+        desc = ArrayDescriptor("S.buf", "buf", "char", (65536,), elem_size=1, offset=0)
+        children = ArrayRangeBuilder(desc, lambda d, i: "0", fold_size=1024).children()
+        children[2]
+        index = NodeSearchIndex([node("S", "S", "struct", children=[node("S.buf", "buf", "char", children=children)])])
+        self.assertEqual(children.materialized, 1)
+        self.assertEqual(index.search("buf[2048"), ["S.buf[2048..3071]"])
+
+    def test_short_queries_cover_word_endings(self):
+        # 1-2 個字元的查詢由 trigram 與字尾 posting 合併而成
+        self.assertEqual(self.index.search("h"), ["S.header", "S.header.length"])
+        self.assertEqual(self.index.search("th"), ["S.header.length"])
+        self.assertEqual(self.index.search("rc"), ["S.crc"])
+        self.assertEqual(self.index.search("c"), ["S", "S.header", "S.crc"])
+        self.assertEqual(self.index.search("nt"), ["S.header.length", "S.header.flags", "S.payload_len", "S.crc"])
+
+    def test_path_query_spanning_segments(self):
+        self.assertEqual(self.index.search("s.header"), ["S.header", "S.header.length", "S.header.flags"])
+        self.assertEqual(self.index.search("der.len"), ["S.header.length"])
+        self.assertEqual(self.index.search("header."), ["S.header.length", "S.header.flags"])
+        self.assertEqual(self.index.search(".crc"), ["S.crc"])
+        self.assertEqual(self.index.search("s.h.length"), [])
+
+    def test_value_index_built_separately(self):
+        values = build_value_index(self.nodes, self.index.ids)
+        self.index.set_values(self.nodes, values)
+        self.assertTrue(self.index.has_values(self.nodes))
+        self.assertEqual(self.index.search("=7"), ["S.crc"])
+
+    def test_build_cancelled_when_stale(self):
+        with self.assertRaises(IndexBuildCancelled):
+            NodeSearchIndex(self.nodes, is_stale=lambda: True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -761,6 +761,59 @@ class TestStructModelASTAPI(unittest.TestCase):
         tail = next(c for c in ast['children'] if c['name'] == 'tail')
         self.assertEqual(tail['type'], 'int')
 
+    def test_ast_to_dict_ids_are_deterministic_paths(self):
+        code = '''
+        struct Outer {
+            struct { int x; } hdr;
+            union { short a; float b; };
+            unsigned int f : 3;
+            unsigned int   : 2;
+            unsigned int   : 3;
+        };
+        '''
+        ast = parse_struct_definition_ast(code)
+        first = ast_to_dict(ast)
+        second = ast_to_dict(ast)
+        self.assertEqual(first, second)
+        self.assertEqual(first['id'], 'Outer')
+        ids = [n['id'] for n in flatten_ast_nodes(first)]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertIn('Outer.hdr.x', ids)
+        self.assertIn('Outer.f', ids)
+
+    def test_node_id_map_is_compact_dfs_index(self):
+        model = StructModel()
+        model.struct_content = "struct Simple { int a; char b; };"
+        id_map = model.get_node_id_map('tree')
+        self.assertEqual(id_map, {'Simple': 0, 'Simple.a': 1, 'Simple.b': 2})
+        self.assertIs(model.get_node_id_map('tree'), id_map)
+
+    def test_display_nodes_cached_per_version_and_mode(self):
+        model = StructModel()
+        model.struct_content = "struct Simple { int a; char b; };"
+        tree = model.get_display_nodes('tree')
+        self.assertIs(model.get_display_nodes('tree'), tree)
+        flat = model.get_display_nodes('flat')
+        self.assertIsNot(flat, tree)
+        self.assertIs(model.get_display_nodes('flat'), flat)
+        version = model.version
+        self.assertEqual(model.bump_version(), version + 1)
+        self.assertIsNot(model.get_display_nodes('tree'), tree)
+
+    def test_decode_bumps_version_and_refreshes_values(self):
+        model = StructModel()
+        model.struct_content = "struct Simple { int a; char b; };"
+        model.layout, model.total_size, _ = calculate_layout([
+            {"type": "int", "name": "a"}, {"type": "char", "name": "b"}
+        ])
+        before = model.get_display_nodes('flat')
+        version = model.version
+        model.parse_hex_data("0100000002000000", "little")
+        self.assertGreater(model.version, version)
+        after = model.get_display_nodes('flat')
+        self.assertIsNot(after, before)
+        self.assertEqual(next(n for n in after if n['label'] == 'a')['value'], '1')
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
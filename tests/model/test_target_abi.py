@@ -0,0 +1,107 @@
+import dataclasses
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.model.layout import StructLayoutCalculator, UnionLayoutCalculator
+from src.model.struct_model import StructModel, calculate_layout
+from src.model.types import ABI_X64, ABI_X86, TargetABI, default_abi, get_pointer_mode, reset_pointer_mode, set_pointer_mode
+
+MEMBERS = [
+    {"type": "char", "name": "c", "is_bitfield": False},
+    {"type": "pointer", "name": "p", "is_bitfield": False},
+    {"type": "long", "name": "l", "is_bitfield": False},
+]
+
+
+class TestTargetABI(unittest.TestCase):
+    def tearDown(self):
+        reset_pointer_mode()
+
+    def test_immutable_hashable_value(self):
+        abi = TargetABI(pointer_size=4, overrides={"my_u24": (3, 1)})
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            abi.pointer_size = 8
+        self.assertEqual(abi, TargetABI(pointer_size=4, overrides=[("my_u24", 3, 1)], name="other"))
+        self.assertEqual(len({abi, TargetABI(pointer_size=4, overrides={"my_u24": {"size": 3, "align": 1}})}), 1)
+        self.assertEqual(abi.type_info("my_u24"), {"size": 3, "align": 1})
+        self.assertEqual(abi.replace(pointer_size=8).type_info("pointer")["size"], 8)
+
+    def test_explicit_abi_ignores_global_pointer_mode(self):
+        set_pointer_mode(32)
+        _, total64, _ = calculate_layout(MEMBERS, abi=ABI_X64)
+        _, total32, _ = calculate_layout(MEMBERS, abi=ABI_X86)
+        self.assertEqual((total64, total32), (24, 16))
+        self.assertEqual(default_abi().pointer_size, 4)  # 全域仍為 32-bit 模式
+        self.assertEqual(calculate_layout(MEMBERS)[1], 16)  # 32-bit pointer、64-bit long
+        self.assertEqual(get_pointer_mode(), 32)
+
+    def test_named_abis_match_pointer_mode(self):
+        members = [{"type": "char", "name": "c", "is_bitfield": False},
+                   {"type": "long", "name": "l", "is_bitfield": False},
+                   {"type": "pointer", "name": "p", "is_bitfield": False}]
+        for bits, abi in ((32, ABI_X86), (64, ABI_X64)):
+            set_pointer_mode(bits)
+            self.assertEqual(default_abi(), abi)
+            self.assertEqual(default_abi().name, abi.name)
+            self.assertEqual(calculate_layout(members)[1:], calculate_layout(members, abi=abi)[1:])
+
+    def test_union_and_nested_use_calculator_abi(self):
+        union = UnionLayoutCalculator(abi=ABI_X86)
+        self.assertEqual(union._get_type_size_and_align("pointer"), (4, 4))
+        self.assertEqual(union._get_type_size_and_align("long"), (8, 8))
+        nested = {"type": "struct", "name": "n", "nested": {"members": MEMBERS}}
+        layout, _, _ = StructLayoutCalculator(abi=ABI_X86).calculate([nested])
+        self.assertEqual([(item.name, item.offset) for item in layout if item.name != "(padding)"],
+                         [("c", 0), ("p", 4), ("l", 8)])
+
+    def test_default_pack_and_overrides(self):
+        abi = TargetABI(default_pack=1, overrides={"int": (2, 2)})
+        members = [("char", "c"), ("int", "i")]
+        self.assertEqual(calculate_layout(members, abi=abi)[1], 3)
+        self.assertEqual(calculate_layout(members, abi=abi, pack_alignment=2)[1], 4)
+
+    def test_concurrent_layouts_with_different_abis(self):
+        stop = threading.Event()
+
+        def toggle():
+            while not stop.is_set():
+                set_pointer_mode(32)
+                set_pointer_mode(64)
+
+        toggler = threading.Thread(target=toggle)
+        toggler.start()
+        try:
+            abis = [ABI_X86, ABI_X64] * 100
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                totals = list(pool.map(lambda abi: calculate_layout(MEMBERS, abi=abi)[1], abis))
+        finally:
+            stop.set()
+            toggler.join()
+        self.assertEqual(totals, [16, 24] * 100)
+
+    def test_model_target_abi(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write("struct S { char c; int *p; long l; };\n")
+        self.addCleanup(os.unlink, f.name)
+        model = StructModel()
+        model.load_struct_from_file(f.name)
+        self.assertEqual(model.total_size, 24)
+        version = model.version
+        model.set_target_abi(ABI_X86)
+        self.assertGreater(model.version, version)
+        model.load_struct_from_file(f.name)
+        self.assertEqual(model.total_size, 16)
+        model.set_target_abi(None)
+        model.load_struct_from_file(f.name)
+        self.assertEqual(model.total_size, 24)
+        model.set_target_abi(ABI_X86)
+        layout = model.calculate_manual_layout([{"name": "c", "type": "char", "bit_size": 0},
+                                                {"name": "p", "type": "pointer", "bit_size": 0}], 8)
+        self.assertEqual([item["offset"] for item in layout if item["name"] == "p"], [4])
+
+
+if __name__ == "__main__":
+    unittest.main()
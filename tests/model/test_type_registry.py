@@ -6,7 +6,9 @@ import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(project_root, '..', 'src'))
 
-from src.model.types import get_type_info, normalize_type, ALIAS_MAP, CUSTOM_TYPE_INFO
+import gc
+
+from src.model.types import get_type_info, normalize_type, ALIAS_MAP, CUSTOM_TYPE_INFO, TypeRegistry
 
 
 class TestTypeRegistryConfig(unittest.TestCase):
@@ -22,6 +24,59 @@ class TestTypeRegistryConfig(unittest.TestCase):
         self.assertEqual(info['align'], 1)
 
 
+class TestVersionedRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = TypeRegistry(base={"int": {"size": 4, "align": 4}}, custom={}, aliases={})
+
+    def test_memoized_lookups_follow_changes(self):
+        reg = self.registry
+        self.assertEqual(reg.get_info("  int "), {"size": 4, "align": 4})
+        self.assertIs(reg.get_info("  int "), reg.get_info("  int "))
+        with self.assertRaises(KeyError):
+            reg.get_info("I32")
+        self.assertTrue(reg.set_alias("I32", "int"))
+        self.assertEqual(reg.normalize("I32"), "int")
+        self.assertEqual(reg.get_info("I32")["size"], 4)
+        self.assertTrue(reg.set_type("int", 2, 2))
+        self.assertEqual(reg.get_info("I32"), {"size": 2, "align": 2})
+        self.assertTrue(reg.remove_type("int"))
+        self.assertEqual(reg.get_info("int")["size"], 4)
+        self.assertEqual(reg.generation, 3)
+
+    def test_subscribers_called_only_on_real_change(self):
+        reg = self.registry
+        calls = []
+        reg.subscribe(lambda r: calls.append(r.generation))
+        self.assertFalse(reg.set_type("int", 4, 4))  # 有效大小未變
+        self.assertTrue(reg.set_alias("I32", "int"))
+        self.assertFalse(reg.set_alias("I32", "int"))
+        reg.set_type("int", 8, 8)
+        self.assertEqual(calls, [1, 2])
+
+    def test_bound_method_subscribers_are_weak(self):
+        reg = self.registry
+
+        class Listener:
+            def __init__(self):
+                self.seen = 0
+
+            def on_change(self, registry):
+                self.seen += 1
+
+        listener = Listener()
+        reg.subscribe(listener.on_change)
+        reg.invalidate()
+        self.assertEqual((listener.seen, reg.subscriber_count()), (1, 1))
+        reg.unsubscribe(listener.on_change)
+        reg.invalidate()
+        self.assertEqual((listener.seen, reg.subscriber_count()), (1, 0))
+        reg.subscribe(listener.on_change)
+        del listener
+        gc.collect()
+        self.assertEqual(reg.subscriber_count(), 0)
+        reg.invalidate()
+
+
 class TestPointerModeSwitch(unittest.TestCase):
     def setUp(self):
         # Import here to avoid hard dependency when not needed by other tests
@@ -71,6 +126,21 @@ class TestPointerModeSwitch(unittest.TestCase):
         self.assertEqual(ptr_items32[0].size, 4)
         self.assertEqual(total32, 8)
 
+    def test_pointer_mode_invalidates_subscribed_caches(self):
+        from src.model.layout import TYPE_INFO
+        from src.model.struct_model import StructModel
+        model = StructModel()
+        model.layout_cache.store("k", [{"name": "p"}])
+        version = model.version
+        self._set_pointer_mode(32)
+        self.assertEqual(len(model.layout_cache), 0)
+        self.assertEqual(model.layout_cache.invalidations, 1)
+        self.assertGreater(model.version, version)
+        self.assertEqual(TYPE_INFO["pointer"]["size"], 4)
+        version = model.version
+        self._set_pointer_mode(32)  # 未變更：不失效
+        self.assertEqual(model.version, version)
+
     def test_union_layout_respects_pointer_mode(self):
         # Union that contains a char and a pointer should change size with pointer mode
         from src.model.struct_model import calculate_layout
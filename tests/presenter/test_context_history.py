@@ -0,0 +1,170 @@
+import unittest
+from unittest.mock import MagicMock
+
+from unittest.mock import patch
+
+from src.presenter import context_history
+from src.presenter.context_history import ContextHistory, FrozenDict, TrackedContext, freeze
+from src.presenter.struct_presenter import StructPresenter
+
+
+def _ctx(**overrides):
+    ctx = {
+        "selected_node": None,
+        "expanded_nodes": ["root"],
+        "user_settings": {"theme": "dark", "columns": list(range(50))},
+        "debug_info": {"last_event": None, "context_history": [], "api_trace": []},
+    }
+    ctx.update(overrides)
+    return ctx
+
+
+class TestContextHistory(unittest.TestCase):
+    def test_freeze_is_read_only_copy(self):
+        src = {"a": [1, {"b": 2}]}
+        frozen = freeze(src)
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertEqual(frozen["a"][1]["b"], 2)
+        src["a"][1]["b"] = 3
+        self.assertEqual(frozen["a"][1]["b"], 2)
+        with self.assertRaises(TypeError):
+            frozen["a"] = 1
+
+    def test_freeze_handles_self_reference(self):
+        ctx = {"history": []}
+        ctx["history"].append(ctx.copy())
+        frozen = freeze(ctx)
+        self.assertIs(frozen["history"][0]["history"], ...)
+
+    def test_unchanged_values_are_shared(self):
+        history = ContextHistory()
+        ctx = _ctx()
+        first = history.append(ctx)
+        ctx["selected_node"] = "a"
+        second = history.append(ctx)
+        self.assertIs(first["user_settings"], second["user_settings"])
+        self.assertEqual(second["selected_node"], "a")
+        self.assertIsNone(first["selected_node"])
+
+    def test_last_changed_keys(self):
+        history = ContextHistory()
+        ctx = _ctx()
+        history.append(ctx)
+        self.assertIsNone(history.last_changed_keys)
+        ctx["selected_node"] = "a"
+        ctx["expanded_nodes"].append("a")
+        history.append(ctx)
+        self.assertEqual(history.last_changed_keys, {"selected_node", "expanded_nodes"})
+
+    def test_debug_history_not_nested(self):
+        history = ContextHistory()
+        ctx = _ctx()
+        ctx["debug_info"]["context_history"] = history
+        history.append(ctx)
+        history.append(ctx)
+        self.assertEqual(history[-1]["debug_info"]["context_history"], ())
+
+    def test_ast_referenced_by_version(self):
+        history = ContextHistory()
+        ast = {"id": "root", "children": [{"id": "a"}]}
+        ctx = _ctx(ast=ast)
+        first = history.append(ctx)
+        second = history.append(ctx)
+        self.assertEqual(first.ast_version, second.ast_version)
+        self.assertIs(second["ast"], ast)
+        ctx["ast"] = {"id": "root2", "children": []}
+        third = history.append(ctx)
+        self.assertNotEqual(third.ast_version, first.ast_version)
+        self.assertEqual(history.ast_versions, 2)
+
+    def test_byte_budget_evicts_oldest_and_releases_ast(self):
+        history = ContextHistory(max_bytes=None)
+        for i in range(5):
+            history.append(_ctx(selected_node=f"n{i}", ast={"id": f"ast{i}", "pad": "x" * 1000}))
+        self.assertEqual(history.ast_versions, 5)
+        used = history.bytes_used
+        history.set_limits(max_bytes=used // 2)
+        self.assertLessEqual(history.bytes_used, used // 2)
+        self.assertLess(len(history), 5)
+        self.assertEqual(history.ast_versions, len(history))
+        self.assertEqual(history[-1]["selected_node"], "n4")
+
+    def test_budget_keeps_latest_snapshot(self):
+        history = ContextHistory(max_bytes=1)
+        history.append(_ctx(selected_node="a"))
+        history.append(_ctx(selected_node="b"))
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]["selected_node"], "b")
+
+    def test_presenter_push_context_uses_budget(self):
+        presenter = StructPresenter(MagicMock(), MagicMock())
+        presenter._debounce_interval = 0
+        presenter._history_budget_bytes = 1
+        for i in range(5):
+            presenter.context["selected_node"] = f"n{i}"
+            presenter.push_context()
+        history = presenter.get_debug_context_history()
+        self.assertIsInstance(history, ContextHistory)
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]["selected_node"], "n4")
+
+    def test_tracked_context_marks_writes_and_container_reads(self):
+        ctx = TrackedContext(_ctx())
+        self.assertEqual(ctx.dirty_keys, set(ctx))
+        ctx.clear_dirty()
+        ctx["selected_node"]  # 純量讀取不標記
+        list(ctx.items())
+        ctx.copy()
+        self.assertEqual(ctx.dirty_keys, set())
+        ctx["expanded_nodes"].append("a")
+        ctx.get("user_settings")
+        ctx["selected_node"] = "a"
+        ctx.setdefault("extra", {})
+        ctx.pop("debug_info")
+        self.assertEqual(ctx.dirty_keys,
+                         {"expanded_nodes", "user_settings", "selected_node", "extra", "debug_info"})
+
+    def test_dirty_keys_skip_freezing_unchanged_values(self):
+        history = ContextHistory()
+        ctx = TrackedContext(_ctx())
+        settings = dict.__getitem__(ctx, "user_settings")
+        first = history.append(ctx, ctx.dirty_keys)
+        ctx.clear_dirty()
+        ctx["selected_node"] = "a"
+        ctx["expanded_nodes"].append("a")
+        with patch.object(context_history, "freeze", wraps=freeze) as spy:
+            second = history.append(ctx, ctx.dirty_keys)
+        frozen_args = [call.args[0] for call in spy.call_args_list]
+        self.assertFalse(any(arg is settings for arg in frozen_args))
+        self.assertIs(first["user_settings"], second["user_settings"])
+        self.assertEqual(second["expanded_nodes"], ("root", "a"))
+        self.assertEqual(history.last_changed_keys, {"selected_node", "expanded_nodes"})
+
+    def test_dirty_keys_fall_back_when_value_replaced_behind_tracking(self):
+        history = ContextHistory()
+        ctx = _ctx()
+        history.append(ctx, set(ctx))
+        ctx["user_settings"] = {"theme": "light"}  # 一般 dict：未回報為 dirty
+        snapshot = history.append(ctx, set())
+        self.assertEqual(snapshot["user_settings"]["theme"], "light")
+        self.assertEqual(history.last_changed_keys, {"user_settings"})
+
+    def test_presenter_push_context_freezes_only_dirty_keys(self):
+        presenter = StructPresenter(MagicMock(), MagicMock())
+        presenter._debounce_interval = 0
+        presenter.push_context()
+        presenter.context["selected_node"] = "a"
+        presenter.push_context()
+        history = presenter.get_debug_context_history()
+        self.assertIs(history[-2]["user_settings"], history[-1]["user_settings"])
+        self.assertNotIn("user_settings", history.last_changed_keys)
+        self.assertIn("selected_node", history.last_changed_keys)
+        presenter.context["expanded_nodes"].append("a")
+        presenter.push_context()
+        self.assertEqual(history[-1]["expanded_nodes"], ("root", "a"))
+        presenter.on_undo()
+        self.assertIsInstance(presenter.context, TrackedContext)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import sys
+import types
 import unittest
-from src.presenter.context_schema import validate_presenter_context
+from unittest.mock import patch
+from src.presenter.context_schema import validate_presenter_context, ContextValidator, _validation_error_cls
 import time
 
 class TestPresenterContextSchema(unittest.TestCase):
@@ -79,4 +82,124 @@ class TestPresenterContextSchema(unittest.TestCase):
             "debug_info": {}
         }
         with self.assertRaises(Exception):
-            validate_presenter_context(context) 
+            validate_presenter_context(context)
+
+
+class TestContextValidator(unittest.TestCase):
+    def _context(self):
+        return {
+            "display_mode": "tree",
+            "expanded_nodes": ["root"],
+            "selected_node": None,
+            "error": None,
+            "version": "1.0",
+            "extra": {},
+            "loading": False,
+            "history": [],
+            "user_settings": {},
+            "last_update_time": time.time(),
+            "readonly": False,
+            "debug_info": {},
+            "arch_mode": "x64",
+        }
+
+    def test_only_changed_keys_are_checked(self):
+        validator = ContextValidator()
+        ctx = self._context()
+        validator.validate(ctx)
+        ctx["loading"] = "yes"  # 未列入 changed_keys，不會被檢查
+        validator.validate(ctx, changed_keys={"selected_node"})
+        with self.assertRaises(Exception):
+            validator.validate(ctx, changed_keys={"loading"})
+
+    def test_required_keys_always_checked(self):
+        validator = ContextValidator()
+        ctx = self._context()
+        validator.validate(ctx)
+        del ctx["history"]
+        with self.assertRaises(Exception):
+            validator.validate(ctx, changed_keys=set())
+
+    def test_enum_checked(self):
+        ctx = self._context()
+        ctx["arch_mode"] = "arm"
+        with self.assertRaises(Exception):
+            ContextValidator().validate(ctx)
+
+    def test_sampling_defers_changed_keys(self):
+        draws = iter([0.9, 0.0])
+        validator = ContextValidator(sample_rate=0.5, rng=lambda: next(draws))
+        ctx = self._context()
+        ctx["expanded_nodes"] = "bad"
+        validator.validate(ctx, changed_keys={"expanded_nodes"})  # 抽樣略過
+        self.assertEqual(validator.skipped_count, 1)
+        with self.assertRaises(Exception):
+            validator.validate(ctx, changed_keys=set())
+
+    def test_debug_flag_disables_sampling(self):
+        validator = ContextValidator(sample_rate=0.0, debug=True)
+        ctx = self._context()
+        ctx["readonly"] = 1
+        with self.assertRaises(Exception):
+            validator.validate(ctx)
+
+    def test_failure_raises_jsonschema_validation_error(self):
+        ctx = self._context()
+        ctx["selected_node"] = 3
+        with self.assertRaises(_validation_error_cls()) as cm:
+            ContextValidator().validate(ctx)
+        self.assertIn("selected_node", str(cm.exception))
+
+    def test_unsupported_keyword_rejected_at_compile_time(self):
+        schema = {"type": "object", "properties": {"display_mode": {"type": "string", "minLength": 1}}}
+        vendored = types.ModuleType("jsonschema")  # 無 validators 的簡化版 jsonschema
+        with patch.dict(sys.modules, {"jsonschema": vendored}):
+            with self.assertRaises(ValueError) as cm:
+                ContextValidator(schema)
+        self.assertIn("minLength", str(cm.exception))
+        with self.assertRaises(ValueError):
+            ContextValidator({"type": "object", "minProperties": 1})
+        with self.assertRaises(ValueError):
+            ContextValidator({"type": "object", "properties": {"n": {"type": "int"}}})
+
+    def test_unsupported_keyword_compiled_by_jsonschema(self):
+        compiled = []
+
+        class FakeValidator:
+            def __init__(self, schema):
+                compiled.append(schema)
+                self.minimum = schema["minLength"]
+
+            @classmethod
+            def check_schema(cls, schema):
+                pass
+
+            def iter_errors(self, value):
+                if len(value) < self.minimum:
+                    yield types.SimpleNamespace(message=f"{value!r} is too short")
+
+        fake = types.ModuleType("jsonschema")
+        fake.validators = types.SimpleNamespace(validator_for=lambda schema: FakeValidator)
+        fake.ValidationError = type("ValidationError", (Exception,), {})
+        schema = {"type": "object", "properties": {"display_mode": {"type": "string", "minLength": 1}}}
+        with patch.dict(sys.modules, {"jsonschema": fake}):
+            validator = ContextValidator(schema)
+            validator.validate({"display_mode": "tree"})
+            validator.validate({"display_mode": ""}, changed_keys=set())
+            with self.assertRaises(fake.ValidationError) as cm:
+                validator.validate({"display_mode": ""}, changed_keys={"display_mode"})
+        self.assertEqual(compiled, [schema["properties"]["display_mode"]])  # 只編譯一次
+        self.assertIn("too short", str(cm.exception))
+
+    def test_nested_object_and_generic_keywords(self):
+        schema = {"type": "object", "properties": {
+            "extra": {"type": "object", "required": ["input_mode"],
+                      "properties": {"input_mode": {"enum": ["grid", "flex"]}}},
+            "count": {"type": "integer", "description": "annotation only"},
+        }}
+        validator = ContextValidator(schema)
+        validator.validate({"extra": {"input_mode": "grid"}, "count": 2})
+        for bad in ({"extra": {}}, {"extra": {"input_mode": "raw"}}, {"count": 1.5}, {"count": True}):
+            with self.assertRaises(_validation_error_cls(), msg=bad):
+                validator.validate(bad)
+
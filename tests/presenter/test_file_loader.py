@@ -0,0 +1,204 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from src.model.struct_model import LoadCancelled, StructModel
+from src.model.struct_parser import _collect_known_types
+from src.presenter.file_loader import BackgroundFileLoader
+from src.presenter.main_thread import MainThreadQueue
+from src.presenter.struct_presenter import StructPresenter
+
+HEADER = "struct A { int x; char y; };\nstruct B { struct A a; short s; };\nstruct C { char c; };\n"
+
+
+class TestBackgroundFileLoader(unittest.TestCase):
+    def test_superseded_result_is_discarded(self):
+        release = threading.Event()
+        results = []
+        loader = BackgroundFileLoader()
+
+        def slow(progress):
+            release.wait(2)
+            return "old"
+        loader.start(slow, results.append)
+        old_thread = loader._thread
+        loader.start(lambda progress: "new", results.append)
+        self.assertTrue(loader.wait(2))
+        release.set()
+        old_thread.join(2)
+        self.assertEqual(results, ["new"])
+        self.assertFalse(loader.busy())
+
+    def test_cancel_stops_between_definitions(self):
+        started, steps, results = threading.Event(), [], []
+        loader = BackgroundFileLoader()
+
+        def job(progress):
+            for i in range(1000):
+                progress(i, 1000)
+                steps.append(i)
+                started.set()
+                threading.Event().wait(0.001)
+            return "done"
+        loader.start(job, results.append)
+        started.wait(2)
+        self.assertTrue(loader.cancel())
+        self.assertTrue(loader.wait(2))
+        self.assertEqual(results, [])
+        self.assertLess(len(steps), 1000)
+
+    def test_collect_known_types_reports_and_cancels(self):
+        calls = []
+        known = _collect_known_types(HEADER, progress=lambda done, total: calls.append((done, total)))
+        self.assertEqual(sorted(known), ["A", "B", "C"])
+        self.assertEqual(len(calls), 4)  # 每個頂層定義前一次 + 結尾
+        self.assertTrue(all(total == calls[0][1] for _, total in calls))
+
+        def cancel(done, total):
+            if done:
+                raise LoadCancelled()
+        with self.assertRaises(LoadCancelled):
+            _collect_known_types(HEADER, progress=cancel)
+
+
+class FakeTk:
+    """``after`` 只記錄排程；``run_pending`` 於測試執行緒（主執行緒）執行。"""
+
+    def __init__(self):
+        self.scheduled = []
+        self.after_threads = set()
+
+    def after(self, ms, fn):
+        self.after_threads.add(threading.current_thread())
+        self.scheduled.append(fn)
+        return len(self.scheduled)
+
+    def update_display(self, nodes, context):
+        pass
+
+    def run_pending(self, until, timeout=5):
+        tick = threading.Event()
+        for _ in range(max(1, int(timeout / 0.01))):
+            pending, self.scheduled = self.scheduled, []
+            for fn in pending:
+                fn()
+            if until():
+                return True
+            tick.wait(0.01)
+        return False
+
+
+class TestMainThreadQueue(unittest.TestCase):
+    def test_worker_posts_run_on_main_thread_only(self):
+        tk = FakeTk()
+        ran_on = []
+        busy = [True]
+        q = MainThreadQueue(lambda: tk.after, is_busy=lambda: busy[0])
+        q.start()
+        worker = threading.Thread(target=lambda: q.post(lambda: ran_on.append(threading.current_thread())))
+        worker.start()
+        worker.join(2)
+        self.assertEqual(ran_on, [])  # 尚未 poll
+        busy[0] = False
+        self.assertTrue(tk.run_pending(lambda: ran_on and not tk.scheduled))
+        self.assertEqual(ran_on, [threading.current_thread()])
+        self.assertEqual(tk.after_threads, {threading.current_thread()})
+
+    def test_failed_after_does_not_run_callbacks_on_worker(self):
+        def broken_after(ms, fn):
+            raise RuntimeError("main thread is not in main loop")
+        ran = []
+        q = MainThreadQueue(lambda: broken_after)
+        q.start()
+        worker = threading.Thread(target=lambda: q.post(lambda: ran.append(1)))
+        worker.start()
+        worker.join(2)
+        self.assertEqual(ran, [])
+
+    def test_without_view_runs_immediately(self):
+        ran = []
+        MainThreadQueue(lambda: None).post(lambda: ran.append(1))
+        self.assertEqual(ran, [1])
+
+
+class TestPresenterFileLoad(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write(HEADER)
+        self.path = f.name
+        self.model = StructModel()
+        self.presenter = StructPresenter(self.model)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_load_file_async_applies_result(self):
+        results, pending = [], []
+        orig_push = self.presenter.push_context
+
+        def push(*args, **kwargs):
+            pending.append(self.presenter.context["pending_action"])
+            return orig_push(*args, **kwargs)
+        self.presenter.push_context = push
+        self.presenter.load_file_async(self.path, results.append, target_name="B")
+        self.assertTrue(self.presenter._file_loader.wait(5))
+        self.assertEqual(results[-1]["type"], "ok")
+        expected = StructModel().load_struct_from_file(self.path, "B")
+        self.assertEqual((results[-1]["struct_name"], results[-1]["total_size"]), (expected[0], expected[2]))
+        self.assertEqual(self.model.available_top_level_types, ["A", "B", "C"])
+        self.assertTrue(pending[0])  # 載入開始即顯示 pending_action
+        self.assertIsNone(self.presenter.context["pending_action"])
+        self.assertFalse(self.presenter.context["loading"])
+
+    def test_load_file_async_with_tk_view_applies_on_main_thread(self):
+        tk = FakeTk()
+        self.presenter.view = tk
+        results, threads = [], []
+        orig_apply = self.model.apply_struct_file
+
+        def apply(loaded):
+            threads.append(threading.current_thread())
+            return orig_apply(loaded)
+        self.model.apply_struct_file = apply
+        self.presenter.load_file_async(self.path, results.append)
+        self.assertTrue(tk.run_pending(lambda: results))
+        self.assertEqual(results[-1]["type"], "ok")
+        self.assertEqual(threads, [threading.current_thread()])
+        self.assertEqual(tk.after_threads, {threading.current_thread()})
+
+    def test_cancel_file_load_clears_pending_action(self):
+        release = threading.Event()
+        self.presenter.view = FakeTk()
+        self.model.read_struct_file = lambda *a, **k: release.wait(2)
+        results = []
+        self.presenter.load_file_async(self.path, results.append)
+        self.assertTrue(self.presenter.context["pending_action"])
+        self.assertTrue(self.presenter.cancel_file_load())
+        release.set()
+        self.assertTrue(self.presenter._file_loader.wait(2))
+        self.presenter.view.run_pending(lambda: False, timeout=0.05)
+        self.assertIsNone(self.presenter.context["pending_action"])
+        self.assertEqual(results, [])
+
+    def test_load_file_async_error(self):
+        results = []
+        self.presenter.load_file_async(self.path + ".missing", results.append)
+        self.assertTrue(self.presenter._file_loader.wait(5))
+        self.assertEqual(results[-1]["type"], "error")
+        self.assertIsNone(self.presenter.context["pending_action"])
+
+    def test_on_load_file_uses_parse_file(self):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.presenter.on_load_file(self.path))
+        finally:
+            loop.close()
+        self.assertIsNone(self.presenter.context["error"])
+        self.assertEqual(self.presenter.context["ast"]["name"], self.model.struct_name)
+        self.assertEqual(self.model.available_top_level_types, ["A", "B", "C"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import threading
+import unittest
+
+from src.presenter.live_decode import LatestOnlyWorker
+from src.presenter.struct_presenter import StructPresenter
+from tests.model.test_incremental_decode import load_model
+
+
+class FakeView:
+    def __init__(self, data, unit_size=4):
+        self.data = data
+        self.unit_size = unit_size
+        self.shown = []
+
+    def get_hex_input_snapshot(self):
+        return bytes(self.data), self.unit_size
+
+    def get_selected_endianness(self):
+        return "Little Endian"
+
+    def show_parsed_values_incremental(self, parsed_values, changed):
+        self.shown.append((parsed_values, list(changed)))
+
+
+class TestLiveDecode(unittest.TestCase):
+    def test_worker_keeps_only_latest_pending_job(self):
+        release = threading.Event()
+        results = []
+        worker = LatestOnlyWorker()
+        worker.submit(lambda is_stale: release.wait(2) and "first", results.append)
+        worker.submit(lambda is_stale: "second", results.append)
+        worker.submit(lambda is_stale: "third", results.append)
+        release.set()
+        self.assertTrue(worker.wait_idle(2))
+        self.assertEqual(results, ["third"])
+
+    def test_presenter_live_decode_updates_model(self):
+        model = load_model()
+        view = FakeView(bytearray(model.total_size), unit_size=1)
+        presenter = StructPresenter(model, view)
+        presenter.on_hex_input_changed()  # live 模式未開啟時不動作
+        self.assertTrue(presenter._live_worker.wait_idle(2))
+        self.assertEqual(view.shown, [])
+
+        presenter.set_live_decode(True)
+        self.assertTrue(presenter.context["extra"]["live_decode"])
+        view.data[0] = 0x41
+        presenter.on_hex_input_changed()
+        self.assertTrue(presenter._live_worker.wait_idle(2))
+        self.assertEqual(model.member_values["c"], "65")
+        self.assertEqual(len(view.shown), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -69,8 +69,15 @@ class TestPresenterMockView(unittest.TestCase):
         from unittest.mock import MagicMock
         self.presenter.invalidate_cache = MagicMock()
         self.presenter.push_context = MagicMock()
-        self.presenter.on_pointer_mode_toggle(True)
-        self.presenter.invalidate_cache.assert_called_once()
+        version = self.model.version
+        try:
+            self.presenter.on_pointer_mode_toggle(True)
+        finally:
+            from src.model.types import reset_pointer_mode
+            reset_pointer_mode()
+        # model 與 layout cache 經由型別 registry 失效，不再整批呼叫 invalidate_cache
+        self.presenter.invalidate_cache.assert_not_called()
+        self.assertGreater(self.model.version, version)
         self.presenter.push_context.assert_called_once()
         self.assertEqual(self.presenter.context.get("arch_mode"), "x86")
 
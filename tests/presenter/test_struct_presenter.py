@@ -60,6 +60,13 @@ class TestStructPresenter(unittest.TestCase):
         self.assertEqual(debug_lines[0], "Box 1 (1 bytes): 01")
         self.assertEqual(debug_lines[1], "Box 2 (1 bytes): 02")
 
+    def test_process_hex_parts_little_endian_mixed_box_sizes(self):
+        hex_parts = [("1234", 8), ("ab", 2), ("", 4)]
+        hex_data, debug_lines = self.presenter._process_hex_parts(hex_parts, "little")
+        self.assertEqual(hex_data, "34120000ab0000")
+        self.assertEqual(len(debug_lines), 3)
+        self.assertEqual(debug_lines[-1], "Box 3 (2 bytes): 00 00")
+
     def test_process_hex_parts_invalid_input(self):
         with self.assertRaises(HexProcessingError) as cm:
             self.presenter._process_hex_parts([("zz", 2)], "big")
@@ -76,6 +83,29 @@ class TestStructPresenter(unittest.TestCase):
         l3 = self.presenter.compute_member_layout(m2, 8)
         self.assertIsNot(l3, l1)  # cache miss
 
+    def test_layout_cache_key_keeps_member_order(self):
+        self.model.calculate_manual_layout.side_effect = lambda m, s: [dict(name=x['name'], size=1) for x in m]
+        m1 = [{"name": "a", "type": "char", "bit_size": 0}, {"name": "b", "type": "int", "bit_size": 0}]
+        m2 = list(reversed(m1))
+        self.assertNotEqual(self.presenter._make_cache_key(m1, 8), self.presenter._make_cache_key(m2, 8))
+        l1 = self.presenter.compute_member_layout(m1, 8)
+        l2 = self.presenter.compute_member_layout(m2, 8)
+        self.assertEqual([i["name"] for i in l2], ["b", "a"])
+        self.assertIsNot(l1, l2)
+
+    def test_layout_cache_shared_with_model_and_stats(self):
+        from src.model.struct_model import StructModel
+        model = StructModel()
+        presenter = StructPresenter(model)
+        self.assertIs(presenter._layout_cache, model.layout_cache)
+        members = [{"name": "a", "type": "char", "bit_size": 0}]
+        presenter.compute_member_layout(members, 4)
+        presenter.compute_member_layout(members, 4)
+        stats = presenter.get_layout_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+        self.assertGreater(stats["bytes"], 0)
+
     def test_layout_cache_invalidation(self):
         self.model.calculate_manual_layout.side_effect = lambda m, s: [dict(name=x['name'], size=1) for x in m]
         m1 = [{"name": "a", "type": "char", "bit_size": 0}]
@@ -377,14 +407,14 @@ class TestStructPresenter(unittest.TestCase):
         presenter._layout_cache[('dummy', 1)] = [1]
         presenter._cache_hits = 5
         presenter._cache_misses = 3
-        # 模擬 model 狀態變更
+        # layout cache 以內容為 key：struct 變更不清空，也不重設統計
         presenter.update("manual_struct_changed", model)
-        assert presenter._layout_cache == {}
-        assert presenter.get_cache_stats() == (0, 0)
-        # 再次通知
-        presenter._layout_cache[('dummy', 1)] = [1]
-        presenter._cache_hits = 2
+        assert presenter._layout_cache == {('dummy', 1): [1]}
+        assert presenter.get_cache_stats() == (5, 3)
         presenter.update("file_struct_loaded", model)
+        assert presenter._layout_cache == {('dummy', 1): [1]}
+        # 明確清空仍會清除項目與統計
+        presenter.invalidate_cache()
         assert presenter._layout_cache == {}
         assert presenter.get_cache_stats() == (0, 0)
         # 未註冊 observer 也不會出錯
@@ -1052,18 +1082,25 @@ class TestPointerModeToggle(unittest.TestCase):
             pass
 
     def test_on_pointer_mode_toggle_updates_context_and_resets_cache(self):
+        # layout cache 由型別 registry 通知清除，不再整批呼叫 invalidate_cache
+        self.presenter._layout_cache.store("k", [{"name": "a"}])
         # Toggle to 32-bit
         self.presenter.on_pointer_mode_toggle(True)
         self.assertEqual(self.presenter.context.get("arch_mode"), "x86")
-        self.presenter.invalidate_cache.assert_called_once()
+        self.assertEqual(len(self.presenter._layout_cache), 0)
+        self.presenter.invalidate_cache.assert_not_called()
         self.presenter.push_context.assert_called()
         # Toggle back to 64-bit
-        self.presenter.invalidate_cache.reset_mock()
+        self.presenter._layout_cache.store("k", [{"name": "a"}])
         self.presenter.push_context.reset_mock()
         self.presenter.on_pointer_mode_toggle(False)
         self.assertEqual(self.presenter.context.get("arch_mode"), "x64")
-        self.presenter.invalidate_cache.assert_called_once()
+        self.assertEqual(len(self.presenter._layout_cache), 0)
         self.presenter.push_context.assert_called()
+        # 同一模式再切一次：型別未變，cache 保留
+        self.presenter._layout_cache.store("k", [{"name": "a"}])
+        self.presenter.on_pointer_mode_toggle(False)
+        self.assertEqual(len(self.presenter._layout_cache), 1)
 
 
 if __name__ == "__main__":
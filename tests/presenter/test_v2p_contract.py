@@ -1,5 +1,7 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 import time
 from src.model.struct_model import StructModel
 from src.presenter.struct_presenter import StructPresenter
@@ -113,6 +115,51 @@ class TestV2PAPIContract(unittest.TestCase):
         self.assertNotIn("V2PTest.a", self.presenter.context["expanded_nodes"])
         self.assertEqual(self.presenter.context["debug_info"]["last_event"], "on_collapse")
 
+    def test_on_expand_all_and_collapse_all_event(self):
+        nodes = [{"id": "S", "children": [
+            {"id": "S.a", "children": [{"id": "S.a.x", "children": []}]},
+            {"id": "S.b", "children": []},
+        ]}]
+        self.presenter.get_display_nodes = lambda mode: nodes
+        self.presenter.on_expand_all()
+        self.assertEqual(self.presenter.context["expanded_nodes"], ["S", "S.a"])
+        self.assertEqual(self.presenter.context["debug_info"]["last_event"], "on_expand_all")
+        self.presenter.on_collapse_all()
+        self.assertEqual(self.presenter.context["expanded_nodes"], ["S"])
+        self.assertEqual(self.presenter.context["debug_info"]["last_event"], "on_collapse_all")
+
+    def test_on_search_and_filter_use_index(self):
+        self.model.struct_content = "struct S { struct { int count; char tag; } inner; int total; };"
+        nodes = self.model.get_display_nodes("tree")
+        self.presenter.on_search("count")
+        self.assertEqual(self.presenter.context["highlighted_nodes"], ["S.inner.count"])
+        self.assertEqual(self.presenter.context["debug_info"]["last_event"], "on_search")
+        self.presenter.on_filter("tag")
+        filtered = self.presenter._apply_filter(nodes)
+        self.assertEqual([c["id"] for c in filtered[0]["children"]], ["S.inner"])
+        self.assertEqual([c["id"] for c in filtered[0]["children"][0]["children"]], ["S.inner.tag"])
+        self.presenter.on_filter("")
+        self.assertIs(self.presenter._apply_filter(nodes), nodes)
+
+    def test_push_context_builds_search_index_in_background(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".h", delete=False) as f:
+            f.write("struct S { int count; char tag; };\n")
+        self.addCleanup(os.unlink, f.name)
+        self.model.load_struct_from_file(f.name)
+        self.presenter.push_context(immediate=True)
+        self.assertTrue(self.presenter._index_worker.wait_idle(5))
+        # 索引已於背景建好：按鍵時不應再建立
+        with patch("src.presenter.struct_presenter.NodeSearchIndex", side_effect=AssertionError("built on keystroke")):
+            self.presenter.on_search("count")
+            self.assertEqual(self.presenter.context["highlighted_nodes"], ["S.count"])
+            self.model.parse_hex_data("2a000000" "05000000", "little")
+            self.presenter.push_context(immediate=True)  # decode 後只重建 value 索引
+            self.assertTrue(self.presenter._index_worker.wait_idle(5))
+            index = self.presenter.get_search_index()
+            self.assertTrue(index.has_values(self.model.get_display_nodes("tree")))
+            self.presenter.on_search("=42")
+        self.assertEqual(self.presenter.context["highlighted_nodes"], ["S.count"])
+
     def test_on_refresh_event(self):
         self.presenter.on_refresh()
         self.assertEqual(self.presenter.context["debug_info"]["last_event"], "on_refresh")
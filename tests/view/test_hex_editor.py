@@ -0,0 +1,135 @@
+import unittest
+
+from src.view.components.hex_editor import BoxEntries, HexBuffer, HexEditor
+
+
+class FakeCanvas:
+    def __init__(self, height=90):
+        self.height = height
+        self.items = []
+        self.bindings = {}
+        self.clipboard = ""
+
+    def bind(self, seq, func, add=None):
+        self.bindings[seq] = func
+
+    def winfo_height(self):
+        return self.height
+
+    def delete(self, tag):
+        self.items.clear()
+
+    def create_text(self, x, y, **kw):
+        self.items.append(("text", x, y, kw))
+
+    def create_rectangle(self, *coords, **kw):
+        self.items.append(("rect", coords, kw))
+
+    def focus_set(self):
+        pass
+
+    def clipboard_get(self):
+        return self.clipboard
+
+    def texts(self):
+        return [kw["text"] for kind, *_, kw in self.items if kind == "text"]
+
+
+class Event:
+    def __init__(self, keysym="", char="", x=0, y=0, state=0):
+        self.keysym, self.char, self.x, self.y, self.state = keysym, char, x, y, state
+
+
+class TestHexBuffer(unittest.TestCase):
+    def test_boxes_follow_unit_size(self):
+        buf = HexBuffer(9, 4)
+        self.assertEqual(buf.box_count, 3)
+        self.assertEqual(buf.box_chars(2), 2)
+        buf.resize(9, 8)
+        self.assertEqual([chars for _, chars in buf.parts()], [16, 2])
+
+    def test_box_text_and_parts_view(self):
+        buf = HexBuffer(5, 4)
+        buf.set_box_text(0, "1")
+        buf.set_box_text(1, "ff")
+        parts = buf.parts()
+        self.assertEqual(list(parts), [("00000001", 8), ("ff", 2)])
+        # view 反映後續修改（不複製資料）
+        buf.set_nibble(0, "a")
+        self.assertEqual(parts[0], ("a0000001", 8))
+        with self.assertRaises(ValueError):
+            buf.set_box_text(1, "123")
+
+    def test_paste_overwrites_from_cursor(self):
+        buf = HexBuffer(4, 1)
+        self.assertEqual(buf.paste(1, "0x12 34"), 5)
+        self.assertEqual(bytes(buf.data), bytes.fromhex("01234000"))
+        self.assertEqual(buf.paste(0, "aabbccddee"), 8)
+        self.assertEqual(bytes(buf.data), bytes.fromhex("aabbccdd"))
+
+    def test_resize_keeps_data(self):
+        buf = HexBuffer(2, 1)
+        buf.paste(0, "abcd")
+        buf.resize(4, 2)
+        self.assertEqual(bytes(buf.data), bytes.fromhex("abcd0000"))
+
+    def test_field_index_from_layout(self):
+        buf = HexBuffer(8, 1)
+        buf.set_layout([{"offset": 0, "size": 4}, {"offset": 4, "size": 2}, {"offset": 6, "size": 2}])
+        self.assertEqual([buf.field_index(i) for i in range(8)], [0, 0, 0, 0, 1, 1, 2, 2])
+
+    def test_box_entries_keep_entry_api(self):
+        buf = HexBuffer(4, 4)
+        entries = BoxEntries(buf)
+        entry, chars = entries[0]
+        self.assertEqual(chars, 8)
+        entry.delete(0, "end")
+        entry.insert(0, "01020304")
+        self.assertEqual(entry.get(), "01020304")
+        self.assertEqual(entries.parts()[0], ("01020304", 8))
+
+
+class TestHexEditor(unittest.TestCase):
+    def setUp(self):
+        self.canvas = FakeCanvas(height=90)
+        self.editor = HexEditor(self.canvas)
+        self.editor.char_width, self.editor.row_height = 8, 18
+        self.editor.margin, self.editor.box_gap = 56, 8
+
+    def test_renders_only_visible_rows(self):
+        self.editor.configure_buffer(65536, 1)
+        texts = self.canvas.texts()
+        # 5 可見列 + 1 部分列，每列 offset + 16 boxes
+        self.assertEqual(len(texts), 6 * 17)
+        self.editor.scroll_rows(100)
+        self.assertIn("000640", self.canvas.texts())
+
+    def test_typing_edits_nibbles_and_advances_cursor(self):
+        self.editor.configure_buffer(4, 2)
+        for ch in "abc":
+            self.canvas.bindings["<Key>"](Event(keysym=ch, char=ch))
+        self.assertEqual(bytes(self.editor.buffer.data), bytes.fromhex("abc00000"))
+        self.assertEqual(self.editor.cursor, 3)
+        self.canvas.bindings["<Key>"](Event(keysym="BackSpace"))
+        self.assertEqual(bytes(self.editor.buffer.data), bytes.fromhex("ab000000"))
+
+    def test_click_hit_test_and_paste(self):
+        self.editor.configure_buffer(32, 1)
+        # 第二列第 3 個 byte 的低 nibble
+        x = self.editor._byte_x(2) + 8
+        self.canvas.bindings["<Button-1>"](Event(x=x + 1, y=18 + 2))
+        self.assertEqual(self.editor.cursor, (16 + 2) * 2 + 1)
+        self.canvas.clipboard = "ff"
+        self.canvas.bindings["<<Paste>>"](Event())
+        self.assertEqual(self.editor.buffer.data[18], 0x0F)
+        self.assertEqual(self.editor.buffer.data[19], 0xF0)
+
+    def test_field_highlight_rectangles(self):
+        self.editor.configure_buffer(16, 1)
+        self.editor.set_layout([{"offset": 0}, {"offset": 4}, {"offset": 8}])
+        rects = [item for item in self.canvas.items if item[0] == "rect" and item[2].get("width") == 0]
+        self.assertEqual(len(rects), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
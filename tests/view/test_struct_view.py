@@ -2543,6 +2543,8 @@ def test_scroll_preserves_selection(view):
     tree = view.member_tree
     tree.selection_set('n0')
     view.virtual._on_scroll(type('E',(object,),{'delta':-120})())
+    assert 'n0' in view.virtual.selection()
+    view.virtual._on_scroll(type('E',(object,),{'delta':120})())
     assert 'n0' in tree.selection()
 
 
@@ -0,0 +1,188 @@
+import unittest
+
+from src.view.tree_patch import (
+    TreeIndex, LazyTreeLoader, build_tree_index, diff_tree_index, apply_tree_ops,
+    placeholder_id, subtree_within,
+)
+
+
+class FakeTree:
+    """Minimal Treeview stand-in: parent -> ordered children, id -> options."""
+
+    def __init__(self):
+        self.children = {"": []}
+        self.parent = {}
+        self.options = {}
+        self.calls = []
+
+    def insert(self, parent, index, iid, **options):
+        if iid in self.parent:
+            raise ValueError(f"Item {iid} already exists")
+        self.calls.append("insert")
+        if index == "end":
+            index = len(self.children[parent])
+        self.children[parent].insert(index, iid)
+        self.children[iid] = []
+        self.parent[iid] = parent
+        self.options[iid] = dict(options)
+        return iid
+
+    def delete(self, iid):
+        self.calls.append("delete")
+        self.children[self.parent[iid]].remove(iid)
+        self._drop(iid)
+
+    def _drop(self, iid):
+        for child in self.children.pop(iid):
+            self._drop(child)
+        del self.parent[iid]
+        del self.options[iid]
+
+    def move(self, iid, parent, index):
+        self.calls.append("move")
+        self.children[self.parent[iid]].remove(iid)
+        self.children[parent].insert(index, iid)
+        self.parent[iid] = parent
+
+    def item(self, iid, **options):
+        self.calls.append("item")
+        self.options[iid].update(options)
+
+    def snapshot(self):
+        def walk(parent):
+            return [(iid, self.options[iid]["text"], walk(iid)) for iid in self.children[parent]]
+        return walk("")
+
+
+def _node(iid, label, children=()):
+    return {"id": iid, "label": label, "children": list(children)}
+
+
+def _options(node):
+    return {"text": node["label"], "values": (node["label"],)}
+
+
+def _render(tree, old, nodes):
+    new = build_tree_index(nodes, _options)
+    apply_tree_ops(tree, diff_tree_index(old, new))
+    return new
+
+
+def _expected(nodes):
+    return [(n["id"], n["label"], _expected(n["children"])) for n in nodes]
+
+
+class TestTreePatch(unittest.TestCase):
+    def setUp(self):
+        self.tree = FakeTree()
+        self.nodes = [_node("S", "S", [_node("S.a", "a"), _node("S.b", "b", [_node("S.b.x", "x")])])]
+        self.index = _render(self.tree, TreeIndex(), self.nodes)
+
+    def test_initial_render(self):
+        self.assertEqual(self.tree.snapshot(), _expected(self.nodes))
+
+    def test_unchanged_nodes_issue_no_calls(self):
+        self.tree.calls.clear()
+        _render(self.tree, self.index, self.nodes)
+        self.assertEqual(self.tree.calls, [])
+
+    def test_value_change_only_updates_item(self):
+        nodes = [_node("S", "S", [_node("S.a", "a=1"), _node("S.b", "b", [_node("S.b.x", "x")])])]
+        self.tree.calls.clear()
+        _render(self.tree, self.index, nodes)
+        self.assertEqual(self.tree.calls, ["item"])
+        self.assertEqual(self.tree.options["S.a"], {"text": "a=1", "values": ("a=1",)})
+
+    def test_insert_delete_and_reorder(self):
+        nodes = [_node("S", "S", [_node("S.c", "c"), _node("S.b", "b"), _node("S.a", "a")])]
+        _render(self.tree, self.index, nodes)
+        self.assertEqual(self.tree.snapshot(), _expected(nodes))
+
+    def test_survivor_under_deleted_parent_is_reinserted(self):
+        nodes = [_node("S", "S", [_node("S.b.x", "x")])]
+        _render(self.tree, self.index, nodes)
+        self.assertEqual(self.tree.snapshot(), _expected(nodes))
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.jobs = {}
+        self._next = 0
+
+    def after(self, ms, func):
+        self._next += 1
+        self.jobs[self._next] = func
+        return self._next
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_one(self):
+        job = min(self.jobs)
+        self.jobs.pop(job)()
+
+    def run_all(self):
+        while self.jobs:
+            self.run_one()
+
+
+def _big_nodes(count):
+    return [_node("S", "S", [_node(f"S.m{i}", f"m{i}", [_node(f"S.m{i}.x", "x")]) for i in range(count)])]
+
+
+class TestLazyTreeLoader(unittest.TestCase):
+    def setUp(self):
+        self.tree = FakeTree()
+        self.nodes = _big_nodes(50)
+        self.index = build_tree_index(self.nodes, _options, is_loaded=lambda n: False)
+        apply_tree_ops(self.tree, diff_tree_index(TreeIndex(), self.index))
+
+    def test_collapsed_node_gets_single_placeholder(self):
+        self.assertEqual(self.tree.children["S"], [placeholder_id("S")])
+        self.assertEqual(len(self.tree.parent), 2)
+        self.assertIn("S", self.index.lazy)
+
+    def test_subtree_within(self):
+        self.assertTrue(subtree_within(self.nodes[0], 100))
+        self.assertFalse(subtree_within(self.nodes[0], 99))
+
+    def test_open_inserts_children_in_chunks(self):
+        sched = FakeScheduler()
+        progress = []
+        loader = LazyTreeLoader(self.tree, self.index, _options, after=sched.after,
+                                after_cancel=sched.after_cancel, chunk_size=20,
+                                on_progress=lambda d, t: progress.append((d, t)))
+        self.assertTrue(loader.open("S"))
+        # 第一批立即插入，其餘排入 after()
+        self.assertEqual(len(self.tree.children["S"]), 20)
+        self.assertTrue(loader.busy)
+        sched.run_all()
+        self.assertFalse(loader.busy)
+        self.assertEqual(self.tree.children["S"], [f"S.m{i}" for i in range(50)])
+        self.assertEqual(self.tree.children["S.m0"], [placeholder_id("S.m0")])
+        self.assertEqual(progress[-1], (50, 50))
+        self.assertFalse(loader.open("S"))
+        # 索引與 widget 一致：再次 diff 無操作
+        self.tree.calls.clear()
+        new = build_tree_index(self.nodes, _options, is_loaded=lambda n: n["id"] == "S")
+        apply_tree_ops(self.tree, diff_tree_index(loader.index, new))
+        self.assertEqual(self.tree.calls, [])
+
+    def test_auto_open_loads_nested_levels(self):
+        loader = LazyTreeLoader(self.tree, self.index, _options, auto_open={"S", "S.m3"})
+        loader.open("S")
+        self.assertEqual(self.tree.children["S.m3"], ["S.m3.x"])
+        self.assertEqual(self.tree.children["S.m4"], [placeholder_id("S.m4")])
+
+    def test_cancel_stops_pending_chunks(self):
+        sched = FakeScheduler()
+        loader = LazyTreeLoader(self.tree, self.index, _options, after=sched.after,
+                                after_cancel=sched.after_cancel, chunk_size=10)
+        loader.open("S")
+        loader.cancel()
+        self.assertEqual(sched.jobs, {})
+        self.assertEqual(len(self.tree.children["S"]), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from src.view.ui_scheduler import ChunkedUpdateScheduler
+
+
+class FakeClock:
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class FakeAfter:
+    def __init__(self):
+        self.jobs = {}
+        self._next = 0
+
+    def after(self, ms, func):
+        self._next += 1
+        self.jobs[self._next] = func
+        return self._next
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_all(self):
+        while self.jobs:
+            job = min(self.jobs)
+            self.jobs.pop(job)()
+
+
+class TestChunkedUpdateScheduler(unittest.TestCase):
+    def setUp(self):
+        self.tk = FakeAfter()
+        self.progress = []
+        # 每次讀 clock 前進 1ms：每 16 筆檢查一次 → 8ms budget 約 128 筆一批
+        self.scheduler = ChunkedUpdateScheduler(
+            self.tk.after, self.tk.after_cancel, budget_ms=8, clock=FakeClock(0.001),
+            on_progress=lambda key, done, total: self.progress.append((key, done, total)),
+        )
+
+    def test_small_update_finishes_synchronously(self):
+        out = []
+        self.assertTrue(self.scheduler.run("t", range(10), out.append))
+        self.assertEqual(out, list(range(10)))
+        self.assertEqual(self.tk.jobs, {})
+        self.assertEqual(self.progress[-1], ("t", 10, 10))
+
+    def test_large_update_is_split_into_batches(self):
+        out = []
+        self.assertFalse(self.scheduler.run("t", range(1000), out.append))
+        first = len(out)
+        self.assertGreater(first, 0)
+        self.assertLess(first, 1000)
+        self.assertTrue(self.scheduler.busy("t"))
+        self.tk.run_all()
+        self.assertEqual(out, list(range(1000)))
+        self.assertFalse(self.scheduler.busy())
+        self.assertGreater(len(self.progress), 2)
+
+    def test_new_data_cancels_stale_batches(self):
+        old, new = [], []
+        self.scheduler.run("t", range(1000), old.append)
+        done_old = len(old)
+        self.scheduler.run("t", range(5), new.append)
+        self.tk.run_all()
+        self.assertEqual(len(old), done_old)
+        self.assertEqual(new, list(range(5)))
+
+    def test_without_after_runs_everything(self):
+        out = []
+        scheduler = ChunkedUpdateScheduler(clock=FakeClock(0.001))
+        self.assertTrue(scheduler.run("t", range(1000), out.append))
+        self.assertEqual(len(out), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+
+from src.view.virtual_tree import VirtualTreeview
+from tests.view.test_tree_patch import FakeTree
+
+
+class FakeVirtualTree(FakeTree):
+    def __init__(self):
+        super().__init__()
+        self.selected = ()
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def delete(self, *iids):
+        self.calls.append("delete")
+        for iid in iids:
+            self.children[self.parent[iid]].remove(iid)
+            self._drop(iid)
+        self.selected = tuple(i for i in self.selected if i in self.parent)
+
+    def move(self, iid, parent, index):
+        if index == "end":
+            index = len(self.children[parent])
+        super().move(iid, parent, index)
+
+    def winfo_manager(self):
+        return ""
+
+    def get_children(self, parent=""):
+        return tuple(self.children[parent])
+
+    def selection(self):
+        self.calls.append("selection")
+        return self.selected
+
+    def selection_set(self, items):
+        self.selected = (items,) if isinstance(items, str) else tuple(items)
+
+    def selection_add(self, items):
+        self.calls.append("selection_add")
+        self.selected += tuple(i for i in items if i not in self.selected)
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.fractions = None
+
+    def configure(self, **kwargs):
+        self.command = kwargs.get("command")
+
+    def set(self, first, last):
+        self.fractions = (first, last)
+
+
+def _flat(count):
+    return [{"id": f"n{i}", "name": f"N{i}", "label": f"N{i}"} for i in range(count)]
+
+
+def _tree_nodes():
+    # a{a.x, a.y{a.y.z}}, b
+    return [
+        {"id": "a", "label": "a", "depth": 0},
+        {"id": "a.x", "label": "x", "depth": 1},
+        {"id": "a.y", "label": "y", "depth": 1},
+        {"id": "a.y.z", "label": "z", "depth": 2},
+        {"id": "b", "label": "b", "depth": 0},
+    ]
+
+
+class TestVirtualTreeview(unittest.TestCase):
+    def setUp(self):
+        self.tree = FakeVirtualTree()
+        self.virtual = VirtualTreeview(self.tree, page_size=10)
+
+    def test_only_window_rendered_and_index_lookup(self):
+        self.virtual.set_nodes(_flat(100000))
+        self.assertEqual(self.tree.get_children(""), tuple(f"n{i}" for i in range(10)))
+        self.assertEqual(self.virtual.get_global_index("n99999"), 99999)
+        self.assertEqual(self.virtual.get_global_index("missing"), -1)
+
+    def test_one_row_scroll_recycles_one_row(self):
+        self.virtual.set_nodes(_flat(1000))
+        self.tree.calls.clear()
+        self.virtual._on_scroll(type("E", (object,), {"delta": -120})())
+        self.assertEqual(sorted(self.tree.calls), ["delete", "insert", "selection"])
+        self.assertEqual(self.tree.get_children("")[0], "n1")
+        self.assertEqual(self.tree.get_children("")[-1], "n10")
+
+    def test_selection_tracked_while_scrolled_out(self):
+        self.virtual.set_nodes(_flat(20))
+        self.tree.selection_set(("n0", "n2"))
+        self.virtual._scroll_by(5)
+        self.assertEqual(self.tree.get_children(""), tuple(f"n{i}" for i in range(5, 15)))
+        self.assertEqual(self.tree.selection(), ())
+        self.assertEqual(self.virtual.selection(), ("n0", "n2"))
+        self.virtual._scroll_by(-3)
+        self.assertEqual(self.tree.selection(), ("n2",))
+        self.virtual._scroll_by(-2)
+        self.assertEqual(set(self.tree.selection()), {"n0", "n2"})
+
+    def test_plain_click_drops_hidden_selection(self):
+        self.virtual.set_nodes(_flat(20))
+        self.virtual.selection_set(["n0", "n12"])
+        self.assertEqual(self.tree.selection(), ("n0",))
+        self.virtual._scroll_by(5)
+        self.virtual._on_select_click(type("E", (object,), {"state": 0x0004})())  # Control-click
+        self.assertEqual(self.virtual.selection(), ("n0", "n12"))
+        self.virtual._on_select_click(type("E", (object,), {"state": 0})())
+        self.tree.selection_set("n7")
+        self.assertEqual(self.virtual.selection(), ("n7",))
+        self.virtual._scroll_by(-5)
+        self.assertEqual(self.tree.selection(), ("n7",))
+
+    def test_page_jump_bounded_tk_calls(self):
+        self.virtual.set_nodes(_flat(1000))
+        self.virtual.selection_set(["n0", "n505"])
+        self.tree.calls.clear()
+        self.virtual.yview("moveto", "0.5")
+        self.assertEqual(self.tree.get_children(""), tuple(f"n{i}" for i in range(500, 510)))
+        self.assertEqual(self.tree.calls.count("insert"), 10)
+        self.assertLessEqual(len(self.tree.calls), self.virtual.page_size + 4)
+        self.assertEqual(self.tree.selection(), ("n505",))
+
+    def test_scrollbar_is_proportional(self):
+        bar = FakeScrollbar()
+        self.virtual.attach_scrollbar(bar)
+        self.virtual.set_nodes(_flat(100))
+        self.assertEqual(bar.fractions, (0.0, 0.1))
+        self.virtual.yview("moveto", "0.5")
+        self.assertEqual(bar.fractions, (0.5, 0.6))
+        self.assertEqual(self.tree.get_children("")[0], "n50")
+        self.virtual.yview("scroll", "1", "pages")
+        self.assertEqual(self.virtual.start, 60)
+
+    def test_collapse_and_expand_on_flattened_model(self):
+        self.virtual.set_nodes(_tree_nodes())
+        self.virtual.collapse("a.y")
+        self.assertEqual(self.tree.get_children(""), ("a", "a.x", "a.y", "b"))
+        self.virtual.collapse("a")
+        self.assertEqual(self.tree.get_children(""), ("a", "b"))
+        self.virtual.expand("a")
+        self.assertEqual(self.tree.get_children(""), ("a", "a.x", "a.y", "b"))
+        self.virtual.toggle("a.y")
+        self.assertEqual(self.tree.get_children(""), ("a", "a.x", "a.y", "a.y.z", "b"))
+
+    def test_reorder_moves_subtree(self):
+        self.virtual.set_nodes(_tree_nodes())
+        self.virtual.reorder_nodes("", 0, 4)
+        self.assertEqual(self.tree.get_children(""), ("b", "a", "a.x", "a.y", "a.y.z"))
+        self.assertEqual(self.virtual.get_global_index("a"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
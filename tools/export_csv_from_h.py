@@ -5,7 +5,7 @@ Usage:
   python tools/export_csv_from_h.py --input path/to/file.h --output out.csv \
     [--struct StructName] [--delimiter ,] [--no-header] [--bom] \
     [--line-ending CRLF] [--null NULL] [--columns col1,col2] \
-    [--sort entity_name:ASC,field_order:ASC]
+    [--sort entity_name:ASC,field_order:ASC] [--profile out.pstats]
 """
 
 import argparse
@@ -20,6 +20,7 @@ from src.export.csv_export import (
     CsvExportOptions,
     build_parsed_model_from_struct,
 )
+from src.model.profiling import PROFILER
 
 
 def parse_sort(spec: str):
@@ -55,9 +56,22 @@ def main():
     # v24 options
     ap.add_argument("--columns-source", choices=["gui_unified", "legacy", "explicit"], default=os.environ.get("CSV_COLUMNS_SOURCE", "gui_unified"))
     ap.add_argument("--include-metadata", action="store_true", help="Append metadata columns after unified set")
+    ap.add_argument("--profile", metavar="PSTATS", help="Profile load + export with cProfile and write a .pstats file")
 
     args = ap.parse_args()
 
+    if args.profile:
+        with PROFILER.capture("export_csv_from_h", path=args.profile, force=True):
+            run(args)
+        if PROFILER.last_error:
+            print(f"Profile not saved: {PROFILER.last_error}", file=sys.stderr)
+        elif PROFILER.last_report is not None:
+            print(PROFILER.last_report.format())
+    else:
+        run(args)
+
+
+def run(args):
     model = StructModel()
     model.load_struct_from_file(args.input, target_name=args.struct_name)
     parsed = build_parsed_model_from_struct(model)
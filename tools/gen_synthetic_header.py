@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""CLI: Generate synthetic C headers and matching binary records.
+
+Reproducible large inputs for benchmarks and stress tests. Everything is
+drawn from one ``random.Random(seed)``, so the same options produce the same
+files on every machine.
+
+The generated header contains:
+- ``--structs`` top-level structs (plus ``--unions`` unions) with
+  ``--members`` members each, nested up to ``--depth`` levels by embedding
+  earlier structs/unions, optionally as arrays;
+- scalar, array (``--max-array``), bitfield (``--bitfield-ratio``) and
+  pointer members. Pointers to structs defined later in the file use a
+  forward declaration (``--forward-ratio``);
+- ``--pack-regions`` ``#pragma pack(push, N)`` / ``#pragma pack(pop)``
+  regions around runs of definitions;
+- alias type names from ``config/type_aliases.yaml`` (``--alias-ratio``).
+
+With ``--records N`` every top-level struct also gets ``<Name>.bin`` with N
+random records of the struct's size (computed by ``StructModel``), and a
+``manifest.json`` lists sizes, seed and options.
+
+Usage:
+  python tools/gen_synthetic_header.py --out-dir out/ --seed 1 \
+    [--structs 50] [--members 12] [--depth 3] [--max-array 16] \
+    [--bitfield-ratio 0.15] [--unions 5] [--forward-ratio 0.1] \
+    [--pack-regions 2] [--alias-ratio 0.2] [--records 100]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from dataclasses import asdict, dataclass
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+SCALARS = ("char", "unsigned char", "short", "unsigned short", "int", "unsigned int",
+           "long long", "unsigned long long", "bool", "float", "double")
+BITFIELD_TYPES = ("unsigned int", "int")
+PACK_VALUES = (1, 2, 4)
+DEFAULT_ALIASES_PATH = os.path.join(ROOT, "config", "type_aliases.yaml")
+
+
+@dataclass
+class GeneratorConfig:
+    seed: int = 0
+    structs: int = 20
+    members: int = 10
+    depth: int = 2
+    max_array: int = 8
+    array_ratio: float = 0.15
+    bitfield_ratio: float = 0.15
+    unions: int = 3
+    forward_ratio: float = 0.05
+    pack_regions: int = 1
+    alias_ratio: float = 0.2
+
+
+def load_aliases(path=DEFAULT_ALIASES_PATH):
+    """讀取 ``aliases:`` 對應表（alias -> 基本型別）；檔案不存在時回傳空 dict。"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    try:
+        import yaml
+        data = yaml.safe_load(text) or {}
+        aliases = data.get("aliases", {}) if isinstance(data, dict) else {}
+    except ImportError:
+        # 無 PyYAML 時只處理 ``aliases:`` 下的 ``NAME: type`` 行
+        aliases, in_block = {}, False
+        for line in text.splitlines():
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            if not line[0].isspace():
+                in_block = line.strip() == "aliases:"
+                continue
+            if in_block and ":" in line:
+                key, value = line.split(":", 1)
+                aliases[key.strip()] = value.strip()
+    return {k: " ".join(v.split()) for k, v in aliases.items()
+            if isinstance(k, str) and isinstance(v, str) and " ".join(v.split()) in SCALARS}
+
+
+class HeaderGenerator:
+    """Build one synthetic header from a ``GeneratorConfig``."""
+
+    def __init__(self, config, aliases=None):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.aliases_by_type = {}
+        for alias, base in sorted((aliases or {}).items()):
+            self.aliases_by_type.setdefault(base, []).append(alias)
+        self.levels = {}  # 型別名稱 -> 巢狀層數（純量成員為 1）
+        self.forward_decls = []
+
+    def _scalar(self):
+        base = self.rng.choice(SCALARS)
+        choices = self.aliases_by_type.get(base)
+        if choices and self.rng.random() < self.config.alias_ratio:
+            return choices[self.rng.randrange(len(choices))], 1
+        return base, 1
+
+    def _array_suffix(self):
+        if self.config.max_array > 1 and self.rng.random() < self.config.array_ratio:
+            return f"[{self.rng.randint(2, self.config.max_array)}]"
+        return ""
+
+    def _member(self, index, defined, later):
+        """回傳 (宣告行, 層數)；``defined`` 為已定義可嵌入的聚合，``later`` 為之後才定義的 struct。"""
+        cfg, rng = self.config, self.rng
+        name = f"m{index}"
+        roll = rng.random()
+        if roll < cfg.bitfield_ratio:
+            bits = rng.randint(1, 7)
+            return [f"{rng.choice(BITFIELD_TYPES)} {name} : {bits};"], 1
+        roll -= cfg.bitfield_ratio
+        if later and roll < cfg.forward_ratio:
+            target = rng.choice(later)
+            if target not in self.forward_decls:
+                self.forward_decls.append(target)
+            return [f"struct {target} *{name};"], 1
+        nestable = [t for t in defined if self.levels[t[1]] < cfg.depth]
+        if nestable and rng.random() < 0.3:
+            kind, type_name = rng.choice(nestable)
+            return [f"{kind} {type_name} {name}{self._array_suffix()};"], self.levels[type_name] + 1
+        type_name, level = self._scalar()
+        return [f"{type_name} {name}{self._array_suffix()};"], level
+
+    def _aggregate(self, kind, name, defined, later):
+        lines, level = [], 1
+        for i in range(max(1, self.config.members)):
+            member_lines, member_level = self._member(i, defined, later)
+            lines.extend(member_lines)
+            level = max(level, member_level)
+        self.levels[name] = level
+        body = "\n".join(f"    {line}" for line in lines)
+        return f"{kind} {name} {{\n{body}\n}};\n"
+
+    def generate(self):
+        """回傳 ``(header 文字, 頂層 struct 名稱 list)``。"""
+        cfg, rng = self.config, self.rng
+        order = [("struct", f"S{i}") for i in range(cfg.structs)] + [("union", f"U{i}") for i in range(cfg.unions)]
+        rng.shuffle(order)
+        regions = self._pack_regions(len(order))
+        defined, blocks = [], []
+        struct_names = [name for kind, name in order if kind == "struct"]
+        for index, (kind, name) in enumerate(order):
+            later = [n for k, n in order[index + 1:] if k == "struct"]
+            text = self._aggregate(kind, name, list(defined), later)
+            if index in regions["push"]:
+                text = f"#pragma pack(push, {regions['push'][index]})\n" + text
+            if index in regions["pop"]:
+                text += "#pragma pack(pop)\n"
+            blocks.append(text)
+            defined.append((kind, name))
+        header = [f"// synthetic header (seed={cfg.seed})", "#ifndef SYNTHETIC_H", "#define SYNTHETIC_H", ""]
+        header.extend(f"struct {name};" for name in self.forward_decls)
+        if self.forward_decls:
+            header.append("")
+        header.append("\n".join(blocks))
+        header.append("#endif // SYNTHETIC_H")
+        return "\n".join(header) + "\n", struct_names
+
+    def _pack_regions(self, count):
+        """不重疊的 pack 區段：``{"push": {index: N}, "pop": {index}}``。"""
+        push, pop = {}, set()
+        if count == 0 or self.config.pack_regions <= 0:
+            return {"push": push, "pop": pop}
+        span = max(1, count // (self.config.pack_regions * 2))
+        starts = sorted(self.rng.sample(range(0, count, span), min(self.config.pack_regions, len(range(0, count, span)))))
+        for start in starts:
+            if start in pop or any(start <= p for p in pop):
+                continue
+            end = min(count - 1, start + self.rng.randint(0, span - 1))
+            push[start] = self.rng.choice(PACK_VALUES)
+            pop.add(end)
+        return {"push": push, "pop": pop}
+
+
+def random_records(rng, record_size, count):
+    if record_size <= 0 or count <= 0:
+        return b""
+    return rng.getrandbits(8 * record_size * count).to_bytes(record_size * count, "little")
+
+
+def struct_sizes(header_path, names):
+    """以 StructModel 載入每個頂層 struct 並回傳 ``{name: total_size}``。"""
+    from src.model.struct_model import StructModel
+    sizes = {}
+    for name in names:
+        model = StructModel()
+        model.load_struct_from_file(header_path, target_name=name)
+        sizes[name] = model.total_size
+    return sizes
+
+
+def generate(out_dir, config, records=0, aliases_path=DEFAULT_ALIASES_PATH, header_name="synthetic.h"):
+    """寫出 header（與 records、manifest），回傳 manifest dict。"""
+    os.makedirs(out_dir, exist_ok=True)
+    header, names = HeaderGenerator(config, load_aliases(aliases_path)).generate()
+    header_path = os.path.join(out_dir, header_name)
+    with open(header_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(header)
+    manifest = {"seed": config.seed, "config": asdict(config), "header": header_name, "structs": names}
+    if records > 0:
+        sizes = struct_sizes(header_path, names)
+        rng = random.Random(f"records-{config.seed}")
+        manifest["records"] = {}
+        for name in names:
+            filename = f"{name}.bin"
+            with open(os.path.join(out_dir, filename), "wb") as f:
+                f.write(random_records(rng, sizes[name], records))
+            manifest["records"][name] = {"file": filename, "record_size": sizes[name], "count": records}
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate synthetic C headers and binary records")
+    ap.add_argument("--out-dir", required=True, help="Output directory")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--structs", type=int, default=GeneratorConfig.structs, help="Top-level structs")
+    ap.add_argument("--unions", type=int, default=GeneratorConfig.unions, help="Top-level unions")
+    ap.add_argument("--members", type=int, default=GeneratorConfig.members, help="Members per struct/union")
+    ap.add_argument("--depth", type=int, default=GeneratorConfig.depth, help="Maximum nesting depth")
+    ap.add_argument("--max-array", type=int, default=GeneratorConfig.max_array, help="Maximum array length")
+    ap.add_argument("--array-ratio", type=float, default=GeneratorConfig.array_ratio)
+    ap.add_argument("--bitfield-ratio", type=float, default=GeneratorConfig.bitfield_ratio)
+    ap.add_argument("--forward-ratio", type=float, default=GeneratorConfig.forward_ratio,
+                    help="Share of members that are pointers to later (forward-declared) structs")
+    ap.add_argument("--pack-regions", type=int, default=GeneratorConfig.pack_regions,
+                    help="Number of #pragma pack(push, N)/pop regions")
+    ap.add_argument("--alias-ratio", type=float, default=GeneratorConfig.alias_ratio,
+                    help="Share of scalar members written with a type_aliases.yaml alias")
+    ap.add_argument("--aliases", default=DEFAULT_ALIASES_PATH, help="type_aliases.yaml path")
+    ap.add_argument("--records", type=int, default=0, help="Random records per struct (0: header only)")
+    args = ap.parse_args(argv)
+
+    config = GeneratorConfig(
+        seed=args.seed, structs=args.structs, members=args.members, depth=args.depth,
+        max_array=args.max_array, array_ratio=args.array_ratio, bitfield_ratio=args.bitfield_ratio,
+        unions=args.unions, forward_ratio=args.forward_ratio, pack_regions=args.pack_regions,
+        alias_ratio=args.alias_ratio,
+    )
+    manifest = generate(args.out_dir, config, records=args.records, aliases_path=args.aliases)
+    print(f"Wrote {manifest['header']} with {len(manifest['structs'])} structs to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
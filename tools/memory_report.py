@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""CLI: Print a memory footprint report for a .H file.
+
+Loads the header, decodes the given (or all-zero) data and builds display
+nodes and the presenter context under tracemalloc, then prints per-stage
+allocation deltas and deep-size estimates of the AST, layout, member maps
+and context.
+
+Usage:
+  python tools/memory_report.py --input path/to/file.h [--struct StructName] \
+    [--hex 0102...] [--endianness little|big] [--top 10] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.model.memory_report import measure_header, format_memory_report
+from src.presenter.struct_presenter import StructPresenter
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Memory footprint report for a .H file")
+    ap.add_argument("--input", required=True, help="Path to .h header file")
+    ap.add_argument("--struct", dest="struct_name", help="Target struct/union name")
+    ap.add_argument("--hex", dest="hex_input", help="Hex string to decode (default: zeros)")
+    ap.add_argument("--endianness", choices=["little", "big"], default="little")
+    ap.add_argument("--top", type=int, default=10, help="Allocation sites kept per stage")
+    ap.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = ap.parse_args(argv)
+
+    report = measure_header(args.input, target_name=args.struct_name, hex_data=args.hex_input,
+                            byte_order=args.endianness, presenter_cls=StructPresenter, top=args.top)
+    print(json.dumps(report, indent=2) if args.json else format_memory_report(report))
+
+
+if __name__ == "__main__":
+    main()